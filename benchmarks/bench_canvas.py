@@ -0,0 +1,229 @@
+"""
+Render path benchmark: QLabel + QMovie vs QLabel.setPixmap vs PetCanvas
+
+Each path shows the same animation in a translucent 128x128 top-level window
+and steps through frames one at a time; every step is timed from the frame
+change to the end of the repaint (event processing included):
+  movie    QLabel.setMovie, QMovie decodes and the label repaints (old path)
+  label    pre-decoded frames through QLabel.setPixmap, full repaint
+  canvas   PetCanvas: paints in paintEvent, only the precomputed bounding
+           box of the pixels that changed since the previous frame
+
+Animations: pikachu idle and click, plus a synthetic 'blink' sprite where only
+the eyes change between frames. The repainted area is what a compositor has to
+take from a translucent window on every frame; the offscreen platform used here
+flushes for free, so the timings mostly show the fixed cost of a Python
+paintEvent, which the canvas must keep within 1.5x of the QMovie path it
+replaces.
+
+Also checks that the partial repaints leave the backing store identical to a
+full repaint, that a speech bubble is drawn in the same pass as the frame, and
+that a repeated frame index does not repaint.
+
+Exits 1 when any check fails.
+
+Usage:
+    python benchmarks/bench_canvas.py [rounds]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from PIL import Image, ImageDraw
+from PySide6.QtWidgets import QApplication, QLabel, QWidget
+from PySide6.QtCore import QPoint, QSize, Qt
+from PySide6.QtGui import QMovie
+
+from src.config import config
+from src.core.instrumentation import metrics
+from src.core.log import set_level
+from src.core.resource_loader import ResourceLoader
+from src.ui.pet_canvas import PetCanvas, SpeechBubble
+
+SIZE = config.WINDOW_SIZE
+
+
+def make_blink(path):
+    """A 256px body that never moves; only the eyes change between frames"""
+    frames = []
+    for i in range(8):
+        frame = Image.new('RGBA', (256, 256), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(frame)
+        draw.ellipse([28, 28, 228, 228], fill=(240, 200, 40, 255))
+        eye = 4 + abs(4 - i) * 4
+        draw.ellipse([90, 100 - eye, 110, 100 + eye], fill=(20, 20, 20, 255))
+        draw.ellipse([146, 100 - eye, 166, 100 + eye], fill=(20, 20, 20, 255))
+        frames.append(frame)
+    frames[0].save(path, save_all=True, append_images=frames[1:], duration=100, loop=0, disposal=2)
+
+
+def make_window(child):
+    window = QWidget()
+    window.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
+    window.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.Tool)
+    window.resize(*SIZE)
+    child.setParent(window)
+    child.setGeometry(0, 0, *SIZE)
+    window.show()
+    QApplication.processEvents()
+    return window
+
+
+def timed_steps(app, step, rounds):
+    start = time.perf_counter()
+    for i in range(rounds):
+        step(i)
+        app.processEvents()
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def bench_movie(app, path, rounds):
+    label = QLabel()
+    movie = QMovie(str(path))
+    movie.setScaledSize(movie.frameRect().size().scaled(QSize(*SIZE), Qt.AspectRatioMode.KeepAspectRatio)
+                        if movie.frameRect().isValid() else QSize(*SIZE))
+    movie.setCacheMode(QMovie.CacheMode.CacheAll)
+    label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+    label.setMovie(movie)
+    window = make_window(label)
+    movie.jumpToFrame(0)
+
+    def step(i):
+        if not movie.jumpToNextFrame():
+            movie.jumpToFrame(0)
+
+    us = timed_steps(app, step, rounds)
+    window.close()
+    return us
+
+
+def bench_label(app, frame_set, rounds):
+    label = QLabel()
+    label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+    window = make_window(label)
+    count = frame_set.frame_count
+    us = timed_steps(app, lambda i: label.setPixmap(frame_set.frame(i % count)), rounds)
+    window.close()
+    return us
+
+
+def bench_canvas(app, frame_set, rounds):
+    canvas = PetCanvas()
+    window = make_window(canvas)
+    count = frame_set.frame_count
+    canvas.set_frame(frame_set, count - 1)
+    app.processEvents()
+
+    metrics.reset()
+    us = timed_steps(app, lambda i: canvas.set_frame(frame_set, i % count), rounds)
+    painted = metrics.counters.get('paint.pixels', 0) / rounds
+    paints = metrics.timers['paint'].count if 'paint' in metrics.timers else 0
+
+    # Partial repaints must leave the same pixels as a full repaint
+    partial = window.backingStore().paintDevice().copy()
+    canvas.repaint()
+    app.processEvents()
+    full = window.backingStore().paintDevice().copy()
+    window.close()
+    return us, painted, paints, partial == full
+
+
+def check_overlay_and_idle(app, frame_set):
+    failures = 0
+    canvas = PetCanvas()
+    window = make_window(canvas)
+    canvas.set_frame(frame_set, 0)
+    app.processEvents()
+
+    bubble = SpeechBubble("Pika!", QPoint(SIZE[0] // 2, 30), max_width=SIZE[0] - 8)
+    canvas.add_overlay(bubble)
+    app.processEvents()
+
+    metrics.reset()
+    for i in range(1, frame_set.frame_count):
+        canvas.set_frame(frame_set, i)
+        app.processEvents()
+    paints = metrics.timers['paint'].count
+    partial = window.backingStore().paintDevice().copy()
+    canvas.repaint()
+    app.processEvents()
+    same = partial == window.backingStore().paintDevice().copy()
+    print(f"[overlay] bubble over {frame_set.frame_count - 1} frame changes: {paints} paint passes, "
+          f"matches full repaint: {same}")
+    if paints > frame_set.frame_count - 1 or not same:
+        print("  FAIL bubble not composed in the frame's paint pass")
+        failures += 1
+
+    metrics.reset()
+    for _ in range(10):
+        canvas.set_frame(frame_set, frame_set.frame_count - 1)
+        app.processEvents()
+    repaints = metrics.timers['paint'].count if 'paint' in metrics.timers else 0
+    print(f"[idle] same frame index set 10 times: {repaints} repaint(s)")
+    if repaints:
+        print("  FAIL repainted without a frame change")
+        failures += 1
+
+    canvas.remove_overlay(bubble)
+    window.close()
+    return failures
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    set_level('WARNING')
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    temp = Path(tempfile.mkdtemp(prefix='pet_canvas_'))
+    failures = 0
+    try:
+        make_blink(temp / 'blink.gif')
+        sources = [(config.SPRITES_DIR / 'pikachu', 'idle.gif'),
+                   (config.SPRITES_DIR / 'pikachu', 'click.gif'),
+                   (temp, 'blink.gif')]
+
+        print(f"{rounds} frame steps per path, {SIZE[0]}x{SIZE[1]} translucent window (us per frame)")
+        print(f"  {'animation':<10} {'movie':>8} {'label':>8} {'canvas':>8}  canvas repainted area "
+              f"(movie/label: 100%)")
+        for sprite_dir, filename in sources:
+            loader = ResourceLoader(sprite_dir, disk_cache=None, use_pack=False)
+            frame_set = loader.load_frames(filename, SIZE)
+            movie = bench_movie(app, sprite_dir / filename, rounds)
+            label = bench_label(app, frame_set, rounds)
+            canvas, painted, paints, identical = bench_canvas(app, frame_set, rounds)
+            area = SIZE[0] * SIZE[1]
+            print(f"  {Path(filename).stem:<10} {movie:8.1f} {label:8.1f} {canvas:8.1f}  "
+                  f"{painted / area:6.1%} of the window, {paints} paints")
+            if not identical:
+                print(f"  FAIL {filename}: partial repaints differ from a full repaint")
+                failures += 1
+            if canvas > movie * 1.5:
+                print(f"  FAIL {filename}: canvas slower than the QMovie path")
+                failures += 1
+            if filename == 'blink.gif' and painted > area * 0.1:
+                print("  FAIL blink: repaint not limited to the changed eyes")
+                failures += 1
+
+        loader = ResourceLoader(temp, disk_cache=None, use_pack=False)
+        failures += check_overlay_and_idle(app, loader.load_frames('blink.gif', SIZE))
+    finally:
+        shutil.rmtree(temp, ignore_errors=True)
+
+    if failures:
+        print(f"\n{failures} check(s) failed")
+        sys.exit(1)
+    print("\nAll checks passed")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,277 @@
+"""
+Frame-delta storage benchmark: full frames vs keyframe + changed-region patches
+
+A DeltaFrameSet keeps only the first frame and, for every frame, the rectangle
+that changed since the previous one; frames are rebuilt on demand into a small
+pool of reusable buffers. This compares it with a FrameSet holding every frame
+as a full pixmap:
+  memory       bytes held by each frame set (hit masks included)
+  sequential   us per frame drawn in playback order (one patch per frame)
+  copy         us per full-frame copy into a rebuild buffer (baseline only)
+  random       us per frame drawn at random indices (replay from the nearest
+               buffer or the keyframe)
+  two pets     us per frame with two consumers drawing the same frame set
+               half an animation apart
+
+Sprites: pikachu idle and click at 1x and 2x, plus synthetic sets: a 256px
+'blink' where only the eyes change, a 512px 48-frame 'tail' where a small
+part waves, and a 'walk' where the body sways across most of the frame
+(deltas do not pay off).
+
+Checks that every rebuilt frame matches the full frame pixel for pixel, that
+the loader picks deltas only where they save at least DELTA_MIN_SAVING, that
+the canvas' partial repaints stay correct with a delta frame set, and that
+the sets deltas are meant for save at least half of their memory while a
+sequential frame costs no more than MAX_SEQUENTIAL_RATIO times the full-frame
+baseline measured in the same run: drawing a full frame plus copying one into
+a buffer (the worst a rebuild should do on top of the draw).
+
+Exits 1 when any check fails.
+
+Usage:
+    python benchmarks/bench_delta_frames.py [rounds]
+"""
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from PIL import Image, ImageDraw
+from PySide6.QtWidgets import QApplication, QWidget
+from PySide6.QtCore import QPoint, Qt
+from PySide6.QtGui import QImage, QPainter
+
+from src.config import config
+from src.core.log import set_level
+from src.core.resource_loader import DeltaFrameSet, ResourceLoader
+from src.core.sprite_cache import FRAME_FORMAT
+from src.ui.pet_canvas import PetCanvas
+
+# Sets where most of the sprite stays still between frames
+DELTA_TARGETS = ('click', 'blink', 'tail')
+MAX_SEQUENTIAL_RATIO = 3
+
+
+def make_blink(path):
+    """A 256px body that never moves; only the eyes change between frames"""
+    frames = []
+    for i in range(8):
+        frame = Image.new('RGBA', (256, 256), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(frame)
+        draw.ellipse([28, 28, 228, 228], fill=(240, 200, 40, 255))
+        eye = 4 + abs(4 - i) * 4
+        draw.ellipse([90, 100 - eye, 110, 100 + eye], fill=(20, 20, 20, 255))
+        draw.ellipse([146, 100 - eye, 166, 100 + eye], fill=(20, 20, 20, 255))
+        frames.append(frame)
+    frames[0].save(path, save_all=True, append_images=frames[1:], duration=100, loop=0, disposal=2)
+
+
+def make_tail(path):
+    """A 512px, 48-frame sprite whose small tail waves while the body stays put"""
+    frames = []
+    for i in range(48):
+        frame = Image.new('RGBA', (512, 512), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(frame)
+        draw.ellipse([96, 96, 416, 416], fill=(90, 160, 230, 255))
+        draw.ellipse([200, 180, 230, 210], fill=(20, 20, 20, 255))
+        draw.ellipse([282, 180, 312, 210], fill=(20, 20, 20, 255))
+        swing = (i % 12 - 6) * 4
+        draw.line([(410, 330), (470, 300 + swing)], fill=(230, 120, 40, 255), width=10)
+        frames.append(frame)
+    frames[0].save(path, save_all=True, append_images=frames[1:], duration=60, loop=0, disposal=2)
+
+
+def make_walk(path):
+    """A 128px body that sways across most of the frame every step"""
+    frames = []
+    for i in range(16):
+        frame = Image.new('RGBA', (128, 128), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(frame)
+        x = abs(8 - i) * 3
+        draw.ellipse([x, 8, x + 100, 120], fill=(120, 200, 90, 255))
+        frames.append(frame)
+    frames[0].save(path, save_all=True, append_images=frames[1:], duration=80, loop=0, disposal=2)
+
+
+def images_of(frame_set):
+    return [frame_set.frame(i).toImage().convertToFormat(FRAME_FORMAT)
+            for i in range(frame_set.frame_count)]
+
+
+def target_for(frame_set):
+    size = frame_set.frame(0).size()
+    image = QImage(size, FRAME_FORMAT)
+    image.setDevicePixelRatio(frame_set.scale)
+    return image
+
+
+def render(frame_set, index, target):
+    target.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(target)
+    frame_set.draw(painter, QPoint(0, 0), index)
+    painter.end()
+    return target.copy()
+
+
+def time_draws(frame_set, indices, target):
+    painter = QPainter(target)
+    origin = QPoint(0, 0)
+    start = time.perf_counter()
+    for index in indices:
+        frame_set.draw(painter, origin, index)
+    painter.end()
+    return (time.perf_counter() - start) / len(indices) * 1e6
+
+
+def time_copies(image, rounds):
+    """Cost of copying a full frame into a buffer the way a rebuild from the keyframe does"""
+    buffer = QImage(image.size(), FRAME_FORMAT)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        painter = QPainter(buffer)
+        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_Source)
+        painter.drawImage(0, 0, image)
+        painter.end()
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def check_identical(full, delta):
+    """Compare rebuilt frames in order, at random and across two consumers"""
+    count = full.frame_count
+    target = target_for(full)
+    expected = [render(full, i, target) for i in range(count)]
+    order = list(range(count)) * 2 + [random.randrange(count) for _ in range(3 * count)]
+    half = count // 2
+    order += [index for i in range(count) for index in (i, (i + half) % count)]
+    return all(render(delta, i, target) == expected[i] for i in order)
+
+
+def bench_set(full, rounds):
+    images = images_of(full)
+    # A negative minimum saving forces the delta encoding for the comparison
+    delta = DeltaFrameSet.from_images(images, full.delays, full.loop_count, full.masks, full.scale,
+                                      min_saving=-1.0)
+    count = full.frame_count
+    target = target_for(full)
+
+    sequential = [i % count for i in range(rounds)]
+    randoms = [random.randrange(count) for _ in range(rounds)]
+    half = count // 2
+    paired = [index for i in range(rounds // 2) for index in (i % count, (i + half) % count)]
+
+    results = {}
+    for label, frame_set in (('full', full), ('delta', delta)):
+        results[label] = (frame_set.nbytes,
+                          time_draws(frame_set, sequential, target),
+                          time_draws(frame_set, randoms, target),
+                          time_draws(frame_set, paired, target))
+    return results, time_copies(images[0], rounds), check_identical(full, delta)
+
+
+def check_canvas(app, frame_set):
+    """Partial repaints from a delta frame set must match a full repaint"""
+    window = QWidget()
+    window.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
+    window.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.Tool)
+    window.resize(*config.WINDOW_SIZE)
+    canvas = PetCanvas(window)
+    canvas.setGeometry(0, 0, *config.WINDOW_SIZE)
+    window.show()
+    app.processEvents()
+
+    for i in range(frame_set.frame_count * 2 + 1):
+        canvas.set_frame(frame_set, i % frame_set.frame_count)
+        app.processEvents()
+    partial = window.backingStore().paintDevice().copy()
+    canvas.repaint()
+    app.processEvents()
+    same = partial == window.backingStore().paintDevice().copy()
+    window.close()
+    return same
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    set_level('WARNING')
+    app = QApplication.instance() or QApplication(sys.argv)
+    random.seed(7)
+
+    temp = Path(tempfile.mkdtemp(prefix='pet_delta_'))
+    failures = 0
+    try:
+        make_blink(temp / 'blink.gif')
+        make_tail(temp / 'tail.gif')
+        make_walk(temp / 'walk.gif')
+        pikachu = config.SPRITES_DIR / 'pikachu'
+        size = config.WINDOW_SIZE
+        sources = [(pikachu, 'idle.gif', size, 1.0), (pikachu, 'idle.gif', size, 2.0),
+                   (pikachu, 'click.gif', size, 1.0), (pikachu, 'click.gif', size, 2.0),
+                   (temp, 'blink.gif', (256, 256), 1.0), (temp, 'tail.gif', (512, 512), 1.0),
+                   (temp, 'walk.gif', size, 1.0)]
+
+        print(f"{rounds} draws per access pattern (memory in KB, us per frame)")
+        print(f"  {'animation':<14} {'frames':>6} {'full KB':>8} {'delta KB':>9} {'saved':>6}  "
+              f"{'sequential':>16} {'random':>16} {'two pets':>16} {'copy':>6}  loader picks")
+        for sprite_dir, filename, target_size, scale in sources:
+            stem = Path(filename).stem
+            label = f"{stem} {target_size[0]}@{scale:g}x"
+            full = ResourceLoader(sprite_dir, disk_cache=None, use_pack=False).load_frames(
+                filename, target_size, scale=scale)
+            results, copy_us, identical = bench_set(full, rounds)
+
+            loader = ResourceLoader(sprite_dir, disk_cache=None, use_pack=False, delta_frames=True,
+                                    delta_min_saving=config.DELTA_MIN_SAVING)
+            picked = loader.load_frames(filename, target_size, scale=scale)
+
+            full_bytes, full_seq, full_rand, full_pair = results['full']
+            delta_bytes, delta_seq, delta_rand, delta_pair = results['delta']
+            saved = 1 - delta_bytes / full_bytes
+            print(f"  {label:<14} {full.frame_count:>6} {full_bytes / 1024:8.0f} {delta_bytes / 1024:9.0f} "
+                  f"{saved:6.0%}  {full_seq:7.1f} -> {delta_seq:6.1f} {full_rand:7.1f} -> {delta_rand:6.1f} "
+                  f"{full_pair:7.1f} -> {delta_pair:6.1f} {copy_us:6.1f}  {type(picked).__name__}")
+
+            if not identical:
+                print(f"  FAIL {label}: rebuilt frames differ from the full frames")
+                failures += 1
+            should_pick = saved >= config.DELTA_MIN_SAVING
+            if isinstance(picked, DeltaFrameSet) != should_pick:
+                print(f"  FAIL {label}: loader picked {type(picked).__name__} for a {saved:.0%} saving")
+                failures += 1
+            if stem in DELTA_TARGETS:
+                if saved < 0.5:
+                    print(f"  FAIL {label}: deltas saved less than half of the memory")
+                    failures += 1
+                limit = MAX_SEQUENTIAL_RATIO * (full_seq + copy_us)
+                if delta_seq > limit:
+                    print(f"  FAIL {label}: sequential rebuild above {limit:.1f} us per frame "
+                          f"({MAX_SEQUENTIAL_RATIO:g}x a full-frame draw plus copy)")
+                    failures += 1
+
+        loader = ResourceLoader(pikachu, disk_cache=None, use_pack=False, delta_frames=True)
+        click = loader.load_frames('click.gif', size)
+        same = check_canvas(app, click)
+        print(f"[canvas] {type(click).__name__} partial repaints match a full repaint: {same}")
+        if not isinstance(click, DeltaFrameSet) or not same:
+            print("  FAIL canvas repaint with a delta frame set")
+            failures += 1
+    finally:
+        shutil.rmtree(temp, ignore_errors=True)
+
+    if failures:
+        print(f"\n{failures} check(s) failed")
+        sys.exit(1)
+    print("\nAll checks passed")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+Benchmark: QMovie playback vs pre-decoded frame atlas (FramePlayer)
+
+Plays the idle animation for a fixed wall-clock duration with each engine
+and reports the CPU time consumed by the process.
+
+Usage:
+    python benchmarks/bench_frame_atlas.py [seconds]
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from PySide6.QtWidgets import QApplication, QLabel
+from PySide6.QtGui import QMovie
+from PySide6.QtCore import QEventLoop, QTimer, QSize
+
+from src.config import config
+from src.core.resource_loader import ResourceLoader, FramePlayer
+
+
+def run_for(app, seconds):
+    """Run the Qt event loop for a fixed time and return (wall, cpu) seconds"""
+    loop = QEventLoop()
+    QTimer.singleShot(int(seconds * 1000), loop.quit)
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    loop.exec()
+    return time.perf_counter() - wall_start, time.process_time() - cpu_start
+
+
+def bench_qmovie(app, path, size, seconds):
+    label = QLabel()
+    label.resize(*size)
+    label.show()
+
+    frames = [0]
+    movie = QMovie(path)
+    movie.setScaledSize(QSize(*size))
+    movie.frameChanged.connect(lambda _: frames.__setitem__(0, frames[0] + 1))
+    label.setMovie(movie)
+    movie.start()
+
+    wall, cpu = run_for(app, seconds)
+    movie.stop()
+    label.close()
+    return wall, cpu, frames[0]
+
+
+def bench_frame_atlas(app, path, size, seconds):
+    label = QLabel()
+    label.resize(*size)
+    label.show()
+
+    loader = ResourceLoader(os.path.dirname(path))
+    decode_start = time.perf_counter()
+    frame_set = loader.load_frames(path, size)
+    decode_time = time.perf_counter() - decode_start
+
+    frames = [0]
+    player = FramePlayer()
+
+    def on_frame(index):
+        frames[0] += 1
+        label.setPixmap(player.current_frame())
+
+    player.frameChanged.connect(on_frame)
+    player.play(frame_set)
+
+    wall, cpu = run_for(app, seconds)
+    player.stop()
+    label.close()
+    return wall, cpu, frames[0], decode_time
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    path = str(config.get_pet_sprite_dir() / 'idle.gif')
+    size = config.WINDOW_SIZE
+
+    print("=" * 60)
+    print(f"  Idle playback benchmark ({seconds:.1f}s each)")
+    print(f"  Sprite: {path}")
+    print("=" * 60)
+
+    wall, cpu, frames = bench_qmovie(app, path, size, seconds)
+    print(f"QMovie      : cpu {cpu * 1000:8.1f}ms  "
+          f"({cpu / wall * 100:5.1f}% of one core)  frames {frames}")
+    qmovie_cpu = cpu
+
+    wall, cpu, frames, decode = bench_frame_atlas(app, path, size, seconds)
+    print(f"Frame atlas : cpu {cpu * 1000:8.1f}ms  "
+          f"({cpu / wall * 100:5.1f}% of one core)  frames {frames}  "
+          f"(one-off decode {decode * 1000:.1f}ms)")
+
+    if cpu > 0:
+        print(f"Steady-state CPU ratio: {qmovie_cpu / cpu:.1f}x less with frame atlas")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,251 @@
+"""
+Input pipeline benchmark: gesture classification and window input handling
+
+  1. scripted synthetic pointer streams (taps, double taps, long presses,
+     drags, flings) through GestureRecognizer; checks the recognized gestures
+  2. recognizer cost per event for a 1000 Hz drag
+  3. synthetic QMouseEvents sent to a PetWindow: a 1000 Hz drag must move the
+     window at most once per display frame, a burst of rapid clicks must not
+     restart the click animation on every click, and a fling must keep the
+     window gliding after release and then come to rest
+
+Exits 1 when any check fails.
+
+Usage:
+    python benchmarks/bench_gestures.py
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QEvent, QEventLoop, QPointF, Qt, QTimer
+from PySide6.QtGui import QMouseEvent
+
+from src.config import config
+from src.core.gesture import (CLICK, DOUBLE_CLICK, DRAG_END, DRAG_MOVE, DRAG_START, FLING,
+                              LONG_PRESS, GestureRecognizer)
+from src.core.log import set_level
+from src.core.movement import shared_movement
+
+
+def drag_path(x0, y0, dx, dy, duration, start, step=8):
+    """Evenly spaced move events from (x0, y0) to (x0 + dx, y0 + dy)"""
+    count = max(int(duration / step), 1)
+    return [('move', x0 + dx * i / count, y0 + dy * i / count, start + duration * i / count)
+            for i in range(1, count + 1)]
+
+
+def run(stream, **options):
+    """Feed ('press'|'move'|'release'|'poll', x, y, t) events; returns gesture kinds"""
+    recognizer = GestureRecognizer(drag_distance=6, double_click_interval=400, long_press=800,
+                                   **options)
+    gestures = []
+    for kind, x, y, t in stream:
+        if kind == 'poll':
+            gestures += recognizer.poll(t)
+        else:
+            gestures += getattr(recognizer, kind)(x, y, t)
+    # Drain pending timeouts
+    deadline = recognizer.deadline()
+    if deadline is not None:
+        gestures += recognizer.poll(deadline)
+    kinds = []
+    for gesture in gestures:
+        if gesture.kind == DRAG_MOVE and kinds and kinds[-1] == DRAG_MOVE:
+            continue
+        kinds.append(gesture.kind)
+    return kinds, gestures
+
+
+def tap(x, y, t, hold=80):
+    return [('press', x, y, t), ('release', x, y, t + hold)]
+
+
+SCENARIOS = [
+    ("tap", tap(10, 10, 0), {}, [CLICK]),
+    ("tap with 4px jitter", [('press', 10, 10, 0), ('move', 13, 12, 30), ('move', 14, 10, 60),
+                             ('release', 14, 10, 90)], {}, [CLICK]),
+    ("double tap", tap(10, 10, 0) + tap(11, 10, 200), {}, [CLICK, DOUBLE_CLICK]),
+    ("double tap, clicks deferred", tap(10, 10, 0) + tap(11, 10, 200), {'defer_click': True},
+     [DOUBLE_CLICK]),
+    ("single tap, clicks deferred", tap(10, 10, 0) + [('poll', 0, 0, 300)], {'defer_click': True},
+     [CLICK]),
+    ("two slow taps", tap(10, 10, 0) + tap(10, 10, 700), {}, [CLICK, CLICK]),
+    ("two taps far apart", tap(10, 10, 0) + tap(60, 10, 150), {}, [CLICK, CLICK]),
+    ("triple tap", tap(10, 10, 0) + tap(10, 10, 150) + tap(10, 10, 300), {},
+     [CLICK, DOUBLE_CLICK, CLICK]),
+    ("long press", [('press', 10, 10, 0), ('poll', 0, 0, 500), ('poll', 0, 0, 800),
+                    ('release', 10, 10, 1200)], {}, [LONG_PRESS]),
+    ("long press, then drag", [('press', 10, 10, 0), ('poll', 0, 0, 800)]
+     + drag_path(10, 10, 100, 0, 1000, 900) + [('release', 110, 10, 2100)], {},
+     [LONG_PRESS, DRAG_START, DRAG_MOVE, DRAG_END]),
+    ("slow drag", [('press', 10, 10, 0)] + drag_path(10, 10, 200, 0, 1000, 0)
+     + [('release', 210, 10, 1008)], {}, [DRAG_START, DRAG_MOVE, DRAG_END]),
+    ("fast drag, pause, release", [('press', 10, 10, 0)] + drag_path(10, 10, 300, 0, 200, 0)
+     + [('release', 310, 10, 400)], {}, [DRAG_START, DRAG_MOVE, DRAG_END]),
+    ("fling", [('press', 10, 10, 0)] + drag_path(10, 10, 300, -100, 200, 0)
+     + [('release', 310, -90, 208)], {}, [DRAG_START, DRAG_MOVE, DRAG_END, FLING]),
+    ("tap, then drag, clicks deferred", tap(10, 10, 0) + [('press', 10, 10, 150)]
+     + drag_path(10, 10, 100, 0, 500, 150) + [('release', 110, 10, 700)], {'defer_click': True},
+     [CLICK, DRAG_START, DRAG_MOVE, DRAG_END]),
+]
+
+
+def check_scenarios():
+    failures = 0
+    print("[recognizer] synthetic event streams")
+    for name, stream, options, expected in SCENARIOS:
+        kinds, _ = run(stream, **options)
+        ok = kinds == expected
+        print(f"  {name:<34} {' '.join(kinds)}")
+        if not ok:
+            print(f"  FAIL {name}: expected {' '.join(expected)}")
+            failures += 1
+
+    # Release velocity of the fling: 1500 px/s right, 500 px/s up
+    _, gestures = run(SCENARIOS[12][1])
+    fling = gestures[-1]
+    print(f"  fling velocity                     ({fling.vx:.0f}, {fling.vy:.0f}) px/s")
+    if abs(fling.vx - 1500) > 100 or abs(fling.vy + 500) > 50:
+        print("  FAIL fling velocity off the drawn path")
+        failures += 1
+
+    stream = [('press', 0, 0, 0)] + drag_path(0, 0, 3000, 0, 200, 0) + [('release', 3000, 0, 208)]
+    _, gestures = run(stream, max_fling_speed=3000.0)
+    speed = gestures[-1].vx
+    print(f"  15000 px/s throw capped at         {speed:.0f} px/s")
+    if gestures[-1].kind != FLING or abs(speed - 3000) > 1:
+        print("  FAIL fling speed not capped")
+        failures += 1
+    return failures
+
+
+def bench_recognizer():
+    recognizer = GestureRecognizer()
+    events = [(100 + i % 400, 100 + i % 50, float(i)) for i in range(20000)]
+    recognizer.press(100, 100, 0.0)
+    start = time.perf_counter()
+    for x, y, t in events:
+        recognizer.move(x, y, t)
+    us = (time.perf_counter() - start) / len(events) * 1e6
+    recognizer.release(100, 100, 20001.0)
+    print(f"[recognizer] {us:.2f} us per move event during a drag")
+    return 0
+
+
+def run_for(seconds):
+    loop = QEventLoop()
+    QTimer.singleShot(int(seconds * 1000), loop.quit)
+    loop.exec()
+
+
+def send(window, kind, global_pos, button=Qt.MouseButton.LeftButton):
+    local = QPointF(global_pos) - QPointF(window.pos())
+    buttons = Qt.MouseButton.NoButton if kind == QEvent.Type.MouseButtonRelease else Qt.MouseButton.LeftButton
+    event = QMouseEvent(kind, local, QPointF(global_pos), button, buttons, Qt.KeyboardModifier.NoModifier)
+    QApplication.sendEvent(window, event)
+
+
+def check_window(app):
+    from src.ui.pet_window import PetWindow
+
+    failures = 0
+    movement = shared_movement()
+    window = PetWindow(position=(300, 300), persist_position=False)
+    window.show()
+    deadline = time.perf_counter() + 10
+    while 'click' not in window.animations and time.perf_counter() < deadline:
+        run_for(0.02)
+    run_for(0.3)
+    window.behavior.stop()
+
+    # 1000 Hz drag
+    origin = window.pos() + window.rect().center()
+    requests, moves = movement.move_requests, movement.moves
+    send(window, QEvent.Type.MouseButtonPress, origin)
+    start = time.perf_counter()
+    i = 0
+    while time.perf_counter() - start < 0.5:
+        send(window, QEvent.Type.MouseMove, origin + QPointF(i % 200, 0).toPoint())
+        i += 1
+        run_for(0.001)
+    run_for(0.2)  # stop moving so the release does not fling
+    send(window, QEvent.Type.MouseButtonRelease, window.pos() + window.rect().center())
+    requests = movement.move_requests - requests
+    moves = movement.moves - moves
+    frames = 0.7 * 1000 / (1000.0 / 60)
+    print(f"[window] drag: {i} mouse moves -> {requests} drag requests -> {moves} window moves")
+    if moves > frames * 1.2 or window.dragging:
+        print("  FAIL drag not coalesced to one move per frame")
+        failures += 1
+    deadline = time.perf_counter() + 5
+    while movement.is_moving(window) and time.perf_counter() < deadline:
+        run_for(0.02)
+
+    # Rapid clicks
+    entered = []
+    window.behavior.stateChanged.connect(lambda state, *_: entered.append(state))
+    center = window.pos() + window.rect().center()
+    for _ in range(10):
+        send(window, QEvent.Type.MouseButtonPress, center)
+        send(window, QEvent.Type.MouseButtonRelease, center)
+        run_for(0.06)
+    run_for(0.5)
+    happy = entered.count('happy')
+    print(f"[window] 10 clicks 60 ms apart: click animation started {happy} times, "
+          f"gesture timer active: {window._gesture_timer.isActive()}")
+    if not 1 <= happy <= 5 or window._gesture_timer.isActive():
+        print("  FAIL rapid clicks not debounced")
+        failures += 1
+
+    # Fling to the right from the left side of the screen
+    config.MOVEMENT_GRAVITY = False
+    window.move(50, window.y())
+    run_for(0.1)
+    center = window.pos() + window.rect().center()
+    send(window, QEvent.Type.MouseButtonPress, center)
+    for step in range(1, 13):
+        send(window, QEvent.Type.MouseMove, center + QPointF(step * 8, 0).toPoint())
+        run_for(0.008)
+    send(window, QEvent.Type.MouseButtonRelease, center + QPointF(96, 0).toPoint())
+    release_x = center.x() + 96 - window.rect().center().x()
+    moving = movement.is_moving(window)
+    deadline = time.perf_counter() + 5
+    while movement.is_moving(window) and time.perf_counter() < deadline:
+        run_for(0.02)
+    glide = window.pos().x() - release_x
+    print(f"[window] fling: glided {glide}px after release, at rest: {not movement.is_moving(window)}")
+    if not moving or glide < 100 or movement.is_moving(window):
+        print("  FAIL fling did not glide and settle")
+        failures += 1
+
+    window.close()
+    return failures
+
+
+def main():
+    set_level('WARNING')
+    app = QApplication.instance() or QApplication(sys.argv)
+    config.save_config = lambda **kwargs: None  # keep the user's config untouched
+    config.HIT_TEST = False
+
+    failures = check_scenarios()
+    failures += bench_recognizer()
+    failures += check_window(app)
+
+    if failures:
+        print(f"\n{failures} check(s) failed")
+        sys.exit(1)
+    print("\nAll checks passed")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Hit-mask benchmark: per-frame mask extraction vs precomputed 1-bit masks
+
+Decodes every pikachu animation at the window size and compares, per frame:
+  - naive:       QPixmap.mask() + QRegion(bitmap) on every frame change, and
+                 a click test through QPixmap.toImage().pixelColor()
+  - precomputed: HitMask built once at load time (reported separately), then
+                 HitMask.contains() for clicks and the cached region
+
+Also verifies that every mask bit agrees with the frame's alpha (>= 128) and
+that the region covers exactly the opaque pixels; exits 1 on a mismatch.
+
+Usage:
+    python benchmarks/bench_hit_mask.py [rounds]
+"""
+
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from PySide6.QtWidgets import QApplication
+from PySide6.QtGui import QPixmap, QRegion
+
+from src.config import config
+from src.core.hit_mask import build_hit_masks
+from src.core.resource_loader import ResourceLoader
+
+
+def per_frame_us(func, items, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for item in items:
+            func(item)
+    return (time.perf_counter() - start) / (rounds * len(items)) * 1e6
+
+
+def verify(images, masks):
+    """Mask bits and region vs the frame alpha channel"""
+    errors = 0
+    for image, mask in zip(images, masks):
+        region = mask.region()
+        opaque = 0
+        for y in range(image.height()):
+            for x in range(image.width()):
+                hit = image.pixelColor(x, y).alpha() >= 128
+                opaque += hit
+                if mask.contains(x, y) != hit:
+                    errors += 1
+        covered = sum(rect.width() * rect.height() for rect in region)
+        if covered != opaque:
+            errors += 1
+    return errors
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    QApplication.instance() or QApplication(sys.argv)
+    loader = ResourceLoader(config.SPRITES_DIR / 'pikachu', disk_cache=None)
+    images = []
+    for name in loader.list_available_animations():
+        path = loader.get_animation_path(name)
+        images.extend(loader.load_frame_images(path, config.WINDOW_SIZE)[0])
+    pixmaps = [QPixmap.fromImage(image) for image in images]
+    width, height = config.WINDOW_SIZE
+    rng = random.Random(0)
+    points = [(rng.randrange(image.width()), rng.randrange(image.height())) for image in images]
+
+    # Load-time cost of the precomputed masks
+    start = time.perf_counter()
+    masks = build_hit_masks(images)
+    build_us = (time.perf_counter() - start) / len(images) * 1e6
+    for mask in masks:
+        mask.region()  # warm the region cache, as the first frame change would
+
+    naive_mask = per_frame_us(lambda p: QRegion(p.mask()), pixmaps, rounds)
+    naive_hit = per_frame_us(
+        lambda i: pixmaps[i].toImage().pixelColor(*points[i]).alpha() >= 128,
+        range(len(pixmaps)), rounds)
+    pre_mask = per_frame_us(lambda m: m.region(), masks, rounds * 100)
+    pre_hit = per_frame_us(lambda i: masks[i].contains(*points[i]), range(len(masks)), rounds * 100)
+
+    print("=" * 64)
+    print(f"  Hit masks ({len(images)} frames at {width}x{height})")
+    print("=" * 64)
+    print(f"{'':<14}{'shape mask':>16}{'click test':>16}")
+    print(f"{'naive':<14}{naive_mask:>13.1f} us{naive_hit:>13.1f} us")
+    print(f"{'precomputed':<14}{pre_mask:>13.2f} us{pre_hit:>13.2f} us")
+    print(f"speedup       {naive_mask / pre_mask:>14.0f}x{naive_hit / pre_hit:>15.0f}x")
+    print(f"build once:   {build_us:.1f} us/frame, "
+          f"{sum(m.nbytes for m in masks) / 1024:.1f} KB for all masks")
+
+    errors = verify(images, masks)
+    print(f"verification: {errors} mismatches")
+    loader.close()
+    if errors:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
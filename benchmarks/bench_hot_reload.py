@@ -0,0 +1,265 @@
+"""
+Hot-reload benchmark: latency of sprite file changes reaching a live window
+
+Copies the pikachu sprites into a temporary sprites directory, opens a
+PetWindow on it and watches the directory with SpriteWatcher. Then:
+  1. rewrites idle.gif repeatedly (atomic replace and in-place writes) and
+     measures the time from the write until the window shows the new frames
+  2. writes idle.gif several times within one debounce interval and checks
+     that this causes a single reload
+  3. adds walk.gif and then removes it again, checking that the window's
+     behavior starts and stops scheduling the walk state
+  4. adds and then re-packs a sprite pack with only one changed animation
+  5. re-packs while the live pack cannot be replaced (as on Windows, where a
+     mapped file cannot be replaced) and checks that the versioned pack the
+     packer writes instead is picked up
+
+Exits with status 1 if an unchanged animation is ever re-decoded or reloaded.
+
+Usage:
+    python benchmarks/bench_hot_reload.py [iterations] [--debounce MS]
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from PIL import Image
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QEventLoop, QTimer
+
+from src.config import config
+from src.core import resource_loader
+from src.core.frame_store import FrameStore
+from src.core.sprite_pack import pack_path_for, write_pack
+from src.core.sprite_watcher import SpriteWatcher
+from src.ui.pet_window import PetWindow
+
+SPECIES = 'bench'
+
+decoded = []  # file names passed to decode_animation
+
+
+def count_decodes():
+    original = resource_loader.decode_animation
+
+    def counting(file_path, *args, **kwargs):
+        decoded.append(os.path.basename(str(file_path)))
+        return original(file_path, *args, **kwargs)
+
+    resource_loader.decode_animation = counting
+
+
+def refuse_replacing(path):
+    """Make os.replace onto path fail like it does on Windows while the file is mapped"""
+    original = os.replace
+
+    def replace(src, dst, **kwargs):
+        if Path(dst) == Path(path):
+            raise PermissionError(13, "The process cannot access the file", str(dst))
+        return original(src, dst, **kwargs)
+
+    os.replace = replace
+    return original
+
+
+def run_for(seconds):
+    loop = QEventLoop()
+    QTimer.singleShot(int(seconds * 1000), loop.quit)
+    loop.exec()
+
+
+def wait_until(predicate, timeout=10.0):
+    deadline = time.perf_counter() + timeout
+    while not predicate() and time.perf_counter() < deadline:
+        run_for(0.005)
+    return predicate()
+
+
+def make_variants(source, target_dir):
+    """Two encodings of the same animation with different frame timing"""
+    frames = []
+    with Image.open(source) as gif:
+        for i in range(gif.n_frames):
+            gif.seek(i)
+            frames.append(gif.convert('RGBA'))
+
+    variants = []
+    for n, duration in enumerate((40, 60)):
+        path = os.path.join(target_dir, f'variant{n}.gif')
+        frames[0].save(path, save_all=True, append_images=frames[1:],
+                       duration=duration, loop=0, disposal=2)
+        with open(path, 'rb') as f:
+            variants.append(f.read())
+    return variants
+
+
+def write_file(path, data, atomic):
+    if atomic:
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    else:
+        with open(path, 'wb') as f:
+            f.write(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sprite hot-reload benchmark")
+    parser.add_argument('iterations', type=int, nargs='?', default=10)
+    parser.add_argument('--debounce', type=int, default=config.HOT_RELOAD_DEBOUNCE,
+                        help="watcher debounce interval in ms")
+    args = parser.parse_args()
+
+    QApplication.instance() or QApplication(sys.argv)
+    count_decodes()
+
+    tmp = tempfile.mkdtemp(prefix='hot_reload_')
+    failures = []
+    try:
+        sprites_dir = os.path.join(tmp, 'sprites')
+        species_dir = os.path.join(sprites_dir, SPECIES)
+        shutil.copytree(config.get_pet_sprite_dir('pikachu'), species_dir)
+        config.SPRITES_DIR = Path(sprites_dir)
+        variants = make_variants(os.path.join(species_dir, 'idle.gif'), tmp)
+
+        store = FrameStore()  # no disk cache: every reload is a real decode
+        window = PetWindow(pet_name=SPECIES, frame_store=store, persist_position=False)
+        window.show()
+        wait_until(lambda: 'idle' in window.animations and 'click' in window.animations)
+
+        watcher = SpriteWatcher(sprites_dir, debounce_ms=args.debounce)
+        watcher.animationsChanged.connect(store.reload_animations)
+        watcher.packChanged.connect(store.reload_pack)
+        watcher.start()
+
+        replaced = []
+        store.frameSetReplaced.connect(lambda key, frame_set: replaced.append(key[1]))
+
+        # 1. single-file edits
+        decoded.clear()
+        latencies = []
+        idle_path = os.path.join(species_dir, 'idle.gif')
+        for i in range(args.iterations):
+            before = window.animations['idle']
+            start = time.perf_counter()
+            write_file(idle_path, variants[i % 2], atomic=i % 2 == 0)
+            if not wait_until(lambda: window.animations['idle'] is not before):
+                failures.append(f"edit {i}: window did not reload")
+                continue
+            latencies.append((time.perf_counter() - start) * 1000)
+            run_for(0.05)
+
+        print("=" * 64)
+        print(f"  Hot reload ({args.iterations} edits, debounce {args.debounce}ms)")
+        print("=" * 64)
+        if latencies:
+            print(f"write -> new frames on screen: median {statistics.median(latencies):.1f}ms, "
+                  f"max {max(latencies):.1f}ms "
+                  f"(reload work excluding debounce: {statistics.median(latencies) - args.debounce:.1f}ms)")
+        print(f"decodes: idle.gif x{decoded.count('idle.gif')}, click.gif x{decoded.count('click.gif')}")
+        if decoded.count('click.gif'):
+            failures.append("unchanged click.gif was re-decoded")
+        if decoded.count('idle.gif') != len(latencies):
+            failures.append(f"expected {len(latencies)} idle decodes, got {decoded.count('idle.gif')}")
+
+        # 2. burst of writes within one debounce interval
+        replaced.clear()
+        for i in range(5):
+            write_file(idle_path, variants[i % 2], atomic=True)
+            run_for(0.01)
+        wait_until(lambda: replaced, timeout=5.0)
+        run_for(args.debounce * 2 / 1000)
+        print(f"burst of 5 writes -> {len(replaced)} reload(s)")
+        if len(replaced) != 1:
+            failures.append(f"burst caused {len(replaced)} reloads")
+
+        # 3. an animation added and removed: the behavior follows the sprite set
+        behavior = window.behavior
+        original = behavior.machine
+        walk = original.state_index('walk')
+        walk_path = os.path.join(species_dir, 'walk.gif')
+        shutil.copy(idle_path, walk_path)
+        wait_until(lambda: behavior.machine is not original and 'walk' in window.animations)
+        added = walk in behavior.machine.next_targets[behavior.machine.initial]
+        os.remove(walk_path)
+        wait_until(lambda: behavior.machine is original)
+        removed = walk not in behavior.machine.next_targets[behavior.machine.initial]
+        print(f"walk.gif added -> walk scheduled: {added}, removed -> walk dropped: {removed}")
+        if not added or not removed:
+            failures.append("behavior did not follow the added/removed walk animation")
+
+        # 4. sprite pack added, then re-packed with only click changed
+        loader = store.loader(SPECIES)
+        animations = []
+        for name in ('idle', 'click'):
+            images, delays, loop_count = resource_loader.decode_animation(
+                os.path.join(species_dir, f'{name}.gif'), config.WINDOW_SIZE)
+            animations.append((name, images, delays, loop_count))
+
+        pack_path = pack_path_for(species_dir)
+        replaced.clear()
+        decoded.clear()
+        write_pack(pack_path, animations)
+        wait_until(lambda: len(replaced) >= 2)
+        print(f"pack added -> reloaded {sorted(replaced)} (decodes: {len(decoded)})")
+        if loader.pack is None or decoded:
+            failures.append("pack was not used for reloading")
+
+        replaced.clear()
+        name, images, delays, loop_count = animations[1]
+        animations[1] = (name, images, [d + 10 for d in delays], loop_count)
+        write_pack(pack_path, animations)
+        start = time.perf_counter()
+        wait_until(lambda: replaced)
+        elapsed = (time.perf_counter() - start) * 1000
+        run_for(args.debounce * 2 / 1000)
+        print(f"click re-packed -> reloaded {replaced} in {elapsed:.1f}ms")
+        if replaced != ['click']:
+            failures.append(f"re-pack reloaded {replaced}, expected ['click']")
+
+        # 5. the live pack cannot be replaced: the packer writes <species>.pack.1
+        replaced.clear()
+        name, images, delays, loop_count = animations[0]
+        animations[0] = (name, images, [d + 10 for d in delays], loop_count)
+        original_replace = refuse_replacing(pack_path)
+        try:
+            write_pack(pack_path, animations)
+            wait_until(lambda: replaced)
+            run_for(args.debounce * 2 / 1000)
+        finally:
+            os.replace = original_replace
+        opened = loader.pack.path.name if loader.pack is not None else None
+        print(f"idle re-packed while in use -> reloaded {replaced} from {opened}")
+        if replaced != ['idle'] or opened != f'{SPECIES}.pack.1':
+            failures.append(f"versioned re-pack reloaded {replaced} from {opened}, "
+                            f"expected ['idle'] from {SPECIES}.pack.1")
+
+        watcher.stop()
+        window.close()
+        store.shutdown()
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    if failures:
+        print()
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("\nOK: only changed animations were reloaded")
+
+
+if __name__ == '__main__':
+    main()
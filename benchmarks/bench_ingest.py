@@ -0,0 +1,148 @@
+"""
+Sprite ingestion benchmark: serial vs process pool, plus incremental rebuilds
+
+Builds a synthetic raw tree of PETS species (a 256px idle GIF with 0 ms and
+10 ms frame delays, a 256px click GIF, a 96px PNG walk sheet) and one species with a
+corrupt file, then:
+  1. ingests everything with 1 worker and with one worker per core
+  2. runs again: every species must be skipped by hash
+  3. touches one source file's content: only that species is rebuilt
+
+Also checks the outputs: frames fit the target size, delays are normalized,
+the sheet was split into frames, and the corrupt species is reported.
+
+Usage:
+    python benchmarks/bench_ingest.py [pets]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from PIL import Image, ImageDraw
+
+from generate_placeholder import generate_sprite_set
+from src.core.log import set_level
+from src.core.sprite_index import parse_gif
+from src.core.sprite_ingest import ingest_tree
+
+SIZE = (128, 128)
+
+
+def make_raw_tree(root, pets):
+    with open(os.devnull, 'w') as devnull:
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            template = Path(generate_sprite_set(str(root / '_template'), (256, 256), 16, 12))
+        finally:
+            sys.stdout = stdout
+
+    # Replace the idle with distinct frames carrying the delays raw GIFs often have (0 and 10 ms)
+    frames = []
+    for i in range(16):
+        frame = Image.new('RGBA', (256, 256), (0, 0, 0, 0))
+        ImageDraw.Draw(frame).ellipse([20 + i * 8, 60, 120 + i * 8, 160], fill=(100, 149, 237, 255))
+        frames.append(frame)
+    frames[0].save(template / 'idle.gif', save_all=True, append_images=frames[1:],
+                   duration=[0, 10] * 8, loop=0, disposal=2)
+
+    sheet = Image.new('RGBA', (96 * 8, 96), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(sheet)
+    for i in range(8):
+        draw.ellipse([i * 96 + 10 + i * 2, 20, i * 96 + 70 + i * 2, 80], fill=(240, 200, 40, 255))
+    sheet.save(template / 'walk.png')
+
+    for n in range(pets):
+        pet_dir = root / f'pet{n:03d}'
+        shutil.copytree(template, pet_dir)
+    shutil.rmtree(template)
+
+    broken = root / 'broken'
+    broken.mkdir()
+    (broken / 'idle.gif').write_bytes(b'GIF89a not really')
+    return root
+
+
+def run(source, output, jobs):
+    start = time.perf_counter()
+    results = ingest_tree(source, output, size=SIZE, jobs=jobs)
+    return time.perf_counter() - start, {r['species']: r for r in results}
+
+
+def main():
+    pets = int(sys.argv[1]) if len(sys.argv) > 1 else 24
+    set_level('ERROR')
+    cores = os.cpu_count() or 1
+    temp = Path(tempfile.mkdtemp(prefix='pet_ingest_'))
+    failures = 0
+    try:
+        source = make_raw_tree(temp / 'raw', pets)
+
+        print(f"Ingesting {pets} pets (+1 broken) to {SIZE[0]}x{SIZE[1]} on {cores} core(s)")
+        timings = {}
+        for jobs in sorted({1, cores}):
+            output = temp / f'out{jobs}'
+            wall, results = run(source, output, jobs)
+            built = [r for r in results.values() if r['status'] == 'built']
+            frames = sum(r['frames'] for r in built)
+            timings[jobs] = wall
+            print(f"  jobs={jobs:<3} {wall:6.2f}s  {len(built) / wall:6.1f} pets/s  {frames / wall:7.0f} frames/s")
+            if len(built) != pets or results['broken']['status'] != 'failed':
+                print(f"  FAIL expected {pets} built and 'broken' failed")
+                failures += 1
+        if cores > 1:
+            print(f"  speedup with {cores} workers: {timings[1] / timings[cores]:.2f}x")
+        else:
+            print("  (single core: no parallel speedup to measure here)")
+
+        # Output checks
+        pet = temp / f'out{cores}' / 'pet000'
+        idle = parse_gif(pet / 'idle.gif')
+        walk = parse_gif(pet / 'walk.gif')
+        print(f"  pet000: idle {idle.frame_count} frames {idle.width}x{idle.height}, "
+              f"delays {sorted(set(idle.delays))}; walk {walk.frame_count} frames {walk.width}x{walk.height}")
+        if idle.width > SIZE[0] or idle.height > SIZE[1] or set(idle.delays) != {100}:
+            print("  FAIL idle not fitted or delays not normalized")
+            failures += 1
+        if walk.frame_count != 8:
+            print("  FAIL walk sheet was not split into 8 frames")
+            failures += 1
+
+        # Incremental: nothing changed
+        output = temp / f'out{cores}'
+        wall, results = run(source, output, cores)
+        skipped = sum(r['status'] == 'skipped' for r in results.values())
+        print(f"  unchanged rerun: {wall:.2f}s, {skipped}/{pets} skipped")
+        if skipped != pets:
+            print("  FAIL unchanged pets were rebuilt")
+            failures += 1
+
+        # Incremental: one input changed
+        with Image.open(source / 'pet001' / 'walk.png') as sheet:
+            sheet = sheet.convert('RGBA')
+        sheet.putpixel((0, 0), (255, 0, 0, 255))
+        sheet.save(source / 'pet001' / 'walk.png')
+        wall, results = run(source, output, cores)
+        rebuilt = sorted(name for name, r in results.items() if r['status'] == 'built')
+        print(f"  one file changed: {wall:.2f}s, rebuilt {rebuilt}")
+        if rebuilt != ['pet001']:
+            print("  FAIL expected only pet001 to be rebuilt")
+            failures += 1
+    finally:
+        shutil.rmtree(temp, ignore_errors=True)
+
+    if failures:
+        print(f"\n{failures} check(s) failed")
+        sys.exit(1)
+    print("\nAll checks passed")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,234 @@
+"""
+HiDPI mipmap benchmark: per-screen resolution levels vs scaling at paint time
+
+  1. level selection for common device pixel ratios
+  2. cost of building each level lazily (decode + scale, then memory-cache hit)
+  3. paint cost on a 2x surface: drawing the 1x frame scaled up on every
+     paint (what an unaware window ends up doing) vs the prebuilt 2x level
+  4. a pet window that moves to a 2x screen: the level switches, playback
+     keeps its frame index and clicks still hit the same logical pixels
+  5. a child process started with QT_SCALE_FACTOR=2 picks the 2x level on
+     its own
+
+Exits 1 when any check fails.
+
+Usage:
+    python benchmarks/bench_mipmap.py [paint_rounds]
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QEvent, QEventLoop, QPoint, QRect, Qt
+from PySide6.QtGui import QImage, QPainter
+
+from src.config import config
+from src.core.frame_store import FrameStore
+from src.core.log import set_level
+from src.core.memory_cache import MemoryCache
+from src.core.resource_loader import ResourceLoader, mipmap_scale
+
+EXPECTED_LEVELS = {1.0: 1.0, 1.25: 1.5, 1.5: 1.5, 1.75: 2.0, 2.0: 2.0, 2.5: 3.0, 3.0: 3.0, 4.0: 3.0}
+
+
+def wait_until(predicate, timeout=10.0):
+    app = QApplication.instance()
+    start = time.perf_counter()
+    while not predicate():
+        if time.perf_counter() - start > timeout:
+            return False
+        app.processEvents(QEventLoop.ProcessEventsFlag.AllEvents, 5)
+    return True
+
+
+def check_levels():
+    failures = 0
+    print("[levels]")
+    for ratio, expected in EXPECTED_LEVELS.items():
+        level = mipmap_scale(ratio, config.MIPMAP_SCALES)
+        status = 'ok' if level == expected else f'FAIL (expected {expected})'
+        print(f"  dpr {ratio:<5} -> {level}x  {status}")
+        failures += level != expected
+    return failures
+
+
+def bench_build(loader, size):
+    print("[build] idle.gif, decode + scale per level, then cache hit")
+    frame_sets = {}
+    for scale in config.MIPMAP_SCALES:
+        start = time.perf_counter()
+        frame_set = loader.load_frames('idle.gif', size, scale)
+        built = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        again = loader.load_frames('idle.gif', size, scale)
+        cached = (time.perf_counter() - start) * 1000
+        frame = frame_set.frame(0)
+        logical = frame.deviceIndependentSize().toSize()
+        print(f"  {scale}x  {frame.width()}x{frame.height()} px "
+              f"(logical {logical.width()}x{logical.height()})  "
+              f"build {built:7.2f} ms  cached {cached:.3f} ms  {frame_set.nbytes / 1024:7.1f} KB")
+        frame_sets[scale] = frame_set
+        if again is not frame_set:
+            print("  FAIL level was not served from the memory cache")
+            return frame_sets, 1
+    return frame_sets, 0
+
+
+def bench_paint(frame_sets, size, rounds):
+    print(f"[paint] {rounds} frames onto a {size[0]}x{size[1]} window at 2x")
+    target = QImage(size[0] * 2, size[1] * 2, QImage.Format.Format_ARGB32_Premultiplied)
+    target.setDevicePixelRatio(2.0)
+    rect = QRect(0, 0, *size)
+
+    def paint(frame_set, smooth):
+        painter = QPainter(target)
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, smooth)
+        frames = frame_set.frames
+        start = time.perf_counter()
+        for i in range(rounds):
+            target.fill(Qt.GlobalColor.transparent)
+            pixmap = frames[i % len(frames)]
+            logical = pixmap.deviceIndependentSize().toSize()
+            painter.drawPixmap(QRect(QPoint(0, 0), logical.scaled(rect.size(), Qt.AspectRatioMode.KeepAspectRatio)), pixmap)
+        painter.end()
+        return (time.perf_counter() - start) / rounds * 1e6
+
+    upscaled = paint(frame_sets[1.0], True)
+    native = paint(frame_sets[2.0], False)
+    print(f"  1x frame scaled at paint time  {upscaled:8.1f} us/frame (and blurry)")
+    print(f"  2x level, 1:1 blit             {native:8.1f} us/frame ({upscaled / native:.1f}x faster)")
+    return 0
+
+
+def check_window_switch():
+    from src.ui.pet_window import PetWindow
+
+    print("[switch] pet window dragged to a 2x screen")
+    store = FrameStore(disk_cache=None, memory_cache=MemoryCache(config.MEMORY_CACHE_BUDGET))
+    window = PetWindow('pikachu', frame_store=store, position=(100, 100), persist_position=False)
+    window.show()
+    failures = 0
+    if not wait_until(lambda: window.current_animation is not None):
+        print("  FAIL idle animation never started")
+        return 1
+    window.behavior.stop()
+    start_scale = window.mipmap_scale
+
+    # A screen change is reported by Qt; fake the new screen's ratio and send the event
+    window.devicePixelRatioF = lambda: 2.0
+    index = window.player.current_index
+    window.player.stop()  # freeze the frame so the preserved index can be checked
+    start = time.perf_counter()
+    QApplication.sendEvent(window, QEvent(QEvent.Type.DevicePixelRatioChange))
+    switched = wait_until(lambda: window.player.frame_set.scale == 2.0)
+    elapsed = (time.perf_counter() - start) * 1000
+    if not switched:
+        print("  FAIL frames never switched to the 2x level")
+        failures += 1
+    else:
+        pixmap = window.player.current_frame()
+        print(f"  {start_scale}x -> {window.mipmap_scale}x in {elapsed:.1f} ms, "
+              f"shown frame {pixmap.width()}x{pixmap.height()} px at dpr {pixmap.devicePixelRatio()}")
+        if window.player.current_index != index:
+            print(f"  FAIL frame index changed {index} -> {window.player.current_index}")
+            failures += 1
+        if pixmap.devicePixelRatio() != 2.0:
+            print("  FAIL label shows a frame without the 2x ratio")
+            failures += 1
+        if window.canvas.frame_size() != window.animations['idle'].frame_size():
+            print("  FAIL logical frame size changed with the level")
+            failures += 1
+
+        # Hit test at 2x agrees with the 1x mask in logical coordinates
+        low = store.loader('pikachu').load_frames(
+            window.resource_loader.get_animation_path(window.current_animation),
+            (window.canvas.width(), window.canvas.height()))
+        low_mask = low.mask(window.player.current_index)
+        dx, dy = window.frame_offset()
+        disagree = total = 0
+        if low_mask is not None:
+            for y in range(0, window.height(), 4):
+                for x in range(0, window.width(), 4):
+                    total += 1
+                    expected = low_mask.contains(x - dx, y - dy)
+                    disagree += window.hit_test(QPoint(x, y)) != expected
+            print(f"  hit test 2x vs 1x: {disagree}/{total} sample points differ (edge pixels)")
+            if disagree > total * 0.05:
+                print("  FAIL hit test no longer matches the sprite")
+                failures += 1
+
+    held = [key for key in store._sets if key[3] == 1.0]
+    if held:
+        print(f"  FAIL 1x frame sets still referenced: {held}")
+        failures += 1
+
+    window.close()
+    window.deleteLater()
+    store.shutdown()
+    return failures
+
+
+def child_main():
+    set_level('WARNING')
+    QApplication.instance() or QApplication(sys.argv)
+    from src.ui.pet_window import PetWindow
+
+    store = FrameStore(disk_cache=None, memory_cache=MemoryCache(config.MEMORY_CACHE_BUDGET))
+    window = PetWindow('pikachu', frame_store=store, position=(100, 100), persist_position=False)
+    window.show()
+    wait_until(lambda: window.current_animation is not None)
+    print(f"{window.devicePixelRatioF()} {window.mipmap_scale} {window.player.frame_set.scale}")
+    window.close()
+    store.shutdown()
+
+
+def check_child():
+    print("[screen] child process with QT_SCALE_FACTOR=2")
+    env = dict(os.environ, QT_SCALE_FACTOR='2')
+    proc = subprocess.run([sys.executable, os.path.abspath(__file__), '--child'],
+                          capture_output=True, text=True, env=env, timeout=60)
+    line = proc.stdout.strip().splitlines()[-1] if proc.stdout.strip() else ''
+    print(f"  dpr, level, playing level: {line or proc.stderr.strip()[-200:]}")
+    if line.split() != ['2.0', '2.0', '2.0']:
+        print("  FAIL window did not pick the 2x level")
+        return 1
+    return 0
+
+
+def main():
+    if '--child' in sys.argv:
+        child_main()
+        return
+
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    set_level('WARNING')
+    QApplication.instance() or QApplication(sys.argv)
+    config.save_config = lambda **kwargs: None
+
+    size = config.WINDOW_SIZE
+    loader = ResourceLoader(config.SPRITES_DIR / 'pikachu', disk_cache=None, use_pack=False)
+
+    failures = check_levels()
+    frame_sets, failed = bench_build(loader, size)
+    failures += failed
+    failures += bench_paint(frame_sets, size, rounds)
+    failures += check_window_switch()
+    failures += check_child()
+
+    if failures:
+        print(f"\n{failures} check(s) failed")
+        sys.exit(1)
+    print("\nAll checks passed")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Movement benchmark: walking pets, drag coalescing and idle shutdown
+
+  1. N pets walk along the bottom of the screen; reports window moves per
+     second, scheduler ticks per second and CPU usage
+  2. a drag fed with 1000 Hz synthetic mouse moves; reports how many of them
+     turned into actual window moves (at most one per display frame)
+  3. after everything stops, checks that the movement callback is removed
+
+Usage:
+    python benchmarks/bench_movement.py [seconds] [N]
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import psutil
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QEventLoop, QPoint, QTimer
+
+from src.config import config
+from src.core.animation_scheduler import shared_scheduler
+from src.core.movement import shared_movement
+from src.ui.pet_manager import PetManager
+
+
+def run_for(seconds):
+    loop = QEventLoop()
+    QTimer.singleShot(int(seconds * 1000), loop.quit)
+    loop.exec()
+
+
+def wait_until(predicate, timeout=30.0):
+    deadline = time.perf_counter() + timeout
+    while not predicate() and time.perf_counter() < deadline:
+        run_for(0.02)
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    QApplication.instance() or QApplication(sys.argv)
+    config.save_config = lambda **kwargs: None  # keep the user's config untouched
+    process = psutil.Process()
+    scheduler = shared_scheduler()
+    movement = shared_movement()
+
+    manager = PetManager()
+    for i in range(count):
+        manager.spawn(position=(20 + (i * 37) % 600, 0), persist_position=False)
+    wait_until(lambda: movement.active_count() == 0)  # everyone has landed
+
+    # 1. walking
+    for i, window in enumerate(manager.pets):
+        window.behavior.stop()  # keep the state machine from stopping the walk
+        movement.walk(window, 1 if i % 2 else -1)
+    moves, ticks = movement.moves, scheduler.ticks
+    cpu_before = process.cpu_times()
+    start = time.perf_counter()
+    run_for(seconds)
+    wall = time.perf_counter() - start
+    cpu_after = process.cpu_times()
+    cpu = (cpu_after.user - cpu_before.user + cpu_after.system - cpu_before.system) / wall * 100
+
+    print("=" * 64)
+    print(f"  Movement ({count} pets, {seconds:.0f}s)")
+    print("=" * 64)
+    print(f"walking: {(movement.moves - moves) / wall:7.0f} moves/s "
+          f"({(movement.moves - moves) / wall / count:.1f} per pet), "
+          f"{(scheduler.ticks - ticks) / wall:5.1f} ticks/s, CPU {cpu:5.1f}%")
+
+    for window in manager.pets:
+        movement.stop_walking(window)
+    run_for(0.1)
+
+    # 2. drag with a 1000 Hz mouse
+    window = manager.pets[0]
+    requests, moves = movement.move_requests, movement.moves
+    movement.begin_drag(window)
+    start = time.perf_counter()
+    i = 0
+    while time.perf_counter() - start < 1.0:
+        movement.drag_to(window, QPoint(100 + i % 300, 100))
+        i += 1
+        run_for(0.001)
+    movement.end_drag(window)
+    requests = movement.move_requests - requests
+    moves = movement.moves - moves
+    print(f"drag:    {requests} mouse moves -> {moves} window moves in 1s "
+          f"({requests / max(moves, 1):.1f}x coalesced)")
+
+    # 3. idle shutdown
+    wait_until(lambda: movement.active_count() == 0)
+    callbacks = scheduler.stats()['callbacks']
+    print(f"idle:    movement callback registered: {bool(callbacks)}")
+
+    manager.close_all()
+    if callbacks:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
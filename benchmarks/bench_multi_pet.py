@@ -0,0 +1,115 @@
+"""
+Stress benchmark: many pets in one process
+
+Spawns N pets through PetManager (shared FrameStore and AnimationScheduler),
+then reports resident memory, CPU usage and frame timing jitter.
+
+Usage:
+    python benchmarks/bench_multi_pet.py [seconds] [N ...]
+"""
+
+import os
+import sys
+import statistics
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import psutil
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QEventLoop, QTimer
+
+from src.core.animation_scheduler import shared_scheduler
+from src.ui.pet_manager import PetManager
+
+JITTER_SAMPLE = 20  # pets whose frame intervals are recorded
+
+
+def run_for(seconds):
+    loop = QEventLoop()
+    QTimer.singleShot(int(seconds * 1000), loop.quit)
+    loop.exec()
+
+
+def wait_until(predicate, timeout=30.0):
+    deadline = time.perf_counter() + timeout
+    while not predicate() and time.perf_counter() < deadline:
+        run_for(0.02)
+
+
+def record_intervals(window, samples):
+    """Record (actual interval - expected delay) for each frame change"""
+    state = {'last': None, 'delay': None}
+
+    def on_frame(index):
+        now = time.perf_counter() * 1000
+        if state['last'] is not None and index != 0:
+            samples.append(now - state['last'] - state['delay'])
+        state['last'] = now
+        state['delay'] = window.player.frame_set.delays[index]
+
+    window.player.frameChanged.connect(on_frame)
+
+
+def bench(count, seconds, process):
+    manager = PetManager()
+    rss_before = process.memory_info().rss
+
+    start = time.perf_counter()
+    for i in range(count):
+        manager.spawn(position=(40 * (i % 20), 40 * (i // 20)), persist_position=False)
+    spawn_time = time.perf_counter() - start
+
+    wait_until(lambda: all('idle' in p.animations for p in manager.pets))
+    ready_time = time.perf_counter() - start
+
+    samples = []
+    for window in manager.pets[:JITTER_SAMPLE]:
+        record_intervals(window, samples)
+
+    ticks_before = shared_scheduler().ticks
+    cpu_before = process.cpu_times()
+    wall_start = time.perf_counter()
+    run_for(seconds)
+    wall = time.perf_counter() - wall_start
+    cpu_after = process.cpu_times()
+    ticks = shared_scheduler().ticks - ticks_before
+
+    cpu = (cpu_after.user - cpu_before.user) + (cpu_after.system - cpu_before.system)
+    rss = process.memory_info().rss
+    store = manager.frame_store.stats()
+
+    jitter = sorted(abs(s) for s in samples)
+    p95 = jitter[int(len(jitter) * 0.95)] if jitter else 0.0
+    mean = statistics.fmean(jitter) if jitter else 0.0
+
+    print(f"{count:>5} pets | spawn {spawn_time * 1000:7.0f}ms ready {ready_time * 1000:7.0f}ms | "
+          f"RSS +{(rss - rss_before) / 2**20:6.1f}MB (frames {store['bytes'] / 2**20:5.1f}MB, "
+          f"{store['frame_sets']} sets) | CPU {cpu / wall * 100:5.1f}% | "
+          f"clock ticks/s {ticks / wall:6.1f} | jitter mean {mean:5.2f}ms p95 {p95:5.2f}ms")
+
+    manager.close_all()
+    run_for(0.1)
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    counts = [int(n) for n in sys.argv[2:]] or [50, 100, 200]
+
+    QApplication.instance() or QApplication(sys.argv)
+    process = psutil.Process()
+
+    print("=" * 72)
+    print(f"  Multi-pet stress benchmark ({seconds:.1f}s steady state per run)")
+    print("=" * 72)
+
+    for count in counts:
+        bench(count, seconds, process)
+
+
+if __name__ == '__main__':
+    main()
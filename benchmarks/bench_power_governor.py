@@ -0,0 +1,243 @@
+"""
+Power governor check: policies driven by simulated samples and a fake clock
+
+Feeds scripted PowerSamples through PowerGovernor.on_sample() with an injected
+clock and a real AnimationScheduler, and checks that:
+  1. high CPU load and running on battery reduce the frame rate
+  2. low battery, hidden windows and long system idle time freeze the
+     scheduler (paused), which resumes when the condition clears
+  3. interacting with a pet restores the full policy at the original full_fps
+     for the interaction grace period, even while the last sample reports the
+     system as idle, under high load or at low battery; the underlying policy
+     comes back once the grace period is over
+  4. samples without idle information never trigger the idle policies
+  5. stats() accounts the time and ticks spent in each policy and the ticks
+     saved against the full-rate tick rate
+  6. samples taken on the real background thread reach the GUI thread
+
+Ticks are simulated by advancing scheduler.ticks at the current frame-rate cap
+(none while paused), so the numbers are deterministic.
+
+Exits 1 when any check fails.
+
+Usage:
+    python benchmarks/bench_power_governor.py
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from PySide6.QtCore import QCoreApplication, QEventLoop, QTimer
+
+from src.config import config
+from src.core.animation_scheduler import AnimationScheduler
+from src.core.log import set_level
+from src.core.power_governor import (POLICY_FROZEN, POLICY_FULL, POLICY_REDUCED, PowerGovernor,
+                                     PowerSample)
+
+FULL_FPS = 60
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeWindow:
+    """Just enough of a QWidget for any_window_visible()"""
+
+    def __init__(self):
+        self.visible = True
+
+    def isVisible(self):
+        return self.visible
+
+    def isMinimized(self):
+        return False
+
+    def windowHandle(self):
+        return None
+
+
+class FakeSource:
+    def __init__(self, sample):
+        self.sample_value = sample
+        self.calls = 0
+
+    def sample(self):
+        self.calls += 1
+        return self.sample_value
+
+
+class Harness:
+    def __init__(self):
+        self.clock = FakeClock()
+        self.scheduler = AnimationScheduler(max_fps=FULL_FPS)
+        self.governor = PowerGovernor(self.scheduler, interval=3600, clock=self.clock)
+        self.window = FakeWindow()
+        self.governor.add_window(self.window)
+        self.failures = 0
+
+    def advance(self, seconds):
+        """Let time pass; the scheduler ticks at its cap unless paused"""
+        if not self.scheduler.paused:
+            self.scheduler.ticks += int(round(self.scheduler.max_fps * seconds))
+        self.clock.now += seconds
+
+    def expect(self, label, policy, reason=None, fps=None):
+        governor, scheduler = self.governor, self.scheduler
+        ok = governor.policy == policy and (reason is None or governor.reason == reason)
+        ok = ok and scheduler.paused == (policy == POLICY_FROZEN)
+        if fps is not None and policy != POLICY_FROZEN:
+            ok = ok and scheduler.max_fps == fps
+        state = 'paused' if scheduler.paused else f'{scheduler.max_fps} fps'
+        print(f"  {label:<40} {governor.policy:<8} ({governor.reason}, scheduler {state})")
+        if not ok:
+            print(f"  FAIL {label}: expected {policy} ({reason}), fps {fps}")
+            self.failures += 1
+
+
+def check_policies():
+    print("[policies] scripted samples")
+    h = Harness()
+    g = h.governor
+    reduced = config.POWER_REDUCED_FPS
+
+    g.on_sample(PowerSample(10.0, idle_seconds=0.0))
+    h.expect("quiet system", POLICY_FULL, 'normal', FULL_FPS)
+    h.advance(10)
+
+    g.on_sample(PowerSample(config.POWER_HIGH_CPU + 5, idle_seconds=0.0))
+    h.expect("high load", POLICY_REDUCED, 'high load', reduced)
+    h.advance(10)
+
+    g.on_sample(PowerSample(10.0, battery_percent=70, on_battery=True, idle_seconds=0.0))
+    h.expect("on battery", POLICY_REDUCED, 'on battery', reduced)
+    h.advance(10)
+
+    g.on_sample(PowerSample(10.0, battery_percent=config.POWER_LOW_BATTERY - 5, on_battery=True,
+                            idle_seconds=0.0))
+    h.expect("low battery", POLICY_FROZEN, 'low battery')
+    h.advance(10)
+
+    g.on_sample(PowerSample(10.0, battery_percent=90, on_battery=False, idle_seconds=0.0))
+    h.expect("plugged in again", POLICY_FULL, 'normal', FULL_FPS)
+    h.advance(10)
+
+    h.window.visible = False
+    g.evaluate()
+    h.expect("all windows hidden", POLICY_FROZEN, 'hidden')
+    h.advance(10)
+    h.window.visible = True
+    g.evaluate()
+    h.expect("window shown again", POLICY_FULL, 'normal', FULL_FPS)
+
+    g.on_sample(PowerSample(10.0, idle_seconds=config.POWER_IDLE_REDUCE + 1))
+    h.expect("system idle", POLICY_REDUCED, 'idle', reduced)
+    h.advance(config.POWER_IDLE_FREEZE)
+    g.evaluate()
+    h.expect("system idle, extrapolated past freeze", POLICY_FROZEN, 'idle')
+
+    g.notify_interaction()
+    h.expect("pet clicked (stale idle sample)", POLICY_FULL, 'interaction', FULL_FPS)
+    h.advance(10)
+
+    g.on_sample(PowerSample(10.0))
+    h.advance(config.POWER_IDLE_FREEZE * 2)
+    g.evaluate()
+    h.expect("no idle information, long time", POLICY_FULL, 'normal', FULL_FPS)
+
+    grace = config.POWER_INTERACTION_GRACE
+    g.on_sample(PowerSample(config.POWER_HIGH_CPU + 5))
+    h.expect("high load again", POLICY_REDUCED, 'high load', reduced)
+    g.notify_interaction()
+    h.expect("pet clicked under high load", POLICY_FULL, 'interaction', FULL_FPS)
+    h.advance(grace / 2)
+    g.on_sample(PowerSample(10.0, battery_percent=config.POWER_LOW_BATTERY - 5, on_battery=True))
+    h.expect("low battery within grace period", POLICY_FULL, 'interaction', FULL_FPS)
+    h.advance(grace / 2)
+    g.evaluate()
+    h.expect("grace period over", POLICY_FROZEN, 'low battery')
+    return h
+
+
+def check_stats(h):
+    stats = h.governor.stats()
+    seconds, ticks = stats['seconds'], stats['ticks']
+    # Full: 10 + 10 + 10 + 1200 (no idle info) + grace period under load/low battery;
+    # reduced: 10 + 10 + 600 (system idle until the freeze threshold);
+    # frozen: 10 (low battery) + 10 (hidden)
+    freeze = config.POWER_IDLE_FREEZE
+    grace = config.POWER_INTERACTION_GRACE
+    expected_seconds = {POLICY_FULL: 30.0 + 2 * freeze + grace, POLICY_REDUCED: 20.0 + freeze,
+                        POLICY_FROZEN: 20.0}
+    expected_ticks = {POLICY_FULL: int(expected_seconds[POLICY_FULL]) * FULL_FPS,
+                      POLICY_REDUCED: int(expected_seconds[POLICY_REDUCED]) * config.POWER_REDUCED_FPS,
+                      POLICY_FROZEN: 0}
+    saved = (FULL_FPS * (expected_seconds[POLICY_REDUCED] + expected_seconds[POLICY_FROZEN])
+             - expected_ticks[POLICY_REDUCED])
+    print(f"[stats] seconds {seconds}, ticks {ticks}, ticks saved {stats['ticks_saved']:.0f}")
+    failures = 0
+    if any(abs(seconds[p] - expected_seconds[p]) > 1e-6 for p in expected_seconds):
+        print(f"  FAIL time per policy, expected {expected_seconds}")
+        failures += 1
+    if ticks != expected_ticks:
+        print(f"  FAIL ticks per policy, expected {expected_ticks}")
+        failures += 1
+    if stats['full_tick_rate'] != FULL_FPS or abs(stats['ticks_saved'] - saved) > 1e-6:
+        print(f"  FAIL ticks saved, expected {saved} at {FULL_FPS} ticks/s")
+        failures += 1
+    if stats['policy'] != h.governor.policy or stats['reason'] != h.governor.reason:
+        print("  FAIL current policy not reported")
+        failures += 1
+    return failures
+
+
+def check_thread():
+    scheduler = AnimationScheduler(max_fps=FULL_FPS)
+    source = FakeSource(PowerSample(config.POWER_HIGH_CPU + 5))
+    governor = PowerGovernor(scheduler, source=source, interval=0.02)
+    governor.start()
+    loop = QEventLoop()
+    deadline = time.perf_counter() + 5
+    while governor.last_sample is None and time.perf_counter() < deadline:
+        QTimer.singleShot(20, loop.quit)
+        loop.exec()
+    reduced = governor.policy == POLICY_REDUCED
+    governor.stop()
+    restored = governor.policy == POLICY_FULL and scheduler.max_fps == FULL_FPS
+    print(f"[thread] {source.calls} background sample(s), reduced: {reduced}, "
+          f"full after stop: {restored}")
+    if not reduced or not restored:
+        print("  FAIL background samples not applied on the GUI thread")
+        return 1
+    return 0
+
+
+def main():
+    set_level('WARNING')
+    QCoreApplication.instance() or QCoreApplication(sys.argv)
+
+    harness = check_policies()
+    failures = harness.failures
+    failures += check_stats(harness)
+    failures += check_thread()
+
+    if failures:
+        print(f"\n{failures} check(s) failed")
+        sys.exit(1)
+    print("\nAll checks passed")
+
+
+if __name__ == '__main__':
+    main()
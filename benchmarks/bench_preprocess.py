@@ -0,0 +1,171 @@
+"""
+Sprite preprocessing benchmark: per-frame Qt scaling vs the NumPy batch pipeline
+
+For every animation (the bundled pikachu sprites plus a generated 256px set)
+the frames are decoded once, then scaled to several target sizes:
+  - qt:    scale_image() + convertToFormat(FRAME_FORMAT) frame by frame
+  - numpy: preprocess.preprocess_images() on the whole animation at once
+
+Reports frames/s for both paths and the mean absolute difference of the
+premultiplied pixels against the Qt result, then the effect of border
+trimming and of shared-palette quantization (error and zlib size) on the
+first pikachu animation.
+
+Exits 1 when the batch output differs in size from the Qt output, when the
+mean difference exceeds MAX_MEAN_DIFF levels, or when a quantized frame is
+not a valid premultiplied pixel (colour above alpha).
+
+Usage:
+    python benchmarks/bench_preprocess.py [rounds]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zlib
+from pathlib import Path
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from PySide6.QtWidgets import QApplication
+from PySide6.QtGui import QImageReader
+
+from generate_placeholder import generate_sprite_set
+from src.config import config
+from src.core import preprocess
+from src.core.log import set_level
+from src.core.resource_loader import scale_image
+from src.core.sprite_cache import FRAME_FORMAT
+
+SIZES = [(64, 64), (128, 128), (256, 256)]
+MAX_MEAN_DIFF = 4.0  # 8-bit levels; the filters differ a little at large reduction ratios
+PALETTE_COLORS = 64
+
+
+def read_frames(path):
+    reader = QImageReader(str(path))
+    images = []
+    while reader.canRead():
+        image = reader.read()
+        if image.isNull():
+            break
+        images.append(image)
+    return images
+
+
+def best_ms(func, rounds):
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best, result
+
+
+def qt_path(images, sizes):
+    return {size: [scale_image(image, size).convertToFormat(FRAME_FORMAT) for image in images]
+            for size in sizes}
+
+
+def numpy_path(images, sizes):
+    return preprocess.preprocess_images(images, sizes)[0]
+
+
+def main():
+    if not preprocess.HAS_NUMPY:
+        print("numpy is not installed; nothing to compare")
+        return
+
+    import numpy as np
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    set_level('WARNING')
+    QApplication.instance() or QApplication(sys.argv)
+
+    temp_dir = Path(tempfile.mkdtemp(prefix='pet_preprocess_'))
+    with open(os.devnull, 'w') as devnull:
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            generate_sprite_set(str(temp_dir), (256, 256), 32, 24)
+        finally:
+            sys.stdout = stdout
+
+    files = sorted((config.SPRITES_DIR / 'pikachu').glob('*.gif')) + sorted(temp_dir.glob('*.gif'))
+    failures = 0
+
+    print("=" * 78)
+    print(f"  Preprocessing: sizes {', '.join(f'{w}x{h}' for w, h in SIZES)}, best of {rounds}")
+    print("=" * 78)
+    print(f"  {'animation':<22}{'frames':>7}{'qt f/s':>10}{'numpy f/s':>11}{'speedup':>9}{'max diff':>10}")
+
+    totals = [0, 0.0, 0.0]
+    for path in files:
+        images = read_frames(path)
+        if not images:
+            continue
+        frames = len(images) * len(SIZES)
+        qt_ms, qt_out = best_ms(lambda: qt_path(images, SIZES), rounds)
+        np_ms, np_out = best_ms(lambda: numpy_path(images, SIZES), rounds)
+        totals[0] += frames
+        totals[1] += qt_ms
+        totals[2] += np_ms
+
+        worst = 0.0
+        for size in SIZES:
+            expected = preprocess.images_to_array(qt_out[size])
+            actual = preprocess.images_to_array(np_out[size])
+            if expected.shape != actual.shape:
+                print(f"  FAIL {path.name} {size}: {actual.shape} != {expected.shape}")
+                failures += 1
+                continue
+            worst = max(worst, float(np.abs(expected.astype(np.int16) - actual).mean()))
+        if worst > MAX_MEAN_DIFF:
+            failures += 1
+
+        name = f"{path.parent.name[:10]}/{path.name}"
+        print(f"  {name:<22}{len(images):>7}{frames / qt_ms * 1000:>10.0f}"
+              f"{frames / np_ms * 1000:>11.0f}{qt_ms / np_ms:>8.2f}x{worst:>10.2f}")
+
+    print(f"  {'total':<22}{totals[0]:>7}{totals[0] / totals[1] * 1000:>10.0f}"
+          f"{totals[0] / totals[2] * 1000:>11.0f}{totals[1] / totals[2]:>8.2f}x")
+
+    # Trimming and palette quantization on a real sprite at the window size
+    size = config.WINDOW_SIZE
+    images = read_frames(files[0])
+    pixels = preprocess.to_pixels(preprocess.resize(preprocess.images_to_array(images), size))
+    trimmed, offset = preprocess.trim(pixels)
+    print(f"\n  trim {pixels.shape[2]}x{pixels.shape[1]} -> {trimmed.shape[2]}x{trimmed.shape[1]}"
+          f" at {offset}: {trimmed.nbytes / pixels.nbytes:.0%} of the bytes")
+
+    quantize_ms, (indices, palette) = best_ms(lambda: preprocess.quantize(pixels, PALETTE_COLORS), rounds)
+    restored = preprocess.dequantize(indices, palette)
+    error = float(np.abs(restored.astype(np.int16) - pixels).mean())
+    invalid = int((restored[..., :3] > restored[..., 3:4]).sum())
+    raw = len(zlib.compress(pixels.tobytes(), 6))
+    packed = len(zlib.compress(restored.tobytes(), 6))
+    print(f"  quantize {len(images)} frames to {PALETTE_COLORS} colors: {quantize_ms:.1f}ms, "
+          f"mean error {error:.2f}, zlib {raw / 1024:.1f} KB -> {packed / 1024:.1f} KB")
+    if invalid:
+        print(f"  FAIL {invalid} quantized pixels have colour above alpha")
+        failures += 1
+
+    # Images built straight from the array must show the same pixels
+    image = preprocess.pixels_to_images(pixels[:1])[0]
+    if preprocess.images_to_array([image])[0].tobytes() != pixels[0].tobytes():
+        print("  FAIL QImage built from the array does not round-trip")
+        failures += 1
+
+    shutil.rmtree(temp_dir, ignore_errors=True)
+    if failures:
+        print(f"\n{failures} check(s) failed")
+        sys.exit(1)
+    print("\nAll checks passed")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark: Pillow frame seeking vs SpriteIndex block-header scan
+
+Generates large, many-frame GIFs in a temporary directory and measures the
+time needed to compute the total animation duration with each approach.
+
+Usage:
+    python benchmarks/bench_sprite_index.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from PIL import Image, ImageDraw
+
+from src.core.sprite_index import parse_gif, SpriteIndex
+
+# (width, height, frames)
+CASES = [
+    (128, 128, 8),
+    (512, 512, 120),
+    (1200, 675, 300),
+]
+
+
+def make_gif(path, width, height, frame_count):
+    """Generate a noisy animated GIF (noise keeps LZW from shrinking the file)"""
+    frames = []
+    for i in range(frame_count):
+        img = Image.effect_noise((width // 4, height // 4), 64 + i % 64)
+        img = img.resize((width, height), Image.NEAREST).convert('P')
+        draw = ImageDraw.Draw(img)
+        r = 10 + (i * 7) % (min(width, height) // 2)
+        draw.ellipse([width // 2 - r, height // 2 - r, width // 2 + r, height // 2 + r], fill=i % 255)
+        frames.append(img)
+
+    frames[0].save(path, save_all=True, append_images=frames[1:],
+                   duration=40, loop=0, disposal=2)
+
+
+def pillow_duration(path):
+    """The original PetWindow.get_gif_duration approach"""
+    img = Image.open(path)
+    total = 0
+    while True:
+        try:
+            total += img.info.get('duration', 100)
+            img.seek(img.tell() + 1)
+        except EOFError:
+            break
+    return total
+
+
+def best_of(func, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    print("=" * 72)
+    print("  GIF metadata benchmark: Pillow seek vs SpriteIndex")
+    print("=" * 72)
+    print(f"{'size':>10} {'frames':>7} {'file':>9} {'pillow':>10} {'index':>10} "
+          f"{'cached':>10} {'speedup':>8}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for width, height, frame_count in CASES:
+            name = f"bench_{width}x{height}_{frame_count}.gif"
+            path = os.path.join(tmp, name)
+            make_gif(path, width, height, frame_count)
+
+            pillow_time, pillow_total = best_of(lambda: pillow_duration(path))
+            index_time, info = best_of(lambda: parse_gif(path))
+
+            index = SpriteIndex(tmp)
+            index.get(name)
+            cached_time, _ = best_of(lambda: index.get(name), repeat=100)
+
+            assert info.total_duration == pillow_total, (info.total_duration, pillow_total)
+
+            size_kb = os.path.getsize(path) / 1024
+            print(f"{width:>4}x{height:<5} {frame_count:>7} {size_kb:>7.0f}KB "
+                  f"{pillow_time * 1000:>8.2f}ms {index_time * 1000:>8.2f}ms "
+                  f"{cached_time * 1e6:>8.1f}us {pillow_time / index_time:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
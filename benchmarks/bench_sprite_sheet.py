@@ -0,0 +1,337 @@
+"""
+Sprite sheet benchmark: one GIF per animation vs one PNG sheet + sheet.json
+
+Builds a synthetic species with ANIMATIONS animations of 8 frames on a
+256x256 canvas, stored twice:
+  loose  one GIF per animation (full-canvas frames, the current layout)
+  sheet  a single sheet.png with the frames trimmed to their opaque bounds
+         and packed tightly, plus a manifest of rectangles, offsets and delays
+
+Both are loaded at the window size at 1x and 2x. Reports the pixel memory held
+by the frame sets, the number of files opened and the paint cost per frame
+(whole pixmap vs sub-rectangle blit), and checks that the sheet renders the
+same pixels, hit masks and timings as the GIFs. Finally a pet window plays the
+sheet species and the sheet is hot-reloaded.
+
+Exits 1 when any check fails.
+
+Usage:
+    python benchmarks/bench_sprite_sheet.py [animations]
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from PIL import Image, ImageDraw
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QEventLoop, QPoint, Qt
+from PySide6.QtGui import QImage, QImageReader, QPainter
+
+import src.core.resource_loader as resource_loader
+import src.core.sprite_sheet as sprite_sheet
+from src.config import config
+from src.core.log import set_level
+from src.core.memory_cache import MemoryCache
+from src.core.resource_loader import ResourceLoader, SheetFrameSet
+from src.core.sprite_cache import FRAME_FORMAT
+
+CANVAS = 256
+FRAMES = 8
+COLORS = [(100, 149, 237), (240, 200, 40), (220, 80, 60), (90, 180, 90)]
+MAX_MEAN_DIFF = 2.0
+
+
+class FileCounter:
+    """Counts image files opened through QImageReader/QImage and Python open()"""
+
+    def __init__(self):
+        self.paths = []
+        counter = self
+
+        class Reader(QImageReader):
+            def __init__(self, *args):
+                if args and isinstance(args[0], str):
+                    counter.paths.append(args[0])
+                super().__init__(*args)
+
+        class Image(QImage):
+            def __init__(self, *args):
+                if len(args) == 1 and isinstance(args[0], str):
+                    counter.paths.append(args[0])
+                super().__init__(*args)
+
+        resource_loader.QImageReader = Reader
+        sprite_sheet.QImageReader = Reader
+        sprite_sheet.QImage = Image
+        sys.addaudithook(self._audit)
+        self.active = False
+
+    def _audit(self, event, args):
+        if self.active and event == 'open' and isinstance(args[0], (str, Path)):
+            if str(args[0]).endswith(('.gif', '.png', '.json')):
+                self.paths.append(str(args[0]))
+
+    def measure(self, func):
+        self.paths = []
+        self.active = True
+        try:
+            result = func()
+        finally:
+            self.active = False
+        return result, len(self.paths)
+
+
+def make_species(root, animations):
+    """Writes the same frames as loose GIFs and as a trimmed sheet"""
+    loose = root / 'loose'
+    sheet_dir = root / 'sheet'
+    loose.mkdir(parents=True)
+    sheet_dir.mkdir(parents=True)
+
+    pieces = []
+    manifest = {'image': 'sheet.png', 'animations': {}}
+    for a in range(animations):
+        name = 'idle' if a == 0 else 'click' if a == 1 else f'anim{a:02d}'
+        color = COLORS[a % len(COLORS)] + (255,)
+        frames = []
+        for i in range(FRAMES):
+            frame = Image.new('RGBA', (CANVAS, CANVAS), (0, 0, 0, 0))
+            x = 40 + i * 8
+            ImageDraw.Draw(frame).ellipse([x, 60 + a * 2, x + 100, 180], fill=color)
+            ImageDraw.Draw(frame).rectangle([x + 30, 100, x + 60, 120], fill=(255, 255, 255, 255))
+            frames.append(frame)
+        delays = [80 + 10 * (i % 3) for i in range(FRAMES)]
+        frames[0].save(loose / f'{name}.gif', save_all=True, append_images=frames[1:],
+                       duration=delays, loop=0, disposal=2)
+
+        entry = {'size': [CANVAS, CANVAS], 'delays': delays, 'frames': []}
+        for frame in frames:
+            left, top, right, bottom = frame.getbbox()
+            left, top = left // 2 * 2, top // 2 * 2  # even offsets scale exactly at 1/2
+            right, bottom = (right + 1) // 2 * 2, (bottom + 1) // 2 * 2
+            pieces.append(frame.crop((left, top, right, bottom)))
+            entry['frames'].append([left, top, right - left, bottom - top])
+        manifest['animations'][name] = entry
+
+    # Shelf-pack the trimmed pieces into one sheet
+    width = 2048
+    x = y = row = 0
+    rects = []
+    for piece in pieces:
+        if x + piece.width > width:
+            x, y, row = 0, y + row, 0
+        rects.append((x, y))
+        x += piece.width
+        row = max(row, piece.height)
+    sheet = Image.new('RGBA', (width, y + row), (0, 0, 0, 0))
+    frames = iter(zip(pieces, rects))
+    for entry in manifest['animations'].values():
+        for frame in entry['frames']:
+            piece, (px, py) = next(frames)
+            sheet.paste(piece, (px, py))
+            frame[:] = [px, py, frame[2], frame[3], frame[0], frame[1]]
+    sheet.save(sheet_dir / 'sheet.png')
+    (sheet_dir / 'sheet.json').write_text(json.dumps(manifest))
+    return loose, sheet_dir, list(manifest['animations'])
+
+
+def load_all(sprite_dir, names, size, scale):
+    loader = ResourceLoader(sprite_dir, disk_cache=None, memory_cache=MemoryCache(512 * 1024 * 1024),
+                            use_pack=False)
+    start = time.perf_counter()
+    frame_sets = {name: loader.load_frames(loader.get_animation_path(name), size, scale) for name in names}
+    return loader, frame_sets, (time.perf_counter() - start) * 1000
+
+
+def held_bytes(frame_sets):
+    """Pixel memory actually held: shared atlases are counted once"""
+    total = 0
+    atlases = {}
+    for frame_set in frame_sets.values():
+        masks = sum(m.nbytes for m in frame_set.masks or () if m is not None)
+        if isinstance(frame_set, SheetFrameSet):
+            atlases[id(frame_set.atlas)] = frame_set.atlas.nbytes
+            total += masks
+        else:
+            total += frame_set.nbytes
+    return total + sum(atlases.values()), len(atlases)
+
+
+def render(frame_set, index, size):
+    image = QImage(size[0], size[1], FRAME_FORMAT)
+    image.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(image)
+    frame_set.draw(painter, QPoint(0, 0), index)
+    painter.end()
+    return image
+
+
+def mean_diff(a, b):
+    a = a.convertToFormat(FRAME_FORMAT)
+    b = b.convertToFormat(FRAME_FORMAT)
+    if a.size() != b.size():
+        return 255.0
+    data_a = bytes(a.constBits())
+    data_b = bytes(b.constBits())
+    return sum(abs(x - y) for x, y in zip(data_a[::7], data_b[::7])) / (len(data_a) // 7)
+
+
+def bench_paint(frame_set, rounds, size):
+    target = QImage(size[0], size[1], FRAME_FORMAT)
+    painter = QPainter(target)
+    start = time.perf_counter()
+    for i in range(rounds):
+        frame_set.draw(painter, QPoint(0, 0), i % frame_set.frame_count)
+    painter.end()
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def compare(counter, loose, sheet_dir, names, size):
+    failures = 0
+    for scale in (1.0, 2.0):
+        print(f"[load] {len(names)} animations x {FRAMES} frames at {size[0]}x{size[1]} @{scale}x")
+        (loose_loader, loose_sets, loose_ms), loose_files = counter.measure(
+            lambda: load_all(loose, names, size, scale))
+        (sheet_loader, sheet_sets, sheet_ms), sheet_files = counter.measure(
+            lambda: load_all(sheet_dir, names, size, scale))
+        loose_bytes, _ = held_bytes(loose_sets)
+        sheet_bytes, textures = held_bytes(sheet_sets)
+        loose_pixmaps = sum(fs.frame_count for fs in loose_sets.values())
+        print(f"  loose GIFs   {loose_bytes / 1024:8.1f} KB  {loose_pixmaps:4d} pixmaps  "
+              f"{loose_files:3d} file opens  {loose_ms:7.1f} ms")
+        print(f"  sprite sheet {sheet_bytes / 1024:8.1f} KB  {textures:4d} pixmaps  "
+              f"{sheet_files:3d} file opens  {sheet_ms:7.1f} ms  "
+              f"({loose_bytes / sheet_bytes:.1f}x less memory)")
+        if textures != 1:
+            print("  FAIL sheet animations do not share one texture")
+            failures += 1
+        if sheet_bytes * 2 > loose_bytes:
+            print("  FAIL sheet did not halve the pixel memory")
+            failures += 1
+        if sheet_files > 3 or sheet_files * 4 > loose_files:
+            print("  FAIL sheet did not cut the file opens")
+            failures += 1
+
+        worst = 0.0
+        mask_diff = mask_total = 0
+        canvas = loose_sets[names[0]].frame_size()
+        level = (round(canvas.width() * scale), round(canvas.height() * scale))
+        for name in names:
+            a, b = loose_sets[name], sheet_sets[name]
+            if a.delays != b.delays or a.frame_count != b.frame_count or b.frame_size() != a.frame_size():
+                print(f"  FAIL {name}: timings or frame size differ")
+                failures += 1
+                continue
+            for i in range(a.frame_count):
+                worst = max(worst, mean_diff(a.frame(i).toImage(), b.frame(i).toImage()))
+                ma, mb = a.mask(i), b.mask(i)
+                for y in range(0, level[1], 3):
+                    for x in range(0, level[0], 3):
+                        mask_total += 1
+                        mask_diff += ma.contains(x, y) != mb.contains(x, y)
+        print(f"  sheet vs GIF pixels: worst mean diff {worst:.2f}/255, "
+              f"hit masks differ on {mask_diff}/{mask_total} samples")
+        if worst > MAX_MEAN_DIFF or mask_diff > mask_total * 0.01:
+            print("  FAIL sheet frames do not match the GIF frames")
+            failures += 1
+
+        if scale == 1.0:
+            rounds = 5000
+            whole = bench_paint(loose_sets[names[0]], rounds, size)
+            sub = bench_paint(sheet_sets[names[0]], rounds, size)
+            print(f"[paint] whole pixmap {whole:.1f} us/frame, sheet sub-rect {sub:.1f} us/frame")
+    return failures
+
+
+def wait_until(predicate, timeout=10.0):
+    app = QApplication.instance()
+    start = time.perf_counter()
+    while not predicate():
+        if time.perf_counter() - start > timeout:
+            return False
+        app.processEvents(QEventLoop.ProcessEventsFlag.AllEvents, 5)
+    return True
+
+
+def check_window(sprites_root):
+    from src.core.frame_store import FrameStore
+    from src.ui.pet_window import PetWindow
+
+    print("[window] pet window playing the sheet species")
+    failures = 0
+    store = FrameStore(disk_cache=None, memory_cache=MemoryCache(config.MEMORY_CACHE_BUDGET))
+    window = PetWindow('sheet', frame_store=store, position=(100, 100), persist_position=False)
+    window.show()
+    if not wait_until(lambda: window.current_animation is not None):
+        print("  FAIL idle animation never started")
+        return 1
+    window.behavior.stop()
+    window.player.stop()
+
+    image = window.grab().toImage()
+    opaque = sum(image.pixelColor(x, y).alpha() > 0
+                 for y in range(0, image.height(), 2) for x in range(0, image.width(), 2))
+    frame_set = window.player.frame_set
+    print(f"  playing {window.current_animation}: {type(frame_set).__name__}, "
+          f"{opaque} opaque samples on screen, hit at center {window.hit_test(QPoint(64, 64))}")
+    if not isinstance(frame_set, SheetFrameSet) or opaque == 0:
+        print("  FAIL window is not drawing from the sheet")
+        failures += 1
+
+    # Hot reload: a manifest edit reloads every animation of the sheet
+    manifest_path = sprites_root / 'sheet' / 'sheet.json'
+    manifest = json.loads(manifest_path.read_text())
+    manifest['animations']['idle']['delays'] = [50] * FRAMES
+    manifest_path.write_text(json.dumps(manifest))
+    store.reload_animations('sheet', ['sheet'])
+    reloaded = wait_until(lambda: window.animations['idle'].delays == [50] * FRAMES)
+    print(f"  manifest edit reloaded: {reloaded}, reloads {store.reloads}")
+    if not reloaded:
+        print("  FAIL sheet edit was not hot-reloaded")
+        failures += 1
+
+    window.close()
+    window.deleteLater()
+    store.shutdown()
+    return failures
+
+
+def main():
+    animations = int(sys.argv[1]) if len(sys.argv) > 1 else 12
+    set_level('WARNING')
+    QApplication.instance() or QApplication(sys.argv)
+    config.save_config = lambda **kwargs: None
+    counter = FileCounter()
+
+    temp = Path(tempfile.mkdtemp(prefix='pet_sheet_'))
+    failures = 0
+    try:
+        loose, sheet_dir, names = make_species(temp, animations)
+        print(f"sheet.png {os.path.getsize(sheet_dir / 'sheet.png') / 1024:.1f} KB vs "
+              f"{sum(p.stat().st_size for p in loose.glob('*.gif')) / 1024:.1f} KB of GIFs")
+        failures += compare(counter, loose, sheet_dir, names, config.WINDOW_SIZE)
+
+        config.SPRITES_DIR = temp
+        failures += check_window(temp)
+    finally:
+        shutil.rmtree(temp, ignore_errors=True)
+
+    if failures:
+        print(f"\n{failures} check(s) failed")
+        sys.exit(1)
+    print("\nAll checks passed")
+
+
+if __name__ == '__main__':
+    main()
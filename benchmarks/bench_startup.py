@@ -0,0 +1,139 @@
+"""
+Startup benchmark: import time and time-to-first-frame of src/main.py
+
+Runs `python -X importtime src/main.py --startup-probe` headless
+(QT_QPA_PLATFORM=offscreen) several times:
+  - cold: every run gets a fresh, empty sprite cache directory
+  - warm: runs share a cache directory that was populated beforehand
+
+Reports the median time-to-first-frame (as printed by the app), process
+wall time, total import time and the slowest imports.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs N] [--output results.json]
+                                       [--baseline baseline.json] [--tolerance 0.25]
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN = os.path.join(project_root, 'src', 'main.py')
+
+FIRST_FRAME_RE = re.compile(r'\[Startup\] First frame painted after ([\d.]+)ms')
+IMPORT_RE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def run_once(cache_dir):
+    """Run the app once; return (first_frame_ms, wall_ms, imports)"""
+    env = dict(os.environ)
+    env['QT_QPA_PLATFORM'] = 'offscreen'
+    env['DESKTOP_POKEMON_CACHE_DIR'] = cache_dir
+    env['PYTHONUNBUFFERED'] = '1'
+
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', MAIN, '--startup-probe'],
+        env=env, cwd=project_root, capture_output=True, text=True, timeout=60
+    )
+    wall = (time.perf_counter() - start) * 1000
+
+    match = FIRST_FRAME_RE.search(proc.stdout)
+    if proc.returncode != 0 or match is None:
+        raise RuntimeError(f"startup probe failed (rc={proc.returncode}):\n{proc.stdout}\n{proc.stderr[-2000:]}")
+
+    # name -> (self_us, cumulative_us, depth)
+    imports = {}
+    for line in proc.stderr.splitlines():
+        m = IMPORT_RE.match(line)
+        if m:
+            self_us, cumulative_us, indent, name = m.groups()
+            imports[name] = (int(self_us), int(cumulative_us), len(indent) // 2)
+
+    return float(match.group(1)), wall, imports
+
+
+def summarize(runs):
+    first_frame = [r[0] for r in runs]
+    wall = [r[1] for r in runs]
+    import_total = [sum(c for _, c, depth in r[2].values() if depth == 0) / 1000 for r in runs]
+    return {
+        'first_frame_ms': statistics.median(first_frame),
+        'wall_ms': statistics.median(wall),
+        'import_ms': statistics.median(import_total),
+        'runs': len(runs),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--output', help="write results as JSON")
+    parser.add_argument('--baseline', help="compare against a previous results JSON")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="allowed slowdown vs baseline (fraction, default 0.25)")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        cold_runs = []
+        for i in range(args.runs):
+            cold_runs.append(run_once(os.path.join(tmp, f'cold{i}')))
+        results['cold'] = summarize(cold_runs)
+
+        warm_dir = os.path.join(tmp, 'warm')
+        run_once(warm_dir)  # populate the cache
+        warm_runs = [run_once(warm_dir) for _ in range(args.runs)]
+        results['warm'] = summarize(warm_runs)
+
+    print("=" * 64)
+    print(f"  Startup benchmark (median of {args.runs} runs, offscreen)")
+    print("=" * 64)
+    for mode in ('cold', 'warm'):
+        r = results[mode]
+        print(f"{mode:>5}: first frame {r['first_frame_ms']:7.1f}ms | "
+              f"process wall {r['wall_ms']:7.1f}ms | imports {r['import_ms']:6.1f}ms")
+
+    print()
+    print("Slowest imports (cumulative, last warm run):")
+    imports = warm_runs[-1][2]
+    top = sorted(imports.items(), key=lambda item: item[1][1], reverse=True)
+    shown = 0
+    for name, (self_us, cumulative_us, depth) in top:
+        if depth > 1:
+            continue
+        print(f"  {cumulative_us / 1000:7.1f}ms  (self {self_us / 1000:6.1f}ms)  {'  ' * depth}{name}")
+        shown += 1
+        if shown == 12:
+            break
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=4)
+        print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+        failed = False
+        for mode in ('cold', 'warm'):
+            before = baseline[mode]['first_frame_ms']
+            after = results[mode]['first_frame_ms']
+            change = (after - before) / before
+            status = 'REGRESSION' if change > args.tolerance else 'ok'
+            failed |= status != 'ok'
+            print(f"{mode:>5}: {before:7.1f}ms -> {after:7.1f}ms ({change:+.0%}) {status}")
+        if failed:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+State machine benchmark: headless simulation of many pets
+
+Compiles the default pet behavior and advances populations of N pets at
+60 steps per simulated second with random clicks and feeding, reporting
+pet-steps per second and the resulting state distribution. Also checks that
+weighted transitions follow their weights and that stepping does not grow
+memory.
+
+Usage:
+    python benchmarks/bench_state_machine.py [simulated_seconds] [N ...]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.models.pet import DEFAULT_BEHAVIOR, IDLE
+from src.models.simulator import PetPopulation, Simulator
+from src.models.state_machine import StateMachine
+
+EVENT_RATES = {'click': 0.01, 'feed': 0.002}  # per pet per second
+
+
+def check_weights(machine, samples=200000):
+    """Empirical transition frequencies out of IDLE vs the declared weights"""
+    population = PetPopulation(machine, 1, seed=1)
+    idle = machine.state_index(IDLE)
+    counts = {}
+    rand = population.rng.random
+    for _ in range(samples):
+        target = machine.pick_next(idle, rand())
+        counts[target] = counts.get(target, 0) + 1
+
+    weights = DEFAULT_BEHAVIOR['states'][IDLE]['next']
+    total = sum(weights.values())
+    worst = 0.0
+    for name, weight in weights.items():
+        observed = counts.get(machine.state_index(name), 0) / samples
+        worst = max(worst, abs(observed - weight / total))
+        print(f"  idle -> {name:<6} expected {weight / total:.3f}, observed {observed:.3f}")
+    return worst
+
+
+def check_allocations(machine, count=10000, steps=300):
+    """Net traced memory growth over many steps (should stay ~0)"""
+    population = PetPopulation(machine, count, seed=2)
+    population.step(16.7)  # warm up
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for _ in range(steps):
+        population.step(16.7)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before
+
+
+def main():
+    args = sys.argv[1:]
+    seconds = float(args[0]) if args else 60.0
+    counts = [int(n) for n in args[1:]] or [1000, 10000, 100000]
+
+    machine = StateMachine(DEFAULT_BEHAVIOR, {'click': 2070, 'eat': 1500})
+
+    print("=" * 72)
+    print(f"  State machine simulation ({seconds:.0f}s simulated at 60 steps/s)")
+    print("=" * 72)
+    for count in counts:
+        simulator = Simulator(machine, count, EVENT_RATES, seed=count)
+        start = time.perf_counter()
+        result = simulator.run(seconds * 1000)
+        wall = time.perf_counter() - start
+
+        occupancy = result['occupancy']
+        distribution = ', '.join(f"{name} {n / count:.0%}" for name, n in occupancy.items() if n)
+        print(f"{count:>7} pets: {result['pet_steps_per_second'] / 1e6:6.2f}M pet-steps/s, "
+              f"{seconds / wall:7.1f}x real time, {result['transitions']} transitions, "
+              f"{simulator.events_fired} events")
+        print(f"          {distribution}")
+
+    print()
+    print("Transition weights:")
+    worst = check_weights(machine)
+    growth = check_allocations(machine)
+    print(f"Memory growth over 300 steps of 10000 pets: {growth} bytes")
+
+    if worst > 0.01 or growth > 4096:
+        print("FAIL")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+"""
+System monitor benchmark: ring buffer, band signals and sampling cost
+
+Drives SystemMonitor with a scripted fake sampler on its real background
+thread and checks that:
+  1. MetricRing rolling averages match a naive recomputation (with gaps)
+  2. bandChanged fires exactly once per band change, in the expected order,
+     and noise around a boundary does not flap thanks to the hysteresis
+  3. the GUI thread receives nothing but those signals
+Also reports the cost of add_sample() and of a real psutil sample.
+
+Exits with status 1 if any check fails.
+
+Usage:
+    python benchmarks/bench_system_monitor.py
+"""
+
+import math
+import os
+import random
+import sys
+import threading
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from PySide6.QtCore import QCoreApplication, QEventLoop, QTimer
+
+from src.core.power_governor import PowerSample, PsutilSource
+from src.core.system_monitor import MetricRing, SystemMonitor
+
+
+class FakeSource:
+    """Replays a list of samples, then signals that it is exhausted"""
+
+    def __init__(self, samples):
+        self.samples = list(samples)
+        self.done = threading.Event()
+
+    def sample(self):
+        if not self.samples:
+            self.done.set()
+            raise RuntimeError("script finished")
+        return self.samples.pop(0)
+
+
+def scripted_samples(rng):
+    """CPU: quiet, busy, noise around the 80% boundary, quiet again"""
+    cpu = [10.0] * 20 + [95.0] * 20
+    cpu += [80.0 + rng.uniform(-3.0, 3.0) for _ in range(60)]
+    cpu += [5.0] * 30
+    return [PowerSample(c, battery_percent=None, memory_percent=40.0, per_cpu=(c, c / 2))
+            for c in cpu]
+
+
+def check_ring(rng, capacity=16, pushes=1000):
+    ring = MetricRing(capacity, 2)
+    history = []
+    worst = 0.0
+    for _ in range(pushes):
+        row = (rng.uniform(0, 100), None if rng.random() < 0.3 else rng.uniform(0, 100))
+        ring.push(row)
+        history.append(row)
+        for column in range(2):
+            values = [r[column] for r in history[-capacity:] if r[column] is not None]
+            expected = sum(values) / len(values) if values else None
+            actual = ring.average(column)
+            if (expected is None) != (actual is None):
+                return math.inf
+            if expected is not None:
+                worst = max(worst, abs(expected - actual))
+    return worst
+
+
+def main():
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    rng = random.Random(0)
+    failed = False
+
+    print("=" * 64)
+    print("  System monitor")
+    print("=" * 64)
+
+    error = check_ring(rng)
+    print(f"ring buffer:  max average error {error:.2e}")
+    failed |= error > 1e-9
+
+    # Real thread, fake sampler; signals are queued to this (GUI) thread
+    source = FakeSource(scripted_samples(rng))
+    monitor = SystemMonitor(source=source, interval=0.001, window=5,
+                            thresholds={'cpu': (30.0, 80.0), 'memory': (50.0, 85.0)},
+                            hysteresis=5.0)
+    received = []
+    monitor.bandChanged.connect(lambda metric, band, avg: received.append((metric, band)))
+    monitor.start()
+    loop = QEventLoop()
+    timer = QTimer()
+    timer.timeout.connect(lambda: source.done.is_set() and loop.quit())
+    timer.start(10)
+    loop.exec()
+    monitor.stop()
+    app.processEvents()
+
+    expected = [('cpu', 'low'), ('memory', 'low'), ('cpu', 'normal'), ('cpu', 'high'),
+                ('cpu', 'normal'), ('cpu', 'low')]
+    print(f"band signals: {received}")
+    ok = received == expected
+    print(f"              {len(received)} signals for {monitor.samples} samples, "
+          f"expected sequence: {'ok' if ok else 'MISMATCH'}")
+    failed |= not ok
+    cores = monitor.stats()['per_cpu']
+    print(f"per-core avg: {[round(c, 1) for c in cores]}")
+
+    # Cost per sample
+    quiet = SystemMonitor(source=None, window=60)
+    sample = PowerSample(42.0, 80.0, True, memory_percent=55.0, per_cpu=(40.0,) * 16)
+    n = 20000
+    start = time.perf_counter()
+    for _ in range(n):
+        quiet.add_sample(sample)
+    record_us = (time.perf_counter() - start) / n * 1e6
+
+    psutil_source = PsutilSource()
+    start = time.perf_counter()
+    for _ in range(200):
+        psutil_source.sample()
+    psutil_us = (time.perf_counter() - start) / 200 * 1e6
+    print(f"cost:         add_sample {record_us:.1f} us (16 cores), psutil sample {psutil_us:.0f} us")
+
+    if failed:
+        print("FAIL")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,297 @@
+"""
+Benchmark suite runner: loading and rendering pipeline against a baseline
+
+Generates synthetic sprite sets with generate_placeholder.generate_sprite_set
+at several frame sizes and frame counts, then measures per set:
+  - ResourceLoader.load_pixmap / load_movie (cold loader, empty caches)
+  - PetWindow.get_gif_duration (first call and repeated calls)
+  - PetWindow construction until the idle animation is playing
+  - click round trip: click -> first click frame painted, and the time spent
+    beyond the click animation's own length before the pet is idle again
+  - steady-state CPU of one idle pet
+
+Results are written as JSON and compared against benchmarks/baseline.json.
+A metric regresses when it exceeds baseline * (1 + tolerance) + slack; any
+regression makes the runner exit with status 1.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--quick] [--scripts]
+                                        [--output FILE] [--baseline FILE]
+                                        [--update-baseline] [--tolerance 0.5]
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import psutil
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QEventLoop, QTimer
+from PySide6.QtGui import QPixmapCache
+
+from generate_placeholder import generate_sprite_set
+from src.config import config
+from src.core.frame_store import FrameStore
+from src.core.instrumentation import metrics
+from src.core.log import set_level
+from src.core.memory_cache import MemoryCache
+from src.core.resource_loader import ResourceLoader
+
+BENCH_DIR = Path(__file__).resolve().parent
+DEFAULT_BASELINE = BENCH_DIR / 'baseline.json'
+DEFAULT_OUTPUT = BENCH_DIR / 'results' / 'latest.json'
+
+# (frame size, idle frames, click frames)
+SPRITE_SETS = [(64, 8, 7), (128, 8, 7), (128, 32, 24), (256, 32, 24)]
+QUICK_SETS = [(128, 8, 7)]
+
+# Absolute slack added to the tolerance, by unit (timer noise on tiny values)
+SLACK = {'ms': 2.0, '%': 2.0}
+
+
+def run_for(seconds):
+    loop = QEventLoop()
+    QTimer.singleShot(int(seconds * 1000), loop.quit)
+    loop.exec()
+
+
+def wait_until(predicate, timeout=10.0):
+    """Spin the event loop until predicate() is true; returns elapsed ms or None"""
+    start = time.perf_counter()
+    app = QApplication.instance()
+    while not predicate():
+        if time.perf_counter() - start > timeout:
+            return None
+        app.processEvents(QEventLoop.ProcessEventsFlag.AllEvents, 1)
+    return (time.perf_counter() - start) * 1000
+
+
+def median_ms(func, repeats):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+class Suite:
+    """Collects metrics as {name: {'value', 'unit'}}"""
+
+    def __init__(self):
+        self.results = {}
+
+    def add(self, name, value, unit='ms'):
+        self.results[name] = {'value': round(value, 4), 'unit': unit}
+        print(f"  {name:<44} {value:10.3f} {unit}")
+
+
+def bench_loader(suite, root, species, tag, repeats):
+    sprite_dir = root / species
+    size = config.WINDOW_SIZE
+
+    def load_pixmap():
+        QPixmapCache.clear()  # QPixmap(path) would otherwise hit Qt's own cache
+        ResourceLoader(sprite_dir, disk_cache=None, use_pack=False).load_pixmap('idle.gif', size)
+
+    def load_movie():
+        # QMovie decodes lazily; include the first frame so the number means something
+        movie = ResourceLoader(sprite_dir, disk_cache=None, use_pack=False).load_movie('idle.gif', size)
+        movie.jumpToFrame(0)
+        movie.currentPixmap()
+
+    suite.add(f'{tag}/load_pixmap', median_ms(load_pixmap, repeats))
+    suite.add(f'{tag}/load_movie', median_ms(load_movie, repeats))
+
+
+def bench_window(suite, root, species, tag, repeats, idle_seconds):
+    from src.ui.pet_window import PetWindow
+
+    # Construction until the idle animation plays (fresh store: no memory or disk cache)
+    construct = []
+    for _ in range(repeats):
+        store = FrameStore(disk_cache=None, memory_cache=MemoryCache(config.MEMORY_CACHE_BUDGET))
+        start = time.perf_counter()
+        window = PetWindow(species, frame_store=store, position=(100, 100), persist_position=False)
+        window.show()
+        ready = wait_until(lambda: window.current_animation == 'idle')
+        construct.append((time.perf_counter() - start) * 1000 if ready is not None else float('inf'))
+        window.close()
+        window.deleteLater()
+        store.shutdown()
+    suite.add(f'{tag}/window_construct', statistics.median(construct))
+
+    store = FrameStore(disk_cache=None, memory_cache=MemoryCache(config.MEMORY_CACHE_BUDGET))
+    window = PetWindow(species, frame_store=store, position=(100, 100), persist_position=False)
+    window.show()
+    wait_until(lambda: 'click' in window.animations and window.current_animation == 'idle')
+
+    # get_gif_duration: first call parses the GIF blocks, later calls hit the index
+    click_path = str(root / species / 'click.gif')
+    window.resource_loader.index.invalidate()
+    start = time.perf_counter()
+    window.get_gif_duration(click_path)
+    suite.add(f'{tag}/gif_duration_first', (time.perf_counter() - start) * 1000)
+    suite.add(f'{tag}/gif_duration_cached', median_ms(lambda: window.get_gif_duration(click_path), 50))
+
+    # Click round trip
+    click_duration = window.animations['click'].total_duration
+    to_frame = []
+    overshoot = []
+    for _ in range(repeats):
+        paints = metrics.timers['paint'].count if 'paint' in metrics.timers else 0
+        start = time.perf_counter()
+        window.behavior.fire('click')
+        shown = wait_until(lambda: 'paint' in metrics.timers and metrics.timers['paint'].count > paints
+                           and window.current_animation == 'click')
+        to_frame.append(shown if shown is not None else float('inf'))
+        back = wait_until(lambda: window.behavior.state == 'idle', timeout=click_duration / 1000 + 5)
+        total = (time.perf_counter() - start) * 1000 if back is not None else float('inf')
+        overshoot.append(max(total - click_duration, 0.0))
+    suite.add(f'{tag}/click_to_first_frame', statistics.median(to_frame))
+    suite.add(f'{tag}/click_round_trip_overshoot', statistics.median(overshoot))
+
+    # Steady-state CPU of one idle pet
+    if idle_seconds > 0:
+        window.behavior.stop()  # stay in idle for the whole measurement
+        process = psutil.Process()
+        run_for(0.3)
+        before = process.cpu_times()
+        start = time.perf_counter()
+        run_for(idle_seconds)
+        wall = time.perf_counter() - start
+        after = process.cpu_times()
+        cpu = (after.user - before.user + after.system - before.system) / wall * 100
+        suite.add(f'{tag}/idle_cpu', cpu, '%')
+
+    window.close()
+    window.deleteLater()
+    store.shutdown()
+
+
+def run_scripts(suite):
+    """Run the standalone bench_*.py scripts; each must exit 0"""
+    failures = []
+    for script in sorted(BENCH_DIR.glob('bench_*.py')):
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, str(script)], capture_output=True, text=True)
+        wall = time.perf_counter() - start
+        status = 'ok' if proc.returncode == 0 else f'FAILED ({proc.returncode})'
+        print(f"  {script.name:<44} {wall:9.1f}s  {status}")
+        if proc.returncode != 0:
+            failures.append(script.name)
+    suite.results['scripts_failed'] = {'value': len(failures), 'unit': 'count'}
+    return failures
+
+
+def compare(results, baseline, tolerance):
+    """Returns a list of (name, value, limit, unit) regressions"""
+    regressions = []
+    for name, entry in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        unit = entry['unit']
+        limit = base['value'] * (1 + tolerance) + SLACK.get(unit, 0.0)
+        if entry['value'] > limit:
+            regressions.append((name, entry['value'], limit, unit))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the headless benchmark suite")
+    parser.add_argument('--quick', action='store_true', help="one sprite set, fewer repeats")
+    parser.add_argument('--scripts', action='store_true', help="also run the bench_*.py scripts")
+    parser.add_argument('--output', type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument('--update-baseline', action='store_true',
+                        help="write the results as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=0.5,
+                        help="allowed relative slowdown before failing (default 0.5 = 50%%)")
+    args = parser.parse_args()
+
+    set_level('WARNING')  # keep load chatter out of the report
+    QApplication.instance() or QApplication(sys.argv)
+    config.save_config = lambda **kwargs: None  # keep the user's config untouched
+
+    sets = QUICK_SETS if args.quick else SPRITE_SETS
+    repeats = 3 if args.quick else 5
+    idle_seconds = 1.0 if args.quick else 3.0
+
+    temp_root = Path(tempfile.mkdtemp(prefix='pet_bench_'))
+    original_sprites_dir = config.SPRITES_DIR
+    suite = Suite()
+    failures = []
+    try:
+        config.SPRITES_DIR = temp_root
+        print("=" * 72)
+        print(f"  Benchmark suite ({len(sets)} sprite sets, window {config.WINDOW_SIZE})")
+        print("=" * 72)
+        for size, idle_frames, click_frames in sets:
+            species = f'synthetic_{size}_{idle_frames}'
+            tag = f'{size}px_{idle_frames}f'
+            with open(os.devnull, 'w') as devnull:
+                stdout, sys.stdout = sys.stdout, devnull  # generator prints every file
+                try:
+                    generate_sprite_set(str(temp_root / species), (size, size), idle_frames, click_frames)
+                finally:
+                    sys.stdout = stdout
+            print(f"[{tag}] idle {idle_frames} frames, click {click_frames} frames at {size}x{size}")
+            bench_loader(suite, temp_root, species, tag, repeats)
+            bench_window(suite, temp_root, species, tag, repeats, idle_seconds)
+
+        if args.scripts:
+            print("[scripts]")
+            failures = run_scripts(suite)
+    finally:
+        config.SPRITES_DIR = original_sprites_dir
+        shutil.rmtree(temp_root, ignore_errors=True)
+
+    report = {
+        'timestamp': time.time(),
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'quick': args.quick,
+        'results': suite.results,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    print(f"\nResults written to {args.output}")
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2), encoding='utf-8')
+        print(f"Baseline updated: {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one")
+        return
+
+    baseline = json.loads(args.baseline.read_text(encoding='utf-8'))['results']
+    regressions = compare(suite.results, baseline, args.tolerance)
+    if regressions or failures:
+        print("\nREGRESSIONS:")
+        for name, value, limit, unit in regressions:
+            print(f"  {name:<44} {value:10.3f} {unit} > {limit:.3f} {unit}")
+        for name in failures:
+            print(f"  {name} failed")
+        sys.exit(1)
+    print(f"No regressions against {args.baseline.name} (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == '__main__':
+    main()
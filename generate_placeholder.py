@@ -4,7 +4,9 @@
 """
 
 from PIL import Image, ImageDraw, ImageFont
+import math
 import os
+import sys
 
 def create_placeholder_image(size, text, filename, bg_color=(100, 149, 237, 200)):
     """
@@ -79,24 +81,33 @@ def create_placeholder_image(size, text, filename, bg_color=(100, 149, 237, 200)
     print(f"[OK] 已创建: {filename}")
 
 
-def create_animated_placeholder():
+def create_animated_placeholder(output_dir='assets/sprites/pikachu', size=(128, 128),
+                                frame_count=8, duration=150):
     """
     创建简单的 GIF 动画占位符
+
+    Args:
+        output_dir: 输出目录（生成其中的 idle.gif）
+        size: 帧尺寸 (width, height)
+        frame_count: 帧数
+        duration: 每帧显示时长（毫秒）
+
+    Returns:
+        生成的文件路径
     """
     frames = []
-    size = (128, 128)
 
     # 创建多帧，模拟"呼吸"效果
-    for i in range(8):
+    for i in range(frame_count):
         img = Image.new('RGBA', size, (0, 0, 0, 0))
         draw = ImageDraw.Draw(img)
 
         # 计算缩放比例（呼吸效果）
-        scale = 1.0 + 0.1 * (i / 8.0)
+        scale = 1.0 + 0.1 * (i / frame_count)
         margin = int(10 * scale)
 
         # 绘制圆形
-        color_intensity = int(200 + 30 * (i / 8.0))
+        color_intensity = int(200 + 30 * (i / frame_count))
         bg_color = (100, 149, 237, min(255, color_intensity))
 
         draw.ellipse(
@@ -111,7 +122,7 @@ def create_animated_placeholder():
         eye_size = size[0] // 10
 
         # 根据帧数改变眼睛（模拟眨眼）
-        if i == 4:  # 第5帧闭眼
+        if i == frame_count // 2:  # 中间一帧闭眼
             # 闭眼用线条表示
             draw.line([size[0]//3 - eye_size, eye_y, size[0]//3 + eye_size, eye_y],
                      fill=(0, 0, 0, 255), width=2)
@@ -133,28 +144,43 @@ def create_animated_placeholder():
         frames.append(img)
 
     # 保存为 GIF
-    filename = 'assets/sprites/pikachu/idle.gif'
+    filename = os.path.join(output_dir, 'idle.gif')
     frames[0].save(
         filename,
         save_all=True,
         append_images=frames[1:],
-        duration=150,  # 每帧150毫秒
+        duration=duration,  # 默认每帧150毫秒
         loop=0,  # 无限循环
         transparency=0,
         disposal=2
     )
     print(f"[OK] 已创建动画: {filename}")
+    return filename
 
 
-def create_click_reaction():
+def create_click_reaction(output_dir='assets/sprites/pikachu', size=(128, 128),
+                          frame_count=None, duration=80):
     """
     创建点击反应动画（跳跃效果）
+
+    Args:
+        output_dir: 输出目录（生成其中的 click.gif）
+        size: 帧尺寸 (width, height)
+        frame_count: 帧数，缺省为 7 帧的标准跳跃
+        duration: 每帧显示时长（毫秒）
+
+    Returns:
+        生成的文件路径
     """
     frames = []
-    size = (128, 128)
 
-    # 创建跳跃动画帧
-    jump_sequence = [0, -10, -20, -25, -20, -10, 0]
+    # 创建跳跃动画帧（高度随尺寸缩放）
+    if frame_count is None:
+        jump_sequence = [0, -10, -20, -25, -20, -10, 0]
+    else:
+        jump_sequence = [round(-25 * math.sin(math.pi * i / max(frame_count - 1, 1)))
+                         for i in range(frame_count)]
+    jump_sequence = [round(offset * size[1] / 128) for offset in jump_sequence]
 
     for offset_y in jump_sequence:
         img = Image.new('RGBA', size, (0, 0, 0, 0))
@@ -197,17 +223,37 @@ def create_click_reaction():
         frames.append(img)
 
     # 保存为 GIF
-    filename = 'assets/sprites/pikachu/click.gif'
+    filename = os.path.join(output_dir, 'click.gif')
     frames[0].save(
         filename,
         save_all=True,
         append_images=frames[1:],
-        duration=80,  # 每帧80毫秒，更快
+        duration=duration,  # 默认每帧80毫秒，更快
         loop=0,
         transparency=0,
         disposal=2
     )
     print(f"[OK] 已创建点击动画: {filename}")
+    return filename
+
+
+def generate_sprite_set(output_dir, size=(128, 128), idle_frames=8, click_frames=None):
+    """
+    生成一套合成精灵图（idle.gif、click.gif），用于性能测试
+
+    Args:
+        output_dir: 输出目录（不存在时创建）
+        size: 帧尺寸 (width, height)
+        idle_frames: 待机动画帧数
+        click_frames: 点击动画帧数，缺省为 7 帧
+
+    Returns:
+        输出目录
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    create_animated_placeholder(output_dir, size, idle_frames)
+    create_click_reaction(output_dir, size, click_frames)
+    return output_dir
 
 
 if __name__ == '__main__':
@@ -231,6 +277,11 @@ if __name__ == '__main__':
         bg_color=(255, 193, 37, 255)
     )
 
+    # 同时生成精灵包（python generate_placeholder.py --pack）
+    if '--pack' in sys.argv:
+        from pack_sprites import default_size, pack_sprites
+        pack_sprites(['pikachu'], size=default_size())
+
     print()
     print("=" * 50)
     print("占位符图像生成完成！")
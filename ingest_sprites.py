@@ -0,0 +1,100 @@
+"""
+精灵图批量导入工具
+把第三方精灵图目录树（<源目录>/<宠物>/<动画>.gif|png）校验、统一帧时间、
+缩放后写入 assets/sprites/<宠物>/，各宠物在多个进程中并行处理，
+输入未变化的宠物自动跳过
+
+用法：
+    python ingest_sprites.py raw_sprites/                  # 导入全部宠物（CPU 核数个进程）
+    python ingest_sprites.py raw_sprites/ --pack --jobs 4  # 导入并打包精灵包
+    python ingest_sprites.py raw_sprites/ bulbasaur --force  # 只重新导入 bulbasaur
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# 添加项目根目录到 Python 路径
+project_root = os.path.dirname(os.path.abspath(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.config import config
+from src.core.sprite_ingest import ingest_tree
+from pack_sprites import parse_size
+
+
+def default_size():
+    """默认目标尺寸：窗口尺寸乘以最大的分辨率级别（HiDPI 屏幕上仍然清晰）"""
+    scale = max(config.MIPMAP_SCALES)
+    return round(config.WINDOW_SIZE[0] * scale), round(config.WINDOW_SIZE[1] * scale)
+
+
+def print_progress(done, total, result):
+    """每完成一个宠物输出一行进度"""
+    status = result['status']
+    line = (f"[Ingest] [{done:>{len(str(total))}}/{total}] {result['species']}: {status}, "
+            f"{result['animations']} animations, {result['frames']} frames ({result['seconds']:.2f}s)")
+    print(line)
+    for error in result['errors']:
+        print(f"[Ingest] Warning: {result['species']}: {error}")
+
+
+def print_summary(results, wall, jobs):
+    """输出汇总和吞吐量"""
+    counts = {status: sum(r['status'] == status for r in results) for status in ('built', 'skipped', 'failed')}
+    built = [r for r in results if r['status'] == 'built']
+    frames = sum(r['frames'] for r in built)
+    bytes_in = sum(r['bytes_in'] for r in built)
+    busy = sum(r['seconds'] for r in results)
+
+    print()
+    print(f"[Ingest] {len(results)} pets: {counts['built']} built, "
+          f"{counts['skipped']} unchanged, {counts['failed']} failed")
+    print(f"[Ingest] {wall:.2f}s wall with {jobs} worker(s): "
+          f"{len(results) / wall:.1f} pets/s, {frames / wall:.0f} frames/s, "
+          f"{bytes_in / wall / (1024 * 1024):.1f} MB/s input")
+    print(f"[Ingest] worker utilization {busy / (wall * jobs):.0%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import raw sprite GIFs/PNG sheets into assets/sprites")
+    parser.add_argument('source', help="source tree: <source>/<pet>/<animation>.gif|png")
+    parser.add_argument('pets', nargs='*', help="pet names (default: all)")
+    parser.add_argument('--output', default=str(config.SPRITES_DIR),
+                        help="output directory (default: assets/sprites)")
+    parser.add_argument('--size', type=parse_size, default=default_size(),
+                        help="fit frames into WxH (default: window size at the largest HiDPI level)")
+    parser.add_argument('--original', action='store_true', help="keep the original frame size")
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count(),
+                        help="worker processes (default: CPU count)")
+    parser.add_argument('--force', action='store_true', help="rebuild pets whose inputs did not change")
+    parser.add_argument('--pack', action='store_true', help="also write <pet>.pack sprite packs")
+    parser.add_argument('--compress', action='store_true', help="zlib-compress packed frame data")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.source):
+        parser.error(f"source directory not found: {args.source}")
+
+    jobs = max(1, args.jobs or 1)
+    size = None if args.original else args.size
+    print(f"[Ingest] {args.source} -> {args.output} "
+          f"(size {'original' if size is None else '%dx%d' % size}, {jobs} worker(s))")
+
+    start = time.perf_counter()
+    results = ingest_tree(args.source, args.output, size=size, jobs=jobs, force=args.force,
+                          pack=args.pack, compress=args.compress, species=args.pets,
+                          progress=print_progress)
+    wall = time.perf_counter() - start
+
+    if not results:
+        print("[Ingest] Warning: No pets found")
+        sys.exit(1)
+    print_summary(results, wall, jobs)
+    if any(r['status'] == 'failed' for r in results):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+精灵包打包工具
+把 assets/sprites/<宠物>/ 下的 GIF/PNG 动画打包成 assets/sprites/<宠物>.pack，
+程序启动时只需打开并映射这一个文件
+
+用法：
+    python pack_sprites.py                       # 打包全部宠物（按窗口尺寸预先缩放）
+    python pack_sprites.py pikachu --compress    # 只打包 pikachu，压缩帧数据
+    python pack_sprites.py --original            # 保留原始尺寸
+    python pack_sprites.py --palette 64 --compress  # 每段动画量化到 64 色共享调色板（需要 numpy）
+"""
+
+import argparse
+import os
+import sys
+
+# 添加项目根目录到 Python 路径
+project_root = os.path.dirname(os.path.abspath(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.config import config
+from src.core.preprocess import HAS_NUMPY
+from src.core.sprite_pack import pack_directory
+
+
+def parse_size(value):
+    """解析 WxH 形式的尺寸"""
+    try:
+        width, height = (int(v) for v in value.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid size '{value}', expected WxH")
+    return width, height
+
+
+def default_size():
+    """
+    默认目标尺寸：窗口尺寸（1x 级别）
+
+    最常用的 1x 级别直接零拷贝读取精灵包；HiDPI 级别比包中的帧大，
+    加载器改用精灵包旁边的散装文件解码。
+    """
+    return config.WINDOW_SIZE
+
+
+def pack_sprites(pets=None, size=None, compress=False, palette_colors=None):
+    """
+    打包宠物精灵图目录
+
+    Args:
+        pets: 宠物名称列表，缺省为 assets/sprites 下的全部目录
+        size: 可选的缩放尺寸 (width, height)
+        compress: 是否压缩帧数据
+        palette_colors: 可选的共享调色板颜色数
+
+    Returns:
+        生成的精灵包路径列表
+    """
+    if not pets:
+        pets = sorted(p.name for p in config.SPRITES_DIR.iterdir() if p.is_dir())
+
+    packs = []
+    for pet in pets:
+        sprite_dir = config.get_pet_sprite_dir(pet)
+        if not sprite_dir.is_dir():
+            print(f"[Pack] Warning: Sprite directory not found: {sprite_dir}")
+            continue
+        try:
+            packs.append(pack_directory(sprite_dir, size=size, compress=compress,
+                                        palette_colors=palette_colors))
+        except (OSError, ValueError) as e:
+            print(f"[Pack] Warning: Failed to pack {pet}: {e}")
+    return packs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack sprite directories into .pack files")
+    parser.add_argument('pets', nargs='*', help="pet names (default: all)")
+    parser.add_argument('--size', type=parse_size, default=default_size(),
+                        help="pre-scale frames to fit WxH (default: window size)")
+    parser.add_argument('--original', action='store_true',
+                        help="keep the original frame size")
+    parser.add_argument('--compress', action='store_true',
+                        help="zlib-compress frame data (smaller file, no zero-copy loading)")
+    parser.add_argument('--palette', type=int, metavar='N',
+                        help="quantize each animation to a shared palette of N colors (2-256)")
+    args = parser.parse_args()
+
+    if args.palette is not None:
+        if not 2 <= args.palette <= 256:
+            parser.error("--palette must be between 2 and 256")
+        if not HAS_NUMPY:
+            parser.error("--palette requires numpy (pip install numpy)")
+
+    size = None if args.original else args.size
+    packs = pack_sprites(args.pets, size, args.compress, args.palette)
+    if not packs:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -5,8 +5,149 @@
 
 import os
 import json
+import atexit
+import secrets
+import stat
+import threading
+import time
 from pathlib import Path
 
+from src.core.instrumentation import metrics
+
+
+def _log():
+    """配置模块的日志记录器（日志模块初始化时要读取配置，所以在使用时才导入）"""
+    from src.core.log import get_logger
+    return get_logger('Config')
+
+
+class ConfigWriter:
+    """
+    配置文件的后台写入器
+
+    短时间内的多次提交只写最后一次；写入在工作线程中以
+    “临时文件 + 重命名”的方式原子完成，不阻塞 GUI 线程。
+    """
+
+    def __init__(self, path, delay=0.5, on_error=None):
+        """
+        Args:
+            path: 配置文件路径
+            delay: 合并写入的等待时间（秒）
+            on_error: 写入失败时调用的函数（参数为写入失败的数据，在写入线程中调用）
+        """
+        self.path = Path(path)
+        self.delay = delay
+        self.on_error = on_error
+        self.write_count = 0
+
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()  # 保证写入按提交顺序进行
+        self._pending = None
+        self._deadline = 0.0
+        self._thread = None
+
+    def submit(self, data):
+        """提交要写入的数据，delay 秒内没有新提交时才真正写入"""
+        metrics.count('config.submits')
+        with self._cond:
+            self._pending = data
+            self._deadline = time.monotonic() + self.delay
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='ConfigWriter', daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def flush(self):
+        """立即写入尚未写出的数据（阻塞到写入完成）"""
+        with self._cond:
+            data = self._pending
+            self._pending = None
+
+        with self._write_lock:
+            if data is not None:
+                self._write(data)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None:
+                    self._cond.wait()
+                # 等待合并窗口结束，期间的新提交会推迟截止时间
+                while self._pending is not None and time.monotonic() < self._deadline:
+                    self._cond.wait(self._deadline - time.monotonic())
+                data = self._pending
+                self._pending = None
+                # 在释放条件锁之前占住写锁，flush 会等这次写入完成后再写更新的数据
+                if data is not None:
+                    self._write_lock.acquire()
+
+            if data is None:
+                continue
+            try:
+                self._write(data)
+            finally:
+                self._write_lock.release()
+
+    def has_pending(self):
+        """是否有尚未写出的数据"""
+        with self._cond:
+            return self._pending is not None
+
+    def _create_temp_file(self):
+        """
+        在配置文件旁边创建临时文件
+
+        与普通 open() 一样以 0o666 创建，由系统扣除 umask，
+        不需要读取（也就不会临时改动）进程的 umask。
+
+        Returns:
+            (文件描述符, 路径) 元组
+        """
+        flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+        while True:
+            tmp_path = self.path.with_name(f'{self.path.name}.{secrets.token_hex(4)}.tmp')
+            try:
+                return os.open(tmp_path, flags, 0o666), tmp_path
+            except FileExistsError:
+                continue
+
+    def _write(self, data):
+        tmp_path = None
+        try:
+            # 已有配置文件时沿用它的权限
+            try:
+                mode = stat.S_IMODE(os.stat(self.path).st_mode)
+            except FileNotFoundError:
+                mode = None
+            fd, tmp_path = self._create_temp_file()
+            with metrics.timer('config.write'):
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=4, ensure_ascii=False)
+                if mode is not None:
+                    os.chmod(tmp_path, mode)
+                os.replace(tmp_path, self.path)
+            self.write_count += 1
+            _log().debug("Config saved")
+        except Exception as e:
+            _log().warning("Failed to save config: %s", e)
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            if self.on_error is not None:
+                self.on_error(data)
+
+
+# 用户可修改的设置：属性名 -> (配置文件中的键, 默认值)
+# 这些属性在首次访问时才读取配置文件，导入本模块不做任何文件 I/O
+USER_SETTINGS = {
+    'window_x': ('window_x', None),
+    'window_y': ('window_y', None),
+    'WINDOW_OPACITY': ('opacity', 1.0),  # 窗口不透明度（1.0 = 完全不透明）
+    'DEFAULT_PET': ('pet_type', 'pikachu'),  # 默认宠物类型
+    'ANIMATION_SPEED': ('animation_speed', 1.0),  # 动画速度倍率
+    'MAX_FPS': ('max_fps', 60),  # 全局动画帧率上限
+}
+
 
 class Config:
     """应用配置类"""
@@ -20,60 +161,154 @@ class Config:
         self.SPRITES_DIR = self.ASSETS_DIR / 'sprites'
         self.SOUNDS_DIR = self.ASSETS_DIR / 'sounds'
         self.ICONS_DIR = self.ASSETS_DIR / 'icons'
+        self.USE_SPRITE_PACKS = True  # 存在 sprites/<宠物>.pack 时优先从精灵包加载
+        self.NUMPY_PREPROCESS = False  # 解码时用 NumPy 批量缩放整段动画（单一尺寸时逐帧缩放更快，打包工具总是批量处理）
+        self.DELTA_FRAMES = True  # 相邻帧变化很小的动画只保存关键帧和变化区域，绘制时重建
+        self.DELTA_MIN_SAVING = 0.5  # 差分存储至少节省一半内存时才使用
+        self.HOT_RELOAD = True  # 精灵图文件变化时自动重新加载
+        self.HOT_RELOAD_DEBOUNCE = 300  # 合并连续文件事件的等待时间（毫秒）
+
+        # 缓存路径（解码后的精灵帧），可用环境变量指定到其他目录
+        self.CACHE_DIR = Path(os.environ.get('DESKTOP_POKEMON_CACHE_DIR', self.BASE_DIR / 'cache'))
+        self.SPRITE_CACHE_DIR = self.CACHE_DIR / 'sprites'
+        self.SPRITE_CACHE_MAX_BYTES = 64 * 1024 * 1024  # 磁盘缓存上限 64 MB
+        self.MEMORY_CACHE_BUDGET = 32 * 1024 * 1024  # 内存缓存预算 32 MB
 
         # 窗口配置
         self.WINDOW_SIZE = (128, 128)  # 窗口尺寸
-        self.WINDOW_OPACITY = 1.0  # 窗口不透明度（1.0 = 完全不透明）
+        self.HIT_TEST = True  # 只有点在宠物不透明像素上才响应鼠标
+        self.SHAPE_MASK = False  # 按当前帧的形状设置窗口遮罩（透明处的点击穿透到下层窗口）
+        self.HIDPI_MIPMAPS = True  # 按所在屏幕的设备像素比使用高分辨率帧（拖到其他屏幕时自动切换）
+        self.MIPMAP_SCALES = (1.0, 1.5, 2.0, 3.0)  # 可用的分辨率级别（按需解码并缓存）
+
+        # 移动配置
+        self.MOVEMENT_GRAVITY = True  # 宠物受重力落到任务栏（屏幕可用区域底部）
+        self.GRAVITY = 2000.0  # 重力加速度（像素/秒²）
+        self.BOUNCE = 0.3  # 落地反弹系数
+        self.WALK_SPEED = 60.0  # 行走速度（像素/秒）
+        self.FRICTION = 1500.0  # 甩出后惯性滑行的减速度（像素/秒²）
+        self.FLING_SPEED = 600.0  # 拖拽松手时识别为甩出的最低速度（像素/秒）
+        self.MAX_FLING_SPEED = 3000.0  # 甩出速度上限（像素/秒）
+
+        # 启动配置
+        self.FAST_START = True  # 首帧显示后再启动非必需的服务
+
+        # 节能配置
+        self.POWER_SAVING = True  # 是否启用节能调节
+        self.POWER_SAMPLE_INTERVAL = 5.0  # 系统状态采样间隔（秒）
+        self.POWER_REDUCED_FPS = 12  # 降频时的帧率上限
+        self.POWER_HIGH_CPU = 80.0  # CPU 占用超过该值时降频（%）
+        self.POWER_LOW_BATTERY = 20  # 电池供电且电量低于该值时冻结（%）
+        self.POWER_IDLE_REDUCE = 60  # 系统无键盘鼠标输入超过该时间后降频（秒，平台支持时）
+        self.POWER_IDLE_FREEZE = 600  # 系统无键盘鼠标输入超过该时间后冻结（秒，平台支持时）
+        self.POWER_INTERACTION_GRACE = 30  # 与宠物交互后保持全帧率的时间（秒，优先于其他策略）
 
-        # 默认宠物类型
-        self.DEFAULT_PET = 'pikachu'
+        # 系统监视配置（宠物对系统负载作出反应）
+        self.SYSTEM_MONITOR = True  # 是否启用系统监视
+        self.MONITOR_INTERVAL = 2.0  # 采样间隔（秒）
+        self.MONITOR_WINDOW = 15  # 滑动平均的采样个数
+        self.MONITOR_CPU_BANDS = (30.0, 80.0)  # CPU 占用 低/中、中/高 档位边界（%）
+        self.MONITOR_MEMORY_BANDS = (50.0, 85.0)  # 内存占用档位边界（%）
+        self.MONITOR_BATTERY_BANDS = (20.0, 50.0)  # 电池电量档位边界（%）
+        self.MONITOR_HYSTERESIS = 5.0  # 档位切换的回差（百分点）
 
-        # 动画配置
-        self.ANIMATION_SPEED = 1.0  # 动画速度倍率
+        # 日志与诊断配置
+        self.LOG_LEVEL = os.environ.get('DESKTOP_POKEMON_LOG', 'INFO')  # 日志级别（DEBUG 输出全部细节）
+        self.LOG_RATE_LIMIT = 5  # 同一条日志在时间窗口内最多输出的条数（0 = 不限流）
+        self.LOG_RATE_INTERVAL = 10.0  # 日志限流的时间窗口（秒）
+        self.DEBUG_OVERLAY = False  # 启动时显示调试浮层（也可从右键菜单打开）
+        self.STATS_FILE = self.BASE_DIR / 'stats.json'  # 右键菜单导出统计的文件
 
         # 配置文件路径
         self.CONFIG_FILE = self.BASE_DIR / 'config.json'
+        self.CONFIG_SAVE_DELAY = 0.5  # 合并连续保存的等待时间（秒）
 
-        # 加载用户配置
-        self.load_config()
+        # 上次写出（或读入）的配置内容，内容不变时不再写文件
+        self._saved_data = None
+        self._writer = ConfigWriter(self.CONFIG_FILE, self.CONFIG_SAVE_DELAY,
+                                    on_error=self._on_write_failed)
+        atexit.register(self.flush)
+
+        # 用户设置延迟到首次访问时加载（见 __getattr__）
+        self._loaded = False
+
+    def __getattr__(self, name):
+        # 只有实例上还不存在的属性才会走到这里
+        if name in USER_SETTINGS and not self.__dict__.get('_loaded', True):
+            self._apply_user_config(self._read_config_file(), overwrite=False)
+            return getattr(self, name)
+        raise AttributeError(f"'Config' object has no attribute '{name}'")
 
     def load_config(self):
-        """从配置文件加载用户设置"""
-        if self.CONFIG_FILE.exists():
-            try:
-                with open(self.CONFIG_FILE, 'r', encoding='utf-8') as f:
-                    user_config = json.load(f)
-
-                # 更新配置
-                self.window_x = user_config.get('window_x', None)
-                self.window_y = user_config.get('window_y', None)
-                self.WINDOW_OPACITY = user_config.get('opacity', 1.0)
-                self.DEFAULT_PET = user_config.get('pet_type', 'pikachu')
-
-                print(f"[Config] Loaded config file")
-            except Exception as e:
-                print(f"[Config] Failed to load config: {e}")
-                self.window_x = None
-                self.window_y = None
-        else:
-            self.window_x = None
-            self.window_y = None
+        """从配置文件加载用户设置（覆盖当前值）"""
+        self._apply_user_config(self._read_config_file(), overwrite=True)
+
+    def _read_config_file(self):
+        if not self.CONFIG_FILE.exists():
+            return {}
+
+        try:
+            with open(self.CONFIG_FILE, 'r', encoding='utf-8') as f:
+                user_config = json.load(f)
+            self._saved_data = user_config
+            _log().debug("Loaded config file")
+            return user_config
+        except Exception as e:
+            _log().warning("Failed to load config: %s", e)
+            return {}
+
+    def _apply_user_config(self, user_config, overwrite):
+        """
+        应用用户设置
+
+        Args:
+            user_config: 配置文件内容（字典）
+            overwrite: 为 False 时保留加载前已经被代码显式设置的属性
+        """
+        for attr, (key, default) in USER_SETTINGS.items():
+            if overwrite or attr not in self.__dict__:
+                setattr(self, attr, user_config.get(key, default))
+        self._loaded = True
 
     def save_config(self, window_x=None, window_y=None):
-        """保存配置到文件"""
+        """
+        保存配置到文件（后台延迟写入）
+
+        连续多次调用会合并为一次写入；配置内容没有变化时不写文件。
+        需要确保已写出时调用 flush()。
+        """
+        if window_x is not None:
+            self.window_x = window_x
+        if window_y is not None:
+            self.window_y = window_y
+
         config_data = {
-            'window_x': window_x if window_x is not None else self.window_x,
-            'window_y': window_y if window_y is not None else self.window_y,
+            'window_x': self.window_x,
+            'window_y': self.window_y,
             'opacity': self.WINDOW_OPACITY,
-            'pet_type': self.DEFAULT_PET
+            'pet_type': self.DEFAULT_PET,
+            'animation_speed': self.ANIMATION_SPEED,
+            'max_fps': self.MAX_FPS
         }
 
-        try:
-            with open(self.CONFIG_FILE, 'w', encoding='utf-8') as f:
-                json.dump(config_data, f, indent=4, ensure_ascii=False)
-            print(f"[Config] Config saved")
-        except Exception as e:
-            print(f"[Config] Failed to save config: {e}")
+        if config_data == self._saved_data:
+            return
+
+        self._saved_data = config_data
+        self._writer.submit(config_data)
+
+    def _on_write_failed(self, data):
+        """写入失败：忘记这份内容，之后相同内容的保存仍会重新写入"""
+        if self._saved_data is data:
+            self._saved_data = None
+
+    def is_dirty(self):
+        """是否有尚未写出的配置"""
+        return self._writer.has_pending()
+
+    def flush(self):
+        """立即写出尚未保存的配置（退出前调用）"""
+        self._writer.flush()
 
     def get_pet_sprite_dir(self, pet_name=None):
         """获取宠物精灵图目录"""
@@ -0,0 +1,238 @@
+"""
+动画调度模块
+全部动画共用一个高精度时钟，按经过的时间推进，支持全局帧率上限和播放速度
+"""
+
+from PySide6.QtCore import QObject, QTimer, QElapsedTimer, Qt, Signal
+
+from src.config import config
+from src.core.instrumentation import metrics
+
+
+class AnimationScheduler(QObject):
+    """
+    全局动画调度器
+
+    每个动画登记自己下一帧的到期时间，调度器只保留一个单次定时器，
+    指向最早的到期时间（但两次 tick 的间隔不小于帧率上限对应的间隔）。
+    tick 时把经过的时间交给所有已到期的动画：落后多帧的动画直接跳到
+    正确的帧，每个动画每次 tick 最多重绘一次。
+
+    动画对象需要实现 advance(elapsed_ms)：推进经过的（已按速度缩放的）
+    毫秒数，返回距下一帧的毫秒数，返回 None 表示播放结束。
+
+    也可以用 add_callback 登记每个 tick 都要调用的回调（如窗口移动），
+    有回调存在时调度器按帧率上限持续 tick，没有时完全停止。
+    """
+
+    ticked = Signal(float)  # 本次 tick 距上次 tick 的毫秒数
+
+    def __init__(self, max_fps=60, speed=1.0, parent=None):
+        """
+        初始化调度器
+
+        Args:
+            max_fps: 全局帧率上限，None 或 0 表示不限制
+            speed: 播放速度倍率（1.0 为原速）
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self._elapsed = QElapsedTimer()
+        self._elapsed.start()
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self._tick)
+
+        self._due = {}  # 动画 -> 到期时间（毫秒）
+        self._last = {}  # 动画 -> 上次推进的时间（毫秒）
+        self._callbacks = []  # 每个 tick 调用的回调 callback(elapsed_ms)
+        self._in_tick = False
+        self._last_tick = None
+        self.paused = False
+
+        self.speed = speed
+        self.min_interval = 0.0
+        self.set_max_fps(max_fps)
+
+        # 统计计数
+        self.ticks = 0
+        self.frames_advanced = 0
+        self.frames_dropped = 0
+
+    def now(self):
+        """调度器启动后经过的毫秒数（亚毫秒精度）"""
+        return self._elapsed.nsecsElapsed() / 1e6
+
+    def set_max_fps(self, max_fps):
+        """设置全局帧率上限"""
+        self.max_fps = max_fps
+        self.min_interval = 1000.0 / max_fps if max_fps else 0.0
+        self._reschedule()
+
+    def set_speed(self, speed):
+        """设置播放速度倍率，已在播放的动画按新速度重新计算到期时间"""
+        if speed <= 0:
+            raise ValueError("animation speed must be positive")
+
+        now = self.now()
+        for animation, due in self._due.items():
+            remaining = (due - now) * self.speed
+            self._due[animation] = now + remaining / speed
+        self.speed = speed
+        self._reschedule()
+
+    def pause(self):
+        """冻结全部动画（停在当前帧，不再产生任何定时器唤醒）"""
+        if self.paused:
+            return
+        self.paused = True
+        self._paused_at = self.now()
+        self._timer.stop()
+
+    def resume(self):
+        """从冻结中恢复，冻结期间的时间不计入动画进度"""
+        if not self.paused:
+            return
+        self.paused = False
+        frozen = self.now() - self._paused_at
+        for animation in self._due:
+            self._due[animation] += frozen
+            self._last[animation] += frozen
+        if self._last_tick is not None:
+            self._last_tick += frozen
+        self._reschedule()
+
+    def add(self, animation, delay):
+        """
+        登记动画，delay 毫秒（未按速度缩放）后推进
+
+        Args:
+            animation: 实现了 advance(elapsed_ms) 的对象
+            delay: 距下一帧的毫秒数
+        """
+        if self._in_tick:
+            now = self._last_tick
+        elif self.paused:
+            now = self._paused_at  # 冻结期间登记的动画，恢复时再开始计时
+        else:
+            now = self.now()
+        self._last[animation] = now
+        self._due[animation] = now + delay / self.speed
+        if not self._in_tick:
+            self._reschedule()
+
+    def remove(self, animation):
+        """取消动画的登记"""
+        self._last.pop(animation, None)
+        if self._due.pop(animation, None) is not None and not self._in_tick:
+            self._reschedule()
+
+    def is_active(self, animation):
+        """动画是否在调度中"""
+        return animation in self._due
+
+    def active_count(self):
+        """调度中的动画数量"""
+        return len(self._due)
+
+    def add_callback(self, callback):
+        """登记每个 tick 都调用的回调 callback(elapsed_ms)"""
+        if callback not in self._callbacks:
+            self._callbacks.append(callback)
+            if not self._in_tick:
+                self._reschedule()
+
+    def remove_callback(self, callback):
+        """取消每个 tick 的回调"""
+        if callback in self._callbacks:
+            self._callbacks.remove(callback)
+
+    def record_frames(self, advanced, dropped=0):
+        """动画在 advance 中上报推进和跳过的帧数"""
+        self.frames_advanced += advanced
+        self.frames_dropped += dropped
+
+    def stats(self):
+        """
+        获取调度统计
+
+        Returns:
+            包含 tick 次数、推进帧数、跳过帧数、活动动画数的字典
+        """
+        return {
+            'ticks': self.ticks,
+            'frames_advanced': self.frames_advanced,
+            'frames_dropped': self.frames_dropped,
+            'active': len(self._due),
+            'callbacks': len(self._callbacks),
+            'max_fps': self.max_fps,
+            'speed': self.speed,
+            'paused': self.paused,
+        }
+
+    def _reschedule(self):
+        if self.paused:
+            return
+
+        if not self._due and not self._callbacks:
+            self._timer.stop()
+            return
+
+        now = self.now()
+        if self._callbacks:
+            target = now  # 有逐帧回调时按帧率上限持续 tick
+        else:
+            target = min(self._due.values())
+
+        # 帧率上限：距上次 tick 不足最小间隔时推迟
+        if self._last_tick is not None:
+            target = max(target, self._last_tick + self.min_interval)
+
+        wait = max(0, int(target - now + 0.999))
+        if not self._timer.isActive() or abs(self._timer.remainingTime() - wait) > 1:
+            self._timer.start(wait)
+
+    def _tick(self):
+        now = self.now()
+        elapsed = now - self._last_tick if self._last_tick is not None else 0.0
+        self._last_tick = now
+        self.ticks += 1
+
+        self._in_tick = True
+        try:
+            due = [animation for animation, deadline in self._due.items() if deadline <= now]
+            for animation in due:
+                if self._due.pop(animation, None) is None:
+                    continue  # 已被前面的动画回调移除
+                scaled = (now - self._last.pop(animation)) * self.speed
+                remaining = animation.advance(scaled)
+
+                # advance 过程中动画可能已经重新 add（如切换到另一段动画）
+                if remaining is not None and animation not in self._due:
+                    self._last[animation] = now
+                    self._due[animation] = now + remaining / self.speed
+
+            for callback in list(self._callbacks):
+                callback(elapsed)
+        finally:
+            self._in_tick = False
+
+        self.ticked.emit(elapsed)
+        metrics.record('tick', self.now() - now)
+        self._reschedule()
+
+
+_shared_scheduler = None
+
+
+def shared_scheduler():
+    """获取进程内共享的动画调度器（帧率上限和速度取自配置）"""
+    global _shared_scheduler
+    if _shared_scheduler is None:
+        _shared_scheduler = AnimationScheduler(
+            max_fps=config.MAX_FPS,
+            speed=config.ANIMATION_SPEED
+        )
+    return _shared_scheduler
@@ -0,0 +1,143 @@
+"""
+异步资源加载模块
+在线程池中解码动画帧，完成后通过信号交回 GUI 线程
+"""
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+from src.core.frame_diff import build_damage_rects
+from src.core.hit_mask import build_hit_masks
+from src.core.log import get_logger
+from src.core.resource_loader import level_size
+from src.core.sprite_sheet import SheetFrames
+
+log = get_logger('AsyncLoader')
+
+
+class _DecodeSignals(QObject):
+    """工作线程向 GUI 线程回传结果用的信号（对象本身属于 GUI 线程）"""
+
+    finished = Signal(object, int, object)  # 请求键, 请求代数, (images, delays, loop_count, masks, damage) 或 None
+
+
+class _DecodeTask(QRunnable):
+    """后台解码任务：只操作 QImage，不接触任何 QPixmap 或控件（命中遮罩和重绘区域也在这里计算）"""
+
+    def __init__(self, resource_loader, key, generation, signals):
+        super().__init__()
+        self.resource_loader = resource_loader
+        self.key = key
+        self.generation = generation
+        self.signals = signals
+
+    def run(self):
+        _, filename, size, scale = self.key
+        try:
+            result = self.resource_loader.load_frame_images(filename, level_size(size, scale))
+            if result is not None:
+                images = result[0]
+                # 精灵表的遮罩和重绘区域在生成图集时已经算好
+                if isinstance(images, SheetFrames):
+                    result = (*result, images.masks, images.damage)
+                else:
+                    result = (*result, build_hit_masks(images), build_damage_rects(images))
+        except Exception as e:
+            log.warning("Failed to decode %s: %s", filename, e)
+            result = None
+        self.signals.finished.emit(self.key, self.generation, result)
+
+
+class AsyncFrameLoader(QObject):
+    """
+    后台帧加载器
+
+    解码在线程池中进行，QPixmap 的创建和缓存写入在 GUI 线程完成。
+    同一动画的重复请求会合并为一次解码。
+    """
+
+    frameSetReady = Signal(object, object)  # 请求标识（如动画名称）, FrameSet
+    loadFailed = Signal(object)  # 请求标识
+
+    def __init__(self, resource_loader, max_threads=2, parent=None):
+        """
+        初始化异步加载器
+
+        Args:
+            resource_loader: 负责实际读取的 ResourceLoader
+            max_threads: 线程池最大线程数
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self.resource_loader = resource_loader
+
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+
+        self._signals = _DecodeSignals(self)
+        self._signals.finished.connect(self._on_task_finished)
+        self._pending = {}  # 请求键 -> 等待该结果的动画名称列表
+        self._generations = {}  # 请求键 -> 最新一次解码的代数，旧代数的结果被丢弃
+        self._next_generation = 0
+
+    def request(self, name, filename, size=None, force=False, scale=1.0):
+        """
+        请求加载动画
+
+        内存缓存命中时立即发出 frameSetReady，否则提交到线程池。
+
+        Args:
+            name: 请求标识，通常是动画名称（信号中原样返回）
+            filename: 文件名（相对于 sprite_dir）或绝对路径
+            size: 可选的缩放尺寸 (width, height)
+            force: 文件已变化，忽略内存缓存并重新解码；
+                   正在进行的同一解码结果作废，等待者改为等待新的结果
+            scale: 多分辨率级别倍率
+        """
+        if not force:
+            frame_set = self.resource_loader.get_cached_frames(filename, size, scale)
+            if frame_set is not None:
+                self.frameSetReady.emit(name, frame_set)
+                return
+
+        key = ('frames', str(filename), size, scale)
+        waiting = self._pending.get(key)
+        if waiting is not None:
+            if name not in waiting:
+                waiting.append(name)
+            if not force:
+                return
+        else:
+            self._pending[key] = [name]
+
+        self._next_generation += 1
+        self._generations[key] = self._next_generation
+        self.pool.start(_DecodeTask(self.resource_loader, key, self._next_generation, self._signals))
+
+    def is_busy(self):
+        """是否还有未完成的请求"""
+        return bool(self._pending)
+
+    def shutdown(self):
+        """取消排队中的任务并等待正在运行的任务结束"""
+        self.pool.clear()
+        self.pool.waitForDone()
+        self._pending.clear()
+        self._generations.clear()
+
+    def _on_task_finished(self, key, generation, result):
+        if self._generations.get(key) != generation:
+            return  # 已被 shutdown 取消，或已有更新的解码
+        del self._generations[key]
+        names = self._pending.pop(key)
+
+        if result is None:
+            for name in names:
+                self.loadFailed.emit(name)
+            return
+
+        _, filename, size, scale = key
+        images, delays, loop_count, masks, damage = result
+        frame_set = self.resource_loader.add_frames(filename, size, images, delays, loop_count,
+                                                    masks, scale=scale, damage=damage)
+        for name in names:
+            self.frameSetReady.emit(name, frame_set)
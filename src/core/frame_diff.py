@@ -0,0 +1,70 @@
+"""
+帧差异模块
+加载帧时预先计算相邻两帧之间发生变化的像素的包围矩形，
+播放时只重绘这块区域（只比较字节，可以在工作线程中调用）
+"""
+
+from PySide6.QtCore import QRect
+
+from src.core.sprite_cache import FRAME_FORMAT
+
+
+def _rows(image):
+    """按紧凑行宽返回每行像素的 bytes 列表"""
+    if image.format() != FRAME_FORMAT:
+        image = image.convertToFormat(FRAME_FORMAT)
+    row_bytes = image.width() * 4
+    stride = image.bytesPerLine()
+    data = bytes(image.constBits())
+    return [data[y * stride:y * stride + row_bytes] for y in range(image.height())]
+
+
+def changed_rect(previous, current, rows=None):
+    """
+    两帧之间变化像素的包围矩形
+
+    先逐行比较 bytes 找出变化的行，只对这些行把像素转成整数异或，
+    由最低和最高的非零位得到变化的列范围。
+
+    Args:
+        previous: 前一帧 QImage
+        current: 当前帧 QImage
+        rows: 可选的 (前一帧行列表, 当前帧行列表)，批量计算时复用
+
+    Returns:
+        QRect（像素坐标），两帧完全相同时为空矩形；尺寸不同时为两帧的并集
+    """
+    if previous.size() != current.size():
+        return previous.rect().united(current.rect())
+
+    rows_a, rows_b = rows if rows is not None else (_rows(previous), _rows(current))
+    changed = [y for y, (a, b) in enumerate(zip(rows_a, rows_b)) if a != b]
+    if not changed:
+        return QRect()
+
+    left = current.width()
+    right = -1
+    for y in changed:
+        v = int.from_bytes(rows_a[y], 'little') ^ int.from_bytes(rows_b[y], 'little')
+        left = min(left, ((v & -v).bit_length() - 1) // 32)
+        right = max(right, (v.bit_length() - 1) // 32)
+    return QRect(left, changed[0], right - left + 1, changed[-1] - changed[0] + 1)
+
+
+def build_damage_rects(images):
+    """
+    为一组循环播放的帧计算重绘区域
+
+    Args:
+        images: QImage 列表
+
+    Returns:
+        与 images 一一对应的 QRect 列表，第 i 项是从第 i - 1 帧切换到第 i 帧时
+        需要重绘的区域（第 0 项对应从最后一帧回到第一帧）
+    """
+    if len(images) < 2:
+        return [QRect() for _ in images]
+
+    rows = [_rows(image) for image in images]
+    return [changed_rect(images[i - 1], images[i], (rows[i - 1], rows[i]))
+            for i in range(len(images))]
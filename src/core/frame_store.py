@@ -0,0 +1,254 @@
+"""
+帧集合仓库模块
+同一进程内的所有宠物按（物种、动画、尺寸、分辨率级别）共享已解码的帧集合
+"""
+
+from PySide6.QtCore import QObject, Signal
+
+from src.config import config
+from src.core.async_loader import AsyncFrameLoader
+from src.core.log import get_logger
+from src.core.memory_cache import MemoryCache
+from src.core.resource_loader import ResourceLoader
+from src.core.sprite_cache import SpriteCache
+from src.core.sprite_sheet import SHEET_NAME
+
+log = get_logger('FrameStore')
+
+
+class FrameStore(QObject):
+    """
+    引用计数的共享帧集合仓库
+
+    每个物种只有一个 ResourceLoader 和一个后台加载器，
+    同一 (物种, 动画, 尺寸, 级别) 无论被多少只宠物使用都只解码、只占用一份内存；
+    不同屏幕上的宠物按各自屏幕的设备像素比使用不同的分辨率级别。
+    资源文件变化时可以只重新加载受影响的动画，新帧集合就绪后整体替换旧的。
+    """
+
+    frameSetReplaced = Signal(object, object)  # (物种, 动画, 尺寸, 级别), 新的 FrameSet
+    animationsReloaded = Signal(str)  # 物种：资源文件变化已处理（动画可能有增删）
+
+    def __init__(self, disk_cache=None, memory_cache=None, parent=None):
+        """
+        初始化帧仓库
+
+        Args:
+            disk_cache: 可选的 SpriteCache，所有物种共用
+            memory_cache: 可选的 MemoryCache，所有物种共用同一预算
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self.disk_cache = disk_cache
+        self.memory_cache = memory_cache
+
+        self._loaders = {}  # 物种 -> ResourceLoader
+        self._async_loaders = {}  # 物种 -> AsyncFrameLoader
+        self._sets = {}  # (物种, 动画, 尺寸, 级别) -> FrameSet
+        self._refs = {}  # (物种, 动画, 尺寸, 级别) -> 引用计数
+        self._callbacks = {}  # (物种, 动画, 尺寸, 级别) -> 等待中的回调列表
+        self._reloading = set()  # 正在重新加载的 (物种, 动画, 尺寸, 级别)
+        self.reloads = 0
+
+    @classmethod
+    def from_config(cls, parent=None):
+        """按全局配置创建带磁盘缓存和内存预算的仓库"""
+        return cls(
+            disk_cache=SpriteCache(config.SPRITE_CACHE_DIR, config.SPRITE_CACHE_MAX_BYTES),
+            memory_cache=MemoryCache(config.MEMORY_CACHE_BUDGET),
+            parent=parent
+        )
+
+    def loader(self, species):
+        """获取物种共享的 ResourceLoader"""
+        loader = self._loaders.get(species)
+        if loader is None:
+            loader = ResourceLoader(
+                config.get_pet_sprite_dir(species),
+                disk_cache=self.disk_cache,
+                memory_cache=self.memory_cache,
+                use_pack=config.USE_SPRITE_PACKS,
+                batch_scale=config.NUMPY_PREPROCESS,
+                delta_frames=config.DELTA_FRAMES,
+                delta_min_saving=config.DELTA_MIN_SAVING
+            )
+            if self.memory_cache is None:
+                # 未指定时让所有物种共用第一个加载器创建的缓存
+                self.memory_cache = loader.memory_cache
+            self._loaders[species] = loader
+        return loader
+
+    def request(self, species, name, size, callback, scale=1.0):
+        """
+        请求一个帧集合，就绪后以 callback(frame_set) 回调
+
+        回调成功时引用计数加一，使用方不再需要时必须调用 release。
+        加载失败时回调参数为 None，且不增加引用计数。
+
+        Args:
+            species: 物种（精灵图目录名）
+            name: 动画名称（如 'idle'）
+            size: 缩放尺寸 (width, height)（逻辑尺寸）
+            callback: 回调函数
+            scale: 多分辨率级别倍率（帧按 size * scale 像素解码）
+        """
+        key = (species, name, size, scale)
+
+        frame_set = self._sets.get(key)
+        if frame_set is not None:
+            self._refs[key] += 1
+            callback(frame_set)
+            return
+
+        waiting = self._callbacks.get(key)
+        if waiting is not None:
+            waiting.append(callback)
+            return
+
+        path = self.loader(species).get_animation_path(name)
+        if path is None:
+            callback(None)
+            return
+
+        self._callbacks[key] = [callback]
+        self._async_loader(species).request(key, path, size, scale=scale)
+
+    def cancel(self, species, name, size, callback, scale=1.0):
+        """取消尚未完成的请求（后台解码仍会完成，结果留在内存缓存中）"""
+        key = (species, name, size, scale)
+        waiting = self._callbacks.get(key)
+        if waiting and callback in waiting:
+            waiting.remove(callback)
+        if not waiting and waiting is not None:
+            # 没有等待者时不再视为正在使用，热加载不会为它重新解码
+            del self._callbacks[key]
+
+    def release(self, species, name, size, scale=1.0):
+        """释放一次引用，引用归零后不再固定该帧集合（仍可能留在内存缓存中）"""
+        key = (species, name, size, scale)
+        count = self._refs.get(key, 0) - 1
+        if count > 0:
+            self._refs[key] = count
+            return
+
+        self._refs.pop(key, None)
+        self._sets.pop(key, None)
+
+    def reload_animations(self, species, names):
+        """
+        资源文件变化后重新加载指定动画
+
+        只有正在使用或正在加载的动画会在后台重新解码，其余动画只清除缓存，
+        下次请求时自然读到新文件。重新加载失败时继续使用旧的帧集合。
+
+        Args:
+            species: 物种
+            names: 发生变化的动画名称列表（'sheet' 表示精灵表清单或图像变化）
+        """
+        loader = self._loaders.get(species)
+        if loader is None:
+            return  # 该物种还没有被使用过
+
+        sheet_files = {SHEET_NAME}
+        if loader.sheet is not None:
+            sheet_files.add(loader.sheet.image_path.stem)
+        if sheet_files.intersection(names):
+            # 精灵表变化：重新读取清单，表中的全部动画都要重新加载
+            sheet_names = loader.reload_sheet()
+            names = [name for name in names if name not in sheet_files]
+            names += [name for name in sheet_names if name not in names]
+
+        for name in names:
+            loader.invalidate(name)
+
+            keys = [key for key in list(self._sets) + list(self._callbacks)
+                    if key[0] == species and key[1] == name]
+            if not keys:
+                continue
+
+            path = loader.get_animation_path(name)
+            if path is None:
+                log.warning("%s/%s was removed, keeping old frames", species, name)
+                continue
+
+            for key in keys:
+                if key in self._sets:
+                    self._reloading.add(key)
+                self._async_loader(species).request(key, path, key[2], force=True, scale=key[3])
+                log.debug("Reloading %s/%s %s @%sx", species, name, key[2], key[3])
+
+        self.animationsReloaded.emit(species)
+
+    def reload_pack(self, species):
+        """精灵包变化后重新打开，并重新加载内容变化的动画"""
+        loader = self._loaders.get(species)
+        if loader is None:
+            return
+
+        changed = loader.reload_pack()
+        log.info("Sprite pack for %s changed: %s", species, changed or 'no animation changes')
+        self.reload_animations(species, changed)
+
+    def ref_count(self, species, name, size, scale=1.0):
+        """当前引用计数"""
+        return self._refs.get((species, name, size, scale), 0)
+
+    def stats(self):
+        """
+        获取仓库统计
+
+        Returns:
+            包含帧集合数量、总引用数、固定占用字节的字典
+        """
+        return {
+            'frame_sets': len(self._sets),
+            'references': sum(self._refs.values()),
+            'bytes': sum(frame_set.nbytes for frame_set in self._sets.values()),
+            'reloads': self.reloads,
+        }
+
+    def shutdown(self):
+        """停止全部后台加载、关闭精灵包并写回磁盘缓存索引"""
+        for async_loader in self._async_loaders.values():
+            async_loader.shutdown()
+        self._callbacks.clear()
+        self._reloading.clear()
+
+        for loader in self._loaders.values():
+            loader.close()
+        if self.disk_cache is not None:
+            self.disk_cache.flush()
+
+    def _async_loader(self, species):
+        async_loader = self._async_loaders.get(species)
+        if async_loader is None:
+            async_loader = AsyncFrameLoader(self.loader(species), parent=self)
+            async_loader.frameSetReady.connect(self._on_frame_set_ready)
+            async_loader.loadFailed.connect(self._on_load_failed)
+            self._async_loaders[species] = async_loader
+        return async_loader
+
+    def _on_frame_set_ready(self, key, frame_set):
+        if key in self._reloading:
+            self._reloading.discard(key)
+            # 期间所有引用都已释放时不再固定新的帧集合
+            if key in self._sets:
+                self._sets[key] = frame_set
+                self.reloads += 1
+                self.frameSetReplaced.emit(key, frame_set)
+
+        callbacks = self._callbacks.pop(key, [])
+        if callbacks:
+            self._sets[key] = frame_set
+            self._refs[key] = self._refs.get(key, 0) + len(callbacks)
+
+        for callback in callbacks:
+            callback(frame_set)
+
+    def _on_load_failed(self, key):
+        if key in self._reloading:
+            self._reloading.discard(key)
+            log.warning("Failed to reload %s/%s, keeping old frames", key[0], key[1])
+
+        for callback in self._callbacks.pop(key, []):
+            callback(None)
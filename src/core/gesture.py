@@ -0,0 +1,262 @@
+"""
+手势识别模块
+把按下、移动、释放的指针事件流分类为点击、双击、长按、拖拽和甩出。
+只根据传入的时间戳（毫秒）和坐标判断，不持有定时器，可以直接用合成的事件序列驱动；
+需要超时判断（长按、等待双击）时由调用方按 deadline() 安排一次 poll()
+"""
+
+import math
+from collections import deque
+
+
+# 手势类型（点击类手势的名称同时用作状态机事件名）
+CLICK = 'click'
+DOUBLE_CLICK = 'double_click'
+LONG_PRESS = 'long_press'
+DRAG_START = 'drag_start'
+DRAG_MOVE = 'drag_move'
+DRAG_END = 'drag_end'
+FLING = 'fling'
+
+# 释放前参与估算速度的时间窗口（毫秒），停住不动超过这段时间再松手不算甩出
+VELOCITY_WINDOW = 80.0
+
+# 默认参数（窗口使用系统设置，见 PetWindow）
+DEFAULT_DRAG_DISTANCE = 6
+DEFAULT_DOUBLE_CLICK_INTERVAL = 400
+DEFAULT_LONG_PRESS = 800
+
+
+class Gesture:
+    """识别出的一个手势"""
+
+    __slots__ = ('kind', 'x', 'y', 'vx', 'vy')
+
+    def __init__(self, kind, x, y, vx=0.0, vy=0.0):
+        """
+        Args:
+            kind: 手势类型（CLICK、DRAG_MOVE 等）
+            x, y: 手势发生的位置（与输入事件相同的坐标系）
+            vx, vy: 释放时的速度（像素/秒），只有 DRAG_END 和 FLING 有意义
+        """
+        self.kind = kind
+        self.x = x
+        self.y = y
+        self.vx = vx
+        self.vy = vy
+
+    def __eq__(self, other):
+        return isinstance(other, Gesture) and (self.kind, self.x, self.y, self.vx, self.vy) == \
+            (other.kind, other.x, other.y, other.vx, other.vy)
+
+    def __repr__(self):
+        if self.kind in (DRAG_END, FLING):
+            return f"Gesture({self.kind}, {self.x}, {self.y}, v=({self.vx:.0f}, {self.vy:.0f}))"
+        return f"Gesture({self.kind}, {self.x}, {self.y})"
+
+
+class GestureRecognizer:
+    """
+    单个指针的手势识别器
+
+    - 按下后移动超过 drag_distance（欧氏距离）开始拖拽，之后每次移动报告 DRAG_MOVE；
+      释放时报告 DRAG_END，速度达到 fling_speed 时再报告 FLING（速度不超过 max_fling_speed）
+    - 按住不动达到 long_press 毫秒报告 LONG_PRESS，之后松手不再算点击
+    - 松手时报告 CLICK；距上次点击不超过 double_click_interval 的第二次点击报告 DOUBLE_CLICK
+      （代替 CLICK，快速连点不会反复触发同一个点击动作）
+    - defer_click 为 True 时 CLICK 推迟到双击间隔结束后才报告，双击不会先触发一次单击
+
+    press/move/release/poll 都返回本次识别出的 Gesture 列表（通常为空或一项）。
+    """
+
+    def __init__(self, drag_distance=DEFAULT_DRAG_DISTANCE,
+                 double_click_interval=DEFAULT_DOUBLE_CLICK_INTERVAL,
+                 long_press=DEFAULT_LONG_PRESS, fling_speed=600.0, max_fling_speed=3000.0,
+                 defer_click=False):
+        """
+        Args:
+            drag_distance: 开始拖拽的移动距离（像素）
+            double_click_interval: 双击的最大间隔（毫秒，上次松手到这次按下）
+            long_press: 长按时间（毫秒），0 表示不识别长按
+            fling_speed: 拖拽松手时识别为甩出的最低速度（像素/秒）
+            max_fling_speed: 甩出速度上限（像素/秒）
+            defer_click: 是否推迟单击直到确认不是双击
+        """
+        self.drag_distance = drag_distance
+        self.double_click_interval = double_click_interval
+        self.long_press = long_press
+        self.fling_speed = fling_speed
+        self.max_fling_speed = max_fling_speed
+        self.defer_click = defer_click
+        self.reset()
+
+    def reset(self):
+        """放弃进行中的手势（如窗口隐藏、失去鼠标捕获）"""
+        self.down = False
+        self.dragging = False
+        self._press = None  # 按下时的 (时间, x, y)
+        self._long_pressed = False
+        self._second = False  # 这次按下可能是双击的第二下
+        self._last_click = None  # 上次点击松手时的 (时间, x, y)
+        self._pending = False  # _last_click 的 CLICK 尚未报告（defer_click）
+        self._samples = deque()  # 最近的 (时间, x, y)，用于估算松手速度
+
+    def press(self, x, y, t):
+        """
+        指针按下
+
+        Args:
+            x, y: 位置
+            t: 时间戳（毫秒）
+        """
+        gestures = []
+        last = self._last_click
+        if last is not None and t - last[0] <= self.double_click_interval \
+                and self._near(last[1], last[2], x, y):
+            self._second = True
+        else:
+            self._flush_click(gestures)
+            self._second = False
+            self._last_click = None
+
+        self.down = True
+        self.dragging = False
+        self._long_pressed = False
+        self._press = (t, x, y)
+        self._samples.clear()
+        self._samples.append((t, x, y))
+        return gestures
+
+    def move(self, x, y, t):
+        """指针移动（未按下时忽略）"""
+        if not self.down:
+            return []
+
+        self._sample(x, y, t)
+        if self.dragging:
+            return [Gesture(DRAG_MOVE, x, y)]
+
+        _, px, py = self._press
+        if self._near(px, py, x, y):
+            return []
+
+        gestures = []
+        self._end_double(gestures)
+        self.dragging = True
+        gestures.append(Gesture(DRAG_START, px, py))
+        gestures.append(Gesture(DRAG_MOVE, x, y))
+        return gestures
+
+    def release(self, x, y, t):
+        """指针释放（未按下时忽略）"""
+        if not self.down:
+            return []
+
+        self.down = False
+        # 松手位置通常与最后一次移动相同，不作为样本（否则会拉低速度）
+        if (x, y) != self._samples[-1][1:]:
+            self._sample(x, y, t)
+        gestures = []
+
+        if self.dragging:
+            self.dragging = False
+            vx, vy = self.velocity(t)
+            gestures.append(Gesture(DRAG_END, x, y, vx, vy))
+            speed = math.hypot(vx, vy)
+            if speed >= self.fling_speed:
+                if speed > self.max_fling_speed:
+                    vx *= self.max_fling_speed / speed
+                    vy *= self.max_fling_speed / speed
+                gestures.append(Gesture(FLING, x, y, vx, vy))
+        elif self._long_pressed:
+            pass
+        elif self._second:
+            # 双击代替第二次单击；推迟的第一次单击不再报告
+            self._second = False
+            self._pending = False
+            self._last_click = None
+            gestures.append(Gesture(DOUBLE_CLICK, x, y))
+        else:
+            self._last_click = (t, x, y)
+            if self.defer_click:
+                self._pending = True
+            else:
+                gestures.append(Gesture(CLICK, x, y))
+        return gestures
+
+    def poll(self, t):
+        """
+        超时检查（在 deadline() 给出的时间调用，提前或多调用都没有副作用）
+
+        Returns:
+            到时的 LONG_PRESS 或推迟的 CLICK
+        """
+        gestures = []
+        if self.down and not self.dragging and not self._long_pressed and self.long_press \
+                and t - self._press[0] >= self.long_press:
+            self._end_double(gestures)
+            self._long_pressed = True
+            gestures.append(Gesture(LONG_PRESS, self._press[1], self._press[2]))
+
+        last = self._last_click
+        if not self.down and last is not None and t - last[0] > self.double_click_interval:
+            self._flush_click(gestures)
+            self._last_click = None
+        return gestures
+
+    def deadline(self):
+        """
+        下一次需要调用 poll() 的时间
+
+        Returns:
+            时间戳（毫秒），没有等待中的超时时返回 None
+        """
+        if self.down:
+            if self.dragging or self._long_pressed or not self.long_press:
+                return None
+            return self._press[0] + self.long_press
+        if self._pending:
+            return self._last_click[0] + self.double_click_interval + 1
+        return None
+
+    def velocity(self, t):
+        """
+        最近 VELOCITY_WINDOW 毫秒内的平均速度
+
+        Returns:
+            (vx, vy) 像素/秒
+        """
+        samples = self._samples
+        while len(samples) > 1 and t - samples[0][0] > VELOCITY_WINDOW:
+            samples.popleft()
+        t0, x0, y0 = samples[0]
+        t1, x1, y1 = samples[-1]
+        if t1 - t0 <= 0 or t - t0 > VELOCITY_WINDOW:
+            return 0.0, 0.0
+        dt = (t1 - t0) / 1000.0
+        return (x1 - x0) / dt, (y1 - y0) / dt
+
+    def _sample(self, x, y, t):
+        samples = self._samples
+        samples.append((t, x, y))
+        while len(samples) > 2 and t - samples[1][0] >= VELOCITY_WINDOW:
+            samples.popleft()
+
+    def _near(self, x0, y0, x1, y1):
+        dx = x1 - x0
+        dy = y1 - y0
+        return dx * dx + dy * dy <= self.drag_distance * self.drag_distance
+
+    def _flush_click(self, gestures):
+        """报告推迟的单击"""
+        if self._pending:
+            self._pending = False
+            _, x, y = self._last_click
+            gestures.append(Gesture(CLICK, x, y))
+
+    def _end_double(self, gestures):
+        """第二次按下变成了拖拽或长按：不是双击，补报推迟的单击"""
+        if self._second:
+            self._second = False
+            self._flush_click(gestures)
+            self._last_click = None
@@ -0,0 +1,161 @@
+"""
+命中测试模块
+加载帧时预先计算每帧的 1 位透明度遮罩，点击检测和窗口形状遮罩
+只查表，不在播放过程中读取任何像素
+"""
+
+from PySide6.QtCore import QRect
+from PySide6.QtGui import QRegion, QTransform
+
+
+class HitMask:
+    """
+    一帧图像的 1 位命中遮罩（按行打包，每行 4 字节对齐，低位在前）
+
+    不透明度达到一半的像素算作命中。遮罩只包含 bytes，可以在工作线程中创建；
+    窗口形状用的 QRegion 在第一次需要时由行程编码构建并缓存。
+    """
+
+    __slots__ = ('width', 'height', 'stride', 'bits', '_spans', '_region', '_scaled')
+
+    def __init__(self, width, height, stride, bits):
+        """
+        Args:
+            width: 帧宽度（像素）
+            height: 帧高度（像素）
+            stride: 每行字节数
+            bits: 打包的遮罩数据（bytes），第 y 行第 x 个像素为
+                  bits[y * stride + x // 8] 的第 x % 8 位
+        """
+        self.width = width
+        self.height = height
+        self.stride = stride
+        self.bits = bits
+        self._spans = None
+        self._region = None
+        self._scaled = None  # (倍率, 按逻辑坐标缩放后的区域)
+
+    @classmethod
+    def from_image(cls, image):
+        """
+        由帧图像创建遮罩（QImage 操作，线程安全）
+
+        Args:
+            image: 带透明通道的 QImage
+
+        Returns:
+            HitMask 对象，图像没有透明通道时返回 None（整帧都可点击）
+        """
+        if image.isNull() or not image.hasAlphaChannel():
+            return None
+
+        mask = image.createAlphaMask()  # Format_MonoLSB，不透明像素为 1
+        if mask.isNull():
+            return None
+        stride = mask.bytesPerLine()
+        bits = bytes(mask.constBits())[:stride * mask.height()]
+        return cls(mask.width(), mask.height(), stride, bits)
+
+    @property
+    def nbytes(self):
+        """遮罩数据占用的内存（字节）"""
+        return len(self.bits)
+
+    def contains(self, x, y):
+        """
+        像素是否命中
+
+        Args:
+            x: 帧内横坐标
+            y: 帧内纵坐标
+
+        Returns:
+            坐标在帧内且该像素不透明时为 True
+        """
+        if x < 0 or y < 0 or x >= self.width or y >= self.height:
+            return False
+        return bool(self.bits[y * self.stride + (x >> 3)] >> (x & 7) & 1)
+
+    def spans(self):
+        """
+        行程编码
+
+        Returns:
+            每行一个 ((起始 x, 长度), ...) 元组组成的列表
+        """
+        if self._spans is not None:
+            return self._spans
+
+        width, stride, bits = self.width, self.stride, self.bits
+        row_mask = (1 << width) - 1
+        spans = []
+        for y in range(self.height):
+            start = y * stride
+            v = int.from_bytes(bits[start:start + stride], 'little') & row_mask
+            row = []
+            x = 0
+            while v:
+                skip = (v & -v).bit_length() - 1  # 跳过透明像素
+                v >>= skip
+                x += skip
+                run = (~v & (v + 1)).bit_length() - 1  # 连续不透明像素
+                row.append((x, run))
+                v >>= run
+                x += run
+            spans.append(tuple(row))
+
+        self._spans = spans
+        return spans
+
+    def region(self, dx=0, dy=0, scale=1.0):
+        """
+        窗口形状遮罩用的区域（相同行合并为一个矩形）
+
+        Args:
+            dx: 帧在窗口中的横向偏移
+            dy: 帧在窗口中的纵向偏移
+            scale: 帧的设备像素比，区域按 1 / scale 缩小到窗口的逻辑坐标
+
+        Returns:
+            QRegion 对象（不偏移的区域缓存在遮罩中）
+        """
+        region = self._region
+        if region is None:
+            rects = []
+            spans = self.spans()
+            y = 0
+            while y < self.height:
+                row = spans[y]
+                end = y + 1
+                while end < self.height and spans[end] == row:
+                    end += 1
+                for x, run in row:
+                    rects.append(QRect(x, y, run, end - y))
+                y = end
+
+            region = QRegion()
+            for rect in rects:
+                region = region.united(rect)
+            self._region = region
+
+        if scale != 1:
+            if self._scaled is None or self._scaled[0] != scale:
+                self._scaled = (scale, QTransform.fromScale(1 / scale, 1 / scale).map(region))
+            region = self._scaled[1]
+
+        if dx or dy:
+            return region.translated(dx, dy)
+        return region
+
+
+def build_hit_masks(images):
+    """
+    为一组帧图像创建遮罩
+
+    Args:
+        images: QImage 列表
+
+    Returns:
+        与 images 一一对应的 HitMask（或 None）列表
+    """
+    return [HitMask.from_image(image) for image in images]
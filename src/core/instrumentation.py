@@ -0,0 +1,184 @@
+"""
+性能埋点模块
+热路径上的计数器和计时器（每次记录只做几次字典和算术操作），
+以及汇总各组件统计的快照和 JSON 导出，供调试浮层和离线分析使用
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+
+class TimerStats:
+    """一个计时器的累计结果（毫秒）"""
+
+    __slots__ = ('count', 'total', 'max', 'last')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def add(self, ms):
+        """记录一次耗时"""
+        self.count += 1
+        self.total += ms
+        self.last = ms
+        if ms > self.max:
+            self.max = ms
+
+    def as_dict(self):
+        """转换为字典"""
+        return {
+            'count': self.count,
+            'total_ms': round(self.total, 3),
+            'mean_ms': round(self.total / self.count, 3) if self.count else None,
+            'max_ms': round(self.max, 3),
+            'last_ms': round(self.last, 3),
+        }
+
+
+class Instrumentation:
+    """
+    计数器、计时器和统计来源的注册表
+
+    计数和计时可以在任意线程中调用；统计来源（如调度器、帧仓库的 stats 方法）
+    只在生成快照时调用，平时没有任何开销。
+    """
+
+    def __init__(self):
+        self.enabled = True
+        self.counters = {}
+        self.timers = {}
+        self._providers = {}  # 名称 -> 返回字典的函数
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+
+    def count(self, name, n=1):
+        """计数器加 n"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def record(self, name, ms):
+        """
+        记录一次耗时
+
+        Args:
+            name: 计时器名称（如 'decode'）
+            ms: 耗时（毫秒）
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            stats = self.timers.get(name)
+            if stats is None:
+                stats = self.timers[name] = TimerStats()
+            stats.add(ms)
+
+    @contextmanager
+    def timer(self, name):
+        """计时上下文：with metrics.timer('decode'): ..."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000)
+
+    def add_provider(self, name, provider):
+        """
+        登记统计来源
+
+        Args:
+            name: 快照中的键
+            provider: 无参数函数，返回可 JSON 序列化的字典
+        """
+        self._providers[name] = provider
+
+    def remove_provider(self, name):
+        """取消登记统计来源"""
+        self._providers.pop(name, None)
+
+    def reset(self):
+        """清空计数器和计时器"""
+        with self._lock:
+            self.counters.clear()
+            self.timers.clear()
+        self._started = time.monotonic()
+
+    def snapshot(self):
+        """
+        生成当前统计快照
+
+        Returns:
+            字典：时间戳、运行时长、计数器、计时器和各统计来源的结果
+        """
+        with self._lock:
+            counters = dict(self.counters)
+            timers = {name: stats.as_dict() for name, stats in self.timers.items()}
+
+        sources = {}
+        for name, provider in list(self._providers.items()):
+            try:
+                sources[name] = provider()
+            except Exception as e:
+                sources[name] = {'error': str(e)}
+
+        return {
+            'timestamp': time.time(),
+            'uptime': round(time.monotonic() - self._started, 3),
+            'pid': os.getpid(),
+            'counters': counters,
+            'timers': timers,
+            'sources': sources,
+        }
+
+    def dump(self, path):
+        """
+        把快照写成 JSON 文件（先写临时文件再重命名）
+
+        Args:
+            path: 输出文件路径
+
+        Returns:
+            写入的快照字典
+        """
+        path = Path(path)
+        snapshot = self.snapshot()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, indent=2, ensure_ascii=False, default=str)
+        os.replace(tmp_path, path)
+        return snapshot
+
+
+def process_stats():
+    """
+    当前进程的资源占用（统计来源）
+
+    Returns:
+        字典：常驻内存（字节）、CPU 占用（%，相对上次调用）、线程数
+    """
+    global _process
+    import psutil
+
+    if _process is None:
+        _process = psutil.Process()
+    with _process.oneshot():
+        return {
+            'rss': _process.memory_info().rss,
+            'cpu_percent': _process.cpu_percent(interval=None),
+            'threads': _process.num_threads(),
+        }
+
+
+_process = None
+
+# 全局埋点实例
+metrics = Instrumentation()
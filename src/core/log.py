@@ -0,0 +1,140 @@
+"""
+日志模块
+基于标准库 logging 的分级日志，输出格式与原先的 "[Tag] message" 一致；
+同一条消息在时间窗口内超过次数上限后被抑制，窗口结束后汇报被抑制的条数
+"""
+
+import logging
+import sys
+import threading
+import time
+
+
+# 所有模块日志记录器的父记录器名称
+LOGGER_NAME = 'desktop_pokemon'
+
+# 级别前缀（INFO 和 DEBUG 不加前缀）
+_LEVEL_PREFIX = {
+    logging.WARNING: 'Warning: ',
+    logging.ERROR: 'Error: ',
+    logging.CRITICAL: 'Error: ',
+}
+
+
+class TagFormatter(logging.Formatter):
+    """输出 "[Tag] Warning: message" 格式，Tag 为记录器名称的最后一段"""
+
+    def format(self, record):
+        tag = record.name.rsplit('.', 1)[-1]
+        message = f"[{tag}] {_LEVEL_PREFIX.get(record.levelno, '')}{record.getMessage()}"
+        if record.exc_info:
+            message += '\n' + self.formatException(record.exc_info)
+        return message
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    按消息模板限流
+
+    同一记录器的同一消息模板（格式化前的 msg）在 interval 秒内最多输出 burst 条，
+    其余被丢弃；窗口过后的第一条消息附带被抑制的条数。
+    """
+
+    def __init__(self, burst=5, interval=10.0, clock=time.monotonic):
+        """
+        Args:
+            burst: 每个时间窗口内允许的条数，0 表示不限流
+            interval: 时间窗口（秒）
+            clock: 时间函数
+        """
+        super().__init__()
+        self.burst = burst
+        self.interval = interval
+        self.clock = clock
+        self.suppressed = 0  # 累计抑制的条数
+
+        self._windows = {}  # (记录器名称, msg) -> [窗口开始时间, 已输出条数, 已抑制条数]
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if not self.burst:
+            return True
+
+        key = (record.name, record.msg)
+        now = self.clock()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.interval:
+                dropped = window[2] if window is not None else 0
+                self._windows[key] = [now, 1, 0]
+                if dropped:
+                    record.msg = f"{record.msg} ({dropped} similar messages suppressed)"
+                return True
+
+            if window[1] < self.burst:
+                window[1] += 1
+                return True
+
+            window[2] += 1
+            self.suppressed += 1
+            return False
+
+
+_root = None
+_setup_lock = threading.Lock()
+
+
+def setup_logging(level=None, burst=None, interval=None, stream=None):
+    """
+    配置日志输出（只需调用一次，get_logger 首次调用时自动以配置中的参数调用）
+
+    Args:
+        level: 日志级别名称（如 'INFO', 'DEBUG'），缺省取自配置
+        burst: 限流条数，缺省取自配置
+        interval: 限流时间窗口（秒），缺省取自配置
+        stream: 输出流，缺省为标准输出
+
+    Returns:
+        父记录器
+    """
+    global _root
+    from src.config import config
+
+    with _setup_lock:
+        root = logging.getLogger(LOGGER_NAME)
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+
+        handler = logging.StreamHandler(stream or sys.stdout)
+        handler.setFormatter(TagFormatter())
+        handler.addFilter(RateLimitFilter(
+            burst if burst is not None else config.LOG_RATE_LIMIT,
+            interval if interval is not None else config.LOG_RATE_INTERVAL,
+        ))
+        root.addHandler(handler)
+        root.setLevel((level or config.LOG_LEVEL).upper())
+        root.propagate = False
+        _root = root
+    return root
+
+
+def get_logger(tag):
+    """
+    获取模块的日志记录器
+
+    Args:
+        tag: 输出中的标签（如 'Resource' 输出为 "[Resource] ..."）
+
+    Returns:
+        logging.Logger 对象
+    """
+    if _root is None:
+        setup_logging()
+    return logging.getLogger(f'{LOGGER_NAME}.{tag}')
+
+
+def set_level(level):
+    """修改日志级别（如 'DEBUG'）"""
+    if _root is None:
+        setup_logging()
+    _root.setLevel(level.upper())
@@ -0,0 +1,140 @@
+"""
+内存缓存模块
+按字节预算管理已加载的图像、动画资源，超出预算时按最近最少使用淘汰
+"""
+
+from collections import OrderedDict
+
+from PySide6.QtGui import QPixmap, QImage, QMovie
+
+
+def estimate_bytes(value):
+    """
+    估算资源占用的内存（字节）
+
+    Args:
+        value: QPixmap / QImage / QMovie，或带 nbytes 属性的对象（如 FrameSet）
+
+    Returns:
+        估算的字节数
+    """
+    if isinstance(value, QPixmap):
+        return value.width() * value.height() * value.depth() // 8
+    if isinstance(value, QImage):
+        return value.sizeInBytes()
+    if isinstance(value, QMovie):
+        # QMovie 按需解码，常驻的只有当前帧
+        size = value.scaledSize()
+        if not size.isValid():
+            size = value.currentImage().size()
+        return max(size.width(), 0) * max(size.height(), 0) * 4
+    return getattr(value, 'nbytes', 0)
+
+
+class MemoryCache:
+    """带字节预算的 LRU 缓存"""
+
+    def __init__(self, budget_bytes):
+        """
+        初始化缓存
+
+        Args:
+            budget_bytes: 缓存总大小上限（字节）
+        """
+        self.budget_bytes = budget_bytes
+        self.total_bytes = 0
+        self._entries = OrderedDict()  # key -> (value, bytes)
+
+        # 统计计数
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """
+        读取缓存，命中时将条目标记为最近使用
+
+        Returns:
+            缓存的值，未命中返回 None
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, value, nbytes=None):
+        """
+        写入缓存
+
+        Args:
+            key: 缓存键（元组）
+            value: 缓存的值
+            nbytes: 占用字节数，缺省时自动估算
+        """
+        if nbytes is None:
+            nbytes = estimate_bytes(value)
+
+        self.remove(key)
+
+        # 单个条目超过整个预算时不缓存
+        if nbytes > self.budget_bytes:
+            return
+
+        self._entries[key] = (value, nbytes)
+        self.total_bytes += nbytes
+        self._evict()
+
+    def remove(self, key):
+        """删除指定条目"""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry[1]
+
+    def remove_if(self, predicate):
+        """删除所有键满足条件的条目"""
+        for key in [k for k in self._entries if predicate(k)]:
+            self.remove(key)
+
+    def clear(self):
+        """清空缓存（统计计数保留）"""
+        self._entries.clear()
+        self.total_bytes = 0
+
+    def set_budget(self, budget_bytes):
+        """调整预算，必要时立即淘汰"""
+        self.budget_bytes = budget_bytes
+        self._evict()
+
+    def stats(self):
+        """
+        获取缓存统计
+
+        Returns:
+            包含条目数、占用字节、命中/未命中/淘汰次数的字典
+        """
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self.total_bytes,
+            'budget': self.budget_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _evict(self):
+        while self.total_bytes > self.budget_bytes and self._entries:
+            _, (_, nbytes) = self._entries.popitem(last=False)
+            self.total_bytes -= nbytes
+            self.evictions += 1
@@ -0,0 +1,331 @@
+"""
+移动引擎模块
+在共享动画时钟上按经过的时间推进宠物窗口的位置（速度、重力、摩擦、边缘反弹），
+每只宠物每帧最多调用一次 move()，没有宠物在移动时完全不占用时钟
+"""
+
+import math
+
+from PySide6.QtCore import QObject, Signal
+
+from src.config import config
+from src.core.animation_scheduler import shared_scheduler
+
+
+# 单次 tick 最多推进的时间（毫秒），避免时钟长时间空闲后第一次 tick 跳得过远
+MAX_STEP_MS = 50.0
+
+# 落地时竖直速度低于该值（像素/秒）即停止弹跳
+REST_SPEED = 40.0
+
+# 屏幕刷新率未知时使用的值
+DEFAULT_REFRESH_RATE = 60.0
+
+
+class _Body:
+    """一只宠物窗口的运动状态"""
+
+    __slots__ = ('window', 'x', 'y', 'vx', 'vy', 'walking', 'dragging', 'drag_target',
+                 'last_drag_move', 'drag_interval', 'bounds', 'last_pos', 'on_settled')
+
+    def __init__(self, window, on_settled):
+        self.window = window
+        pos = window.pos()
+        self.x = float(pos.x())
+        self.y = float(pos.y())
+        self.vx = 0.0
+        self.vy = 0.0
+        self.walking = False
+        self.dragging = False
+        self.drag_target = None
+        self.last_drag_move = None
+        self.drag_interval = 1000.0 / DEFAULT_REFRESH_RATE
+        self.bounds = None
+        self.last_pos = (pos.x(), pos.y())
+        self.on_settled = on_settled
+
+    def update_bounds(self):
+        """取窗口所在屏幕的可用区域（不含任务栏）：(左, 右, 顶, 地面) 窗口坐标范围"""
+        window = self.window
+        screen = window.screen()
+        if screen is None:
+            self.bounds = None
+            return
+
+        area = screen.availableGeometry()
+        self.bounds = (
+            area.left(),
+            area.right() - window.width() + 1,
+            area.top(),
+            area.bottom() - window.height() + 1,
+        )
+        rate = screen.refreshRate()
+        self.drag_interval = 1000.0 / (rate if rate > 0 else DEFAULT_REFRESH_RATE)
+
+
+class MovementEngine(QObject):
+    """
+    宠物移动引擎
+
+    有宠物在移动（行走、下落、拖拽、甩出）时登记一个每 tick 回调，
+    全部静止后取消回调，调度器随之停止 tick。
+    拖拽时鼠标事件只记录目标位置，按屏幕刷新率应用，多余的事件被合并。
+    """
+
+    settled = Signal(object)  # 窗口停止移动
+
+    def __init__(self, scheduler=None, parent=None):
+        """
+        Args:
+            scheduler: 使用的 AnimationScheduler，缺省为进程共享调度器
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self.scheduler = scheduler if scheduler is not None else shared_scheduler()
+
+        self._bodies = {}  # 窗口 -> _Body
+        self._active = set()  # 正在移动的 _Body
+        self._ticking = False
+
+        # 统计计数
+        self.move_requests = 0  # 拖拽产生的移动请求
+        self.moves = 0  # 实际调用 move() 的次数
+
+    def add(self, window, on_settled=None):
+        """
+        登记宠物窗口（启用重力时立即开始下落到地面）
+
+        Args:
+            window: 宠物窗口
+            on_settled: 可选回调，窗口停止移动时调用（如保存位置）
+        """
+        if window in self._bodies:
+            return
+        body = _Body(window, on_settled)
+        self._bodies[window] = body
+        self._wake(body)
+
+    def remove(self, window):
+        """取消登记（窗口关闭时调用）"""
+        body = self._bodies.pop(window, None)
+        if body is not None:
+            self._active.discard(body)
+
+    def walk(self, window, direction, speed=None):
+        """
+        开始沿水平方向行走，碰到屏幕边缘时掉头
+
+        Args:
+            window: 宠物窗口
+            direction: 1 向右，-1 向左
+            speed: 速度（像素/秒），缺省取自配置
+        """
+        body = self._bodies.get(window)
+        if body is None or body.dragging:
+            return
+        body.walking = True
+        body.vx = direction * (speed if speed is not None else config.WALK_SPEED)
+        self._wake(body)
+
+    def stop_walking(self, window):
+        """停止行走（仍在下落的宠物会继续落地）"""
+        body = self._bodies.get(window)
+        if body is not None and body.walking:
+            body.walking = False
+            body.vx = 0.0
+
+    def begin_drag(self, window):
+        """开始拖拽：暂停物理运动，只跟随鼠标"""
+        body = self._bodies.get(window)
+        if body is None:
+            return
+        body.dragging = True
+        body.vx = body.vy = 0.0
+        body.drag_target = None
+        body.last_drag_move = None
+        body.update_bounds()
+
+    def drag_to(self, window, pos):
+        """
+        拖拽到指定位置（按屏幕刷新率应用，期间的请求只保留最新一个）
+
+        Args:
+            window: 宠物窗口
+            pos: 窗口左上角的目标位置（QPoint）
+        """
+        body = self._bodies.get(window)
+        if body is None or not body.dragging:
+            window.move(pos)
+            return
+
+        self.move_requests += 1
+        body.drag_target = (pos.x(), pos.y())
+
+        # 调度器冻结时不会 tick，拖拽仍需立即响应
+        if self.scheduler.paused:
+            self._apply_drag(body, self.scheduler.now())
+            return
+        self._wake(body)
+
+    def end_drag(self, window):
+        """结束拖拽：立即应用最后的位置，启用重力时从这里落下"""
+        body = self._bodies.get(window)
+        if body is None or not body.dragging:
+            return
+
+        if body.drag_target is not None:
+            self._apply_drag(body, self.scheduler.now())
+        body.dragging = False
+        pos = window.pos()
+        body.x, body.y = float(pos.x()), float(pos.y())
+        body.update_bounds()  # 可能被拖到了另一块屏幕
+        self._wake(body)
+
+    def fling(self, window, vx, vy):
+        """
+        甩出：以给定初速度惯性滑行，受摩擦减速（启用重力时竖直方向由重力接管），碰到屏幕边缘反弹
+
+        Args:
+            window: 宠物窗口
+            vx, vy: 初速度（像素/秒）
+        """
+        body = self._bodies.get(window)
+        if body is None or body.dragging:
+            return
+        body.walking = False
+        body.vx = float(vx)
+        body.vy = float(vy)
+        self._wake(body)
+
+    def is_moving(self, window):
+        """窗口是否正在移动"""
+        body = self._bodies.get(window)
+        return body is not None and body in self._active
+
+    def active_count(self):
+        """正在移动的窗口数量"""
+        return len(self._active)
+
+    def stats(self):
+        """
+        获取移动统计
+
+        Returns:
+            包含登记窗口数、移动中窗口数、拖拽请求数、实际 move() 次数的字典
+        """
+        return {
+            'windows': len(self._bodies),
+            'active': len(self._active),
+            'move_requests': self.move_requests,
+            'moves': self.moves,
+            'ticking': self._ticking,
+        }
+
+    def _wake(self, body):
+        if body.bounds is None:
+            body.update_bounds()
+        self._active.add(body)
+        if not self._ticking:
+            self._ticking = True
+            self.scheduler.add_callback(self._on_tick)
+
+    def _apply_drag(self, body, now):
+        x, y = body.drag_target
+        body.drag_target = None
+        body.last_drag_move = now
+        body.x, body.y = float(x), float(y)
+        self._move(body, x, y)
+
+    def _move(self, body, x, y):
+        if (x, y) != body.last_pos:
+            body.last_pos = (x, y)
+            body.window.move(x, y)
+            self.moves += 1
+
+    def _on_tick(self, elapsed):
+        dt = min(elapsed, MAX_STEP_MS) / 1000.0
+        now = self.scheduler.now()
+        gravity = config.GRAVITY if config.MOVEMENT_GRAVITY else 0.0
+        bounce = config.BOUNCE
+        slowdown = config.FRICTION * dt
+
+        settled = []
+        for body in list(self._active):
+            if body.dragging:
+                if body.drag_target is not None and (
+                        body.last_drag_move is None
+                        or now - body.last_drag_move >= body.drag_interval - 1.0):
+                    self._apply_drag(body, now)
+                continue
+
+            if body.bounds is None:
+                settled.append(body)
+                continue
+            left, right, top, ground = body.bounds
+
+            # 甩出后的惯性滑行受摩擦减速（行走保持匀速）
+            if not body.walking and body.vx != 0.0:
+                body.vx = 0.0 if abs(body.vx) <= slowdown else body.vx - math.copysign(slowdown, body.vx)
+            if not gravity and body.vy != 0.0:
+                body.vy = 0.0 if abs(body.vy) <= slowdown else body.vy - math.copysign(slowdown, body.vy)
+
+            # 水平：行走或滑行，碰到边缘反弹
+            x = body.x + body.vx * dt
+            if x < left:
+                x = left + (left - x)
+                body.vx = abs(body.vx)
+            elif x > right:
+                x = right - (x - right)
+                body.vx = -abs(body.vx)
+            body.x = min(max(x, left), right)
+
+            # 竖直：重力下落到地面，落地时衰减反弹；碰到屏幕顶部时反弹
+            grounded = True
+            if not gravity:
+                if body.vy != 0.0:
+                    y = body.y + body.vy * dt
+                    if y < top or y > ground:
+                        body.vy = -body.vy * bounce
+                    body.y = min(max(y, top), ground)
+                    grounded = body.vy == 0.0
+            else:
+                if body.y < ground or body.vy != 0.0:
+                    body.vy += gravity * dt
+                    y = body.y + body.vy * dt
+                    if y >= ground:
+                        y = ground
+                        body.vy = -body.vy * bounce
+                        if abs(body.vy) < REST_SPEED:
+                            body.vy = 0.0
+                    elif y < top:
+                        y = top
+                        body.vy = abs(body.vy) * bounce
+                    body.y = y
+                    grounded = body.y >= ground and body.vy == 0.0
+
+            self._move(body, int(round(body.x)), int(round(body.y)))
+
+            if grounded and body.vx == 0.0:
+                settled.append(body)
+
+        for body in settled:
+            self._active.discard(body)
+            if body.on_settled is not None:
+                body.on_settled()
+            self.settled.emit(body.window)
+
+        # 全部静止：取消回调，调度器在没有动画到期时完全停止
+        if not self._active and self._ticking:
+            self._ticking = False
+            self.scheduler.remove_callback(self._on_tick)
+
+
+_shared_movement = None
+
+
+def shared_movement():
+    """获取进程内共享的移动引擎"""
+    global _shared_movement
+    if _shared_movement is None:
+        _shared_movement = MovementEngine()
+    return _shared_movement
@@ -0,0 +1,373 @@
+"""
+节能调节模块
+根据系统负载、电池、窗口可见性和用户空闲时间调整动画帧率，必要时冻结动画
+"""
+
+import sys
+import threading
+import time
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from src.config import config
+from src.core.log import get_logger
+
+log = get_logger('Power')
+
+
+# 节能策略
+POLICY_FULL = 'full'  # 全帧率
+POLICY_REDUCED = 'reduced'  # 降低帧率
+POLICY_FROZEN = 'frozen'  # 停在静止帧
+
+
+class PowerSample:
+    """一次系统状态采样"""
+
+    def __init__(self, cpu_percent, battery_percent=None, on_battery=False,
+                 memory_percent=None, per_cpu=(), idle_seconds=None):
+        """
+        Args:
+            cpu_percent: 整机 CPU 占用（0-100）
+            battery_percent: 电池电量（0-100），没有电池时为 None
+            on_battery: 是否使用电池供电
+            memory_percent: 内存占用（0-100），未采样时为 None
+            per_cpu: 每个逻辑核心的占用（0-100）
+            idle_seconds: 系统级的用户空闲时间（距最后一次键盘或鼠标输入的秒数），
+                          平台不支持时为 None
+        """
+        self.cpu_percent = cpu_percent
+        self.battery_percent = battery_percent
+        self.on_battery = on_battery
+        self.memory_percent = memory_percent
+        self.per_cpu = per_cpu
+        self.idle_seconds = idle_seconds
+
+
+def _windows_idle_seconds():
+    """Windows：由 GetLastInputInfo 得到距最后一次输入的秒数"""
+    import ctypes
+
+    class LASTINPUTINFO(ctypes.Structure):
+        _fields_ = [('cbSize', ctypes.c_uint), ('dwTime', ctypes.c_uint)]
+
+    info = LASTINPUTINFO()
+    info.cbSize = ctypes.sizeof(info)
+    if not ctypes.windll.user32.GetLastInputInfo(ctypes.byref(info)):
+        return None
+    # 两个值都是 32 位毫秒计数，回绕时按无符号差计算
+    elapsed = (ctypes.windll.kernel32.GetTickCount() - info.dwTime) & 0xFFFFFFFF
+    return elapsed / 1000.0
+
+
+def system_idle_reader():
+    """
+    当前平台读取系统空闲时间的函数
+
+    psutil 不提供用户输入的空闲时间，这里只支持 Windows；其他平台返回 None，
+    节能调节不使用空闲策略（不会因为没有点击宠物而降频或冻结）。
+    """
+    if sys.platform == 'win32':
+        return _windows_idle_seconds
+    return None
+
+
+class PsutilSource:
+    """基于 psutil 的采样源"""
+
+    def __init__(self):
+        import psutil
+        self._psutil = psutil
+        # CPU 占用由两次采样之间的 CPU 时间求差得到；基准保存在本对象中，
+        # 多个采样源（节能调节、系统监视）互不重置对方的基准
+        self._last_times = self._cpu_times()
+        self._idle_reader = system_idle_reader()
+
+    def _cpu_times(self):
+        """每个核心的 (空闲时间, 总时间)"""
+        times = []
+        for t in self._psutil.cpu_times(percpu=True):
+            # Linux 上 guest 时间已经计入 user，不重复计算
+            total = sum(t) - getattr(t, 'guest', 0.0) - getattr(t, 'guest_nice', 0.0)
+            times.append((t.idle + getattr(t, 'iowait', 0.0), total))
+        return times
+
+    def sample(self):
+        """
+        采样当前系统状态（非阻塞）
+
+        Returns:
+            PowerSample 对象
+        """
+        times = self._cpu_times()
+        per_cpu = []
+        busy = total = 0.0
+        for (idle, all_time), (last_idle, last_all) in zip(times, self._last_times):
+            delta = all_time - last_all
+            core_busy = max(delta - (idle - last_idle), 0.0)
+            per_cpu.append(min(100.0 * core_busy / delta, 100.0) if delta > 0 else 0.0)
+            busy += core_busy
+            total += delta
+        self._last_times = times
+        cpu = min(100.0 * busy / total, 100.0) if total > 0 else 0.0
+
+        memory = None
+        try:
+            memory = self._psutil.virtual_memory().percent
+        except OSError:
+            pass
+
+        battery = None
+        try:
+            battery = self._psutil.sensors_battery()
+        except (AttributeError, NotImplementedError, OSError):
+            pass
+
+        idle = None
+        if self._idle_reader is not None:
+            try:
+                idle = self._idle_reader()
+            except (AttributeError, OSError):
+                self._idle_reader = None
+
+        if battery is None:
+            return PowerSample(cpu, memory_percent=memory, per_cpu=tuple(per_cpu), idle_seconds=idle)
+        return PowerSample(cpu, battery.percent, not battery.power_plugged,
+                           memory_percent=memory, per_cpu=tuple(per_cpu), idle_seconds=idle)
+
+
+class PowerGovernor(QObject):
+    """
+    节能调节器
+
+    在后台线程中周期采样，采样结果通过信号回到 GUI 线程后再决定策略，
+    所有对调度器的操作都在 GUI 线程完成。
+
+    空闲策略使用采样源报告的系统级空闲时间（整台机器没有键盘鼠标输入），
+    采样源不提供时不启用。与宠物交互后的一段宽限期内总是全帧率，
+    优先于负载、电池、可见性和空闲策略；宽限期结束后重新决策。
+    """
+
+    policyChanged = Signal(str, str)  # 新策略, 原因
+    _sampled = Signal(object)  # 后台线程 -> GUI 线程
+
+    def __init__(self, scheduler, source=None, interval=None, clock=time.monotonic, parent=None):
+        """
+        初始化节能调节器
+
+        Args:
+            scheduler: 受控的 AnimationScheduler
+            source: 采样源（需实现 sample() -> PowerSample），缺省使用 psutil
+            interval: 采样间隔（秒），缺省取自配置
+            clock: 时间函数，便于用模拟时间驱动
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self.scheduler = scheduler
+        self.source = source
+        self.interval = interval if interval is not None else config.POWER_SAMPLE_INTERVAL
+        self.clock = clock
+
+        self.full_fps = scheduler.max_fps
+        self.policy = POLICY_FULL
+        self.reason = 'startup'
+        self.last_sample = None
+        self._sample_time = None
+
+        self._windows = []
+        self._last_interaction = clock()
+        self._interacted = False  # 启动后是否有过交互（启动不算交互，不享受宽限期）
+
+        # 宽限期结束时重新决策（采样间隔可能比宽限期长）
+        self._grace_timer = QTimer(self)
+        self._grace_timer.setSingleShot(True)
+        self._grace_timer.timeout.connect(self.evaluate)
+
+        # 统计：每种策略的累计时间和调度器 tick 数
+        self._policy_since = clock()
+        self._ticks_at_policy_start = scheduler.ticks
+        self._time_in = {POLICY_FULL: 0.0, POLICY_REDUCED: 0.0, POLICY_FROZEN: 0.0}
+        self._ticks_in = {POLICY_FULL: 0, POLICY_REDUCED: 0, POLICY_FROZEN: 0}
+
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._sampled.connect(self.on_sample)
+
+    def start(self):
+        """启动后台采样线程"""
+        if self._thread is not None:
+            return
+        if self.source is None:
+            self.source = PsutilSource()
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='PowerGovernor', daemon=True)
+        self._thread.start()
+        log.info("Governor started (interval: %ss)", self.interval)
+
+    def stop(self):
+        """停止采样并恢复全帧率"""
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
+        self._grace_timer.stop()
+        self._apply(POLICY_FULL, 'stopped')
+
+    def add_window(self, window):
+        """登记需要检测可见性的宠物窗口"""
+        if window not in self._windows:
+            self._windows.append(window)
+
+    def remove_window(self, window):
+        """取消登记宠物窗口"""
+        if window in self._windows:
+            self._windows.remove(window)
+
+    def notify_interaction(self):
+        """用户与宠物交互：视为一次输入，宽限期内保持全帧率"""
+        self._last_interaction = self.clock()
+        self._interacted = True
+        self._grace_timer.start(int(config.POWER_INTERACTION_GRACE * 1000))
+        self.evaluate()
+
+    def on_sample(self, sample):
+        """收到一次采样（GUI 线程）"""
+        self.last_sample = sample
+        self._sample_time = self.clock()
+        self.evaluate()
+
+    def evaluate(self):
+        """根据最近的采样、可见性和空闲时间重新决定策略"""
+        policy, reason = self.decide(self.last_sample, self.any_window_visible(), self.idle_seconds(),
+                                     self.seconds_since_interaction())
+        self._apply(policy, reason)
+
+    def idle_seconds(self):
+        """
+        当前的用户空闲时间
+
+        Returns:
+            系统级空闲时间（按采样后经过的时间外推，与宠物交互后清零），
+            采样源不提供空闲时间时返回 None
+        """
+        sample = self.last_sample
+        if sample is None or sample.idle_seconds is None:
+            return None
+        now = self.clock()
+        return min(sample.idle_seconds + now - self._sample_time, now - self._last_interaction)
+
+    def seconds_since_interaction(self):
+        """距最后一次与宠物交互的秒数，还没有交互过时返回 None"""
+        if not self._interacted:
+            return None
+        return self.clock() - self._last_interaction
+
+    def decide(self, sample, visible, idle_seconds, since_interaction=None):
+        """
+        策略决策（纯函数，不修改状态）
+
+        Args:
+            sample: 最近的 PowerSample，可能为 None
+            visible: 是否至少有一只宠物可见
+            idle_seconds: 用户空闲的秒数，未知时为 None（不使用空闲策略）
+            since_interaction: 距最后一次与宠物交互的秒数，没有交互过时为 None
+
+        Returns:
+            (策略, 原因) 元组
+        """
+        if since_interaction is not None and since_interaction < config.POWER_INTERACTION_GRACE:
+            return POLICY_FULL, 'interaction'
+        if not visible:
+            return POLICY_FROZEN, 'hidden'
+        if idle_seconds is not None and idle_seconds >= config.POWER_IDLE_FREEZE:
+            return POLICY_FROZEN, 'idle'
+
+        if sample is not None:
+            if (sample.on_battery and sample.battery_percent is not None
+                    and sample.battery_percent <= config.POWER_LOW_BATTERY):
+                return POLICY_FROZEN, 'low battery'
+            if sample.cpu_percent >= config.POWER_HIGH_CPU:
+                return POLICY_REDUCED, 'high load'
+            if sample.on_battery:
+                return POLICY_REDUCED, 'on battery'
+
+        if idle_seconds is not None and idle_seconds >= config.POWER_IDLE_REDUCE:
+            return POLICY_REDUCED, 'idle'
+
+        return POLICY_FULL, 'normal'
+
+    def any_window_visible(self):
+        """是否至少有一个登记的窗口可见（没有登记窗口时视为可见）"""
+        if not self._windows:
+            return True
+
+        for window in self._windows:
+            if not window.isVisible() or window.isMinimized():
+                continue
+            handle = window.windowHandle()
+            # isExposed 在支持的平台上能反映窗口被完全遮挡的情况
+            if handle is None or handle.isExposed():
+                return True
+        return False
+
+    def stats(self):
+        """
+        获取当前策略和节省情况
+
+        Returns:
+            字典：当前策略、原因、各策略累计时间（秒）和 tick 数、
+            估算节省的 tick 数（以全帧率下实测的 tick 速率为基准）
+        """
+        now = self.clock()
+        time_in = dict(self._time_in)
+        ticks_in = dict(self._ticks_in)
+        time_in[self.policy] += now - self._policy_since
+        ticks_in[self.policy] += self.scheduler.ticks - self._ticks_at_policy_start
+
+        full_rate = ticks_in[POLICY_FULL] / time_in[POLICY_FULL] if time_in[POLICY_FULL] > 0 else None
+        saved = None
+        if full_rate is not None:
+            saved = sum(full_rate * time_in[p] - ticks_in[p] for p in (POLICY_REDUCED, POLICY_FROZEN))
+
+        return {
+            'policy': self.policy,
+            'reason': self.reason,
+            'seconds': time_in,
+            'ticks': ticks_in,
+            'full_tick_rate': full_rate,
+            'ticks_saved': saved,
+        }
+
+    def _apply(self, policy, reason):
+        if policy == self.policy:
+            self.reason = reason
+            return
+
+        # 结算上一个策略的统计
+        now = self.clock()
+        self._time_in[self.policy] += now - self._policy_since
+        self._ticks_in[self.policy] += self.scheduler.ticks - self._ticks_at_policy_start
+        self._policy_since = now
+        self._ticks_at_policy_start = self.scheduler.ticks
+
+        if policy == POLICY_FROZEN:
+            self.scheduler.pause()
+        else:
+            fps = self.full_fps if policy == POLICY_FULL else config.POWER_REDUCED_FPS
+            self.scheduler.set_max_fps(fps)
+            self.scheduler.resume()
+
+        self.policy = policy
+        self.reason = reason
+        log.info("Policy -> %s (%s)", policy, reason)
+        self.policyChanged.emit(policy, reason)
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                sample = self.source.sample()
+            except Exception as e:
+                log.warning("Sampling failed: %s", e)
+                continue
+            self._sampled.emit(sample)
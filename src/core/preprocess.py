@@ -0,0 +1,279 @@
+"""
+精灵图预处理模块
+把整段动画的全部帧转换为一个 NumPy 数组后批量处理：预乘透明度、高质量缩放
+（可一次输出多个尺寸）、裁掉空白边缘、可选的共享调色板量化，
+输出的像素可以直接构建 QImage（FRAME_FORMAT），无需再转换格式
+
+NumPy 是可选依赖：未安装时 HAS_NUMPY 为 False，调用方回退到逐帧的 Qt 缩放。
+导入本模块不会导入 NumPy（启动路径不需要它），第一次预处理时才导入。
+"""
+
+from importlib.util import find_spec
+
+from PySide6.QtCore import QSize, Qt
+from PySide6.QtGui import QImage
+
+from src.core.sprite_cache import FRAME_FORMAT
+
+HAS_NUMPY = find_spec('numpy') is not None
+
+np = None  # 第一次调用 _require_numpy() 时导入
+
+
+def _require_numpy():
+    global np
+    if np is None:
+        if not HAS_NUMPY:
+            raise RuntimeError("NumPy is required for sprite preprocessing (pip install numpy)")
+        import numpy
+        np = numpy
+
+
+def images_to_array(images):
+    """
+    把帧图像转换为一个数组
+
+    预乘透明度在转换为 FRAME_FORMAT 时由 Qt 完成（SIMD 实现，
+    比在 NumPy 中逐通道相乘快一个数量级），数组中的像素已经是预乘的。
+
+    Args:
+        images: 尺寸相同的 QImage 列表
+
+    Returns:
+        (帧数, 高, 宽, 4) 的 uint8 数组，通道顺序 B, G, R, A（预乘）
+    """
+    _require_numpy()
+    if not images:
+        return np.zeros((0, 0, 0, 4), dtype=np.uint8)
+
+    width, height = images[0].width(), images[0].height()
+    array = np.empty((len(images), height, width, 4), dtype=np.uint8)
+    for i, image in enumerate(images):
+        if image.format() != FRAME_FORMAT:
+            image = image.convertToFormat(FRAME_FORMAT)
+        if image.width() != width or image.height() != height:
+            raise ValueError("all frames of an animation must have the same size")
+        stride = image.bytesPerLine()
+        rows = np.frombuffer(image.constBits(), dtype=np.uint8, count=stride * height)
+        array[i] = rows.reshape(height, stride)[:, :width * 4].reshape(height, width, 4)
+    return array
+
+
+def _weights(source, target):
+    """
+    一维重采样矩阵（三角形滤波，缩小时按比例放宽）
+
+    Returns:
+        (target, source) 的 float32 矩阵，每行和为 1
+    """
+    scale = source / target
+    support = max(scale, 1.0)
+    centers = (np.arange(target, dtype=np.float64) + 0.5) * scale - 0.5
+    positions = np.arange(source, dtype=np.float64)
+    distance = np.abs(positions[None, :] - centers[:, None]) / support
+    weights = np.clip(1.0 - distance, 0.0, None)
+    totals = weights.sum(axis=1, keepdims=True)
+    totals[totals == 0] = 1.0
+    return (weights / totals).astype(np.float32)
+
+
+def _resize_axis(frames, axis, target):
+    """
+    沿一个轴缩放
+
+    缩小两倍以上时先按整数倍做盒式平均（对步长切片求和，整段动画一次完成），
+    剩余不到两倍的部分再用三角形滤波矩阵做张量乘法，与 Pillow 的 reducing_gap 做法相同。
+    """
+    length = frames.shape[axis]
+    factor = length // target
+    if factor >= 2:
+        usable = length // factor * factor
+        start = (length - usable) // 2
+        # uint8 求和用 uint16 累加即可（factor * 255 不会溢出），避免整幅图转换为浮点
+        dtype = np.uint16 if frames.dtype == np.uint8 and factor <= 257 else np.float32
+        index = [slice(None)] * frames.ndim
+        total = None
+        for i in range(factor):
+            index[axis] = slice(start + i, start + usable, factor)
+            part = frames[tuple(index)]
+            total = part.astype(dtype) if total is None else total + part
+        frames = total.astype(np.float32)
+        frames *= 1.0 / factor
+        length = frames.shape[axis]
+
+    if length == target:
+        return frames.astype(np.float32, copy=False)
+    weights = _weights(length, target)
+    if axis == 1:
+        # 行方向：每帧是一次 (target, length) x (length, 宽*4) 的矩阵乘法
+        count = frames.shape[0]
+        result = np.matmul(weights, frames.reshape(count, length, -1))
+        return result.reshape((count, target) + frames.shape[2:])
+    return np.moveaxis(np.tensordot(weights, frames, axes=([1], [axis])), 0, axis)
+
+
+def target_size(width, height, size):
+    """
+    等比缩放后的尺寸（与 Qt 的 KeepAspectRatio 规则一致，和 scale_image 得到的尺寸相同）
+
+    Returns:
+        (width, height)
+    """
+    scaled = QSize(width, height).scaled(QSize(*size), Qt.AspectRatioMode.KeepAspectRatio)
+    return scaled.width(), scaled.height()
+
+
+def resize(frames, size):
+    """
+    批量缩放全部帧（在预乘空间中进行，透明边缘不会出现色边）
+
+    Args:
+        frames: images_to_array 返回的数组（或其他 (帧数, 高, 宽, 4) 数组）
+        size: 目标尺寸 (width, height)，保持宽高比
+
+    Returns:
+        缩放后的 float32 数组，尺寸不变时返回原数组
+    """
+    _require_numpy()
+    _, height, width, _ = frames.shape
+    out_width, out_height = target_size(width, height, size)
+    if (out_width, out_height) == (width, height):
+        return frames
+
+    # 先缩放行（切片连续，最快），再在已经缩小的数据上缩放列
+    frames = _resize_axis(frames, 1, out_height)
+    return _resize_axis(frames, 2, out_width)
+
+
+def trim(frames):
+    """
+    裁掉所有帧共同的透明边缘（按全部帧的并集裁剪，动画不会抖动）
+
+    Args:
+        frames: 任意 (帧数, 高, 宽, 4) 数组
+
+    Returns:
+        (裁剪后的数组, (x, y)) 元组，(x, y) 为裁剪区域在原帧中的左上角；
+        全部透明时不裁剪
+    """
+    _require_numpy()
+    visible = (frames[..., 3] > 0).any(axis=0)
+    ys = np.flatnonzero(visible.any(axis=1))
+    xs = np.flatnonzero(visible.any(axis=0))
+    if ys.size == 0:
+        return frames, (0, 0)
+    top, bottom = ys[0], ys[-1] + 1
+    left, right = xs[0], xs[-1] + 1
+    return np.ascontiguousarray(frames[:, top:bottom, left:right]), (int(left), int(top))
+
+
+def to_pixels(frames):
+    """浮点帧取整为 uint8（预乘后的 B, G, R, A，即 FRAME_FORMAT 的内存布局）"""
+    _require_numpy()
+    if frames.dtype == np.uint8:
+        return np.ascontiguousarray(frames)
+    return np.clip(np.rint(frames), 0, 255).astype(np.uint8, order='C')
+
+
+def quantize(pixels, colors=256):
+    """
+    把全部帧量化到一个共享调色板
+
+    所有帧拼成一张图交给 Pillow 的八叉树量化，保证整段动画使用同一调色板。
+    量化直接在预乘像素上进行，调色板也是预乘的。
+
+    Args:
+        pixels: to_pixels 返回的 uint8 数组
+        colors: 调色板颜色数（不超过 256）
+
+    Returns:
+        (indices, palette) 元组：indices 为 (帧数, 高, 宽) 的 uint8 索引，
+        palette 为 (颜色数, 4) 的 uint8 数组（与 pixels 通道顺序相同）
+    """
+    _require_numpy()
+    from PIL import Image
+
+    count, height, width, _ = pixels.shape
+    mosaic = Image.fromarray(pixels.reshape(count * height, width, 4), 'RGBA')
+    indexed = mosaic.quantize(colors=colors, method=Image.Quantize.FASTOCTREE)
+    indices = np.asarray(indexed, dtype=np.uint8).reshape(count, height, width)
+
+    raw = indexed.getpalette('RGBA') or []
+    palette = np.zeros((256, 4), dtype=np.uint8)
+    entries = np.frombuffer(bytes(raw), dtype=np.uint8).reshape(-1, 4)[:256]
+    palette[:len(entries)] = entries
+    return indices, palette
+
+
+def dequantize(indices, palette):
+    """调色板索引还原为像素数组（颜色通道不超过 alpha，保证仍是合法的预乘像素）"""
+    _require_numpy()
+    pixels = palette[indices]
+    np.minimum(pixels[..., :3], pixels[..., 3:4], out=pixels[..., :3])
+    return pixels
+
+
+def pixels_to_images(pixels):
+    """
+    由像素数组构建 QImage 列表（不复制像素）
+
+    每个 QImage 直接引用数组中对应帧的内存，数组挂在图像上以保证其生命周期。
+
+    Args:
+        pixels: (帧数, 高, 宽, 4) 的 uint8 数组（预乘 B, G, R, A）
+
+    Returns:
+        FRAME_FORMAT 的 QImage 列表
+    """
+    _require_numpy()
+    pixels = np.ascontiguousarray(pixels)
+    _, height, width, _ = pixels.shape
+    images = []
+    for frame in pixels:
+        image = QImage(frame.data, width, height, width * 4, FRAME_FORMAT)
+        # QImage 不持有缓冲区引用：把帧数组挂在图像上
+        image._buffer = frame
+        images.append(image)
+    return images
+
+
+def quantize_images(images, colors=256):
+    """
+    把整段动画量化到一个共享调色板
+
+    Args:
+        images: 尺寸相同的 QImage 列表
+        colors: 调色板颜色数
+
+    Returns:
+        量化后的 QImage 列表（FRAME_FORMAT）
+    """
+    return pixels_to_images(dequantize(*quantize(images_to_array(images), colors)))
+
+
+def preprocess_images(images, sizes, trim_borders=False, palette_colors=None):
+    """
+    整段动画批量预处理
+
+    Args:
+        images: 原始帧（QImage 列表，尺寸相同）
+        sizes: 需要输出的尺寸列表 [(width, height), ...]，None 表示原尺寸
+        trim_borders: 是否先裁掉共同的透明边缘（缩放按裁剪后的内容进行）
+        palette_colors: 可选的调色板颜色数，提供时输出经过共享调色板量化的帧
+
+    Returns:
+        ({尺寸: QImage 列表}, (x, y)) 元组，(x, y) 为裁剪偏移（原尺寸坐标）
+    """
+    frames = images_to_array(images)
+    offset = (0, 0)
+    if trim_borders:
+        frames, offset = trim(frames)
+
+    results = {}
+    for size in sizes:
+        scaled = frames if size is None else resize(frames, size)
+        pixels = to_pixels(scaled)
+        if palette_colors:
+            pixels = dequantize(*quantize(pixels, palette_colors))
+        results[size] = pixels_to_images(pixels)
+    return results, offset
@@ -3,26 +3,591 @@
 负责加载和管理图像、动画等资源
 """
 
+import os
+import time
 from pathlib import Path
-from PySide6.QtGui import QPixmap, QMovie
-from PySide6.QtCore import QSize
+from PySide6.QtGui import QImage, QPainter, QPixmap, QMovie, QImageReader
+from PySide6.QtCore import QObject, QPoint, QRectF, QSize, Qt, Signal
+
+from src.core.animation_scheduler import shared_scheduler
+from src.core.frame_diff import build_damage_rects
+from src.core.hit_mask import build_hit_masks
+from src.core.instrumentation import metrics
+from src.core.log import get_logger
+from src.core.memory_cache import MemoryCache
+from src.core.preprocess import HAS_NUMPY, preprocess_images
+from src.core.sprite_cache import FRAME_FORMAT
+from src.core.sprite_index import ANIMATION_EXTENSIONS, DEFAULT_FRAME_DELAY, get_sprite_index
+from src.core.sprite_pack import MEMBER_SEPARATOR, open_pack, pack_species
+from src.core.sprite_sheet import SheetFrames, open_sheet, sheet_path_for
+
+log = get_logger('Resource')
+
+
+def scale_image(image, size):
+    """
+    按目标尺寸等比缩放图像，尺寸已经符合时直接返回原图
+
+    Args:
+        image: QImage 对象
+        size: 目标尺寸 (width, height)，为 None 时不缩放
+
+    Returns:
+        QImage 对象
+    """
+    if not size:
+        return image
+
+    target = image.size().scaled(QSize(*size), Qt.AspectRatioMode.KeepAspectRatio)
+    if target == image.size():
+        return image
+    return image.scaled(target, Qt.AspectRatioMode.IgnoreAspectRatio,
+                        Qt.TransformationMode.SmoothTransformation)
+
+
+def level_size(size, scale):
+    """
+    多分辨率级别的像素尺寸
+
+    Args:
+        size: 逻辑尺寸 (width, height)，为 None 时不缩放
+        scale: 级别倍率（如 2.0）
+
+    Returns:
+        像素尺寸 (width, height)
+    """
+    if not size or scale == 1:
+        return size
+    return round(size[0] * scale), round(size[1] * scale)
+
+
+def mipmap_scale(device_pixel_ratio, scales):
+    """
+    按屏幕的设备像素比选择多分辨率级别
+
+    选择不小于设备像素比的最小级别（只缩小不放大，显示最清晰），
+    超出最大级别时使用最大级别。
+
+    Args:
+        device_pixel_ratio: 屏幕的设备像素比（如 1.25、2.0）
+        scales: 可用的级别倍率
+
+    Returns:
+        级别倍率
+    """
+    scales = sorted(scales)
+    for scale in scales:
+        if scale >= device_pixel_ratio - 0.01:
+            return scale
+    return scales[-1]
+
+
+def decode_animation(file_path, size=None, info=None, batch=False):
+    """
+    解码动画文件的全部帧
+
+    Args:
+        file_path: 动画文件路径
+        size: 可选的缩放尺寸 (width, height)，保持宽高比
+        info: 可选的 AnimationInfo，提供时帧时间以索引为准
+        batch: 是否用 NumPy 批量缩放全部帧（见 src.core.preprocess），
+            未安装 NumPy 时回退到逐帧缩放
+
+    Returns:
+        (images, delays, loop_count) 元组，images 为 QImage 列表
+    """
+    reader = QImageReader(str(file_path))
+    batch = batch and size and HAS_NUMPY
+    images = []
+    delays = []
+
+    while reader.canRead():
+        image = reader.read()
+        if image.isNull():
+            break
+
+        images.append(image if batch else scale_image(image, size).convertToFormat(FRAME_FORMAT))
+        delay = reader.nextImageDelay()
+        delays.append(delay if delay > 0 else DEFAULT_FRAME_DELAY)
+
+    if batch and images:
+        images = preprocess_images(images, [size])[0][size]
+
+    if info is not None and info.frame_count == len(images):
+        return images, list(info.delays), info.loop_count
+
+    return images, delays, reader.loopCount()
+
+
+class FrameSet:
+    """预解码的动画帧集合（帧图集）"""
+
+    def __init__(self, frames, delays, loop_count=-1, masks=None, scale=1.0, damage=None):
+        """
+        初始化帧集合
+
+        Args:
+            frames: 已缩放好的 QPixmap 列表
+            delays: 每帧显示时长（毫秒）列表，与 frames 一一对应
+            loop_count: 循环次数，-1 表示无限循环
+            masks: 可选的命中遮罩（HitMask）列表，与 frames 一一对应
+            scale: 多分辨率级别倍率（帧的设备像素比），遮罩坐标为像素坐标
+            damage: 可选的重绘区域（QRect，像素坐标）列表，第 i 项为从上一帧切换到
+                    第 i 帧时变化的区域，缺省时每次换帧整帧重绘
+        """
+        self.frames = frames
+        self.delays = delays
+        self.loop_count = loop_count
+        self.masks = masks
+        self.scale = scale
+        self.damage_rects = damage
+        self.total_duration = sum(delays)
+
+    @classmethod
+    def from_images(cls, images, delays, loop_count=-1, masks=None, scale=1.0, damage=None):
+        """
+        由 QImage 帧列表创建帧集合
+
+        Args:
+            masks: 已在工作线程中算好的命中遮罩，缺省时在这里计算
+            damage: 已在工作线程中算好的重绘区域，缺省时在这里计算
+            scale: 多分辨率级别倍率，设置为帧的设备像素比，
+                   显示时按逻辑尺寸绘制，不需要再缩放
+
+        images 为精灵表的 SheetFrames 时创建共用图集纹理的 SheetFrameSet。
+        """
+        if isinstance(images, SheetFrames):
+            return SheetFrameSet.from_sheet(images, delays, loop_count, scale)
+        if masks is None:
+            masks = build_hit_masks(images)
+        if damage is None:
+            damage = build_damage_rects(images)
+        frames = []
+        for image in images:
+            pixmap = QPixmap.fromImage(image)
+            pixmap.setDevicePixelRatio(scale)
+            frames.append(pixmap)
+        return cls(frames, delays, loop_count, masks, scale, damage)
+
+    @property
+    def frame_count(self):
+        """帧数"""
+        return len(self.frames)
+
+    @property
+    def nbytes(self):
+        """全部帧占用的像素内存（字节，含命中遮罩）"""
+        pixels = sum(f.width() * f.height() * f.depth() // 8 for f in self.frames)
+        return pixels + sum(m.nbytes for m in self.masks or () if m is not None)
+
+    def frame(self, index):
+        """获取指定帧"""
+        return self.frames[index]
+
+    def frame_size(self):
+        """帧的逻辑尺寸（QSize，同一动画的所有帧尺寸相同）"""
+        return self.frames[0].deviceIndependentSize().toSize()
+
+    def draw(self, painter, origin, index):
+        """
+        绘制指定帧
+
+        Args:
+            painter: QPainter
+            origin: 帧左上角的逻辑坐标（QPoint）
+            index: 帧序号
+        """
+        painter.drawPixmap(origin, self.frames[index])
+
+    def mask(self, index):
+        """获取指定帧的命中遮罩，没有遮罩时返回 None（整帧可点击）"""
+        if not self.masks:
+            return None
+        return self.masks[index]
+
+    def damage(self, index):
+        """
+        从上一帧切换到指定帧时需要重绘的区域
+
+        Returns:
+            QRect（像素坐标，两帧相同时为空矩形），没有预先计算时返回 None（整帧重绘）
+        """
+        if not self.damage_rects:
+            return None
+        return self.damage_rects[index]
+
+
+class SheetFrameSet(FrameSet):
+    """
+    精灵表帧集合：整段动画共用一张图集纹理，每帧只是图集中的一个子矩形
+
+    frames 为子矩形（QRect）列表，绘制时从图集中按子矩形贴图，不持有每帧的 QPixmap。
+    """
+
+    def __init__(self, sheet, rects, offsets, canvas, delays, loop_count=-1, masks=None, scale=1.0,
+                 atlas=None, damage=None):
+        """
+        Args:
+            sheet: 图集 QPixmap（设备像素比为 scale）
+            rects: 每帧在图集中的 QRect（像素坐标）
+            offsets: 每帧在画布中的偏移（像素，QPoint）
+            canvas: 画布像素尺寸（QSize）
+            atlas: 所属的 SheetAtlas（保持共享图集存活）
+            damage: 重绘区域列表（画布像素坐标）
+        """
+        super().__init__(rects, delays, loop_count, masks, scale, damage)
+        self.sheet = sheet
+        self.offsets = offsets
+        self.canvas = canvas
+        self.atlas = atlas
+
+    @classmethod
+    def from_sheet(cls, frames, delays, loop_count=-1, scale=1.0):
+        """
+        由工作线程生成的 SheetFrames 创建帧集合（只能在 GUI 线程调用）
+
+        Args:
+            frames: SheetFrames
+            scale: 多分辨率级别倍率
+        """
+        return cls(frames.atlas.pixmap(scale), frames.rects, frames.offsets, frames.canvas,
+                   delays, loop_count, frames.masks, scale, frames.atlas, frames.damage)
+
+    @property
+    def nbytes(self):
+        """本动画用到的图集像素（字节，含命中遮罩；同一子图在多段动画中重复计入）"""
+        pixels = sum(w * h * 4 for _, _, w, h in {rect.getRect() for rect in self.frames})
+        return pixels + sum(m.nbytes for m in self.masks or () if m is not None)
+
+    def frame(self, index):
+        """获取指定帧（按画布合成一个新的 QPixmap，播放时不走这里，见 draw）"""
+        pixmap = QPixmap(self.canvas)
+        pixmap.setDevicePixelRatio(self.scale)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        self.draw(painter, QPoint(0, 0), index)
+        painter.end()
+        return pixmap
+
+    def frame_size(self):
+        """画布的逻辑尺寸（QSize）"""
+        return QSize(round(self.canvas.width() / self.scale), round(self.canvas.height() / self.scale))
+
+    def draw(self, painter, origin, index):
+        """从图集中按子矩形绘制指定帧"""
+        rect = self.frames[index]
+        offset = self.offsets[index]
+        scale = self.scale
+        target = QRectF(origin.x() + offset.x() / scale, origin.y() + offset.y() / scale,
+                        rect.width() / scale, rect.height() / scale)
+        painter.drawPixmap(target, self.sheet, QRectF(rect))
+
+
+class DeltaFrameSet(FrameSet):
+    """
+    差分帧集合：只保存第一帧（关键帧）和每帧相对上一帧变化区域的子图（类似 GIF 的帧处置），
+    绘制时把子图贴到可复用的重建缓冲区上得到完整帧
+
+    frames 为子图（QImage，像素坐标与 damage 相同）列表，第 i 项是从第 i - 1 帧切换到
+    第 i 帧时变化的区域（第 0 项对应从最后一帧回到第一帧），两帧相同时为 None。
+    顺序播放每帧只需贴一块子图；跳帧时从距离最近的缓冲区向前重放，或从关键帧重新开始。
+    多个宠物共用同一帧集合时各自停在不同的帧上，所以保留少量缓冲区，按最近使用淘汰。
+    """
+
+    # 每个帧集合最多保留的重建缓冲区数
+    MAX_BUFFERS = 2
+
+    def __init__(self, keyframe, patches, delays, loop_count=-1, masks=None, scale=1.0, damage=None):
+        """
+        Args:
+            keyframe: 第一帧 QImage（FRAME_FORMAT，像素尺寸）
+            patches: 每帧变化区域的子图列表，与 damage 一一对应
+            damage: 重绘区域列表（像素坐标），也是每块子图在帧中的位置
+        """
+        super().__init__(patches, delays, loop_count, masks, scale, damage)
+        self.keyframe = keyframe
+        self._buffers = []  # [QImage, 帧序号]，按最近使用排序（最后一个最新）
+
+    @classmethod
+    def from_images(cls, images, delays, loop_count=-1, masks=None, scale=1.0, damage=None,
+                    min_saving=0.5):
+        """
+        由 QImage 帧列表创建差分帧集合
+
+        Args:
+            min_saving: 差分存储相比整帧至少节省的内存比例，达不到时不使用差分
+
+        Returns:
+            DeltaFrameSet，少于两帧、帧尺寸不一致或节省不够时返回 None
+        """
+        if isinstance(images, SheetFrames) or len(images) < 2:
+            return None
+        size = images[0].size()
+        if any(image.size() != size for image in images):
+            return None
+        if damage is None:
+            damage = build_damage_rects(images)
+
+        frame_bytes = size.width() * size.height() * 4
+        full = frame_bytes * len(images)
+        # 关键帧加上全部重建缓冲区
+        delta = (1 + cls.MAX_BUFFERS) * frame_bytes
+        delta += sum(rect.width() * rect.height() * 4 for rect in damage)
+        if delta > full * (1 - min_saving):
+            return None
+
+        if masks is None:
+            masks = build_hit_masks(images)
+        # 关键帧和子图都深拷贝，不引用解码缓冲区或精灵包的映射内存；
+        # 重建时按像素坐标贴图，所以设备像素比统一为 1
+        keyframe = images[0].convertToFormat(FRAME_FORMAT).copy()
+        patches = [None if rect.isEmpty() else image.convertToFormat(FRAME_FORMAT).copy(rect)
+                   for image, rect in zip(images, damage)]
+        for image in [keyframe] + patches:
+            if image is not None:
+                image.setDevicePixelRatio(1.0)
+        return cls(keyframe, patches, delays, loop_count, masks, scale, damage)
+
+    @property
+    def nbytes(self):
+        """关键帧、子图和 MAX_BUFFERS 个重建缓冲区的像素内存（字节，含命中遮罩）"""
+        pixels = (1 + self.MAX_BUFFERS) * self.keyframe.width() * self.keyframe.height() * 4
+        pixels += sum(p.width() * p.height() * 4 for p in self.frames if p is not None)
+        return pixels + sum(m.nbytes for m in self.masks or () if m is not None)
+
+    def _apply(self, painter, index):
+        patch = self.frames[index]
+        if patch is not None:
+            painter.drawImage(self.damage_rects[index].topLeft(), patch)
+
+    def _buffer(self, index):
+        """返回内容为指定帧的重建缓冲区（QImage）"""
+        count = self.frame_count
+        best, steps = None, index + 1  # 从关键帧重建：复制关键帧再贴 index 块子图
+        for entry in self._buffers:
+            distance = (index - entry[1]) % count
+            if distance < steps:
+                best, steps = entry, distance
+
+        if best is not None and steps == 0:
+            self._buffers.remove(best)
+            self._buffers.append(best)
+            return best[0]
+
+        # 不是顺序的下一帧时，缓冲区可能正被另一个宠物使用：有空位就另开一个
+        restart = best is None or (steps > 1 and len(self._buffers) < self.MAX_BUFFERS)
+        if restart:
+            if len(self._buffers) < self.MAX_BUFFERS:
+                best = [QImage(self.keyframe.size(), FRAME_FORMAT), 0]
+            else:
+                best = self._buffers[0]
+                self._buffers.remove(best)
+        else:
+            self._buffers.remove(best)
+
+        start = time.perf_counter()
+        painter = QPainter(best[0])
+        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_Source)
+        if restart:
+            painter.drawImage(0, 0, self.keyframe)
+            targets = range(1, index + 1)
+        else:
+            targets = ((best[1] + i) % count for i in range(1, steps + 1))
+        for i in targets:
+            self._apply(painter, i)
+        painter.end()
+        metrics.record('delta.apply', (time.perf_counter() - start) * 1000)
+
+        best[1] = index
+        self._buffers.append(best)
+        return best[0]
+
+    def frame(self, index):
+        """获取指定帧（重建后复制为一个新的 QPixmap，播放时不走这里，见 draw）"""
+        pixmap = QPixmap.fromImage(self._buffer(index))
+        pixmap.setDevicePixelRatio(self.scale)
+        return pixmap
+
+    def frame_size(self):
+        """帧的逻辑尺寸（QSize）"""
+        return QSize(round(self.keyframe.width() / self.scale),
+                     round(self.keyframe.height() / self.scale))
+
+    def draw(self, painter, origin, index):
+        """把指定帧重建到缓冲区后绘制"""
+        image = self._buffer(index)
+        scale = self.scale
+        target = QRectF(origin.x(), origin.y(), image.width() / scale, image.height() / scale)
+        painter.drawImage(target, image, QRectF(image.rect()))
+
+
+class FramePlayer(QObject):
+    """
+    帧图集播放器
+
+    不持有自己的定时器，而是由共享的 AnimationScheduler 按经过的时间推进，
+    播放过程中不再解码或缩放任何图像。
+    """
+
+    frameChanged = Signal(int)  # 当前帧序号
+    finished = Signal()  # 非循环播放结束
+
+    def __init__(self, parent=None, scheduler=None):
+        """
+        Args:
+            parent: 父对象
+            scheduler: 使用的 AnimationScheduler，缺省为进程共享调度器
+        """
+        super().__init__(parent)
+        self.frame_set = None
+        self.current_index = 0
+        self.loop = True
+        self.scheduler = scheduler if scheduler is not None else shared_scheduler()
+
+        self._remaining = 0  # 当前帧剩余的显示时间（毫秒）
+
+    def play(self, frame_set, loop=True):
+        """
+        从第一帧开始播放
+
+        Args:
+            frame_set: 要播放的 FrameSet
+            loop: 是否循环播放
+        """
+        self.scheduler.remove(self)
+        self.frame_set = frame_set
+        self.loop = loop
+        self.current_index = 0
+
+        if frame_set is None or frame_set.frame_count == 0:
+            return
+
+        self.frameChanged.emit(0)
+
+        # 循环播放的单帧动画不需要调度
+        if frame_set.frame_count > 1 or not loop:
+            self._remaining = frame_set.delays[0]
+            self.scheduler.add(self, self._remaining)
+
+    def swap(self, frame_set):
+        """
+        换用同一动画的另一份帧集合（如另一个分辨率级别），保持当前帧和计时
+
+        帧数不同时从第一帧重新播放。
+
+        Args:
+            frame_set: 新的 FrameSet
+        """
+        current = self.frame_set
+        if current is None or frame_set.frame_count != current.frame_count:
+            self.play(frame_set, loop=self.loop)
+            return
+        self.frame_set = frame_set
+        self.frameChanged.emit(self.current_index)
+
+    def stop(self):
+        """停止播放（停留在当前帧）"""
+        self.scheduler.remove(self)
+
+    def is_running(self):
+        """是否正在播放"""
+        return self.scheduler.is_active(self)
+
+    def current_frame(self):
+        """当前帧的 QPixmap"""
+        if self.frame_set is None or self.frame_set.frame_count == 0:
+            return None
+        return self.frame_set.frame(self.current_index)
+
+    def advance(self, elapsed):
+        """
+        调度器回调：推进经过的时间
+
+        落后多帧时直接跳到应显示的帧，只发出一次 frameChanged。
+
+        Args:
+            elapsed: 经过的毫秒数（已按播放速度缩放）
+
+        Returns:
+            距下一帧的毫秒数，播放结束返回 None
+        """
+        frame_set = self.frame_set
+        delays = frame_set.delays
+        count = frame_set.frame_count
+        index = self.current_index
+        remaining = self._remaining - elapsed
+        steps = 0
+
+        # 循环动画落后超过一整轮时，整轮跳过
+        if self.loop and remaining < -frame_set.total_duration:
+            remaining %= -frame_set.total_duration
+
+        while remaining <= 0:
+            index += 1
+            steps += 1
+            if index >= count:
+                if not self.loop:
+                    # 跳帧越过结尾时仍停在最后一帧
+                    last = count - 1
+                    if self.current_index != last:
+                        self.scheduler.record_frames(1, steps - 2)
+                        self.current_index = last
+                        self.frameChanged.emit(last)
+                    self.finished.emit()
+                    return None
+                index = 0
+            remaining += delays[index]
+
+        self._remaining = remaining
+        self.scheduler.record_frames(1, steps - 1)
+        if index != self.current_index:
+            self.current_index = index
+            self.frameChanged.emit(index)
+        return remaining
+
+
+# 未指定内存缓存时的默认预算
+DEFAULT_MEMORY_BUDGET = 32 * 1024 * 1024
 
 
 class ResourceLoader:
     """资源加载器"""
 
-    def __init__(self, sprite_dir):
+    def __init__(self, sprite_dir, disk_cache=None, memory_cache=None, use_pack=True,
+                 batch_scale=False, delta_frames=False, delta_min_saving=0.5):
         """
         初始化资源加载器
 
         Args:
             sprite_dir: 精灵图资源目录路径
+            disk_cache: 可选的 SpriteCache，用于持久化解码后的帧
+            memory_cache: 可选的 MemoryCache，多个加载器可共享同一预算
+            use_pack: 目录同级存在精灵包（<目录名>.pack）时是否优先使用
+            batch_scale: 解码动画时是否用 NumPy 批量缩放全部帧
+            delta_frames: 是否把相邻帧变化很小的动画存为差分帧集合（DeltaFrameSet）
+            delta_min_saving: 差分存储至少节省的内存比例，达不到时仍保存整帧
         """
         self.sprite_dir = Path(sprite_dir)
-        self.cached_pixmaps = {}  # Cache static images
-        self.cached_movies = {}  # Cache animations
+        self.disk_cache = disk_cache
+        self.batch_scale = batch_scale
+        self.delta_frames = delta_frames
+        self.delta_min_saving = delta_min_saving
+        self.index = get_sprite_index(self.sprite_dir)
+
+        # 精灵包中的动画以虚拟路径 <精灵包>#<动画名> 表示，不再访问散装文件
+        self.use_pack = use_pack
+        self.pack = open_pack(self.sprite_dir) if use_pack else None
+
+        # 精灵表中的动画以虚拟路径 <清单>#<动画名> 表示，整张精灵表按尺寸生成一份共享图集
+        self.sheet = open_sheet(self.sprite_dir)
+
+        # 图像、动画、帧集合共用一个按字节计费的 LRU 缓存
+        # 键为 (类型, 文件绝对路径, 尺寸)
+        if memory_cache is None:
+            memory_cache = MemoryCache(DEFAULT_MEMORY_BUDGET)
+        self.memory_cache = memory_cache
 
-        print(f"[Resource] Resource directory: {self.sprite_dir}")
+        log.debug("Resource directory: %s", self.sprite_dir)
 
     def load_pixmap(self, filename, size=None):
         """
@@ -35,33 +600,33 @@ class ResourceLoader:
         Returns:
             QPixmap 对象
         """
-        cache_key = f"{filename}_{size}"
-
-        if cache_key in self.cached_pixmaps:
-            return self.cached_pixmaps[cache_key]
-
         file_path = self.sprite_dir / filename
+        cache_key = ('pixmap', str(file_path), size)
+
+        pixmap = self.memory_cache.get(cache_key)
+        if pixmap is not None:
+            return pixmap
 
         if not file_path.exists():
-            print(f"[Resource] Warning: Image file not found: {file_path}")
+            log.warning("Image file not found: %s", file_path)
             return None
 
         pixmap = QPixmap(str(file_path))
 
         if pixmap.isNull():
-            print(f"[Resource] Warning: Failed to load image: {file_path}")
+            log.warning("Failed to load image: %s", file_path)
             return None
 
         # 如果指定了尺寸，则缩放
         if size:
             pixmap = pixmap.scaled(
                 QSize(*size),
-                aspectRatioMode=1,  # KeepAspectRatio
-                transformMode=1  # SmoothTransformation
+                Qt.AspectRatioMode.KeepAspectRatio,
+                Qt.TransformationMode.SmoothTransformation
             )
 
-        self.cached_pixmaps[cache_key] = pixmap
-        print(f"[Resource] Loaded image: {filename}")
+        self.memory_cache.put(cache_key, pixmap)
+        log.debug("Loaded image: %s", filename)
         return pixmap
 
     def load_movie(self, filename, size=None):
@@ -73,37 +638,229 @@ class ResourceLoader:
             size: 可选的缩放尺寸 (width, height)
 
         Returns:
-            QMovie 对象
+            QMovie 对象（缓存共享，调用方之间共享播放状态）
         """
         file_path = self.sprite_dir / filename
+        cache_key = ('movie', str(file_path), size)
+
+        movie = self.memory_cache.get(cache_key)
+        if movie is not None:
+            return movie
 
         if not file_path.exists():
-            print(f"[Resource] Warning: Animation file not found: {file_path}")
+            log.warning("Animation file not found: %s", file_path)
             return None
 
         movie = QMovie(str(file_path))
 
         if not movie.isValid():
-            print(f"[Resource] Warning: Failed to load animation: {file_path}")
+            log.warning("Failed to load animation: %s", file_path)
             return None
 
         # 如果指定了尺寸，则缩放
         if size:
             movie.setScaledSize(QSize(*size))
 
-        print(f"[Resource] Loaded animation: {filename}")
+        self.memory_cache.put(cache_key, movie)
+        log.info("Loaded animation: %s", filename)
         return movie
 
-    def get_animation_path(self, animation_name):
+    def load_frames(self, filename, size=None, scale=1.0):
+        """
+        加载动画并一次性解码为帧图集
+
+        所有帧只在这里解码和缩放一次，之后由 FramePlayer 直接播放。
+        配置了磁盘缓存时，优先从缓存读取，未命中才解码并写回缓存。
+
+        Args:
+            filename: 文件名（相对于 sprite_dir）或绝对路径
+            size: 可选的缩放尺寸 (width, height)，保持宽高比
+            scale: 多分辨率级别倍率，帧按 size * scale 像素解码（HiDPI 屏幕）
+
+        Returns:
+            FrameSet 对象，失败返回 None
+        """
+        frame_set = self.get_cached_frames(filename, size, scale)
+        if frame_set is not None:
+            return frame_set
+
+        result = self.load_frame_images(filename, level_size(size, scale))
+        if result is None:
+            return None
+
+        return self.add_frames(filename, size, *result, scale=scale)
+
+    def load_frame_images(self, filename, size=None):
+        """
+        读取动画的全部帧图像（磁盘缓存或解码）
+
+        只使用 QImage，不创建 QPixmap，可以在后台线程中调用。
+
+        Args:
+            filename: 文件名（相对于 sprite_dir）或绝对路径
+            size: 可选的缩放尺寸 (width, height)
+
+        Returns:
+            (images, delays, loop_count) 元组，失败返回 None；
+            精灵表中的动画 images 为 SheetFrames（图集子矩形和命中遮罩）
+        """
+        member = self._sheet_member(filename)
+        if member is not None:
+            with metrics.timer('load.sheet'):
+                frames, delays, loop_count = self.sheet.frames(member, size)
+            metrics.count('load.sheet')
+            log.info("Loaded animation: %s (sprite sheet, %s frames, %sms)",
+                     member, len(frames), sum(delays))
+            return frames, delays, loop_count
+
+        member = self._pack_member(filename)
+        source = self._pack_source(member, size) if member is not None else None
+        if source is not None:
+            # 精灵包的帧比请求的分辨率级别小：改用散装文件，避免放大出模糊的帧
+            filename, member = source, None
+        if member is not None:
+            with metrics.timer('load.pack'):
+                images, delays, loop_count = self.pack.frame_images(member)
+                images = [scale_image(image, size) for image in images]
+            metrics.count('load.pack')
+            log.info("Loaded animation: %s (sprite pack, %s frames, %sms)",
+                     member, len(images), sum(delays))
+            return images, delays, loop_count
+
+        file_path = self.sprite_dir / filename
+
+        if not file_path.exists():
+            log.warning("Animation file not found: %s", file_path)
+            return None
+
+        cached = None
+        if self.disk_cache:
+            with metrics.timer('load.disk_cache'):
+                cached = self.disk_cache.load(file_path, size)
+            metrics.count('cache.disk.hit' if cached is not None else 'cache.disk.miss')
+        if cached is not None:
+            images, delays, loop_count = cached
+            source = 'disk cache'
+        else:
+            with metrics.timer('decode'):
+                images, delays, loop_count = decode_animation(
+                    file_path, size, self.index.get(file_path), self.batch_scale)
+            metrics.count('frames.decoded', len(images))
+            source = 'decoded'
+
+            if images and self.disk_cache:
+                self.disk_cache.store(file_path, size, images, delays, loop_count)
+
+        if not images:
+            log.warning("Failed to decode animation: %s", file_path)
+            return None
+
+        log.info("Loaded animation: %s (%s, %s frames, %sms)",
+                 file_path.name, source, len(images), sum(delays))
+        return images, delays, loop_count
+
+    def load_first_frame(self, filename, size=None, scale=1.0):
+        """
+        只解码动画的第一帧，用于在完整动画就绪前尽快显示
+
+        Args:
+            filename: 文件名（相对于 sprite_dir）或绝对路径
+            size: 可选的缩放尺寸 (width, height)
+            scale: 多分辨率级别倍率
+
+        Returns:
+            QPixmap 对象，失败返回 None
+        """
+        member = self._pack_member(filename)
+        sheet_member = self._sheet_member(filename)
+        source = self._pack_source(member, level_size(size, scale)) if member is not None else None
+        if source is not None:
+            image = QImageReader(str(source)).read()
+            if image.isNull():
+                return None
+        elif member is not None:
+            image = self.pack.first_frame(member)
+        elif sheet_member is not None:
+            image = self.sheet.first_frame(sheet_member)
+            if image.isNull():
+                return None
+        else:
+            image = QImageReader(str(self.sprite_dir / filename)).read()
+            if image.isNull():
+                return None
+
+        pixmap = QPixmap.fromImage(scale_image(image, level_size(size, scale)))
+        pixmap.setDevicePixelRatio(scale)
+        return pixmap
+
+    def get_animation_info(self, filename):
+        """
+        获取动画元数据（精灵包清单或元数据索引，均不解码像素）
+
+        Args:
+            filename: 文件名（相对于 sprite_dir）、绝对路径或精灵包、精灵表虚拟路径
+
+        Returns:
+            AnimationInfo 对象，失败返回 None
+        """
+        member = self._pack_member(filename)
+        if member is not None:
+            return self.pack.info(member)
+        member = self._sheet_member(filename)
+        if member is not None:
+            return self.sheet.info(member)
+        return self.index.get(filename)
+
+    def get_cached_frames(self, filename, size=None, scale=1.0):
+        """从内存缓存获取帧集合，未命中返回 None"""
+        return self.memory_cache.get(('frames', str(self.sprite_dir / filename), size, scale))
+
+    def add_frames(self, filename, size, images, delays, loop_count, masks=None, scale=1.0,
+                   damage=None):
+        """
+        将已解码的帧图像转换为 FrameSet 并放入内存缓存
+
+        QPixmap 只能在 GUI 线程中创建，所以必须在 GUI 线程调用。
+        开启 delta_frames 时，差分存储能省下足够内存的动画保存为 DeltaFrameSet，
+        对调用方接口相同。
+
+        Args:
+            size: 逻辑尺寸（images 已按 size * scale 缩放好）
+            masks: 可选的命中遮罩列表（由工作线程预先计算）
+            scale: 多分辨率级别倍率
+            damage: 可选的重绘区域列表（由工作线程预先计算）
+
+        Returns:
+            FrameSet 对象
+        """
+        frame_set = None
+        if self.delta_frames:
+            frame_set = DeltaFrameSet.from_images(images, delays, loop_count, masks, scale, damage,
+                                                  self.delta_min_saving)
+        if frame_set is None:
+            frame_set = FrameSet.from_images(images, delays, loop_count, masks, scale, damage)
+        self.memory_cache.put(('frames', str(self.sprite_dir / filename), size, scale), frame_set)
+        return frame_set
+
+    def get_animation_path(self, animation_name, warn=True):
         """
         获取动画文件路径
 
         Args:
             animation_name: 动画名称（如 'idle', 'click'）
+            warn: 找不到时是否打印警告（查询可选动画时关闭）
 
         Returns:
             文件路径字符串，如果文件不存在则返回 None
         """
+        # 精灵包中的动画不需要访问文件系统
+        if self.pack is not None and animation_name in self.pack:
+            return self.pack.member_path(animation_name)
+
+        # 其次是精灵表
+        if self.sheet is not None and animation_name in self.sheet:
+            return self.sheet.member_path(animation_name)
+
         # 尝试 GIF 格式
         gif_path = self.sprite_dir / f"{animation_name}.gif"
         if gif_path.exists():
@@ -114,7 +871,8 @@ class ResourceLoader:
         if png_path.exists():
             return str(png_path)
 
-        print(f"[Resource] Warning: Animation not found: '{animation_name}'")
+        if warn:
+            log.warning("Animation not found: '%s'", animation_name)
         return None
 
     def list_available_animations(self):
@@ -124,24 +882,170 @@ class ResourceLoader:
         Returns:
             动画名称列表
         """
-        animations = []
+        if self.pack is not None:
+            animations = self.pack.animations()
+            log.debug("Available animations: %s (sprite pack)", animations)
+            return animations
+
+        animations = self.sheet.animations() if self.sheet is not None else []
 
         if not self.sprite_dir.exists():
-            print(f"[Resource] Warning: Resource directory not found: {self.sprite_dir}")
+            log.warning("Resource directory not found: %s", self.sprite_dir)
             return animations
 
         # 扫描 GIF 和 PNG 文件
         for ext in ['*.gif', '*.png']:
             for file in self.sprite_dir.glob(ext):
                 animation_name = file.stem  # 不带扩展名的文件名
+                if self.sheet is not None and file == self.sheet.image_path:
+                    continue  # 精灵表图像本身不是动画
                 if animation_name not in animations:
                     animations.append(animation_name)
 
-        print(f"[Resource] Available animations: {animations}")
+        log.debug("Available animations: %s", animations)
         return animations
 
     def clear_cache(self):
-        """清空缓存"""
-        self.cached_pixmaps.clear()
-        self.cached_movies.clear()
-        print("[Resource] Cache cleared")
+        """清空本目录资源的缓存（同一内存缓存中其他物种的资源不受影响）"""
+        # 加上分隔符，避免 sprites/pika 匹配到 sprites/pikachu/...（精灵表虚拟路径也在目录内）；
+        # 精灵包在目录之外，按文件名精确匹配本物种的精灵包
+        prefix = str(self.sprite_dir) + os.sep
+        self.memory_cache.remove_if(
+            lambda key: key[1].startswith(prefix) or self._pack_member_of(key[1]) is not None)
+        log.debug("Cache cleared")
+
+    def invalidate(self, animation_name):
+        """
+        使单个动画的内存缓存和元数据索引失效（其他动画不受影响）
+
+        磁盘缓存按文件内容哈希命中，文件变化后自然失效，这里不需要处理。
+
+        Args:
+            animation_name: 动画名称（如 'idle'）
+        """
+        filenames = [f"{animation_name}{ext}" for ext in ANIMATION_EXTENSIONS]
+        paths = {str(self.sprite_dir / filename) for filename in filenames}
+        paths.add(f"{sheet_path_for(self.sprite_dir)}{MEMBER_SEPARATOR}{animation_name}")
+
+        # 精灵包可能换成了带版本号的文件，新旧精灵包中的这个动画都要失效
+        self.memory_cache.remove_if(
+            lambda key: key[1] in paths or self._pack_member_of(key[1]) == animation_name)
+        for filename in filenames:
+            self.index.invalidate(filename)
+
+    def reload_pack(self):
+        """
+        重新打开精灵包（精灵包被重新打包、新增或删除后调用）
+
+        Returns:
+            内容发生变化的动画名称列表（已从缓存中失效）
+        """
+        old_pack = self.pack
+        new_pack = open_pack(self.sprite_dir) if self.use_pack else None
+
+        if old_pack is not None and new_pack is not None:
+            # 按清单中的内容哈希比较，只有变化的动画需要重新加载
+            names = set(old_pack.animations()) | set(new_pack.animations())
+            changed = [name for name in names
+                       if name not in old_pack or name not in new_pack
+                       or old_pack.animation_hash(name) is None
+                       or old_pack.animation_hash(name) != new_pack.animation_hash(name)]
+        else:
+            # 精灵包新增或删除：动画来源整体切换
+            changed = set()
+            for pack in (old_pack, new_pack):
+                if pack is not None:
+                    changed.update(pack.animations())
+            changed = list(changed)
+
+        self.pack = new_pack
+        if old_pack is not None:
+            old_pack.close()
+
+        for name in changed:
+            self.invalidate(name)
+        return sorted(changed)
+
+    def reload_sheet(self):
+        """
+        重新读取精灵表（清单或精灵表图像变化、新增或删除后调用）
+
+        图像变化会影响所有子图，所以新旧精灵表中的全部动画都会失效。
+
+        Returns:
+            已从缓存中失效的动画名称列表
+        """
+        old_sheet = self.sheet
+        self.sheet = open_sheet(self.sprite_dir)
+
+        changed = set()
+        for sheet in (old_sheet, self.sheet):
+            if sheet is not None:
+                changed.update(sheet.animations())
+
+        for name in changed:
+            self.invalidate(name)
+        return sorted(changed)
+
+    def close(self):
+        """关闭精灵包"""
+        if self.pack is not None:
+            self.pack.close()
+            self.pack = None
+
+    def _pack_member_of(self, path):
+        """
+        虚拟路径属于本物种任一版本的精灵包时返回动画名称（不要求精灵包仍然打开）
+
+        Returns:
+            动画名称，不是本物种的精灵包路径时返回 None
+        """
+        pack_file, separator, member = str(path).rpartition(MEMBER_SEPARATOR)
+        if not separator:
+            return None
+        pack_file = Path(pack_file)
+        if (pack_file.parent != self.sprite_dir.parent
+                or pack_species(pack_file.name) != self.sprite_dir.name):
+            return None
+        return member
+
+    def _pack_member(self, filename):
+        """精灵包虚拟路径对应的动画名称，不是精灵包路径时返回 None"""
+        if self.pack is None:
+            return None
+        return self.pack.member_name(filename)
+
+    def _pack_source(self, member, size):
+        """
+        精灵包中的帧小于目标尺寸时对应的散装动画文件
+
+        精灵包按打包时的尺寸预先缩放，旧精灵包或按窗口尺寸打包的精灵包在 HiDPI 级别上
+        只能放大；散装文件还在时从它解码同样快，画面更清晰。
+
+        Args:
+            member: 精灵包中的动画名称
+            size: 目标像素尺寸 (width, height)，为 None 时不缩放
+
+        Returns:
+            散装文件路径（Path），精灵包的帧足够大或没有散装文件时返回 None
+        """
+        if not size:
+            return None
+        info = self.pack.info(member)
+        frame = QSize(info.width, info.height)
+        if frame.scaled(QSize(*size), Qt.AspectRatioMode.KeepAspectRatio).width() <= frame.width():
+            return None
+
+        for ext in ANIMATION_EXTENSIONS:
+            path = self.sprite_dir / f"{member}{ext}"
+            if path.exists():
+                log.debug("Sprite pack frames of '%s' are %sx%s, smaller than %sx%s: using %s",
+                          member, info.width, info.height, size[0], size[1], path.name)
+                return path
+        return None
+
+    def _sheet_member(self, filename):
+        """精灵表虚拟路径对应的动画名称，不是精灵表路径时返回 None"""
+        if self.sheet is None:
+            return None
+        return self.sheet.member_name(filename)
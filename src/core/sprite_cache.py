@@ -0,0 +1,310 @@
+"""
+精灵图磁盘缓存模块
+将解码并缩放好的动画帧持久化到配置目录，热启动时直接映射读取，跳过解码
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from pathlib import Path
+
+from PySide6.QtGui import QImage
+
+from src.core.log import get_logger
+
+log = get_logger('Cache')
+
+
+# 缓存格式版本，格式变化时递增，旧缓存会被整体清除
+CACHE_VERSION = 1
+
+# 文件头：魔数、版本、宽、高、帧数、循环次数
+_HEADER = struct.Struct('<4sHHHHi')
+_MAGIC = b'DPSC'
+
+# 帧像素格式（QPixmap 在光栅后端的原生格式，转换时无需再做像素变换）
+FRAME_FORMAT = QImage.Format.Format_ARGB32_Premultiplied
+
+_INDEX_FILE = 'index.json'
+_HASH_CHUNK = 1 << 20
+
+
+class SpriteCache:
+    """精灵图磁盘缓存（带 LRU 容量上限）"""
+
+    def __init__(self, cache_dir, max_bytes=64 * 1024 * 1024):
+        """
+        初始化磁盘缓存
+
+        Args:
+            cache_dir: 缓存目录
+            max_bytes: 缓存总大小上限（字节），超出时按最近最少使用淘汰
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+        # 后台解码线程会并发读写缓存，索引的修改需要加锁
+        self._lock = threading.RLock()
+
+        # files: 源文件路径 -> {mtime, size, hash}
+        # entries: 缓存键 -> {bytes, last_used}
+        self._index = {'version': CACHE_VERSION, 'files': {}, 'entries': {}}
+        # 命中只更新内存中的 last_used 和文件记录，索引在写入、淘汰或 flush() 时才落盘
+        self._dirty = False
+        self._load_index()
+
+    def load(self, file_path, size=None):
+        """
+        从缓存读取动画帧
+
+        Args:
+            file_path: 源动画文件路径
+            size: 缩放尺寸 (width, height)，与写入时一致
+
+        Returns:
+            (images, delays, loop_count) 元组，未命中返回 None
+        """
+        with self._lock:
+            key = self._entry_key(file_path, size)
+            if key is None or key not in self._index['entries']:
+                return None
+
+            try:
+                result = self._read_entry(self._entry_path(key))
+            except (OSError, ValueError, struct.error) as e:
+                log.warning("Dropping corrupt cache entry %s: %s", key, e)
+                self._remove_entry(key)
+                self._save_index()
+                return None
+
+            self._index['entries'][key]['last_used'] = time.time()
+            self._dirty = True
+            return result
+
+    def store(self, file_path, size, images, delays, loop_count):
+        """
+        写入动画帧到缓存
+
+        Args:
+            file_path: 源动画文件路径
+            size: 缩放尺寸 (width, height)
+            images: 同尺寸的 QImage 帧列表
+            delays: 每帧延迟（毫秒）
+            loop_count: 循环次数，-1 表示无限循环
+        """
+        if not images:
+            return
+
+        with self._lock:
+            self._store(file_path, size, images, delays, loop_count)
+
+    def _store(self, file_path, size, images, delays, loop_count):
+        key = self._entry_key(file_path, size)
+        if key is None:
+            return
+
+        width = images[0].width()
+        height = images[0].height()
+        frame_bytes = width * height * 4
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entry_path = self._entry_path(key)
+        tmp_path = entry_path.with_suffix('.tmp')
+
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(_HEADER.pack(_MAGIC, CACHE_VERSION, width, height,
+                                     len(images), loop_count))
+                f.write(struct.pack(f'<{len(delays)}I', *delays))
+                for image in images:
+                    if image.format() != FRAME_FORMAT:
+                        image = image.convertToFormat(FRAME_FORMAT)
+                    # 逐行写入，跳过行尾可能存在的填充字节
+                    bits = image.constBits()
+                    stride = image.bytesPerLine()
+                    if stride == width * 4:
+                        f.write(bits[:frame_bytes])
+                    else:
+                        for y in range(height):
+                            f.write(bits[y * stride:y * stride + width * 4])
+            os.replace(tmp_path, entry_path)
+        except OSError as e:
+            log.warning("Failed to write cache entry: %s", e)
+            return
+
+        self._index['entries'][key] = {
+            'bytes': entry_path.stat().st_size,
+            'last_used': time.time(),
+        }
+        self._evict()
+        self._save_index()
+
+    def flush(self):
+        """把命中后只在内存中更新的索引写回磁盘（退出时调用）"""
+        with self._lock:
+            if self._dirty:
+                self._save_index()
+
+    def invalidate(self, file_path):
+        """使某个源文件的全部缓存失效"""
+        with self._lock:
+            record = self._index['files'].pop(str(Path(file_path).resolve()), None)
+            if record is None:
+                return
+
+            prefix = record['hash']
+            for key in [k for k in self._index['entries'] if k.startswith(prefix)]:
+                self._remove_entry(key)
+            self._save_index()
+
+    def clear(self):
+        """清空全部缓存"""
+        with self._lock:
+            for key in list(self._index['entries']):
+                self._remove_entry(key)
+            self._index = {'version': CACHE_VERSION, 'files': {}, 'entries': {}}
+            self._save_index()
+
+    def total_bytes(self):
+        """当前缓存占用（字节）"""
+        with self._lock:
+            return sum(entry['bytes'] for entry in self._index['entries'].values())
+
+    def _entry_key(self, file_path, size):
+        """缓存键 = 内容哈希 + 目标尺寸"""
+        content_hash = self._content_hash(Path(file_path))
+        if content_hash is None:
+            return None
+        size_tag = f"{size[0]}x{size[1]}" if size else 'orig'
+        return f"{content_hash}_{size_tag}"
+
+    def _content_hash(self, file_path):
+        """
+        获取文件内容哈希
+
+        路径、修改时间和大小都未变化时直接复用记录的哈希，不再读取文件。
+        """
+        try:
+            stat = file_path.stat()
+        except OSError:
+            return None
+
+        path_key = str(file_path.resolve())
+        record = self._index['files'].get(path_key)
+        if record and record['mtime'] == stat.st_mtime_ns and record['size'] == stat.st_size:
+            return record['hash']
+
+        digest = hashlib.blake2b(digest_size=16)
+        try:
+            with open(file_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(_HASH_CHUNK), b''):
+                    digest.update(chunk)
+        except OSError:
+            return None
+        content_hash = digest.hexdigest()
+
+        # 文件内容已变化：旧内容若不再被其他文件引用，则删除其缓存
+        if record and record['hash'] != content_hash:
+            old_hash = record['hash']
+            still_used = any(r['hash'] == old_hash
+                             for p, r in self._index['files'].items() if p != path_key)
+            if not still_used:
+                for key in [k for k in self._index['entries'] if k.startswith(old_hash)]:
+                    self._remove_entry(key)
+
+        self._index['files'][path_key] = {
+            'mtime': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'hash': content_hash,
+        }
+        self._dirty = True
+        return content_hash
+
+    def _entry_path(self, key):
+        return self.cache_dir / f"{key}.frames"
+
+    def _read_entry(self, entry_path):
+        """通过内存映射读取缓存文件"""
+        with open(entry_path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                magic, version, width, height, count, loop_count = _HEADER.unpack_from(mm, 0)
+                if magic != _MAGIC or version != CACHE_VERSION:
+                    raise ValueError("cache header mismatch")
+
+                offset = _HEADER.size
+                delays = list(struct.unpack_from(f'<{count}I', mm, offset))
+                offset += 4 * count
+
+                frame_bytes = width * height * 4
+                if len(mm) < offset + frame_bytes * count:
+                    raise ValueError("truncated cache entry")
+
+                images = []
+                view = memoryview(mm)
+                try:
+                    for _ in range(count):
+                        frame = QImage(view[offset:offset + frame_bytes],
+                                       width, height, width * 4, FRAME_FORMAT)
+                        # 深拷贝，使 QImage 不再依赖映射内存
+                        images.append(frame.copy())
+                        del frame
+                        offset += frame_bytes
+                finally:
+                    view.release()
+
+        return images, delays, loop_count
+
+    def _evict(self):
+        """按最近最少使用淘汰，直到总大小不超过上限"""
+        entries = self._index['entries']
+        total = self.total_bytes()
+        for key in sorted(entries, key=lambda k: entries[k]['last_used']):
+            if total <= self.max_bytes:
+                break
+            total -= entries[key]['bytes']
+            self._remove_entry(key)
+            log.debug("Evicted cache entry: %s", key)
+
+    def _remove_entry(self, key):
+        self._index['entries'].pop(key, None)
+        try:
+            self._entry_path(key).unlink()
+        except FileNotFoundError:
+            pass
+
+    def _load_index(self):
+        index_path = self.cache_dir / _INDEX_FILE
+        if not index_path.exists():
+            return
+
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError) as e:
+            log.warning("Failed to read cache index: %s", e)
+            index = None
+
+        if not index or index.get('version') != CACHE_VERSION:
+            # 版本不兼容：删除全部旧的缓存文件
+            for path in self.cache_dir.glob('*.frames'):
+                path.unlink(missing_ok=True)
+            log.info("Cache version changed, cache cleared")
+            return
+
+        self._index = index
+
+    def _save_index(self):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        index_path = self.cache_dir / _INDEX_FILE
+        tmp_path = index_path.with_suffix('.tmp')
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._index, f)
+            os.replace(tmp_path, index_path)
+            self._dirty = False
+        except OSError as e:
+            log.warning("Failed to write cache index: %s", e)
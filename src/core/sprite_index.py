@@ -0,0 +1,253 @@
+"""
+精灵图元数据索引模块
+只解析 GIF 的块头（帧数、帧延迟、循环次数、尺寸、处置方式），不解压像素数据
+"""
+
+import mmap
+import struct
+from pathlib import Path
+
+from src.core.log import get_logger
+
+log = get_logger('Index')
+
+
+# GIF 帧未声明延迟时使用的默认值（毫秒）
+DEFAULT_FRAME_DELAY = 100
+
+# 动画文件扩展名，按查找优先级排列
+ANIMATION_EXTENSIONS = ('.gif', '.png')
+
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+class AnimationInfo:
+    """单个动画文件的元数据"""
+
+    def __init__(self, path, width, height, delays, disposals, loop_count):
+        """
+        Args:
+            path: 文件路径
+            width: 逻辑画布宽度
+            height: 逻辑画布高度
+            delays: 每帧延迟（毫秒）列表
+            disposals: 每帧处置方式列表（GIF disposal method 0-7）
+            loop_count: 循环次数，-1 表示无限循环，0 表示只播放一次
+        """
+        self.path = Path(path)
+        self.width = width
+        self.height = height
+        self.delays = delays
+        self.disposals = disposals
+        self.loop_count = loop_count
+        self.total_duration = sum(delays)
+
+    @property
+    def frame_count(self):
+        """帧数"""
+        return len(self.delays)
+
+    @property
+    def size(self):
+        """画布尺寸 (width, height)"""
+        return (self.width, self.height)
+
+    def __repr__(self):
+        return (f"AnimationInfo({self.path.name}, {self.width}x{self.height}, "
+                f"{self.frame_count} frames, {self.total_duration}ms)")
+
+
+def _skip_sub_blocks(data, pos):
+    """跳过一串数据子块，返回终止块之后的位置"""
+    while True:
+        block_size = data[pos]
+        pos += 1
+        if block_size == 0:
+            return pos
+        pos += block_size
+
+
+def parse_gif(path):
+    """
+    单次扫描 GIF 文件，读取动画元数据
+
+    图像数据只按子块长度跳过，不做 LZW 解压。
+
+    Args:
+        path: GIF 文件路径
+
+    Returns:
+        AnimationInfo 对象
+
+    Raises:
+        ValueError: 文件不是合法的 GIF
+    """
+    with open(path, 'rb') as f:
+        # 内存映射：大文件无需整体读入内存
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return _parse_gif_data(path, data)
+
+
+def _parse_gif_data(path, data):
+    if data[:6] not in (b'GIF87a', b'GIF89a'):
+        raise ValueError(f"not a GIF file: {path}")
+
+    width, height, packed = struct.unpack_from('<HHB', data, 6)
+    pos = 13
+    if packed & 0x80:
+        pos += 3 << ((packed & 0x07) + 1)  # 全局颜色表
+
+    delays = []
+    disposals = []
+    loop_count = 0  # 没有 NETSCAPE 扩展时只播放一次
+    pending_delay = None
+    pending_disposal = 0
+
+    try:
+        while True:
+            block = data[pos]
+            pos += 1
+
+            if block == 0x2C:  # 图像描述符
+                packed = data[pos + 8]
+                pos += 9
+                if packed & 0x80:
+                    pos += 3 << ((packed & 0x07) + 1)  # 局部颜色表
+                pos += 1  # LZW 最小码长
+                pos = _skip_sub_blocks(data, pos)
+
+                delays.append(pending_delay if pending_delay else DEFAULT_FRAME_DELAY)
+                disposals.append(pending_disposal)
+                pending_delay = None
+                pending_disposal = 0
+
+            elif block == 0x21:  # 扩展块
+                label = data[pos]
+                pos += 1
+
+                if label == 0xF9 and data[pos] == 4:  # 图形控制扩展
+                    packed, delay_cs = struct.unpack_from('<BH', data, pos + 1)
+                    pending_disposal = (packed >> 2) & 0x07
+                    pending_delay = delay_cs * 10
+                    pos += 5
+                elif label == 0xFF and data[pos:pos + 12] == b'\x0bNETSCAPE2.0':
+                    pos += 12
+                    if data[pos] == 3 and data[pos + 1] == 1:
+                        loops = struct.unpack_from('<H', data, pos + 2)[0]
+                        loop_count = -1 if loops == 0 else loops
+                pos = _skip_sub_blocks(data, pos)
+
+            elif block == 0x3B:  # 文件结束
+                break
+
+            else:
+                raise ValueError(f"unknown GIF block 0x{block:02x} at offset {pos - 1}")
+
+    except IndexError:
+        # 截断的文件：保留已经完整读取的帧
+        if not delays:
+            raise ValueError(f"truncated GIF file: {path}")
+
+    return AnimationInfo(path, width, height, delays, disposals, loop_count)
+
+
+def parse_png(path):
+    """
+    读取 PNG 文件头（IHDR），作为单帧动画
+
+    Args:
+        path: PNG 文件路径
+
+    Returns:
+        AnimationInfo 对象
+    """
+    with open(path, 'rb') as f:
+        header = f.read(24)
+
+    if header[:8] != _PNG_SIGNATURE:
+        raise ValueError(f"not a PNG file: {path}")
+
+    width, height = struct.unpack_from('>II', header, 16)
+    return AnimationInfo(path, width, height, [DEFAULT_FRAME_DELAY], [0], 0)
+
+
+class SpriteIndex:
+    """精灵图目录的元数据索引"""
+
+    def __init__(self, sprite_dir):
+        """
+        初始化索引
+
+        Args:
+            sprite_dir: 精灵图资源目录路径
+        """
+        self.sprite_dir = Path(sprite_dir)
+        self._entries = {}  # 文件路径 -> ((mtime, size), AnimationInfo)
+
+    def get(self, path):
+        """
+        获取动画文件的元数据（文件未变化时直接返回缓存结果）
+
+        Args:
+            path: 文件名（相对于 sprite_dir）或绝对路径
+
+        Returns:
+            AnimationInfo 对象，文件不存在或无法解析时返回 None
+        """
+        file_path = self.sprite_dir / path
+
+        try:
+            stat = file_path.stat()
+        except OSError:
+            return None
+
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        key = str(file_path)
+        entry = self._entries.get(key)
+        if entry and entry[0] == stamp:
+            return entry[1]
+
+        try:
+            if file_path.suffix.lower() == '.gif':
+                info = parse_gif(file_path)
+            else:
+                info = parse_png(file_path)
+        except (OSError, ValueError) as e:
+            log.warning("Failed to index %s: %s", file_path.name, e)
+            return None
+
+        self._entries[key] = (stamp, info)
+        return info
+
+    def get_animation(self, animation_name):
+        """
+        按动画名称获取元数据（如 'idle'、'click'）
+
+        Returns:
+            AnimationInfo 对象，找不到时返回 None
+        """
+        for ext in ANIMATION_EXTENSIONS:
+            info = self.get(f"{animation_name}{ext}")
+            if info is not None:
+                return info
+        return None
+
+    def invalidate(self, path=None):
+        """清除某个文件（或全部）的索引结果"""
+        if path is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(str(self.sprite_dir / path), None)
+
+
+# 每个精灵图目录共享一个索引实例
+_indexes = {}
+
+
+def get_sprite_index(sprite_dir):
+    """获取指定目录的共享 SpriteIndex"""
+    key = str(Path(sprite_dir).resolve())
+    index = _indexes.get(key)
+    if index is None:
+        index = _indexes[key] = SpriteIndex(key)
+    return index
@@ -0,0 +1,391 @@
+"""
+精灵图导入模块
+把第三方的原始精灵图（GIF 动画、PNG 单帧或横向排列的 PNG 精灵表）
+校验、统一帧时间、缩放后写入 assets/sprites/<宠物>/，可选同时打包精灵包。
+
+每个物种是一个独立任务，在进程池中并行处理（解码和缩放只用 Pillow，
+打包只用 QImage，工作进程不需要 QApplication）；
+输入内容和参数的哈希记录在输出目录的清单文件中，未变化的物种直接跳过。
+"""
+
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from PIL import Image, ImageSequence
+
+from src.core.log import get_logger
+from src.core.sprite_index import ANIMATION_EXTENSIONS, DEFAULT_FRAME_DELAY, parse_gif
+
+log = get_logger('Ingest')
+
+
+# 输出目录中记录导入结果的清单文件
+MANIFEST_NAME = '.ingest.json'
+
+# 清单格式版本，处理逻辑变化时递增，使旧的导入结果全部重建
+INGEST_VERSION = 1
+
+# 短于该值的帧时间按浏览器的惯例视为未设置（许多 GIF 用 0 或 10 毫秒表示“默认速度”）
+MIN_FRAME_DELAY = 20
+
+# GIF 以 1/100 秒为单位保存帧时间
+DELAY_STEP = 10
+
+# GIF 只有 1 位透明度：不透明度低于一半的像素写为全透明
+ALPHA_THRESHOLD = 128
+
+_HASH_CHUNK = 1024 * 1024
+
+
+def find_species(source_root):
+    """
+    列出源目录下的物种（含有 GIF/PNG 文件的子目录）
+
+    Args:
+        source_root: 源目录，结构为 <源目录>/<物种>/<动画>.gif|png
+
+    Returns:
+        物种目录 Path 列表（按名称排序）
+    """
+    return sorted(
+        path for path in Path(source_root).iterdir()
+        if path.is_dir() and any(p.suffix.lower() in ANIMATION_EXTENSIONS for p in path.iterdir())
+    )
+
+
+def source_files(species_dir):
+    """
+    物种目录中的动画源文件（同名动画按扩展名优先级只取一个）
+
+    Returns:
+        {动画名称: 文件 Path}
+    """
+    files = {}
+    for ext in ANIMATION_EXTENSIONS:
+        for path in sorted(Path(species_dir).iterdir()):
+            if path.suffix.lower() == ext and path.is_file():
+                files.setdefault(path.stem.lower(), path)
+    return files
+
+
+def normalize_delays(delays):
+    """
+    统一帧时间：缺失或过短的帧时间改为默认值，并取整到 GIF 能表示的 10 毫秒
+
+    Args:
+        delays: 原始帧时间（毫秒）列表，元素可以是 None
+
+    Returns:
+        新的帧时间列表
+    """
+    result = []
+    for delay in delays:
+        if not delay or delay < MIN_FRAME_DELAY:
+            delay = DEFAULT_FRAME_DELAY
+        result.append(max(DELAY_STEP, int(round(delay / DELAY_STEP)) * DELAY_STEP))
+    return result
+
+
+def read_source(path):
+    """
+    读取一个源文件的全部帧
+
+    GIF 和 APNG 按动画读取；宽度是高度整数倍的静态 PNG 视为横向排列的
+    正方形帧精灵表，其余 PNG 视为单帧。
+
+    Args:
+        path: 源文件路径
+
+    Returns:
+        (frames, delays, loop_count) 元组，frames 为 RGBA 模式的 PIL 图像列表，
+        delays 中缺失的帧时间为 None
+
+    Raises:
+        ValueError: 文件无法解码或没有任何帧
+    """
+    try:
+        with Image.open(path) as image:
+            image.load()
+            loop = image.info.get('loop', 0)
+            if getattr(image, 'n_frames', 1) > 1:
+                frames = []
+                delays = []
+                for frame in ImageSequence.Iterator(image):
+                    frames.append(frame.convert('RGBA'))
+                    delays.append(frame.info.get('duration'))
+            else:
+                sheet = image.convert('RGBA')
+                width, height = sheet.size
+                count = width // height if height and width % height == 0 else 1
+                if count > 1:
+                    frames = [sheet.crop((i * height, 0, (i + 1) * height, height)) for i in range(count)]
+                else:
+                    frames = [sheet]
+                delays = [image.info.get('duration')] * len(frames)
+    except (OSError, SyntaxError) as e:
+        raise ValueError(f"cannot decode {path.name}: {e}") from e
+
+    if not frames:
+        raise ValueError(f"{path.name} has no frames")
+    return frames, delays, -1 if loop == 0 else loop
+
+
+def validate_frames(name, frames):
+    """
+    校验帧序列
+
+    Raises:
+        ValueError: 帧尺寸不一致、尺寸为零或全部帧完全透明
+    """
+    size = frames[0].size
+    if not size[0] or not size[1]:
+        raise ValueError(f"{name}: empty frame size {size}")
+    for i, frame in enumerate(frames):
+        if frame.size != size:
+            raise ValueError(f"{name}: frame {i} is {frame.size}, expected {size}")
+    if all(frame.getchannel('A').getbbox() is None for frame in frames):
+        raise ValueError(f"{name}: every frame is fully transparent")
+
+
+def fit_frames(frames, size):
+    """
+    把帧缩放到目标尺寸之内（保持宽高比）
+
+    缩小用 Lanczos 滤波并在预乘空间中进行（透明边缘不会出现色边）；
+    放大只按整数倍最近邻放大，像素风格的小精灵图保持清晰，
+    剩余的缩放留给加载时按窗口尺寸完成。
+
+    Args:
+        frames: RGBA 图像列表
+        size: 目标尺寸 (width, height)，为 None 时不缩放
+
+    Returns:
+        新的图像列表
+    """
+    if not size:
+        return frames
+
+    width, height = frames[0].size
+    ratio = min(size[0] / width, size[1] / height)
+    if ratio >= 2:
+        factor = int(ratio)
+        target = (width * factor, height * factor)
+        return [frame.resize(target, Image.Resampling.NEAREST) for frame in frames]
+    if ratio >= 1:
+        return frames
+
+    target = (max(1, round(width * ratio)), max(1, round(height * ratio)))
+    return [frame.convert('RGBa').resize(target, Image.Resampling.LANCZOS).convert('RGBA')
+            for frame in frames]
+
+
+def _binarize_alpha(frame):
+    """透明度二值化（GIF 只能表示全透明或不透明）"""
+    alpha = frame.getchannel('A').point(lambda a: 255 if a >= ALPHA_THRESHOLD else 0)
+    clear = Image.new('RGBA', frame.size, (0, 0, 0, 0))
+    solid = frame.copy()
+    solid.putalpha(255)
+    return Image.composite(solid, clear, alpha)
+
+
+def write_gif(path, frames, delays, loop_count):
+    """
+    写入 GIF 动画（先写临时文件再重命名，中途失败不会留下半个文件）
+
+    Returns:
+        写入的字节数
+    """
+    frames = [_binarize_alpha(frame) for frame in frames]
+    tmp_path = path.with_name(path.name + '.tmp')
+    frames[0].save(
+        tmp_path,
+        format='GIF',
+        save_all=True,
+        append_images=frames[1:],
+        duration=delays,
+        loop=0 if loop_count < 0 else loop_count,
+        disposal=2,
+    )
+    os.replace(tmp_path, path)
+    return path.stat().st_size
+
+
+def input_hash(files, options):
+    """
+    输入内容和处理参数的哈希
+
+    Args:
+        files: {动画名称: 文件 Path}
+        options: 影响输出的参数（可 JSON 序列化）
+
+    Returns:
+        十六进制哈希字符串
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps([INGEST_VERSION, options], sort_keys=True).encode())
+    for name in sorted(files):
+        digest.update(name.encode() + b'\0')
+        with open(files[name], 'rb') as f:
+            for chunk in iter(lambda: f.read(_HASH_CHUNK), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_manifest(output_dir):
+    """读取输出目录的导入清单，不存在或损坏时返回 None"""
+    try:
+        with open(Path(output_dir) / MANIFEST_NAME, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def ingest_species(species_dir, output_dir, size=None, force=False, pack=False, compress=False):
+    """
+    导入一个物种（进程池中的任务函数，参数和返回值都可以跨进程传递）
+
+    Args:
+        species_dir: 源目录（<源目录>/<物种>）
+        output_dir: 输出目录（assets/sprites/<物种>）
+        size: 可选的目标尺寸 (width, height)
+        force: 忽略清单，总是重新导入
+        pack: 导入后打包为精灵包（<输出目录>.pack）
+        compress: 打包时压缩帧数据
+
+    Returns:
+        结果字典：species、status（'built' / 'skipped' / 'failed'）、animations、
+        frames、bytes_in、bytes_out、seconds、errors
+    """
+    start = time.perf_counter()
+    species_dir = Path(species_dir)
+    output_dir = Path(output_dir)
+    result = {
+        'species': species_dir.name, 'status': 'failed', 'animations': 0, 'frames': 0,
+        'bytes_in': 0, 'bytes_out': 0, 'seconds': 0.0, 'errors': [],
+    }
+
+    files = source_files(species_dir)
+    result['bytes_in'] = sum(path.stat().st_size for path in files.values())
+    options = {'size': list(size) if size else None, 'pack': pack, 'compress': compress}
+    digest = input_hash(files, options)
+
+    manifest = read_manifest(output_dir)
+    if (not force and manifest is not None and manifest.get('hash') == digest
+            and all((output_dir / f"{name}.gif").exists() for name in manifest.get('animations', {}))):
+        result.update(status='skipped', animations=len(manifest['animations']),
+                      frames=sum(a['frames'] for a in manifest['animations'].values()),
+                      seconds=time.perf_counter() - start)
+        return result
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    animations = {}
+    for name, path in files.items():
+        try:
+            frames, delays, loop_count = read_source(path)
+            validate_frames(path.name, frames)
+            frames = fit_frames(frames, size)
+            delays = normalize_delays(delays)
+            output = output_dir / f"{name}.gif"
+            result['bytes_out'] += write_gif(output, frames, delays, loop_count)
+            # 相同的连续帧在写入时会合并，以实际写入的块头为准
+            info = parse_gif(output)
+        except (OSError, ValueError) as e:
+            result['errors'].append(str(e))
+            continue
+        animations[name] = {
+            'source': path.name,
+            'frames': info.frame_count,
+            'size': [info.width, info.height],
+            'duration': info.total_duration,
+        }
+        result['frames'] += info.frame_count
+
+    # 上次导入过、但源文件已经删除的动画
+    if manifest is not None:
+        for name in manifest.get('animations', {}):
+            if name not in files:
+                (output_dir / f"{name}.gif").unlink(missing_ok=True)
+
+    result['animations'] = len(animations)
+    if 'idle' not in animations:
+        result['errors'].append("no usable idle animation")
+    else:
+        if pack:
+            from src.core.sprite_pack import pack_directory
+            try:
+                pack_directory(output_dir, compress=compress)
+            except (OSError, ValueError) as e:
+                result['errors'].append(f"pack failed: {e}")
+
+        # 有动画失败时不写清单，下次运行会重新尝试
+        if not result['errors']:
+            manifest = {'hash': digest, 'source': str(species_dir), 'animations': animations}
+            with open(output_dir / MANIFEST_NAME, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=2, ensure_ascii=False)
+        result['status'] = 'built'
+
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+def ingest_tree(source_root, output_root, size=None, jobs=None, force=False,
+                pack=False, compress=False, species=None, progress=None):
+    """
+    并行导入源目录下的全部物种
+
+    Args:
+        source_root: 源目录，结构为 <源目录>/<物种>/<动画>.gif|png
+        output_root: 输出目录（通常是 assets/sprites）
+        size: 可选的目标尺寸 (width, height)
+        jobs: 工作进程数，缺省为 CPU 核数；为 1 时在当前进程中依次处理
+        force: 忽略清单，全部重新导入
+        pack: 导入后为每个物种打包精灵包
+        compress: 打包时压缩帧数据
+        species: 可选的物种名称列表，只导入这些物种
+        progress: 可选的回调 progress(done, total, result)，每完成一个物种调用一次
+
+    Returns:
+        结果字典列表（按完成顺序）
+    """
+    dirs = find_species(source_root)
+    if species:
+        wanted = set(species)
+        dirs = [path for path in dirs if path.name in wanted]
+    jobs = max(1, jobs or os.cpu_count() or 1)
+    output_root = Path(output_root)
+
+    tasks = [(path, output_root / path.name, size, force, pack, compress) for path in dirs]
+    results = []
+
+    def finish(result):
+        results.append(result)
+        if progress is not None:
+            progress(len(results), len(tasks), result)
+
+    if jobs == 1 or len(tasks) <= 1:
+        for task in tasks:
+            finish(_run_task(task))
+        return results
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as executor:
+        futures = {executor.submit(_run_task, task): task for task in tasks}
+        for future in as_completed(futures):
+            finish(future.result())
+    return results
+
+
+def _run_task(task):
+    """任务包装：未预料的异常也转换为失败结果，不中断整个导入"""
+    species_dir = task[0]
+    try:
+        return ingest_species(*task)
+    except Exception as e:
+        log.warning("Failed to ingest %s: %s", species_dir.name, e)
+        return {
+            'species': species_dir.name, 'status': 'failed', 'animations': 0, 'frames': 0,
+            'bytes_in': 0, 'bytes_out': 0, 'seconds': 0.0, 'errors': [str(e)],
+        }
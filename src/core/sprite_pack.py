@@ -0,0 +1,432 @@
+"""
+精灵包模块
+每个物种的全部动画打包成一个文件：清单、帧时间和（可选轻度压缩的）像素数据，
+运行时通过内存映射直接在文件内容上构建 QImage，不再解码 GIF
+"""
+
+import glob
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import time
+import zlib
+from pathlib import Path
+
+from PySide6.QtGui import QImage
+
+from src.core.log import get_logger
+from src.core.sprite_cache import FRAME_FORMAT
+from src.core.sprite_index import ANIMATION_EXTENSIONS, AnimationInfo
+
+log = get_logger('Pack')
+
+
+# 精灵包格式版本，格式变化时递增
+PACK_VERSION = 1
+
+# 精灵包扩展名：assets/sprites/<物种>.pack
+PACK_EXTENSION = '.pack'
+
+# 精灵包内动画的虚拟路径：<精灵包路径>#<动画名称>
+MEMBER_SEPARATOR = '#'
+
+# 精灵包正被映射时无法替换（Windows），新精灵包写为 <物种>.pack.<版本号>，打开时取最新的
+_PACK_NAME = re.compile(rf'(.+){re.escape(PACK_EXTENSION)}(?:\.(\d+))?')
+
+# 文件头：魔数、版本、保留字段、清单长度
+_HEADER = struct.Struct('<4sHHI')
+_MAGIC = b'DPSP'
+
+# 帧数据按 16 字节对齐，保证映射出的 QImage 像素地址对齐
+_ALIGN = 16
+
+COMPRESSION_NONE = 'none'
+COMPRESSION_ZLIB = 'zlib'
+
+
+def pack_path_for(sprite_dir):
+    """精灵图目录对应的精灵包路径（与目录同级，如 sprites/pikachu.pack）"""
+    sprite_dir = Path(sprite_dir)
+    return sprite_dir.parent / f"{sprite_dir.name}{PACK_EXTENSION}"
+
+
+def pack_species(filename):
+    """
+    精灵包文件名对应的物种
+
+    Returns:
+        物种名称（如 'pikachu.pack' 和 'pikachu.pack.2' 都是 'pikachu'），不是精灵包时返回 None
+    """
+    match = _PACK_NAME.fullmatch(Path(filename).name)
+    return match.group(1) if match else None
+
+
+def _pack_version(path):
+    """精灵包文件的版本号（<物种>.pack 为 0）"""
+    version = _PACK_NAME.fullmatch(path.name).group(2)
+    return int(version) if version else 0
+
+
+def pack_versions(sprite_dir):
+    """
+    精灵图目录对应的全部精灵包文件
+
+    Returns:
+        路径列表，按写出时间从旧到新排序（同一时间按版本号）
+    """
+    path = pack_path_for(sprite_dir)
+    species = path.name[:-len(PACK_EXTENSION)]
+    candidates = [p for p in path.parent.glob(f'{glob.escape(path.name)}*')
+                  if pack_species(p.name) == species]
+
+    stamped = []
+    for candidate in candidates:
+        try:
+            stamped.append((candidate.stat().st_mtime_ns, _pack_version(candidate), candidate))
+        except OSError:
+            pass  # 扫描期间被删除
+    return [candidate for _, _, candidate in sorted(stamped)]
+
+
+def resolve_pack_path(sprite_dir):
+    """
+    精灵图目录当前使用的精灵包路径
+
+    最新的是带版本号的精灵包时，尽量把它改名为 <物种>.pack，并删除旧版本；
+    旧版本仍被映射（Windows）时保留，下次打开时再清理。
+
+    Returns:
+        最新的精灵包路径，没有精灵包时返回 None
+    """
+    versions = pack_versions(sprite_dir)
+    if not versions:
+        return None
+
+    path = pack_path_for(sprite_dir)
+    newest = versions.pop()
+    if newest != path:
+        try:
+            os.replace(newest, path)
+            newest = path
+        except OSError:
+            pass
+
+    for old in versions:
+        if old != newest:
+            try:
+                old.unlink()
+            except OSError:
+                pass
+    return newest
+
+
+def _next_version_path(path):
+    """给无法替换的精灵包分配一个新的版本号路径"""
+    versions = [_pack_version(p) for p in pack_versions(path.parent / path.stem)]
+    return path.with_name(f"{path.name}.{max(versions, default=0) + 1}")
+
+
+def _image_bytes(image):
+    """按紧凑行宽（width * 4）导出帧像素"""
+    if image.format() != FRAME_FORMAT:
+        image = image.convertToFormat(FRAME_FORMAT)
+
+    row_bytes = image.width() * 4
+    bits = image.constBits()
+    stride = image.bytesPerLine()
+    if stride == row_bytes:
+        return bytes(bits[:row_bytes * image.height()])
+    return b''.join(bytes(bits[y * stride:y * stride + row_bytes]) for y in range(image.height()))
+
+
+class SpritePack:
+    """只读的精灵包（整个文件映射到内存）"""
+
+    def __init__(self, path):
+        """
+        打开精灵包
+
+        Args:
+            path: 精灵包文件路径
+
+        Raises:
+            OSError: 文件无法读取
+            ValueError: 文件不是合法的精灵包或版本不兼容
+        """
+        self.path = Path(path)
+
+        with open(self.path, 'rb') as f:
+            # 写时复制映射：即使有人写入 QImage 也不会改动文件
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+        try:
+            magic, version, _, manifest_size = _HEADER.unpack_from(self._mm, 0)
+            if magic != _MAGIC or version != PACK_VERSION:
+                raise ValueError(f"not a supported sprite pack: {self.path}")
+
+            start = _HEADER.size
+            self.manifest = json.loads(self._mm[start:start + manifest_size].decode('utf-8'))
+        except (struct.error, UnicodeDecodeError, json.JSONDecodeError) as e:
+            self._mm.close()
+            raise ValueError(f"corrupt sprite pack {self.path}: {e}")
+        except ValueError:
+            self._mm.close()
+            raise
+
+        self._animations = self.manifest['animations']
+
+    def __contains__(self, name):
+        return name in self._animations
+
+    def animations(self):
+        """包内的动画名称列表（按打包顺序）"""
+        return list(self._animations)
+
+    def member_path(self, name):
+        """包内动画的虚拟路径"""
+        return f"{self.path}{MEMBER_SEPARATOR}{name}"
+
+    def member_name(self, path):
+        """
+        从虚拟路径取出动画名称
+
+        Returns:
+            动画名称，路径不属于本精灵包时返回 None
+        """
+        prefix = f"{self.path}{MEMBER_SEPARATOR}"
+        path = str(path)
+        if path.startswith(prefix) and path[len(prefix):] in self._animations:
+            return path[len(prefix):]
+        return None
+
+    def animation_hash(self, name):
+        """动画内容哈希（帧数据和时间），用于判断重新打包后哪些动画发生了变化"""
+        return self._animations[name].get('hash')
+
+    def info(self, name):
+        """
+        获取动画元数据
+
+        Returns:
+            AnimationInfo 对象（帧已合成完毕，处置方式均为 0）
+        """
+        entry = self._animations[name]
+        delays = list(entry['delays'])
+        return AnimationInfo(self.member_path(name), entry['width'], entry['height'],
+                             delays, [0] * len(delays), entry['loop_count'])
+
+    def frame_images(self, name):
+        """
+        获取动画的全部帧
+
+        未压缩的帧直接建立在映射内存上（零拷贝），压缩的帧解压为独立的 QImage。
+
+        Returns:
+            (images, delays, loop_count) 元组
+        """
+        entry = self._animations[name]
+        images = [self._frame(entry, i) for i in range(len(entry['frames']))]
+        return images, list(entry['delays']), entry['loop_count']
+
+    def first_frame(self, name):
+        """只获取动画的第一帧"""
+        return self._frame(self._animations[name], 0)
+
+    def close(self):
+        """关闭映射（仍有 QImage 引用映射内存时，由最后一个引用释放）"""
+        if self._mm is None:
+            return
+        try:
+            self._mm.close()
+        except BufferError:
+            pass  # 帧图像持有的视图释放后，映射随对象回收一起关闭
+        self._mm = None
+
+    def _frame(self, entry, index):
+        width = entry['width']
+        height = entry['height']
+        offset, length = entry['frames'][index]
+
+        if entry['compression'] == COMPRESSION_ZLIB:
+            data = zlib.decompress(self._mm[offset:offset + length])
+            return QImage(data, width, height, width * 4, FRAME_FORMAT).copy()
+
+        view = memoryview(self._mm)[offset:offset + length]
+        image = QImage(view, width, height, width * 4, FRAME_FORMAT)
+        # QImage 不持有缓冲区引用：把视图挂在图像上，保证映射在图像存活期间有效
+        image._buffer = view
+        return image
+
+
+def open_pack(sprite_dir):
+    """
+    打开精灵图目录对应的精灵包
+
+    Returns:
+        SpritePack 对象，精灵包不存在或无法读取时返回 None
+    """
+    path = resolve_pack_path(sprite_dir)
+    if path is None:
+        return None
+
+    try:
+        pack = SpritePack(path)
+    except (OSError, ValueError) as e:
+        log.warning("Failed to open sprite pack %s: %s", path.name, e)
+        return None
+
+    log.info("Opened sprite pack: %s (%s animations)", path.name, len(pack.animations()))
+    return pack
+
+
+def write_pack(path, animations, compress=False):
+    """
+    写出精灵包（先写临时文件再替换，运行中的程序不会读到半个文件）
+
+    运行中的程序映射着旧精灵包时，Windows 不允许替换它，这时写为带版本号的
+    <物种>.pack.<n>，程序的热加载和下次启动都会打开最新的版本。
+
+    Args:
+        path: 输出文件路径
+        animations: 列表，元素为 (name, images, delays, loop_count)，
+                    同一动画的所有帧尺寸相同
+        compress: 是否用 zlib（最快档）压缩帧数据
+
+    Returns:
+        写出的字节数
+    """
+    compression = COMPRESSION_ZLIB if compress else COMPRESSION_NONE
+
+    # 先确定每帧的数据，再根据清单长度计算偏移
+    blobs = []
+    manifest = {'created': time.time(), 'animations': {}}
+    for name, images, delays, loop_count in animations:
+        frames = []
+        header = (images[0].width(), images[0].height(), list(delays), loop_count)
+        digest = hashlib.blake2b(repr(header).encode(), digest_size=16)
+        for image in images:
+            data = _image_bytes(image)
+            digest.update(data)
+            if compress:
+                data = zlib.compress(data, 1)
+            blobs.append(data)
+            frames.append([0, len(data)])
+
+        manifest['animations'][name] = {
+            'width': images[0].width(),
+            'height': images[0].height(),
+            'delays': list(delays),
+            'loop_count': loop_count,
+            'compression': compression,
+            'hash': digest.hexdigest(),
+            'frames': frames,
+        }
+
+    def align(value):
+        return (value + _ALIGN - 1) // _ALIGN * _ALIGN
+
+    # 偏移的位数会影响清单长度，按偏移上界预留足够的空间
+    entries = [frame for entry in manifest['animations'].values() for frame in entry['frames']]
+    for frame in entries:
+        frame[0] = 1 << 40
+    data_start = align(_HEADER.size + len(json.dumps(manifest).encode('utf-8')))
+
+    offset = data_start
+    for frame, blob in zip(entries, blobs):
+        frame[0] = offset
+        offset = align(offset + len(blob))
+
+    manifest_bytes = json.dumps(manifest).encode('utf-8')
+
+    path = Path(path)
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, PACK_VERSION, 0, len(manifest_bytes)))
+        f.write(manifest_bytes)
+        for frame, blob in zip(entries, blobs):
+            f.write(b'\0' * (frame[0] - f.tell()))
+            f.write(blob)
+    try:
+        os.replace(tmp_path, path)
+    except PermissionError:
+        if pack_species(path.name) is None:
+            raise  # 不是 <物种>.pack 形式的输出路径，无法使用版本号
+        staged = _next_version_path(path)
+        os.replace(tmp_path, staged)
+        log.warning("%s is in use, wrote %s instead (picked up on reload)", path.name, staged.name)
+    return offset
+
+
+def pack_directory(sprite_dir, output=None, size=None, compress=False, palette_colors=None):
+    """
+    把精灵图目录中的全部动画打包
+
+    Args:
+        sprite_dir: 精灵图目录（如 assets/sprites/pikachu）
+        output: 输出路径，缺省为目录同级的 <目录名>.pack
+        size: 可选的缩放尺寸 (width, height)，打包时预先缩放好
+            （安装了 NumPy 时整段动画批量缩放）
+        compress: 是否压缩帧数据
+        palette_colors: 可选的调色板颜色数，每段动画量化到一个共享调色板
+            （需要 NumPy，与 compress 一起使用时压缩率更高）
+
+    Returns:
+        精灵包路径
+    """
+    from src.core.preprocess import HAS_NUMPY, preprocess_images, quantize_images
+    from src.core.resource_loader import decode_animation, scale_image
+    from src.core.sprite_index import SpriteIndex
+    from src.core.sprite_sheet import open_sheet
+
+    sprite_dir = Path(sprite_dir)
+    index = SpriteIndex(sprite_dir)
+
+    animations = []
+    names = set()
+
+    # 精灵表中的动画优先于同名的散装文件（与 ResourceLoader 的查找顺序一致）
+    sheet = open_sheet(sprite_dir)
+    if sheet is not None:
+        for name in sheet.animations():
+            images, delays, loop_count = sheet.frame_images(name)
+            if size and HAS_NUMPY:
+                images = preprocess_images(images, [size])[0][size]
+            elif size:
+                images = [scale_image(image, size) for image in images]
+            if palette_colors:
+                images = quantize_images(images, palette_colors)
+            names.add(name)
+            animations.append((name, images, delays, loop_count))
+            log.info("Added %s from %s: %s frames, %sx%s",
+                     name, sheet.path.name, len(images), images[0].width(), images[0].height())
+
+    for ext in ANIMATION_EXTENSIONS:
+        for file_path in sorted(sprite_dir.glob(f'*{ext}')):
+            if file_path.stem in names:
+                continue  # 同名动画按扩展名优先级只取一个
+            if sheet is not None and file_path == sheet.image_path:
+                continue  # 精灵表图像本身不是动画
+
+            images, delays, loop_count = decode_animation(
+                file_path, size, index.get(file_path), batch=True)
+            if not images:
+                log.warning("Skipping %s: no frames decoded", file_path.name)
+                continue
+            if palette_colors:
+                images = quantize_images(images, palette_colors)
+
+            names.add(file_path.stem)
+            animations.append((file_path.stem, images, delays, loop_count))
+            log.info("Added %s: %s frames, %sx%s",
+                     file_path.name, len(images), images[0].width(), images[0].height())
+
+    if not animations:
+        raise ValueError(f"no animations found in {sprite_dir}")
+
+    output = Path(output) if output else pack_path_for(sprite_dir)
+    nbytes = write_pack(output, animations, compress)
+    log.info("Wrote %s (%.1f KB)", output, nbytes / 1024)
+    return output
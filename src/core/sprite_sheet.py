@@ -0,0 +1,434 @@
+"""
+精灵表模块
+一个物种的多段动画放在同一张 PNG 精灵表中，由清单（sheet.json）给出每帧的矩形和时间。
+精灵表整体作为一张纹理加载，绘制时按子矩形贴图，不再为每帧创建单独的 QPixmap
+
+清单格式：
+    {
+        "image": "sheet.png",
+        "animations": {
+            "idle": {
+                "frames": [[x, y, w, h], [x, y, w, h, 偏移x, 偏移y], ...],
+                "size": [画布宽, 画布高],
+                "delays": [100, 120, ...],
+                "loop_count": -1
+            },
+            "walk": {"strip": [x, y, w, h, 帧数], "delay": 80}
+        }
+    }
+
+frames 与 strip（从 (x, y) 起向右排列的等宽帧）二选一；带偏移的帧是裁掉透明边的子图，
+绘制在画布中的 (偏移x, 偏移y) 处，size 缺省为第一帧的尺寸。
+delays 与 delay 二选一，缺省每帧 100 毫秒；loop_count 缺省为 -1（无限循环）。
+"""
+
+import json
+import threading
+import weakref
+from pathlib import Path
+
+from PySide6.QtCore import QPoint, QRect, QSize, Qt
+from PySide6.QtGui import QImage, QImageReader, QPainter, QPixmap
+
+from src.core.hit_mask import HitMask
+from src.core.log import get_logger
+from src.core.sprite_cache import FRAME_FORMAT
+from src.core.sprite_index import DEFAULT_FRAME_DELAY, AnimationInfo
+from src.core.sprite_pack import MEMBER_SEPARATOR
+
+log = get_logger('Sheet')
+
+
+# 精灵表清单文件名（位于物种目录中），清单和默认的精灵表图像都以此为主名
+SHEET_MANIFEST = 'sheet.json'
+SHEET_NAME = 'sheet'
+
+# 缩放后的图集每行的最大宽度（像素）
+ATLAS_WIDTH = 2048
+
+# 图集中子图之间的透明间隔，缩放绘制时不会采样到相邻帧
+ATLAS_PADDING = 1
+
+
+def sheet_path_for(sprite_dir):
+    """精灵图目录中的精灵表清单路径"""
+    return Path(sprite_dir) / SHEET_MANIFEST
+
+
+def _int_list(value, length, what):
+    if not isinstance(value, list) or len(value) != length or not all(isinstance(v, int) for v in value):
+        raise ValueError(f"{what} must be a list of {length} integers")
+    return value
+
+
+class _SheetAnimation:
+    """清单中的一段动画（源精灵表坐标）"""
+
+    def __init__(self, name, entry):
+        if 'strip' in entry:
+            x, y, w, h, count = _int_list(entry['strip'], 5, f"{name}.strip")
+            frames = [[x + i * w, y, w, h] for i in range(count)]
+        else:
+            frames = entry.get('frames')
+        if not frames:
+            raise ValueError(f"{name}: no frames")
+
+        self.rects = []
+        self.offsets = []
+        for frame in frames:
+            if isinstance(frame, list) and len(frame) == 4:
+                frame = frame + [0, 0]
+            x, y, w, h, dx, dy = _int_list(frame, 6, f"{name}.frames[]")
+            if w <= 0 or h <= 0:
+                raise ValueError(f"{name}: empty frame rectangle {frame[:4]}")
+            self.rects.append(QRect(x, y, w, h))
+            self.offsets.append(QPoint(dx, dy))
+
+        if 'size' in entry:
+            width, height = _int_list(entry['size'], 2, f"{name}.size")
+        else:
+            width, height = self.rects[0].width(), self.rects[0].height()
+        self.size = QSize(width, height)
+
+        count = len(self.rects)
+        if 'delays' in entry:
+            delays = [int(d) for d in entry['delays']]
+            if len(delays) != count:
+                raise ValueError(f"{name}: {len(delays)} delays for {count} frames")
+        else:
+            delays = [int(entry.get('delay', DEFAULT_FRAME_DELAY))] * count
+        self.delays = [d if d > 0 else DEFAULT_FRAME_DELAY for d in delays]
+        self.loop_count = int(entry.get('loop_count', -1))
+
+
+class SheetAtlas:
+    """
+    按某个像素尺寸缩放好的精灵表图集（同一尺寸的所有动画共用一份）
+
+    图像在工作线程中生成，QPixmap 在 GUI 线程中第一次使用时创建，
+    之后释放 QImage，只保留一份纹理。
+    """
+
+    def __init__(self, image, rects, masks):
+        """
+        Args:
+            image: 图集 QImage
+            rects: (源矩形元组, 缩放后尺寸元组) -> 图集中的 QRect
+            masks: (源矩形元组, 偏移元组, 缩放后画布尺寸元组) -> HitMask（或 None）
+        """
+        self.image = image
+        self.rects = rects
+        self.masks = masks
+        self.size = image.size()
+        self._pixmaps = {}  # 设备像素比 -> QPixmap
+
+    @property
+    def nbytes(self):
+        """图集像素占用的内存（字节）"""
+        return self.size.width() * self.size.height() * 4
+
+    def pixmap(self, scale=1.0):
+        """
+        图集纹理（只能在 GUI 线程调用）
+
+        Args:
+            scale: 设备像素比（多分辨率级别倍率）
+        """
+        pixmap = self._pixmaps.get(scale)
+        if pixmap is None:
+            if self._pixmaps:
+                pixmap = QPixmap(next(iter(self._pixmaps.values())))
+            else:
+                pixmap = QPixmap.fromImage(self.image)
+                self.image = None  # 纹理已经持有像素
+            pixmap.setDevicePixelRatio(scale)
+            self._pixmaps[scale] = pixmap
+        return pixmap
+
+
+class SheetFrames:
+    """
+    一段动画在图集中的帧（工作线程的解码结果，代替 QImage 列表交给 GUI 线程）
+
+    Attributes:
+        atlas: 所在的 SheetAtlas
+        rects: 每帧在图集中的 QRect
+        offsets: 每帧在画布中的偏移（像素，QPoint）
+        canvas: 画布像素尺寸（QSize）
+        masks: 每帧的命中遮罩（画布坐标）
+        damage: 每帧的重绘区域（画布坐标），为上一帧和这一帧子图所占矩形的并集
+    """
+
+    def __init__(self, atlas, rects, offsets, canvas, masks):
+        self.atlas = atlas
+        self.rects = rects
+        self.offsets = offsets
+        self.canvas = canvas
+        self.masks = masks
+
+        placed = [QRect(offset, rect.size()) for rect, offset in zip(rects, offsets)]
+        if len(placed) < 2:
+            self.damage = [QRect() for _ in placed]
+        else:
+            self.damage = [placed[i - 1].united(placed[i]) for i in range(len(placed))]
+
+    def __len__(self):
+        return len(self.rects)
+
+
+class SpriteSheet:
+    """精灵表：清单加一张精灵表图像，按像素尺寸生成并缓存图集"""
+
+    def __init__(self, path):
+        """
+        读取清单（只读取精灵表图像的尺寸，不解码像素）
+
+        Args:
+            path: 清单文件路径
+
+        Raises:
+            OSError: 文件无法读取
+            ValueError: 清单格式错误或帧矩形超出精灵表
+        """
+        self.path = Path(path)
+        with open(self.path, encoding='utf-8') as f:
+            try:
+                manifest = json.load(f)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"corrupt sprite sheet manifest {self.path}: {e}")
+
+        try:
+            self.image_path = self.path.parent / manifest.get('image', f"{SHEET_NAME}.png")
+            self._animations = {name: _SheetAnimation(name, entry)
+                                for name, entry in manifest['animations'].items()}
+        except (AttributeError, KeyError, TypeError) as e:
+            raise ValueError(f"invalid sprite sheet manifest {self.path}: {e!r}")
+
+        reader = QImageReader(str(self.image_path))
+        size = reader.size()
+        if not size.isValid():
+            raise OSError(f"cannot read sprite sheet image {self.image_path}: {reader.errorString()}")
+        bounds = QRect(QPoint(0, 0), size)
+        for name, animation in self._animations.items():
+            for rect in animation.rects:
+                if not bounds.contains(rect):
+                    raise ValueError(f"{name}: frame {rect.getRect()} outside the {size.width()}x{size.height()} sheet")
+
+        self._lock = threading.Lock()
+        self._atlases = weakref.WeakValueDictionary()  # 像素尺寸 -> SheetAtlas（帧集合都释放后回收）
+
+    def __contains__(self, name):
+        return name in self._animations
+
+    def animations(self):
+        """精灵表中的动画名称列表（按清单顺序）"""
+        return list(self._animations)
+
+    def member_path(self, name):
+        """精灵表中动画的虚拟路径：<清单路径>#<动画名称>"""
+        return f"{self.path}{MEMBER_SEPARATOR}{name}"
+
+    def member_name(self, path):
+        """
+        从虚拟路径取出动画名称
+
+        Returns:
+            动画名称，路径不属于本精灵表时返回 None
+        """
+        prefix = f"{self.path}{MEMBER_SEPARATOR}"
+        path = str(path)
+        if path.startswith(prefix) and path[len(prefix):] in self._animations:
+            return path[len(prefix):]
+        return None
+
+    def info(self, name):
+        """
+        获取动画元数据
+
+        Returns:
+            AnimationInfo 对象（尺寸为画布尺寸，处置方式均为 0）
+        """
+        animation = self._animations[name]
+        delays = list(animation.delays)
+        return AnimationInfo(self.member_path(name), animation.size.width(), animation.size.height(),
+                             delays, [0] * len(delays), animation.loop_count)
+
+    def frames(self, name, size=None):
+        """
+        获取动画在指定像素尺寸图集中的帧（线程安全，可以在工作线程中调用）
+
+        同一尺寸第一次请求时读取精灵表并为全部动画生成图集，之后的请求直接复用。
+
+        Args:
+            name: 动画名称
+            size: 画布缩放尺寸 (width, height)，保持宽高比，为 None 时不缩放
+
+        Returns:
+            (SheetFrames, delays, loop_count) 元组
+        """
+        atlas = self.atlas(size)
+        animation = self._animations[name]
+        canvas = self._canvas_size(animation, size)
+        rects, offsets, masks = [], [], []
+        for rect, offset in zip(animation.rects, animation.offsets):
+            target, target_offset = self._scaled_frame(animation, rect, offset, canvas)
+            rects.append(atlas.rects[(rect.getRect(), (target.width(), target.height()))])
+            offsets.append(target_offset)
+            masks.append(atlas.masks[(rect.getRect(), (offset.x(), offset.y()), (canvas.width(), canvas.height()))])
+        return (SheetFrames(atlas, rects, offsets, canvas, masks),
+                list(animation.delays), animation.loop_count)
+
+    def frame_images(self, name):
+        """
+        获取动画的全部帧（按画布尺寸合成的独立 QImage，用于打包等离线处理）
+
+        Returns:
+            (images, delays, loop_count) 元组
+        """
+        sheet = self._read_image()
+        animation = self._animations[name]
+        images = [self._compose(sheet, rect, offset, animation.size)
+                  for rect, offset in zip(animation.rects, animation.offsets)]
+        return images, list(animation.delays), animation.loop_count
+
+    def first_frame(self, name):
+        """只获取动画的第一帧（按画布尺寸合成，只解码第一帧所在的区域）"""
+        animation = self._animations[name]
+        rect = animation.rects[0]
+        reader = QImageReader(str(self.image_path))
+        reader.setClipRect(rect)
+        image = reader.read()
+        if image.isNull():
+            return image
+        return self._compose(image, image.rect(), animation.offsets[0], animation.size)
+
+    def atlas(self, size=None):
+        """
+        获取指定像素尺寸的图集，不存在时生成
+
+        Args:
+            size: 画布缩放尺寸 (width, height)，为 None 时不缩放
+
+        Returns:
+            SheetAtlas 对象
+        """
+        key = tuple(size) if size else None
+        with self._lock:
+            atlas = self._atlases.get(key)
+            if atlas is None:
+                atlas = self._build_atlas(size)
+                self._atlases[key] = atlas
+        return atlas
+
+    def _read_image(self):
+        image = QImage(str(self.image_path))
+        if image.isNull():
+            raise OSError(f"failed to decode sprite sheet image {self.image_path}")
+        return image.convertToFormat(FRAME_FORMAT)
+
+    @staticmethod
+    def _canvas_size(animation, size):
+        if not size:
+            return animation.size
+        return animation.size.scaled(QSize(*size), Qt.AspectRatioMode.KeepAspectRatio)
+
+    @staticmethod
+    def _scaled_frame(animation, rect, offset, canvas):
+        """帧子图缩放到画布尺寸后的大小和偏移"""
+        if canvas == animation.size:
+            return rect.size(), QPoint(offset)
+        fx = canvas.width() / animation.size.width()
+        fy = canvas.height() / animation.size.height()
+        target = QSize(max(1, round(rect.width() * fx)), max(1, round(rect.height() * fy)))
+        return target, QPoint(round(offset.x() * fx), round(offset.y() * fy))
+
+    @staticmethod
+    def _compose(image, rect, offset, canvas):
+        """把子图放到画布上的偏移处（没有偏移且子图就是整个画布时直接复制子图）"""
+        if offset.isNull() and rect.size() == canvas:
+            return image.copy(rect)
+        result = QImage(canvas, FRAME_FORMAT)
+        result.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(result)
+        painter.drawImage(offset, image, rect)
+        painter.end()
+        return result
+
+    def _build_atlas(self, size):
+        """
+        为全部动画生成图集
+
+        不需要缩放时直接使用精灵表本身；否则每个不同的子图单独缩放，
+        按行排进新的图集（重复使用的子图只存一份）。命中遮罩同时算好。
+        """
+        sheet = self._read_image()
+
+        # 每个不同的 (源矩形, 目标尺寸) 只缩放一次
+        pieces = {}
+        frames = []
+        for animation in self._animations.values():
+            canvas = self._canvas_size(animation, size)
+            for rect, offset in zip(animation.rects, animation.offsets):
+                target, target_offset = self._scaled_frame(animation, rect, offset, canvas)
+                key = (rect.getRect(), (target.width(), target.height()))
+                pieces.setdefault(key, (rect, target))
+                frames.append((key, rect, offset, canvas, target_offset))
+
+        if all(rect.size() == target for rect, target in pieces.values()):
+            image = sheet
+            rects = {key: QRect(rect) for key, (rect, _) in pieces.items()}
+        else:
+            # 按高度排序后逐行排列，减少每行的空白
+            order = sorted(pieces, key=lambda key: -pieces[key][1].height())
+            rects = {}
+            x = y = row_height = width = 0
+            for key in order:
+                target = pieces[key][1]
+                if x and x + target.width() > ATLAS_WIDTH:
+                    x, y, row_height = 0, y + row_height + ATLAS_PADDING, 0
+                rects[key] = QRect(QPoint(x, y), target)
+                x += target.width() + ATLAS_PADDING
+                row_height = max(row_height, target.height())
+                width = max(width, x - ATLAS_PADDING)
+
+            image = QImage(width, y + row_height, FRAME_FORMAT)
+            image.fill(Qt.GlobalColor.transparent)
+            painter = QPainter(image)
+            for key, (rect, target) in pieces.items():
+                piece = sheet.copy(rect).scaled(target, Qt.AspectRatioMode.IgnoreAspectRatio,
+                                                Qt.TransformationMode.SmoothTransformation)
+                painter.drawImage(rects[key].topLeft(), piece)
+            painter.end()
+
+        masks = {}
+        for key, rect, offset, canvas, target_offset in frames:
+            mask_key = (rect.getRect(), (offset.x(), offset.y()), (canvas.width(), canvas.height()))
+            if mask_key not in masks:
+                masks[mask_key] = HitMask.from_image(
+                    self._compose(image, rects[key], target_offset, canvas))
+
+        log.info("Built sprite sheet atlas: %s %s (%s frames, %s pieces, %sx%s)",
+                 self.path.parent.name, 'original' if not size else '%sx%s' % tuple(size),
+                 len(frames), len(pieces), image.width(), image.height())
+        return SheetAtlas(image, rects, masks)
+
+
+def open_sheet(sprite_dir):
+    """
+    打开精灵图目录中的精灵表
+
+    Returns:
+        SpriteSheet 对象，清单不存在或无法读取时返回 None
+    """
+    path = sheet_path_for(sprite_dir)
+    if not path.exists():
+        return None
+
+    try:
+        sheet = SpriteSheet(path)
+    except (OSError, ValueError) as e:
+        log.warning("Failed to open sprite sheet %s: %s", path, e)
+        return None
+
+    log.info("Opened sprite sheet: %s (%s animations)", path.parent.name, len(sheet.animations()))
+    return sheet
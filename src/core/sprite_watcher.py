@@ -0,0 +1,161 @@
+"""
+精灵图热加载模块
+监视精灵图目录，资源文件变化时通知哪些动画需要重新加载
+"""
+
+from pathlib import Path
+
+from PySide6.QtCore import QObject, QFileSystemWatcher, QTimer, Signal
+
+from src.config import config
+from src.core.log import get_logger
+from src.core.sprite_index import ANIMATION_EXTENSIONS
+from src.core.sprite_pack import pack_species
+from src.core.sprite_sheet import SHEET_MANIFEST
+
+log = get_logger('Watcher')
+
+
+def _stamp(path):
+    """文件的 (修改时间, 大小)，文件不存在时返回 None"""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class SpriteWatcher(QObject):
+    """
+    精灵图目录监视器
+
+    监视 sprites 目录（精灵包）和每个物种目录（散装动画文件）。
+    文件系统事件只标记目录为脏，经过防抖间隔后再扫描脏目录，
+    与上次的快照比较得出真正变化的动画，一次保存产生的多个事件只触发一次重新加载。
+    """
+
+    animationsChanged = Signal(str, list)  # 物种, 变化的动画名称列表
+    packChanged = Signal(str)  # 物种
+
+    def __init__(self, sprites_dir=None, debounce_ms=None, parent=None):
+        """
+        初始化监视器
+
+        Args:
+            sprites_dir: 精灵图根目录，缺省取自配置
+            debounce_ms: 防抖间隔（毫秒），缺省取自配置
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self.sprites_dir = Path(sprites_dir or config.SPRITES_DIR)
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+        self._watcher.fileChanged.connect(self._on_file_changed)
+
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(debounce_ms if debounce_ms is not None else config.HOT_RELOAD_DEBOUNCE)
+        self._debounce.timeout.connect(self._flush)
+
+        self._snapshots = {}  # 目录 -> {文件名: (修改时间, 大小)}
+        self._dirty = set()  # 等待扫描的目录
+
+    def start(self):
+        """开始监视"""
+        if not self.sprites_dir.is_dir():
+            log.warning("Sprite directory not found: %s", self.sprites_dir)
+            return
+
+        self._snapshots[self.sprites_dir] = self._scan(self.sprites_dir)
+        for species_dir in self._species_dirs():
+            self._snapshots[species_dir] = self._scan(species_dir)
+        self._watch_all()
+        log.info("Watching %s (%s species)", self.sprites_dir, len(self._snapshots) - 1)
+
+    def stop(self):
+        """停止监视"""
+        self._debounce.stop()
+        paths = self._watcher.files() + self._watcher.directories()
+        if paths:
+            self._watcher.removePaths(paths)
+        self._snapshots.clear()
+        self._dirty.clear()
+
+    def _species_dirs(self):
+        return sorted(p for p in self.sprites_dir.iterdir() if p.is_dir())
+
+    def _scan(self, directory):
+        """扫描目录中的资源文件：根目录只看精灵包（含带版本号的），物种目录只看动画文件和精灵表清单"""
+        root = directory == self.sprites_dir
+
+        snapshot = {}
+        try:
+            for path in directory.iterdir():
+                if root:
+                    wanted = pack_species(path.name) is not None
+                else:
+                    wanted = path.suffix.lower() in ANIMATION_EXTENSIONS or path.name == SHEET_MANIFEST
+                if wanted:
+                    stamp = _stamp(path)
+                    if stamp is not None:
+                        snapshot[path.name] = stamp
+        except OSError:
+            pass
+        return snapshot
+
+    def _watch_all(self):
+        """
+        登记全部目录和文件
+
+        原子替换（写临时文件再改名）的文件会从监视列表中消失，所以每次扫描后重新登记。
+        """
+        paths = []
+        for directory, snapshot in self._snapshots.items():
+            paths.append(str(directory))
+            paths.extend(str(directory / name) for name in snapshot)
+
+        watched = set(self._watcher.files()) | set(self._watcher.directories())
+        missing = [path for path in paths if path not in watched]
+        if missing:
+            self._watcher.addPaths(missing)
+
+    def _on_directory_changed(self, path):
+        self._dirty.add(Path(path))
+        self._debounce.start()
+
+    def _on_file_changed(self, path):
+        self._dirty.add(Path(path).parent)
+        self._debounce.start()
+
+    def _flush(self):
+        dirty, self._dirty = self._dirty, set()
+
+        if self.sprites_dir in dirty:
+            # 新增的物种目录从现在开始监视
+            for species_dir in self._species_dirs():
+                if species_dir not in self._snapshots:
+                    self._snapshots[species_dir] = self._scan(species_dir)
+                    log.info("New species directory: %s", species_dir.name)
+
+        for directory in dirty:
+            if directory not in self._snapshots:
+                continue
+
+            old = self._snapshots[directory]
+            new = self._scan(directory)
+            self._snapshots[directory] = new
+            changed = {name for name in old.keys() | new.keys() if old.get(name) != new.get(name)}
+            if not changed:
+                continue
+
+            if directory == self.sprites_dir:
+                log.info("Sprite pack changed: %s", sorted(changed))
+                for species in sorted({pack_species(name) for name in changed}):
+                    self.packChanged.emit(species)
+            else:
+                names = sorted({Path(name).stem for name in changed})
+                log.info("Animations changed in %s: %s", directory.name, names)
+                self.animationsChanged.emit(directory.name, names)
+
+        self._watch_all()
@@ -0,0 +1,306 @@
+"""
+系统监视模块
+在后台线程中按固定频率采样 CPU、内存和电池，最近的采样保存在定长环形缓冲区中，
+滑动平均增量更新，只有平均值进入新的档位时才通过信号通知 GUI 线程
+"""
+
+import math
+import threading
+from array import array
+
+from PySide6.QtCore import QObject, Signal
+
+from src.config import config
+from src.core.log import get_logger
+
+log = get_logger('Monitor')
+
+
+# 监视的指标
+METRIC_CPU = 'cpu'
+METRIC_MEMORY = 'memory'
+METRIC_BATTERY = 'battery'
+METRICS = (METRIC_CPU, METRIC_MEMORY, METRIC_BATTERY)
+
+# 档位名称，按阈值从低到高
+BANDS = ('low', 'normal', 'high')
+
+
+class MetricRing:
+    """
+    定长环形缓冲区（数组存储，多列）
+
+    每次写入一行，缓冲区满后覆盖最旧的一行；每列的和随写入增量更新，
+    取平均值是 O(1)。NaN 表示缺失值，不计入平均。
+    """
+
+    def __init__(self, capacity, columns=1):
+        """
+        Args:
+            capacity: 保存的行数
+            columns: 每行的值个数
+        """
+        if capacity <= 0 or columns <= 0:
+            raise ValueError("capacity and columns must be positive")
+        self.capacity = capacity
+        self.columns = columns
+        self.data = array('d', [math.nan]) * (capacity * columns)
+        self.size = 0  # 已保存的行数
+        self.head = 0  # 下一次写入的行
+
+        self._sums = [0.0] * columns
+        self._counts = [0] * columns  # 每列非缺失值的个数
+
+    def __len__(self):
+        return self.size
+
+    def push(self, values):
+        """
+        写入一行
+
+        Args:
+            values: 长度为 columns 的数值序列，None 或 NaN 表示缺失
+        """
+        data, sums, counts = self.data, self._sums, self._counts
+        base = self.head * self.columns
+        full = self.size == self.capacity
+
+        for c in range(self.columns):
+            value = values[c]
+            if value is None:
+                value = math.nan
+            if full:
+                old = data[base + c]
+                if old == old:  # 不是 NaN
+                    sums[c] -= old
+                    counts[c] -= 1
+            if value == value:
+                sums[c] += value
+                counts[c] += 1
+            data[base + c] = value
+
+        self.head = (self.head + 1) % self.capacity
+        if not full:
+            self.size += 1
+        elif self.head == 0:
+            self._resum()  # 每绕一圈重新求和一次，消除浮点累积误差
+
+    def average(self, column=0):
+        """
+        列的滑动平均
+
+        Returns:
+            平均值，没有有效值时为 None
+        """
+        count = self._counts[column]
+        if count == 0:
+            return None
+        return self._sums[column] / count
+
+    def latest(self, column=0):
+        """最近一次写入的值，缺失或为空时为 None"""
+        if self.size == 0:
+            return None
+        value = self.data[((self.head - 1) % self.capacity) * self.columns + column]
+        return None if value != value else value
+
+    def values(self, column=0):
+        """列的全部值（从旧到新，缺失值为 NaN）"""
+        start = (self.head - self.size) % self.capacity
+        return [self.data[((start + i) % self.capacity) * self.columns + column]
+                for i in range(self.size)]
+
+    def clear(self):
+        """清空缓冲区"""
+        for i in range(len(self.data)):
+            self.data[i] = math.nan
+        self.size = 0
+        self.head = 0
+        self._sums = [0.0] * self.columns
+        self._counts = [0] * self.columns
+
+    def _resum(self):
+        for c in range(self.columns):
+            total = 0.0
+            count = 0
+            for i in range(c, len(self.data), self.columns):
+                value = self.data[i]
+                if value == value:
+                    total += value
+                    count += 1
+            self._sums[c] = total
+            self._counts[c] = count
+
+
+def band_for(value, thresholds, current=None, hysteresis=0.0):
+    """
+    计算数值所在的档位
+
+    已在某一档位时，需要越过边界 hysteresis 以上才切换，避免在边界附近来回跳动。
+
+    Args:
+        value: 数值
+        thresholds: (低/中边界, 中/高边界)
+        current: 当前档位序号，None 表示没有档位
+        hysteresis: 回差
+
+    Returns:
+        档位序号（0 = low, 1 = normal, 2 = high）
+    """
+    band = sum(1 for t in thresholds if value >= t)
+    if current is None:
+        return band
+    # 上升时要越过边界加回差，下降时要低于边界减回差
+    while band > current and value < thresholds[band - 1] + hysteresis:
+        band -= 1
+    while band < current and value > thresholds[band] - hysteresis:
+        band += 1
+    return band
+
+
+class SystemMonitor(QObject):
+    """
+    系统监视服务
+
+    采样、写缓冲区和档位判断都在后台线程中完成，GUI 线程只在档位变化时
+    收到一次信号，不需要任何轮询。采样源可以替换（如测试用的假采样源）。
+    """
+
+    bandChanged = Signal(str, str, float)  # 指标名称, 新档位, 滑动平均值
+
+    def __init__(self, source=None, interval=None, window=None, thresholds=None,
+                 hysteresis=None, parent=None):
+        """
+        Args:
+            source: 采样源（需实现 sample() -> PowerSample），缺省使用 psutil
+            interval: 采样间隔（秒），缺省取自配置
+            window: 滑动平均的采样个数（缓冲区长度），缺省取自配置
+            thresholds: {指标名称: (低/中边界, 中/高边界)}，缺省取自配置
+            hysteresis: 档位切换的回差（百分点），缺省取自配置
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self.source = source
+        self.interval = interval if interval is not None else config.MONITOR_INTERVAL
+        window = window if window is not None else config.MONITOR_WINDOW
+        self.thresholds = thresholds or {
+            METRIC_CPU: config.MONITOR_CPU_BANDS,
+            METRIC_MEMORY: config.MONITOR_MEMORY_BANDS,
+            METRIC_BATTERY: config.MONITOR_BATTERY_BANDS,
+        }
+        self.hysteresis = hysteresis if hysteresis is not None else config.MONITOR_HYSTERESIS
+
+        self.metrics = MetricRing(window, len(METRICS))  # 每行：CPU, 内存, 电池
+        self.per_cpu = None  # 每个核心一列，首次采样时按核心数创建
+        self.bands = {}  # 指标名称 -> 档位序号
+        self.samples = 0
+        self.band_changes = 0
+
+        self._lock = threading.Lock()  # 保护缓冲区，GUI 线程读取统计时使用
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    def start(self):
+        """启动后台采样线程"""
+        if self._thread is not None:
+            return
+        if self.source is None:
+            from src.core.power_governor import PsutilSource
+            self.source = PsutilSource()
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='SystemMonitor', daemon=True)
+        self._thread.start()
+        log.info("Started (interval: %ss, window: %s)", self.interval, self.metrics.capacity)
+
+    def stop(self):
+        """停止采样线程"""
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
+
+    def is_running(self):
+        """采样线程是否在运行"""
+        return self._thread is not None
+
+    def add_sample(self, sample):
+        """
+        记录一次采样并更新档位（采样线程调用，也可以直接调用以同步驱动）
+
+        Args:
+            sample: PowerSample 对象
+
+        Returns:
+            本次发生变化的 (指标名称, 档位名称, 平均值) 列表
+        """
+        with self._lock:
+            self.metrics.push((sample.cpu_percent, sample.memory_percent, sample.battery_percent))
+            per_cpu = sample.per_cpu
+            if per_cpu:
+                if self.per_cpu is None or self.per_cpu.columns != len(per_cpu):
+                    self.per_cpu = MetricRing(self.metrics.capacity, len(per_cpu))
+                self.per_cpu.push(per_cpu)
+            self.samples += 1
+
+            changes = []
+            for column, metric in enumerate(METRICS):
+                average = self.metrics.average(column)
+                thresholds = self.thresholds.get(metric)
+                if average is None or thresholds is None:
+                    continue
+                current = self.bands.get(metric)
+                band = band_for(average, thresholds, current, self.hysteresis)
+                if band != current:
+                    self.bands[metric] = band
+                    changes.append((metric, BANDS[band], average))
+            self.band_changes += len(changes)
+
+        for metric, band, average in changes:
+            log.info("%s -> %s (avg %.1f%%)", metric, band, average)
+            self.bandChanged.emit(metric, band, average)
+        return changes
+
+    def band(self, metric):
+        """指标当前的档位名称，还没有采样时为 None"""
+        band = self.bands.get(metric)
+        return None if band is None else BANDS[band]
+
+    def average(self, metric):
+        """指标的滑动平均值"""
+        with self._lock:
+            return self.metrics.average(METRICS.index(metric))
+
+    def stats(self):
+        """
+        获取监视状态
+
+        Returns:
+            字典：采样次数、档位变化次数、各指标的最新值/平均值/档位、各核心的平均占用
+        """
+        with self._lock:
+            metrics = {}
+            for column, metric in enumerate(METRICS):
+                metrics[metric] = {
+                    'latest': self.metrics.latest(column),
+                    'average': self.metrics.average(column),
+                    'band': self.band(metric),
+                }
+            per_cpu = None
+            if self.per_cpu is not None:
+                per_cpu = [self.per_cpu.average(c) for c in range(self.per_cpu.columns)]
+            return {
+                'samples': self.samples,
+                'band_changes': self.band_changes,
+                'metrics': metrics,
+                'per_cpu': per_cpu,
+            }
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                sample = self.source.sample()
+            except Exception as e:
+                log.warning("Sampling failed: %s", e)
+                continue
+            self.add_sample(sample)
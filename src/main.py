@@ -3,8 +3,14 @@ Desktop-Pokemon 主入口
 赛博桌宠应用
 """
 
+import time
+
+# 尽早记录启动时间，用于统计首帧耗时
+_start_time = time.perf_counter()
+
 import sys
 import os
+import argparse
 
 # 添加项目根目录到 Python 路径
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -12,11 +18,70 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 from PySide6.QtWidgets import QApplication
-from src.ui.pet_window import PetWindow
+from src.config import config
+from src.core.instrumentation import metrics
+from src.core.log import get_logger, set_level
+
+
+def parse_args():
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="Desktop-Pokemon")
+    parser.add_argument('--pets', type=int, default=1, help="number of pets to spawn")
+    parser.add_argument('--pet', default=None, help="pet type (sprite directory name)")
+    parser.add_argument('--startup-probe', action='store_true',
+                        help="print time-to-first-frame and exit (for benchmarks)")
+    parser.add_argument('--log-level', default=None, type=str.upper,
+                        choices=['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'],
+                        help="log level (DEBUG, INFO, WARNING); overrides DESKTOP_POKEMON_LOG")
+    parser.add_argument('--stats', metavar='FILE', default=None,
+                        help="write instrumentation stats as JSON to FILE on exit")
+    return parser.parse_known_args()[0]
+
+
+def start_services(manager, args):
+    """启动非必需的服务：其余宠物、热加载、系统监视和节能调节"""
+    first = manager.pets[0] if manager.pets else None
+    for i in range(1, args.pets):
+        position = (first.x() - 40 * i, first.y()) if first else None
+        manager.spawn(args.pet, position=position)
+
+    # 精灵图热加载：资源文件变化时只重新加载受影响的动画
+    if config.HOT_RELOAD:
+        from src.core.sprite_watcher import SpriteWatcher
+
+        manager.watcher = SpriteWatcher(parent=manager)
+        manager.watcher.animationsChanged.connect(manager.frame_store.reload_animations)
+        manager.watcher.packChanged.connect(manager.frame_store.reload_pack)
+        manager.watcher.start()
+
+    # 系统监视：负载档位变化时宠物作出反应（GUI 线程不轮询）
+    if config.SYSTEM_MONITOR:
+        from src.core.system_monitor import SystemMonitor
+
+        manager.monitor = SystemMonitor(parent=manager)
+        manager.monitor.bandChanged.connect(manager.on_band_changed)
+        manager.monitor.start()
+        metrics.add_provider('system', manager.monitor.stats)
+
+    # 节能调节（根据系统负载、电池和空闲时间调整帧率）
+    if config.POWER_SAVING:
+        from src.core.animation_scheduler import shared_scheduler
+        from src.core.power_governor import PowerGovernor
+
+        manager.governor = PowerGovernor(shared_scheduler(), parent=manager)
+        for window in manager.pets:
+            manager.governor.add_window(window)
+            window.interacted.connect(manager.governor.notify_interaction)
+        manager.governor.start()
+        metrics.add_provider('power', manager.governor.stats)
 
 
 def main():
     """主函数"""
+    args = parse_args()
+    if args.log_level:
+        set_level(args.log_level)
+
     print("=" * 60)
     print("  Desktop-Pokemon")
     print("=" * 60)
@@ -29,17 +94,38 @@ def main():
     app.setApplicationName("Desktop-Pokemon")
     app.setOrganizationName("Desktop-Pokemon")
 
-    # 创建主窗口
-    window = PetWindow()
-    window.show()
+    # 窗口相关模块在 QApplication 创建后再导入
+    from src.ui.pet_manager import PetManager
+
+    # 创建宠物窗口（多只宠物共享资源和动画时钟）
+    manager = PetManager()
+    first = manager.spawn(args.pet)
+
+    def on_first_frame():
+        elapsed = (time.perf_counter() - _start_time) * 1000
+        get_logger('Startup').info("First frame painted after %.1fms", elapsed)
+        if args.startup_probe:
+            app.quit()
+            return
+        if config.FAST_START:
+            start_services(manager, args)
+
+    first.firstFramePainted.connect(on_first_frame)
+    if not config.FAST_START and not args.startup_probe:
+        start_services(manager, args)
 
     print()
     print("[INFO] Desktop pet started!")
     print("[TIP] Left-drag to move, click to interact, right-click to exit")
     print()
 
-    # 运行应用
-    sys.exit(app.exec())
+    # 运行应用，退出前写出尚未保存的配置
+    exit_code = app.exec()
+    if args.stats:
+        metrics.dump(args.stats)
+    manager.close_all()
+    config.flush()
+    sys.exit(exit_code)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,297 @@
+"""
+宠物模型模块
+宠物的状态定义、默认行为描述，以及按状态机驱动单只宠物的行为控制器
+"""
+
+import json
+import math
+import random
+
+from PySide6.QtCore import QObject, Signal
+
+from src.core.animation_scheduler import shared_scheduler
+from src.core.log import get_logger
+from src.models.state_machine import DURATION_ANIMATION, StateMachine
+
+log = get_logger('Pet')
+
+
+# 宠物状态
+IDLE = 'idle'
+WALK = 'walk'
+EAT = 'eat'
+SLEEP = 'sleep'
+HAPPY = 'happy'
+SAD = 'sad'
+
+# 物种目录中可选的行为描述文件，存在时替换默认行为
+BEHAVIOR_FILE = 'behavior.json'
+
+# 默认行为：物种缺少动画的状态（如 walk、sleep）不会被随机进入，
+# 事件触发时由窗口回退到待机动画
+DEFAULT_BEHAVIOR = {
+    'initial': IDLE,
+    'states': {
+        IDLE: {'animation': 'idle', 'duration': [4000, 10000],
+               'next': {IDLE: 4, WALK: 3, SLEEP: 1}},
+        WALK: {'animation': 'walk', 'duration': [2000, 6000], 'next': {IDLE: 1}},
+        EAT: {'animation': 'eat', 'duration': DURATION_ANIMATION, 'loop': False,
+              'next': {HAPPY: 1}},
+        SLEEP: {'animation': 'sleep', 'duration': [20000, 60000], 'next': {IDLE: 1}},
+        HAPPY: {'animation': 'click', 'duration': DURATION_ANIMATION, 'loop': False,
+                'next': {IDLE: 1}},
+        SAD: {'animation': 'sad', 'duration': [3000, 6000], 'next': {IDLE: 1}},
+    },
+    'events': {
+        'click': {'*': HAPPY},
+        'feed': {'*': EAT},
+        'high_load': {IDLE: SAD, WALK: SAD},
+    },
+}
+
+
+def load_behavior_spec(sprite_dir):
+    """
+    读取物种的行为描述
+
+    Args:
+        sprite_dir: 精灵图目录
+
+    Returns:
+        行为描述字典（目录中没有 behavior.json 或读取失败时为默认行为）
+    """
+    path = sprite_dir / BEHAVIOR_FILE
+    if not path.exists():
+        return DEFAULT_BEHAVIOR
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        log.warning("Failed to read %s: %s, using default behavior", path, e)
+        return DEFAULT_BEHAVIOR
+
+
+def prune_transitions(spec, available):
+    """
+    去掉指向物种缺少动画的状态的随机转换
+
+    缺少动画的状态只能回退播放待机动画（例如没有 walk 动画的宠物会一边播放待机
+    动画一边被拖着走），因此定时结束时不随机进入这些状态；事件仍可显式触发它们。
+
+    Args:
+        spec: 状态机描述字典（不会被修改）
+        available: 物种拥有的动画名称集合
+
+    Returns:
+        新的描述字典；某个状态的转换全部被去掉时保留原转换
+    """
+    states = spec.get('states') or {}
+
+    def has_animation(name):
+        state = states.get(name)
+        if state is None:
+            return True  # 未知状态留给编译时报错
+        return (state or {}).get('animation', name) in available
+
+    pruned = {}
+    for name, state in states.items():
+        transitions = (state or {}).get('next')
+        if transitions:
+            kept = {target: w for target, w in transitions.items() if has_animation(target)}
+            if kept and len(kept) != len(transitions):
+                state = dict(state, next=kept)
+        pruned[name] = state
+    return dict(spec, states=pruned)
+
+
+# 每个物种的行为描述只读取一次
+_specs = {}
+
+# 按（物种, 可用动画）编译一次，所有同种宠物共享；热加载增删动画后换用新的编译结果
+_machines = {}
+
+
+def get_state_machine(species, resource_loader):
+    """
+    获取物种共享的已编译状态机
+
+    随机转换只指向物种拥有动画的状态，所以缓存按当前可用的动画区分：
+    热加载增删动画后再次调用会得到按新动画集合编译的状态机。
+    'animation' 持续时间取自动画元数据（只读块头或精灵包清单，不解码）；
+    动画集合不变、只有时长变化时由窗口调用 StateMachine.set_animation_duration 更新。
+
+    Args:
+        species: 物种名称
+        resource_loader: 该物种的 ResourceLoader
+
+    Returns:
+        StateMachine 对象
+    """
+    spec = _specs.get(species)
+    if spec is None:
+        spec = load_behavior_spec(resource_loader.sprite_dir)
+
+    paths = _animation_paths(spec, resource_loader)
+    key = (species, frozenset(paths))
+    machine = _machines.get(key)
+    if machine is not None:
+        return machine
+
+    try:
+        machine = _compile(spec, paths, resource_loader)
+    except ValueError as e:
+        if spec is DEFAULT_BEHAVIOR:
+            raise
+        log.warning("Invalid behavior for %s: %s, using default behavior", species, e)
+        _specs[species] = DEFAULT_BEHAVIOR
+        return get_state_machine(species, resource_loader)
+
+    _specs[species] = spec
+    _machines[key] = machine
+    return machine
+
+
+def _animation_paths(spec, resource_loader):
+    """行为描述用到的、物种拥有的动画 {动画名称: 路径}"""
+    paths = {}
+    for name, state in (spec.get('states') or {}).items():
+        animation = (state or {}).get('animation', name)
+        if animation not in paths:
+            path = resource_loader.get_animation_path(animation, warn=False)
+            if path:
+                paths[animation] = path
+    return paths
+
+
+def _compile(spec, paths, resource_loader):
+    """
+    编译行为描述
+
+    Raises:
+        ValueError: 描述不合法
+    """
+    durations = {}
+    for animation, path in paths.items():
+        info = resource_loader.get_animation_info(path)
+        if info is not None:
+            durations[animation] = info.total_duration
+    return StateMachine(prune_transitions(spec, set(paths)), durations)
+
+
+class PetBehavior(QObject):
+    """
+    单只宠物的行为控制器
+
+    由共享的 AnimationScheduler 推进（与动画播放器相同的 advance 接口），
+    不单独占用定时器；调度器冻结时行为也随之冻结。
+    """
+
+    stateChanged = Signal(str, str, bool)  # 新状态, 动画名称, 动画是否循环
+
+    def __init__(self, machine, scheduler=None, rng=None, parent=None):
+        """
+        Args:
+            machine: 已编译的 StateMachine
+            scheduler: 使用的 AnimationScheduler，缺省为进程共享调度器
+            rng: 随机数生成器（random.Random），便于复现
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self.machine = machine
+        self.scheduler = scheduler if scheduler is not None else shared_scheduler()
+        self.rng = rng or random.Random()
+
+        self.state_index = machine.initial
+        self._remaining = math.inf
+
+    @property
+    def state(self):
+        """当前状态名称"""
+        return self.machine.state_names[self.state_index]
+
+    @property
+    def animation(self):
+        """当前状态的动画名称"""
+        return self.machine.animations[self.state_index]
+
+    @property
+    def loop(self):
+        """当前状态的动画是否循环"""
+        return self.machine.loops[self.state_index]
+
+    def start(self):
+        """进入初始状态"""
+        self._enter(self.machine.initial)
+
+    def set_machine(self, machine):
+        """
+        换用重新编译的状态机（热加载增删动画后），保持当前状态和剩余时间
+
+        Args:
+            machine: 新的 StateMachine
+        """
+        name = self.state
+        self.machine = machine
+        if name in machine.state_names:
+            self.state_index = machine.state_index(name)
+        else:
+            self._enter(machine.initial)
+
+    def stop(self):
+        """停止行为（停留在当前状态）"""
+        self.scheduler.remove(self)
+
+    def fire(self, event):
+        """
+        触发事件
+
+        Args:
+            event: 事件名称（如 'click'）
+
+        Returns:
+            是否发生了状态转换
+        """
+        event_index = self.machine.event_index(event)
+        if event_index is None:
+            return False
+
+        target = self.machine.on_event(self.state_index, event_index)
+        if target < 0:
+            return False
+
+        self._enter(target)
+        return True
+
+    def advance(self, elapsed):
+        """
+        调度器回调：当前状态到时，按权重随机转换
+
+        Returns:
+            距下次到时的毫秒数，不限时状态返回 None（不再调度）
+        """
+        self._remaining -= elapsed
+        machine = self.machine
+
+        # 落后多个状态时连续转换；全部为零时长的描述最多转换一轮，下个 tick 继续
+        steps = 0
+        while self._remaining <= 0 and steps < machine.state_count:
+            state = machine.pick_next(self.state_index, self.rng.random())
+            self._set_state(state, self._remaining)
+            steps += 1
+
+        if self._remaining == math.inf:
+            return None
+        return max(self._remaining, 0.0)
+
+    def _enter(self, state):
+        self.scheduler.remove(self)
+        self._set_state(state, 0.0)
+        if self._remaining != math.inf:
+            self.scheduler.add(self, self._remaining)
+
+    def _set_state(self, state, overshoot):
+        self.state_index = state
+        self._remaining = self.machine.pick_duration(state, self.rng.random()) + overshoot
+        self.stateChanged.emit(self.machine.state_names[state],
+                               self.machine.animations[state], self.machine.loops[state])
@@ -0,0 +1,185 @@
+"""
+行为模拟模块
+不创建窗口，批量推进大量宠物的状态机，用于验证行为描述和性能测试
+"""
+
+import math
+import random
+import time
+from array import array
+
+
+class PetPopulation:
+    """
+    一群共享同一状态机的宠物（结构数组）
+
+    每只宠物只占用数组中的一个状态编号和一个剩余时间，
+    推进时不创建任何列表、字典或对象。
+    """
+
+    def __init__(self, machine, count, seed=None):
+        """
+        Args:
+            machine: 已编译的 StateMachine
+            count: 宠物数量
+            seed: 随机种子，相同种子得到相同的模拟结果
+        """
+        self.machine = machine
+        self.count = count
+        self.rng = random.Random(seed)
+
+        self.states = array('i', [machine.initial]) * count
+        self.remaining = array('d', [0.0]) * count
+        self.transitions = 0
+
+        rand = self.rng.random
+        for i in range(count):
+            self.remaining[i] = machine.pick_duration(machine.initial, rand())
+
+    def step(self, elapsed):
+        """
+        所有宠物推进 elapsed 毫秒
+
+        Returns:
+            本次发生的定时转换次数
+        """
+        states = self.states
+        remaining = self.remaining
+        rand = self.rng.random
+
+        # 查找表提前取到局部变量，循环内只做数组索引
+        machine = self.machine
+        next_targets = machine.next_targets
+        next_prob = machine.next_prob
+        next_alias = machine.next_alias
+        duration_min = machine.duration_min
+        duration_span = machine.duration_span
+        max_steps = machine.state_count
+
+        transitions = 0
+        for i in range(self.count):
+            left = remaining[i] - elapsed
+            if left > 0:
+                remaining[i] = left
+                continue
+
+            state = states[i]
+            steps = 0
+            while left <= 0 and steps < max_steps:
+                targets = next_targets[state]
+                u = rand() * len(targets)
+                k = int(u)
+                state = targets[k] if u - k < next_prob[state][k] else targets[next_alias[state][k]]
+                left += duration_min[state] + duration_span[state] * rand()
+                steps += 1
+
+            states[i] = state
+            remaining[i] = left
+            transitions += steps
+
+        self.transitions += transitions
+        return transitions
+
+    def fire(self, pet, event_index):
+        """
+        向单只宠物触发事件
+
+        Args:
+            pet: 宠物序号
+            event_index: 事件编号（StateMachine.event_index）
+
+        Returns:
+            是否发生了状态转换
+        """
+        machine = self.machine
+        target = machine.event_table[event_index * machine.state_count + self.states[pet]]
+        if target < 0:
+            return False
+
+        self.states[pet] = target
+        self.remaining[pet] = machine.duration_min[target] + machine.duration_span[target] * self.rng.random()
+        self.transitions += 1
+        return True
+
+    def occupancy(self):
+        """
+        各状态的宠物数量
+
+        Returns:
+            {状态名称: 数量} 字典
+        """
+        counts = [0] * self.machine.state_count
+        for state in self.states:
+            counts[state] += 1
+        return dict(zip(self.machine.state_names, counts))
+
+
+class Simulator:
+    """
+    无窗口的行为模拟器
+
+    按固定步长推进一群宠物，并按给定频率随机触发事件（如点击、喂食）。
+    """
+
+    def __init__(self, machine, count, event_rates=None, seed=None):
+        """
+        Args:
+            machine: 已编译的 StateMachine
+            count: 宠物数量
+            event_rates: {事件名称: 每只宠物每秒触发次数}
+            seed: 随机种子
+        """
+        self.population = PetPopulation(machine, count, seed)
+        self.rng = random.Random(None if seed is None else seed + 1)
+
+        self._events = []  # (事件编号, 每毫秒期望次数)
+        for event, rate in (event_rates or {}).items():
+            event_index = machine.event_index(event)
+            if event_index is None:
+                raise ValueError(f"unknown event '{event}'")
+            self._events.append((event_index, rate * count / 1000.0))
+
+        self.simulated_ms = 0.0
+        self.events_fired = 0
+
+    def run(self, duration, step=1000 / 60):
+        """
+        模拟一段时间
+
+        Args:
+            duration: 模拟时长（毫秒）
+            step: 步长（毫秒），缺省为 60 FPS 的一帧
+
+        Returns:
+            统计字典：步数、宠物步数、转换次数、实际耗时、每秒推进的宠物步数、状态分布
+        """
+        population = self.population
+        rand = self.rng.random
+        count = population.count
+        steps = int(math.ceil(duration / step))
+        transitions_before = population.transitions
+
+        start = time.perf_counter()
+        for _ in range(steps):
+            population.step(step)
+
+            # 事件次数按期望值取整，小数部分按概率进位
+            for event_index, per_ms in self._events:
+                expected = per_ms * step
+                fired = int(expected)
+                if rand() < expected - fired:
+                    fired += 1
+                for _ in range(fired):
+                    population.fire(int(rand() * count), event_index)
+                self.events_fired += fired
+        elapsed = time.perf_counter() - start
+
+        self.simulated_ms += steps * step
+        return {
+            'steps': steps,
+            'pet_steps': steps * count,
+            'transitions': population.transitions - transitions_before,
+            'seconds': elapsed,
+            'pet_steps_per_second': steps * count / elapsed if elapsed > 0 else math.inf,
+            'occupancy': population.occupancy(),
+        }
@@ -0,0 +1,249 @@
+"""
+状态机模块
+把声明式的状态转换描述编译成查找表：按权重随机转换（别名表，O(1) 抽样）、
+定时状态和事件触发，单步推进不做任何字典查找或对象分配
+"""
+
+import math
+
+
+# 事件表中表示"该状态不响应此事件"
+NO_TRANSITION = -1
+
+# 状态持续时间取动画时长（编译时由 animation_durations 提供）
+DURATION_ANIMATION = 'animation'
+
+# 动画时长未知时使用的默认持续时间（毫秒）
+DEFAULT_ANIMATION_DURATION = 2000
+
+
+def _build_alias(weights):
+    """
+    构建 Vose 别名表
+
+    Args:
+        weights: 非负权重列表（至少一个为正）
+
+    Returns:
+        (prob, alias) 两个等长列表
+    """
+    count = len(weights)
+    total = float(sum(weights))
+    prob = [w * count / total for w in weights]
+    alias = [0] * count
+
+    small = [i for i, p in enumerate(prob) if p < 1.0]
+    large = [i for i, p in enumerate(prob) if p >= 1.0]
+    while small and large:
+        lesser = small.pop()
+        greater = large.pop()
+        alias[lesser] = greater
+        prob[greater] -= 1.0 - prob[lesser]
+        (small if prob[greater] < 1.0 else large).append(greater)
+
+    # 浮点误差留下的项概率视为 1
+    for i in small + large:
+        prob[i] = 1.0
+    return prob, alias
+
+
+class StateMachine:
+    """
+    编译后的状态机（只读，可被任意多只宠物共享）
+
+    状态和事件都编号为整数，查找表：
+    - event_table[event * state_count + state]：事件触发的目标状态，NO_TRANSITION 表示忽略
+    - next_targets/next_prob/next_alias[state]：定时结束后的随机转换（别名表）
+    - duration_min/duration_span[state]：持续时间的均匀分布区间，无限持续为 inf
+    """
+
+    def __init__(self, spec, animation_durations=None):
+        """
+        编译状态机描述
+
+        描述格式::
+
+            {
+                'initial': 'idle',
+                'states': {
+                    'idle': {
+                        'animation': 'idle',           # 动画名称，缺省与状态同名
+                        'duration': [4000, 10000],     # 毫秒；数字、区间、'animation' 或 None（不限时）
+                        'loop': True,                  # 动画是否循环
+                        'next': {'walk': 3, 'idle': 1},  # 定时结束后的权重随机转换
+                    },
+                    ...
+                },
+                'events': {
+                    'click': {'*': 'happy', 'sleep': 'idle'},  # '*' 适用于全部状态
+                },
+            }
+
+        Args:
+            spec: 状态机描述字典
+            animation_durations: 可选的 {动画名称: 时长毫秒}，用于 'animation' 持续时间
+
+        Raises:
+            ValueError: 描述不合法（未知状态、缺少转换等）
+        """
+        states = spec.get('states')
+        if not states:
+            raise ValueError("state machine spec has no states")
+        animation_durations = animation_durations or {}
+
+        self.state_names = list(states)
+        self.state_count = len(self.state_names)
+        self._state_index = {name: i for i, name in enumerate(self.state_names)}
+
+        initial = spec.get('initial', self.state_names[0])
+        self.initial = self._lookup(initial, 'initial state')
+
+        self.animations = []
+        self.loops = []
+        self.duration_min = []
+        self.duration_span = []
+        self.animation_timed = []  # 持续时间是否取自动画时长
+        self.next_targets = []
+        self.next_prob = []
+        self.next_alias = []
+
+        for name in self.state_names:
+            state = states[name] or {}
+            animation = state.get('animation', name)
+            self.animations.append(animation)
+            self.loops.append(bool(state.get('loop', True)))
+
+            duration = state.get('duration')
+            self.animation_timed.append(duration == DURATION_ANIMATION)
+            if duration == DURATION_ANIMATION:
+                duration = animation_durations.get(animation, DEFAULT_ANIMATION_DURATION)
+            if duration is None:
+                low, high = math.inf, math.inf
+            elif isinstance(duration, (int, float)):
+                low, high = duration, duration
+            else:
+                low, high = duration
+            if low < 0 or high < low:
+                raise ValueError(f"invalid duration for state '{name}': {duration}")
+            self.duration_min.append(float(low))
+            self.duration_span.append(float(high - low) if high != math.inf else 0.0)
+
+            transitions = state.get('next') or {}
+            targets = [self._lookup(target, f"transition of '{name}'") for target in transitions]
+            weights = list(transitions.values())
+            if any(w < 0 for w in weights) or (weights and sum(weights) <= 0):
+                raise ValueError(f"invalid transition weights for state '{name}'")
+            if low != math.inf and not targets:
+                raise ValueError(f"timed state '{name}' has no 'next' transitions")
+
+            if targets:
+                prob, alias = _build_alias(weights)
+            else:
+                prob, alias = [], []
+            self.next_targets.append(targets)
+            self.next_prob.append(prob)
+            self.next_alias.append(alias)
+
+        # 事件表：每个事件一行，每个状态一列
+        events = spec.get('events') or {}
+        self.event_names = list(events)
+        self._event_index = {name: i for i, name in enumerate(self.event_names)}
+        self.event_table = [NO_TRANSITION] * (len(self.event_names) * self.state_count)
+
+        for event, mapping in events.items():
+            row = self._event_index[event] * self.state_count
+            default = mapping.get('*')
+            if default is not None:
+                target = self._lookup(default, f"event '{event}'")
+                for s in range(self.state_count):
+                    self.event_table[row + s] = target
+            for source, target in mapping.items():
+                if source == '*':
+                    continue
+                s = self._lookup(source, f"event '{event}'")
+                self.event_table[row + s] = (NO_TRANSITION if target is None
+                                             else self._lookup(target, f"event '{event}'"))
+
+    def _lookup(self, name, context):
+        index = self._state_index.get(name)
+        if index is None:
+            raise ValueError(f"unknown state '{name}' in {context}")
+        return index
+
+    def state_index(self, name):
+        """状态名称 -> 编号"""
+        return self._lookup(name, 'lookup')
+
+    def event_index(self, name):
+        """事件名称 -> 编号，未知事件返回 None"""
+        return self._event_index.get(name)
+
+    def animation_names(self):
+        """全部状态用到的动画名称（去重，保持顺序）"""
+        return list(dict.fromkeys(self.animations))
+
+    def set_animation_duration(self, animation, duration):
+        """
+        更新动画时长（动画文件热加载后时长可能变化）
+
+        只影响持续时间为 'animation' 且使用该动画的状态；正在这些状态中的宠物
+        按进入时抽取的时长结束，之后进入的宠物使用新时长。
+
+        Args:
+            animation: 动画名称
+            duration: 新的时长（毫秒）
+
+        Returns:
+            是否有状态的持续时间发生变化
+        """
+        changed = False
+        for state in range(self.state_count):
+            if (self.animation_timed[state] and self.animations[state] == animation
+                    and self.duration_min[state] != duration):
+                self.duration_min[state] = float(duration)
+                changed = True
+        return changed
+
+    def on_event(self, state, event):
+        """
+        事件触发的目标状态
+
+        Args:
+            state: 当前状态编号
+            event: 事件编号
+
+        Returns:
+            目标状态编号，不响应时返回 NO_TRANSITION
+        """
+        return self.event_table[event * self.state_count + state]
+
+    def pick_next(self, state, u):
+        """
+        定时结束后按权重抽取下一个状态（别名法，一个随机数）
+
+        Args:
+            state: 当前状态编号
+            u: [0, 1) 内的随机数
+
+        Returns:
+            下一个状态编号
+        """
+        targets = self.next_targets[state]
+        u *= len(targets)
+        i = int(u)
+        if u - i < self.next_prob[state][i]:
+            return targets[i]
+        return targets[self.next_alias[state][i]]
+
+    def pick_duration(self, state, u):
+        """
+        抽取状态持续时间
+
+        Args:
+            state: 状态编号
+            u: [0, 1) 内的随机数
+
+        Returns:
+            持续时间（毫秒），不限时返回 inf
+        """
+        return self.duration_min[state] + self.duration_span[state] * u
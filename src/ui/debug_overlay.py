@@ -0,0 +1,96 @@
+"""
+调试浮层模块
+在宠物窗口角落显示实时帧率、内存和热路径耗时，只在显示时才定时刷新
+"""
+
+import time
+
+from PySide6.QtWidgets import QLabel
+from PySide6.QtCore import Qt, QTimer
+
+from src.core.animation_scheduler import shared_scheduler
+from src.core.instrumentation import metrics, process_stats
+
+
+# 刷新间隔（毫秒）
+REFRESH_INTERVAL = 500
+
+
+class DebugOverlay(QLabel):
+    """
+    调试浮层
+
+    帧率由调度器计数在两次刷新之间的差值算出，不在每帧做任何额外工作。
+    """
+
+    def __init__(self, frame_store=None, parent=None):
+        """
+        Args:
+            frame_store: 可选的 FrameStore，显示帧集合占用的内存
+            parent: 所在的宠物窗口
+        """
+        super().__init__(parent)
+        self.frame_store = frame_store
+        self.scheduler = shared_scheduler()
+
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.setStyleSheet(
+            "background-color: rgba(0, 0, 0, 160); color: #7CFC00;"
+            "font-family: monospace; font-size: 9px; padding: 2px;"
+        )
+        self.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop)
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(REFRESH_INTERVAL)
+        self._timer.timeout.connect(self.refresh)
+        self._last = None  # (时间, tick 数, 推进帧数, 跳过帧数)
+        self.hide()
+
+    def set_active(self, active):
+        """显示或隐藏浮层（隐藏时停止刷新）"""
+        if active:
+            self._last = None
+            self.refresh()
+            self.show()
+            self.raise_()
+            self._timer.start()
+        else:
+            self._timer.stop()
+            self.hide()
+
+    def is_active(self):
+        """浮层是否显示中"""
+        return self._timer.isActive()
+
+    def refresh(self):
+        """刷新显示内容"""
+        scheduler = self.scheduler
+        now = time.perf_counter()
+        current = (now, scheduler.ticks, scheduler.frames_advanced, scheduler.frames_dropped)
+
+        if self._last is None:
+            fps = tick_rate = 0.0
+            dropped = 0
+        else:
+            dt = max(now - self._last[0], 1e-6)
+            tick_rate = (current[1] - self._last[1]) / dt
+            fps = (current[2] - self._last[2]) / dt
+            dropped = current[3] - self._last[3]
+        self._last = current
+
+        rss = process_stats()['rss'] / (1024 * 1024)
+        lines = [
+            f"fps {fps:5.1f}  tick {tick_rate:5.1f}/s",
+            f"drop {dropped:<4} {'paused' if scheduler.paused else f'max {scheduler.max_fps}'}",
+            f"rss {rss:6.1f} MB",
+        ]
+        if self.frame_store is not None:
+            lines.append(f"frames {self.frame_store.stats()['bytes'] / (1024 * 1024):5.1f} MB")
+
+        tick = metrics.timers.get('tick')
+        paint = metrics.timers.get('paint')
+        if tick is not None and paint is not None:
+            lines.append(f"tick {tick.last:.2f} paint {paint.last:.2f}ms")
+
+        self.setText('\n'.join(lines))
+        self.adjustSize()
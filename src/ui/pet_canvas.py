@@ -0,0 +1,222 @@
+"""
+宠物画布模块
+在 paintEvent 中直接绘制当前帧和浮层（对话气泡、特效），
+换帧时只重绘两帧之间变化像素的包围矩形
+"""
+
+import time
+
+from PySide6.QtWidgets import QWidget
+from PySide6.QtCore import QPoint, QRect, QRectF, Qt
+from PySide6.QtGui import QColor, QFont, QFontMetrics, QPainter, QPainterPath, QPen
+
+from src.core.instrumentation import metrics
+
+
+class Overlay:
+    """
+    画布浮层基类（和帧在同一次绘制中画出）
+
+    子类实现 bounds 和 paint；内容或位置变化后调用 PetCanvas.update_overlay。
+    """
+
+    def bounds(self):
+        """浮层占用的区域（画布逻辑坐标，QRect）"""
+        raise NotImplementedError
+
+    def paint(self, painter):
+        """绘制浮层（painter 已裁剪到本次重绘区域）"""
+        raise NotImplementedError
+
+
+class SpeechBubble(Overlay):
+    """宠物头顶的对话气泡"""
+
+    # 气泡样式
+    PADDING = 4
+    RADIUS = 6
+    TAIL = 5
+    BACKGROUND = QColor(255, 255, 255, 235)
+    BORDER = QColor(60, 60, 60)
+    TEXT = QColor(30, 30, 30)
+
+    def __init__(self, text, anchor, max_width=120, font=None):
+        """
+        Args:
+            text: 气泡文字（可换行）
+            anchor: 气泡尖角指向的位置（画布逻辑坐标，QPoint），气泡位于其上方
+            max_width: 气泡最大宽度（逻辑像素），超出时自动换行
+            font: 可选的字体，缺省为 9 像素的系统字体
+        """
+        self.text = text
+        self.font = font or QFont()
+        if font is None:
+            self.font.setPixelSize(9)
+
+        font_metrics = QFontMetrics(self.font)
+        inner = max_width - 2 * self.PADDING
+        text_rect = font_metrics.boundingRect(QRect(0, 0, inner, 1000),
+                                              Qt.TextFlag.TextWordWrap | Qt.AlignmentFlag.AlignCenter, text)
+        width = text_rect.width() + 2 * self.PADDING
+        height = text_rect.height() + 2 * self.PADDING
+        x = max(0, anchor.x() - width // 2)
+        y = max(0, anchor.y() - self.TAIL - height)
+        self._body = QRect(x, y, width, height)
+        self._anchor = QPoint(min(max(anchor.x(), x + self.RADIUS + self.TAIL),
+                                  x + width - self.RADIUS - self.TAIL), y + height + self.TAIL)
+
+    def bounds(self):
+        """气泡和尖角占用的区域（含描边）"""
+        return self._body.adjusted(-1, -1, 1, self.TAIL + 1)
+
+    def paint(self, painter):
+        """绘制气泡"""
+        body = QRectF(self._body)
+        tip = self._anchor
+        path = QPainterPath()
+        path.addRoundedRect(body, self.RADIUS, self.RADIUS)
+        tail = QPainterPath()
+        tail.moveTo(tip.x() - self.TAIL, body.bottom() - 1)
+        tail.lineTo(tip.x(), tip.y())
+        tail.lineTo(tip.x() + self.TAIL, body.bottom() - 1)
+        tail.closeSubpath()
+        path = path.united(tail)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(QPen(self.BORDER, 1))
+        painter.setBrush(self.BACKGROUND)
+        painter.drawPath(path)
+        painter.setPen(self.TEXT)
+        painter.setFont(self.font)
+        painter.drawText(body.adjusted(self.PADDING, self.PADDING, -self.PADDING, -self.PADDING),
+                         Qt.TextFlag.TextWordWrap | Qt.AlignmentFlag.AlignCenter, self.text)
+        painter.restore()
+
+
+class PetCanvas(QWidget):
+    """
+    宠物画布
+
+    帧由帧集合自己绘制：普通帧集合直接贴整帧 QPixmap，精灵表帧集合从共享图集中按子矩形贴图。
+    只有帧序号变化时才请求重绘；顺序播放到下一帧时只重绘加载时预先算好的变化区域，
+    跳帧、换动画或换分辨率级别时整帧重绘。浮层在同一次绘制中画在帧之上。
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._frame_set = None
+        self._index = 0
+        self._pixmap = None  # 完整动画就绪前显示的单张图像
+        self._origin = QPoint()  # 帧左上角的位置，只在帧尺寸或画布尺寸变化时重新计算
+        self._overlays = []
+
+    def set_frame(self, frame_set, index):
+        """
+        显示帧集合中的一帧
+
+        Args:
+            frame_set: FrameSet
+            index: 帧序号
+        """
+        previous, previous_index = self._frame_set, self._index
+        if frame_set is previous and index == previous_index and self._pixmap is None:
+            return
+
+        self._frame_set = frame_set
+        self._index = index
+        self._pixmap = None
+
+        if frame_set is previous and index == (previous_index + 1) % frame_set.frame_count:
+            damage = frame_set.damage(index)
+            if damage is not None:
+                if not damage.isEmpty():
+                    self.update(self.map_damage(frame_set, damage))
+                return
+        self._update_origin()
+        self.update()
+
+    def set_pixmap(self, pixmap):
+        """显示单张图像（如首帧）"""
+        self._frame_set = None
+        self._pixmap = pixmap
+        self._update_origin()
+        self.update()
+
+    def map_damage(self, frame_set, rect):
+        """把帧的像素坐标矩形换算为画布逻辑坐标（向外取整）"""
+        scale = frame_set.scale
+        origin = self._origin
+        return QRectF(origin.x() + rect.x() / scale, origin.y() + rect.y() / scale,
+                      rect.width() / scale, rect.height() / scale).toAlignedRect()
+
+    def frame_size(self):
+        """当前帧的逻辑尺寸（QSize），没有帧时为画布尺寸"""
+        if self._frame_set is not None:
+            return self._frame_set.frame_size()
+        if self._pixmap is not None:
+            return self._pixmap.deviceIndependentSize().toSize()
+        return self.size()
+
+    def frame_origin(self):
+        """当前帧左上角在画布中的位置（居中）"""
+        return QPoint(self._origin)
+
+    def _update_origin(self):
+        size = self.frame_size()
+        self._origin = QPoint((self.width() - size.width()) // 2, (self.height() - size.height()) // 2)
+
+    def add_overlay(self, overlay):
+        """添加浮层（画在最上面）"""
+        self._overlays.append(overlay)
+        self.update(overlay.bounds())
+
+    def remove_overlay(self, overlay):
+        """移除浮层"""
+        if overlay in self._overlays:
+            self._overlays.remove(overlay)
+            self.update(overlay.bounds())
+
+    def update_overlay(self, overlay, old_bounds=None):
+        """
+        浮层内容或位置变化后重绘
+
+        Args:
+            overlay: 浮层
+            old_bounds: 变化前的区域，位置或大小改变时需要一并重绘
+        """
+        rect = overlay.bounds()
+        if old_bounds is not None:
+            rect = rect.united(old_bounds)
+        self.update(rect)
+
+    def overlays(self):
+        """当前的浮层列表"""
+        return list(self._overlays)
+
+    def resizeEvent(self, event):
+        """画布尺寸变化时重新居中"""
+        self._update_origin()
+        super().resizeEvent(event)
+
+    def paintEvent(self, event):
+        """绘制事件：先把重绘区域清为透明，再画帧和浮层"""
+        start = time.perf_counter()
+        area = event.rect()
+        painter = QPainter(self)
+        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_Source)
+        painter.fillRect(area, Qt.GlobalColor.transparent)
+        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceOver)
+
+        if self._frame_set is not None:
+            self._frame_set.draw(painter, self._origin, self._index)
+        elif self._pixmap is not None:
+            painter.drawPixmap(self._origin, self._pixmap)
+
+        for overlay in self._overlays:
+            if overlay.bounds().intersects(area):
+                overlay.paint(painter)
+        painter.end()
+
+        metrics.record('paint', (time.perf_counter() - start) * 1000)
+        metrics.count('paint.pixels', area.width() * area.height())
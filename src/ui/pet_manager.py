@@ -0,0 +1,125 @@
+"""
+多宠物管理模块
+在同一个 QApplication 中运行多只宠物，共享帧集合和动画时钟
+"""
+
+from PySide6.QtCore import QObject, Signal
+
+from src.config import config
+from src.core.animation_scheduler import shared_scheduler
+from src.core.frame_store import FrameStore
+from src.core.instrumentation import metrics, process_stats
+from src.core.log import get_logger
+from src.core.movement import shared_movement
+from src.ui.pet_window import PetWindow
+
+log = get_logger('Manager')
+
+
+class PetManager(QObject):
+    """宠物管理器"""
+
+    petAdded = Signal(object)  # PetWindow
+    petRemoved = Signal(object)  # PetWindow
+
+    def __init__(self, frame_store=None, governor=None, parent=None):
+        """
+        初始化宠物管理器
+
+        Args:
+            frame_store: 共享的 FrameStore，缺省按全局配置创建
+            governor: 可选的 PowerGovernor，宠物的可见性和交互会通知它
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self.frame_store = frame_store or FrameStore.from_config(parent=self)
+        self.governor = governor
+        self.watcher = None  # 可选的 SpriteWatcher（热加载）
+        self.monitor = None  # 可选的 SystemMonitor（宠物对系统负载作出反应）
+        self.pets = []
+
+        # 统计快照（调试浮层、导出统计）包含的组件
+        metrics.add_provider('process', process_stats)
+        metrics.add_provider('scheduler', shared_scheduler().stats)
+        metrics.add_provider('frame_store', self.frame_store.stats)
+        if self.frame_store.memory_cache is not None:
+            metrics.add_provider('memory_cache', self.frame_store.memory_cache.stats)
+        metrics.add_provider('movement', shared_movement().stats)
+        metrics.add_provider('pets', self.stats)
+
+    def spawn(self, pet_name=None, position=None, persist_position=None):
+        """
+        创建并显示一只宠物
+
+        Args:
+            pet_name: 宠物种类，缺省使用配置中的默认宠物
+            position: 初始位置 (x, y)
+            persist_position: 是否保存位置，缺省只有第一只宠物保存
+
+        Returns:
+            PetWindow 对象
+        """
+        if persist_position is None:
+            persist_position = not self.pets
+
+        window = PetWindow(
+            pet_name=pet_name or config.DEFAULT_PET,
+            frame_store=self.frame_store,
+            position=position,
+            persist_position=persist_position
+        )
+        window.closed.connect(lambda: self._forget(window))
+        if self.governor is not None:
+            window.interacted.connect(self.governor.notify_interaction)
+            self.governor.add_window(window)
+        window.show()
+
+        self.pets.append(window)
+        self.petAdded.emit(window)
+        log.info("Spawned %s (total: %s)", window.pet_name, len(self.pets))
+        return window
+
+    def remove(self, window):
+        """关闭并移除一只宠物"""
+        if window in self.pets:
+            window.close()
+            self._forget(window)
+            window.deleteLater()
+
+    def stats(self):
+        """
+        获取宠物统计
+
+        Returns:
+            字典：宠物数量、各宠物的种类和当前状态
+        """
+        return {
+            'count': len(self.pets),
+            'pets': [{'species': w.pet_name, 'state': w.behavior.state} for w in self.pets],
+        }
+
+    def on_band_changed(self, metric, band, average):
+        """系统监视档位变化：CPU 或内存进入高负载时，所有宠物触发 high_load 事件"""
+        if metric in ('cpu', 'memory') and band == 'high':
+            for window in self.pets:
+                window.behavior.fire('high_load')
+
+    def close_all(self):
+        """关闭全部宠物并停止后台服务"""
+        if self.watcher is not None:
+            self.watcher.stop()
+        if self.monitor is not None:
+            self.monitor.stop()
+        for window in list(self.pets):
+            window.close()
+        self.pets.clear()
+        self.frame_store.shutdown()
+        if self.governor is not None:
+            self.governor.stop()
+
+    def _forget(self, window):
+        if window in self.pets:
+            self.pets.remove(window)
+            if self.governor is not None:
+                self.governor.remove_window(window)
+            self.petRemoved.emit(window)
@@ -3,43 +3,111 @@
 实现透明、无边框、可拖拽的桌宠窗口
 """
 
-from PySide6.QtWidgets import QWidget, QLabel, QMenu
-from PySide6.QtCore import Qt, QPoint, QTimer
-from PySide6.QtGui import QMovie, QCursor
-from PIL import Image
+import math
+import random
+from functools import partial
+
+from PySide6.QtWidgets import QWidget, QMenu
+from PySide6.QtCore import Qt, QEvent, QPoint, QTimer, Signal
+from PySide6.QtGui import QCursor, QGuiApplication
 
 from src.config import config
-from src.core.resource_loader import ResourceLoader
+from src.core.frame_store import FrameStore
+from src.core.gesture import (CLICK, DOUBLE_CLICK, DRAG_END, DRAG_MOVE, DRAG_START, FLING,
+                              LONG_PRESS, GestureRecognizer)
+from src.core.instrumentation import metrics
+from src.core.log import get_logger
+from src.core.movement import shared_movement
+from src.core.resource_loader import FramePlayer, mipmap_scale
+from src.models.pet import WALK, PetBehavior, get_state_machine
+from src.ui.pet_canvas import PetCanvas, SpeechBubble
+
+log = get_logger('Window')
+
+
+# 物种缺少某个状态的动画时使用的动画
+FALLBACK_ANIMATION = 'idle'
+
+# 转发给状态机的手势（事件名与手势类型相同，状态机未定义的事件被忽略）
+BEHAVIOR_GESTURES = (CLICK, DOUBLE_CLICK, LONG_PRESS, FLING)
 
 
 class PetWindow(QWidget):
     """桌宠窗口类"""
 
-    def __init__(self):
+    closed = Signal()  # 窗口关闭
+    interacted = Signal()  # 用户与宠物交互（点击、拖拽、右键）
+    firstFramePainted = Signal()  # 窗口第一次完成绘制
+
+    def __init__(self, pet_name=None, frame_store=None, position=None, persist_position=True):
+        """
+        初始化桌宠窗口
+
+        Args:
+            pet_name: 宠物种类（精灵图目录名），缺省使用配置中的默认宠物
+            frame_store: 共享的 FrameStore，缺省时为本窗口单独创建
+            position: 初始位置 (x, y)，缺省使用保存的位置或屏幕右下角
+            persist_position: 是否把窗口位置写入配置文件
+        """
         super().__init__()
 
-        # 初始化资源加载器
-        self.resource_loader = ResourceLoader(config.get_pet_sprite_dir())
+        self.pet_name = pet_name or config.DEFAULT_PET
+        self.initial_position = position
+        self.persist_position = persist_position
+
+        # 帧集合由 FrameStore 管理，多只宠物共享同一份解码结果
+        self._owns_store = frame_store is None
+        self.frame_store = frame_store or FrameStore.from_config(parent=self)
+        self.resource_loader = self.frame_store.loader(self.pet_name)
+        self._acquired = set()  # 已获得引用的动画名称
+        self._load_callbacks = {}  # 动画名称 -> 等待中的回调
+        self.frame_store.frameSetReplaced.connect(self.on_frame_set_replaced)
+        self.frame_store.animationsReloaded.connect(self.on_animations_reloaded)
 
         # 当前动画状态
-        self.current_animation = None
-        self.idle_animation = None  # 待机动画
-        self.click_animation = None  # 点击动画
-        self.click_animation_duration = 2000  # 默认点击动画时长（毫秒）
+        self.current_animation = None  # 正在播放的动画名称
+        self.animations = {}  # 动画名称 -> FrameSet
+        self._wanted = None  # 当前状态要求的 (动画名称, 是否循环)，动画就绪后播放
+
+        # 帧图集播放器（所有动画共用一个定时器）
+        self.player = FramePlayer(self)
+        self.player.frameChanged.connect(self.on_frame_changed)
+
+        # 行为状态机：决定何时播放哪个动画（同种宠物共享编译好的状态机）
+        machine = get_state_machine(self.pet_name, self.resource_loader)
+        self.behavior = PetBehavior(machine, parent=self)
+        self.behavior.stateChanged.connect(self.on_state_changed)
+
+        self._first_paint_done = False
+        self._shape_mask = None  # 当前设置的窗口形状遮罩（HitMask），避免重复设置
+        self.mipmap_scale = None  # 当前使用的分辨率级别，开始加载动画时按所在屏幕选择
 
         # 拖拽相关
         self.dragging = False
-        self.drag_position = QPoint()
-        self.drag_start_pos = QPoint()  # 记录拖拽起始位置
+        self.drag_position = QPoint()  # 按下时鼠标相对窗口左上角的位置
+
+        # 手势识别：阈值取系统设置；状态机响应双击时推迟单击，避免双击先触发一次单击
+        hints = QGuiApplication.styleHints()
+        self.gestures = GestureRecognizer(
+            drag_distance=hints.startDragDistance(),
+            double_click_interval=hints.mouseDoubleClickInterval(),
+            long_press=hints.mousePressAndHoldInterval(),
+            fling_speed=config.FLING_SPEED,
+            max_fling_speed=config.MAX_FLING_SPEED,
+            defer_click=machine.event_index(DOUBLE_CLICK) is not None
+        )
 
         # 初始化 UI
         self.init_ui()
 
-        # 加载动画
-        self.load_animations()
+        # 行走、下落和拖拽都由共享的移动引擎按帧合并后再移动窗口
+        self.movement = shared_movement()
+        self.movement.add(self, on_settled=self.save_position)
 
-        # 播放待机动画
-        self.play_idle_animation()
+        # 加载动画（先显示第一帧，完整动画就绪后自动开始播放待机动画）
+        self.mipmap_scale = self.screen_mipmap_scale()
+        self.load_animations()
+        self.behavior.start()
 
     def init_ui(self):
         """初始化用户界面"""
@@ -56,13 +124,30 @@ class PetWindow(QWidget):
         # 设置窗口大小
         self.resize(*config.WINDOW_SIZE)
 
-        # 创建标签用于显示动画
-        self.animation_label = QLabel(self)
-        self.animation_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.animation_label.setGeometry(0, 0, *config.WINDOW_SIZE)
-
-        # 设置窗口位置（如果有保存的位置）
-        if config.window_x is not None and config.window_y is not None:
+        # 画布：直接绘制当前帧和浮层，换帧时只重绘变化的区域
+        self.canvas = PetCanvas(self)
+        self.canvas.setGeometry(0, 0, *config.WINDOW_SIZE)
+
+        # 手势超时（长按、等待双击）共用一个单次定时器，每次输入后重新安排，不会堆积回调
+        self._gesture_timer = QTimer(self)
+        self._gesture_timer.setSingleShot(True)
+        self._gesture_timer.timeout.connect(self.on_gesture_timeout)
+
+        # 对话气泡（同一时间只有一个，再次说话时替换并重新计时）
+        self.bubble = None
+        self._bubble_timer = QTimer(self)
+        self._bubble_timer.setSingleShot(True)
+        self._bubble_timer.timeout.connect(self.hide_bubble)
+
+        # 调试浮层在第一次打开时才创建
+        self.debug_overlay = None
+        if config.DEBUG_OVERLAY:
+            self.toggle_debug_overlay(True)
+
+        # 设置窗口位置（指定位置优先，其次是保存的位置）
+        if self.initial_position is not None:
+            self.move(*self.initial_position)
+        elif self.persist_position and config.window_x is not None and config.window_y is not None:
             self.move(config.window_x, config.window_y)
         else:
             # 默认位置：屏幕右下角
@@ -78,7 +163,7 @@ class PetWindow(QWidget):
         # 设置鼠标形状
         self.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
 
-        print("[Window] Window initialized")
+        log.debug("Window initialized")
 
     def get_gif_duration(self, gif_path):
         """
@@ -90,96 +175,254 @@ class PetWindow(QWidget):
         Returns:
             总时长（毫秒），如果出错返回默认值 2000
         """
-        try:
-            img = Image.open(gif_path)
-            total_duration = 0
-            frame_count = 0
-
-            while True:
-                try:
-                    frame_duration = img.info.get('duration', 100)  # 默认 100ms
-                    total_duration += frame_duration
-                    frame_count += 1
-                    img.seek(img.tell() + 1)
-                except EOFError:
-                    break
-
-            print(f"[Window] GIF analysis: {frame_count} frames, {total_duration}ms total")
-            return total_duration
-
-        except Exception as e:
-            print(f"[Window] Warning: Failed to analyze GIF duration: {e}")
+        # 只读取 GIF 块头或精灵包清单，不解码像素
+        info = self.resource_loader.get_animation_info(gif_path)
+        if info is None:
+            log.warning("Failed to analyze GIF duration")
             return 2000  # 默认 2 秒
 
-    def load_animations(self):
-        """加载所有动画资源"""
-        # 列出可用动画
-        available_animations = self.resource_loader.list_available_animations()
+        log.debug("GIF analysis: %s frames, %sms total", info.frame_count, info.total_duration)
+        return info.total_duration
+
+    def screen_mipmap_scale(self):
+        """按窗口所在屏幕的设备像素比选择分辨率级别"""
+        if not config.HIDPI_MIPMAPS:
+            return 1.0
+        return mipmap_scale(self.devicePixelRatioF(), config.MIPMAP_SCALES)
+
+    def update_mipmap_level(self):
+        """
+        窗口移到设备像素比不同的屏幕后切换分辨率级别
+
+        新级别的帧在后台解码，就绪前继续显示旧级别的帧；
+        正在播放的动画换帧后保持当前进度。
+        """
+        if self.mipmap_scale is None:
+            return  # 还没有开始加载动画
+        scale = self.screen_mipmap_scale()
+        if scale == self.mipmap_scale:
+            return
+
+        log.info("Device pixel ratio %s: switching sprites from %sx to %sx",
+                 self.devicePixelRatioF(), self.mipmap_scale, scale)
+        self.release_animations()
+        self.mipmap_scale = scale
+        self.load_animations(show_first_frame=False)
+
+    def load_animations(self, show_first_frame=True):
+        """
+        加载状态机用到的全部动画资源（后台解码，不阻塞窗口显示）
+
+        Args:
+            show_first_frame: 当前状态的动画尚未就绪时是否先同步显示第一帧
+        """
+        label_size = (self.canvas.width(), self.canvas.height())
+
+        paths = {}
+        for name in self.behavior.machine.animation_names():
+            path = self.resource_loader.get_animation_path(name, warn=False)
+            if path:
+                paths[name] = path
+
+        if not paths:
+            log.warning("No animation resources found!")
+            return
+
+        for name in paths:
+            if name in self._acquired or name in self._load_callbacks:
+                continue  # 已经持有或正在加载（热加载新增动画后只请求新的）
+            callback = partial(self.on_animation_loaded, name)
+            self._load_callbacks[name] = callback
+            self.frame_store.request(self.pet_name, name, label_size, callback, self.mipmap_scale)
+
+        # 初始状态的动画尚未就绪（没有其他宠物解码过）：先同步显示第一帧
+        first = self.behavior.animation if self.behavior.animation in paths else FALLBACK_ANIMATION
+        if show_first_frame and first in paths and first not in self.animations:
+            first_frame = self.resource_loader.load_first_frame(paths[first], label_size,
+                                                                self.mipmap_scale)
+            if first_frame:
+                self.canvas.set_pixmap(first_frame)
+
+    def release_animations(self):
+        """归还对共享帧集合的引用，并取消未完成的加载"""
+        label_size = (self.canvas.width(), self.canvas.height())
+
+        for name, callback in self._load_callbacks.items():
+            self.frame_store.cancel(self.pet_name, name, label_size, callback, self.mipmap_scale)
+        self._load_callbacks.clear()
+
+        for name in self._acquired:
+            self.frame_store.release(self.pet_name, name, label_size, self.mipmap_scale)
+        self._acquired.clear()
+
+        self.animations.clear()
+
+    def on_animation_loaded(self, name, frame_set):
+        """帧集合就绪的回调"""
+        self._load_callbacks.pop(name, None)
+        if frame_set is None:
+            log.warning("Failed to load %s animation", name)
+            return
+        self._acquired.add(name)
+        self.animations[name] = frame_set
+        log.info("%s animation loaded (%s frames, %sms)",
+                 name.capitalize(), frame_set.frame_count, frame_set.total_duration)
+
+        # 切换分辨率级别：正在播放的动画换成新级别的帧，保持播放进度
+        current = self.player.frame_set
+        if name == self.current_animation and current is not None and current.scale != frame_set.scale:
+            self.player.swap(frame_set)
+            return
+
+        # 当前状态正等待这个动画
+        if self._wanted is not None and self._wanted[0] == name:
+            self.play_animation(name, self._wanted[1])
 
-        if not available_animations:
-            print("[Window] Warning: No animation resources found!")
+    def on_frame_set_replaced(self, key, frame_set):
+        """资源文件变化后，共享帧集合被整体替换（热加载）"""
+        species, name, size, scale = key
+        label_size = (self.canvas.width(), self.canvas.height())
+        if (species != self.pet_name or size != label_size or scale != self.mipmap_scale
+                or name not in self._acquired):
             return
 
-        # 加载待机动画
-        idle_path = self.resource_loader.get_animation_path('idle')
-        if idle_path:
-            self.idle_animation = QMovie(idle_path)
-            self.idle_animation.setScaledSize(self.animation_label.size())
-            print("[Window] Idle animation loaded")
-
-        # 加载点击动画
-        click_path = self.resource_loader.get_animation_path('click')
-        if click_path:
-            self.click_animation = QMovie(click_path)
-            self.click_animation.setScaledSize(self.animation_label.size())
-            # 计算点击动画的实际时长
-            self.click_animation_duration = self.get_gif_duration(click_path)
-            print(f"[Window] Click animation loaded (duration: {self.click_animation_duration}ms)")
-
-    def play_idle_animation(self):
-        """播放待机动画"""
-        if self.idle_animation:
-            self.current_animation = 'idle'
-            self.animation_label.setMovie(self.idle_animation)
-            self.idle_animation.start()
-            print("[Window] Playing idle animation")
+        self.animations[name] = frame_set
+        # 动画时长可能变化：以动画时长计时的状态（如点击后的 happy）使用新时长
+        self.behavior.machine.set_animation_duration(name, frame_set.total_duration)
+
+        # 正在播放的动画从新帧集合的第一帧重新开始
+        if self.current_animation == name:
+            self.player.play(frame_set, loop=self.player.loop)
+        log.info("Reloaded %s animation (%s frames)", name, frame_set.frame_count)
+
+    def on_animations_reloaded(self, species):
+        """资源文件变化后，按新的动画集合换用状态机并加载新增的动画"""
+        if species != self.pet_name:
+            return
+        machine = get_state_machine(self.pet_name, self.resource_loader)
+        if machine is self.behavior.machine:
+            return
+
+        log.info("Animations of %s added or removed, switching behavior", species)
+        self.behavior.set_machine(machine)
+        self.load_animations(show_first_frame=False)
+
+    def on_frame_changed(self, index):
+        """播放器切换帧时更新显示"""
+        self.canvas.set_frame(self.player.frame_set, index)
+        if config.SHAPE_MASK:
+            self.update_shape_mask()
+
+    def frame_offset(self):
+        """当前帧左上角在窗口中的位置（标签居中显示帧，按逻辑尺寸计算）"""
+        origin = self.canvas.frame_origin() + self.canvas.pos()
+        return origin.x(), origin.y()
+
+    def current_mask(self):
+        """当前帧的命中遮罩，还没有完整动画（只显示首帧）时返回 None"""
+        frame_set = self.player.frame_set
+        if frame_set is None or frame_set.frame_count == 0:
+            return None
+        return frame_set.mask(self.player.current_index)
+
+    def hit_test(self, pos):
+        """
+        窗口坐标是否落在宠物的不透明像素上（查预先计算的遮罩）
+
+        Args:
+            pos: 窗口坐标（QPoint）
+
+        Returns:
+            命中时为 True；当前帧没有遮罩时整个窗口都算命中
+        """
+        mask = self.current_mask()
+        if mask is None:
+            return True
+        dx, dy = self.frame_offset()
+        # 遮罩是帧的像素坐标，高分辨率级别下一个逻辑像素对应 scale 个像素
+        scale = self.player.frame_set.scale
+        return mask.contains(int((pos.x() - dx) * scale), int((pos.y() - dy) * scale))
+
+    def update_shape_mask(self):
+        """按当前帧设置窗口形状遮罩（同一遮罩不重复设置）"""
+        mask = self.current_mask()
+        if mask is self._shape_mask:
+            return
+        self._shape_mask = mask
+        if mask is None:
+            self.clearMask()
         else:
-            print("[Window] Warning: Idle animation not loaded")
-
-    def play_click_animation(self):
-        """播放点击反馈动画"""
-        if self.click_animation:
-            self.current_animation = 'click'
-            # 停止当前播放的动画
-            if self.idle_animation and self.idle_animation.state() == QMovie.MovieState.Running:
-                self.idle_animation.stop()
-
-            self.animation_label.setMovie(self.click_animation)
-            self.click_animation.start()
-            print(f"[Window] Playing click animation (will play for {self.click_animation_duration}ms)")
-
-            # 使用实际计算的动画时长，播放完一次后返回待机
-            QTimer.singleShot(self.click_animation_duration, self.on_click_animation_finished)
+            self.setMask(mask.region(*self.frame_offset(), self.player.frame_set.scale))
+
+    def say(self, text, duration=3000):
+        """
+        在宠物头顶显示对话气泡（与帧在同一次绘制中画出）
+
+        Args:
+            text: 气泡文字
+            duration: 显示时长（毫秒）
+        """
+        self.hide_bubble()
+        origin = self.canvas.frame_origin()
+        anchor = QPoint(self.canvas.width() // 2, origin.y() + self.canvas.frame_size().height() // 4)
+        self.bubble = SpeechBubble(text, anchor, max_width=self.canvas.width() - 8)
+        self.canvas.add_overlay(self.bubble)
+        self._bubble_timer.start(duration)
+
+    def hide_bubble(self):
+        """隐藏对话气泡"""
+        self._bubble_timer.stop()
+        if self.bubble is not None:
+            self.canvas.remove_overlay(self.bubble)
+            self.bubble = None
+
+    def on_state_changed(self, state, animation, loop):
+        """行为状态变化：切换到该状态的动画"""
+        # 物种没有这个动画（且不在加载中）时回退到待机动画
+        if animation not in self.animations and animation not in self._load_callbacks:
+            animation, loop = FALLBACK_ANIMATION, True
+
+        self._wanted = (animation, loop)
+
+        if state == WALK:
+            self.movement.walk(self, random.choice((-1, 1)))
         else:
-            # 如果没有点击动画，直接返回待机
-            print("[Window] Warning: Click animation not loaded, using idle")
-            self.play_idle_animation()
-
-    def on_click_animation_finished(self):
-        """点击动画播放完成后的回调"""
-        # 停止点击动画
-        if self.click_animation:
-            self.click_animation.stop()
-        # 返回待机动画
-        self.play_idle_animation()
+            self.movement.stop_walking(self)
+
+        # 同一个循环动画继续播放，不从头开始
+        if animation == self.current_animation and loop and self.player.loop:
+            return
+        self.play_animation(animation, loop)
+
+    def play_animation(self, name, loop=True):
+        """
+        播放动画（非循环动画停在最后一帧，由状态机决定何时切换）
+
+        Args:
+            name: 动画名称
+            loop: 是否循环播放
+        """
+        frame_set = self.animations.get(name)
+        if frame_set is None:
+            return  # 尚未加载完成，就绪后由 on_animation_loaded 播放
+
+        self.current_animation = name
+        self.player.play(frame_set, loop=loop)
+        log.debug("Playing %s animation (%s)", name, self.behavior.state)
 
     def mousePressEvent(self, event):
         """鼠标按下事件"""
+        # 透明像素上的点击不属于宠物
+        if config.HIT_TEST and not self.hit_test(event.position().toPoint()):
+            event.ignore()
+            return
+
+        self.interacted.emit()
+
         if event.button() == Qt.MouseButton.LeftButton:
-            # 记录拖拽起始位置
-            self.dragging = True
-            self.drag_position = event.globalPosition().toPoint() - self.frameGeometry().topLeft()
-            self.drag_start_pos = event.globalPosition().toPoint()  # 记录起始全局位置
+            pos = event.globalPosition().toPoint()
+            self.drag_position = pos - self.frameGeometry().topLeft()
+            self.handle_gestures(self.gestures.press(pos.x(), pos.y(), self.movement.scheduler.now()))
             event.accept()
 
         elif event.button() == Qt.MouseButton.RightButton:
@@ -187,63 +430,144 @@ class PetWindow(QWidget):
             self.show_context_menu(event.globalPosition().toPoint())
 
     def mouseMoveEvent(self, event):
-        """鼠标移动事件（拖拽）"""
-        if self.dragging and event.buttons() == Qt.MouseButton.LeftButton:
-            # 移动窗口
-            self.move(event.globalPosition().toPoint() - self.drag_position)
+        """鼠标移动事件（超过拖拽距离后开始拖拽）"""
+        if self.gestures.down and event.buttons() & Qt.MouseButton.LeftButton:
+            pos = event.globalPosition().toPoint()
+            self.handle_gestures(self.gestures.move(pos.x(), pos.y(), self.movement.scheduler.now()))
             event.accept()
 
     def mouseReleaseEvent(self, event):
         """鼠标释放事件"""
         if event.button() == Qt.MouseButton.LeftButton:
-            if self.dragging:
-                # 结束拖拽
-                self.dragging = False
+            pos = event.globalPosition().toPoint()
+            self.handle_gestures(self.gestures.release(pos.x(), pos.y(), self.movement.scheduler.now()))
+            event.accept()
 
-                # 保存窗口位置
-                pos = self.pos()
-                config.save_config(window_x=pos.x(), window_y=pos.y())
+    def on_gesture_timeout(self):
+        """长按或双击等待到时"""
+        self.handle_gestures(self.gestures.poll(self.movement.scheduler.now()))
 
-                # 检查是否是点击（鼠标移动距离小于5像素认为是点击）
-                release_pos = event.globalPosition().toPoint()
-                distance = (release_pos - self.drag_start_pos).manhattanLength()
-                if distance < 5:
-                    # 触发点击动画
-                    self.play_click_animation()
+    def handle_gestures(self, gestures):
+        """
+        执行识别出的手势，并按识别器的下一个超时重新安排定时器
 
-            event.accept()
+        拖拽交给移动引擎（按屏幕刷新率合并为每帧一次 move），松手速度足够时甩出；
+        点击类手势作为事件交给状态机，状态机重新计时而不是叠加回调。
+
+        Args:
+            gestures: Gesture 列表
+        """
+        for gesture in gestures:
+            kind = gesture.kind
+            if kind == DRAG_START:
+                self.dragging = True
+                self.movement.begin_drag(self)
+            elif kind == DRAG_MOVE:
+                self.movement.drag_to(self, QPoint(gesture.x, gesture.y) - self.drag_position)
+            elif kind == DRAG_END:
+                # 结束拖拽（启用重力时从这里落下，落地后保存位置）
+                self.dragging = False
+                self.movement.end_drag(self)
+            if kind == FLING:
+                self.movement.fling(self, gesture.vx, gesture.vy)
+            if kind in BEHAVIOR_GESTURES:
+                self.behavior.fire(kind)
+
+        deadline = self.gestures.deadline()
+        if deadline is None:
+            self._gesture_timer.stop()
+        else:
+            self._gesture_timer.start(max(0, math.ceil(deadline - self.movement.scheduler.now())))
+
+    def save_position(self):
+        """保存窗口位置（移动停止后调用）"""
+        if self.persist_position:
+            pos = self.pos()
+            config.save_config(window_x=pos.x(), window_y=pos.y())
 
     def show_context_menu(self, position):
         """显示右键菜单"""
         menu = QMenu(self)
 
         # 添加菜单项
+        overlay_action = menu.addAction("调试信息")
+        overlay_action.setCheckable(True)
+        overlay_action.setChecked(self.debug_overlay is not None and self.debug_overlay.is_active())
+        dump_action = menu.addAction("导出统计")
+        menu.addSeparator()
         exit_action = menu.addAction("退出")
 
         # 执行菜单并获取选择的动作
         action = menu.exec(position)
 
-        if action == exit_action:
+        if action == overlay_action:
+            self.toggle_debug_overlay(overlay_action.isChecked())
+        elif action == dump_action:
+            self.dump_stats()
+        elif action == exit_action:
             self.close_application()
 
+    def toggle_debug_overlay(self, active):
+        """显示或隐藏调试浮层（帧率、内存、热路径耗时）"""
+        if self.debug_overlay is None:
+            if not active:
+                return
+            from src.ui.debug_overlay import DebugOverlay
+            self.debug_overlay = DebugOverlay(self.frame_store, parent=self)
+        self.debug_overlay.set_active(active)
+
+    def dump_stats(self, path=None):
+        """
+        把埋点统计导出为 JSON 文件
+
+        Args:
+            path: 输出文件路径，缺省取自配置
+        """
+        path = path or config.STATS_FILE
+        try:
+            metrics.dump(path)
+        except OSError as e:
+            log.warning("Failed to write stats to %s: %s", path, e)
+            return
+        log.info("Stats written to %s", path)
+
     def close_application(self):
         """关闭应用程序"""
-        print("[Window] Closing application...")
+        log.info("Closing application...")
 
-        # 保存当前位置
-        pos = self.pos()
-        config.save_config(window_x=pos.x(), window_y=pos.y())
+        # 保存当前位置，并在退出前确保写入磁盘
+        if self.persist_position:
+            pos = self.pos()
+            config.save_config(window_x=pos.x(), window_y=pos.y())
+            config.flush()
 
         # 关闭窗口
         self.close()
 
+    def event(self, event):
+        """窗口移到其他屏幕或屏幕缩放比例变化时切换分辨率级别"""
+        if event.type() in (QEvent.Type.ScreenChangeInternal, QEvent.Type.DevicePixelRatioChange):
+            self.update_mipmap_level()
+        return super().event(event)
+
+    def paintEvent(self, event):
+        """绘制事件（只用于报告首帧）"""
+        super().paintEvent(event)
+        if not self._first_paint_done:
+            self._first_paint_done = True
+            self.firstFramePainted.emit()
+
     def closeEvent(self, event):
         """窗口关闭事件"""
-        # 停止所有动画
-        if self.idle_animation:
-            self.idle_animation.stop()
-        if self.click_animation:
-            self.click_animation.stop()
-
-        print("[Window] Window closed")
+        # 停止动画并归还共享资源
+        self.player.stop()
+        self.behavior.stop()
+        self._gesture_timer.stop()
+        self.movement.remove(self)
+        self.release_animations()
+        if self._owns_store:
+            self.frame_store.shutdown()
+
+        log.info("Window closed")
+        self.closed.emit()
         event.accept()